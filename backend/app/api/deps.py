@@ -6,9 +6,33 @@ Follows the FastAPI Depends pattern for clean endpoint signatures.
 
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from app.config import Settings, get_settings
+from app.core.auth import AuthenticatedUser, AuthenticationError, TokenVerifier
+from app.core.database import get_service_client
+from app.core.llm.cache import InterpretationCache
+from app.core.llm.client import LLMClient, LLMFactory
+from app.core.services.conversations import (
+    ConversationCache,
+    ConversationService,
+    SupabaseConversationStore,
+)
+from app.core.services.credits import SupabaseCreditLedger
+from app.core.services.daily import DailyReadingService
+from app.core.services.entitlements import EntitlementCache, EntitlementLedger
+from app.core.services.history import (
+    ReadingHistoryStore,
+    SupabaseReadingHistoryStore,
+)
+from app.core.services.jobs import JobWorkerPool
+from app.core.services.reading import ReadingOrchestrator, SupabaseReadingStore
+from app.core.services.stats import ReadingStatsStore, SupabaseReadingStatsStore
+from app.core.services.webhooks import WebhookProcessor
+from app.core.tarot.deck import TarotDeck
+
+bearer_scheme = HTTPBearer(auto_error=False)
 
 
 def get_settings_dep() -> Settings:
@@ -24,3 +48,218 @@ def get_settings_dep() -> Settings:
 
 
 SettingsDep = Annotated[Settings, Depends(get_settings_dep)]
+
+
+def get_deck() -> TarotDeck:
+    """Get the shared tarot deck.
+
+    The deck and its search index are built once per process.
+
+    Returns:
+        TarotDeck: Process-wide deck instance.
+    """
+    return TarotDeck.get_instance()
+
+
+DeckDep = Annotated[TarotDeck, Depends(get_deck)]
+
+
+def get_llm_client(settings: SettingsDep) -> LLMClient:
+    """Get the shared LLM client, reading through the interpretation cache.
+
+    Args:
+        settings: Application configuration
+
+    Returns:
+        LLMClient: Process-wide client instance.
+    """
+    return LLMFactory.get_instance(
+        use_local=settings.use_local_llm,
+        ollama_base_url=settings.ollama_base_url,
+        grok_api_key=settings.xai_api_key,
+        cache=InterpretationCache.get_instance(settings),
+        routing_rules=settings.llm_routing_rules,
+    )
+
+
+LLMClientDep = Annotated[LLMClient, Depends(get_llm_client)]
+
+
+def get_token_verifier() -> TokenVerifier:
+    """Get the access token verifier.
+
+    Returns:
+        TokenVerifier: Process-wide verifier, with its cached keys.
+    """
+    return TokenVerifier.get_instance(get_settings())
+
+
+async def get_current_user(
+    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(bearer_scheme)],
+) -> AuthenticatedUser:
+    """Authenticate the request's Supabase bearer token.
+
+    Tokens are verified locally against cached signing keys.
+
+    Args:
+        credentials: Parsed Authorization header, if any
+
+    Returns:
+        AuthenticatedUser: The caller.
+
+    Raises:
+        HTTPException: 401 if the token is missing or invalid.
+    """
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Missing bearer token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    try:
+        return await get_token_verifier().verify(credentials.credentials)
+    except AuthenticationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        ) from e
+
+
+CurrentUserDep = Annotated[AuthenticatedUser, Depends(get_current_user)]
+
+
+def get_entitlements(settings: SettingsDep) -> EntitlementCache:
+    """Get the cache of users' tier and credit balance.
+
+    Args:
+        settings: Application configuration
+
+    Returns:
+        EntitlementCache: Process-wide cache instance.
+    """
+    return EntitlementCache.get_instance(settings)
+
+
+EntitlementCacheDep = Annotated[EntitlementCache, Depends(get_entitlements)]
+
+
+def get_reading_orchestrator(
+    deck: DeckDep, llm: LLMClientDep, entitlements: EntitlementCacheDep
+) -> ReadingOrchestrator:
+    """Assemble the reading pipeline.
+
+    Args:
+        deck: Shared tarot deck
+        llm: Shared LLM client
+        entitlements: Cache invalidated when credits change
+
+    Returns:
+        ReadingOrchestrator: Pipeline backed by Supabase.
+    """
+    client = get_service_client()
+    return ReadingOrchestrator(
+        deck=deck,
+        llm=llm,
+        ledger=EntitlementLedger(SupabaseCreditLedger(client), entitlements),
+        store=SupabaseReadingStore(client),
+    )
+
+
+ReadingOrchestratorDep = Annotated[
+    ReadingOrchestrator, Depends(get_reading_orchestrator)
+]
+
+
+def get_conversation_service(
+    settings: SettingsDep, llm: LLMClientDep
+) -> ConversationService:
+    """Get the chat service for follow-up questions.
+
+    Args:
+        settings: Application configuration
+        llm: Shared LLM client
+
+    Returns:
+        ConversationService: Service using the process-wide conversation
+        cache, backed by Supabase.
+    """
+    return ConversationService(
+        cache=ConversationCache.get_instance(settings),
+        store=SupabaseConversationStore(get_service_client()),
+        llm=llm,
+    )
+
+
+ConversationServiceDep = Annotated[
+    ConversationService, Depends(get_conversation_service)
+]
+
+
+def get_stats_store() -> ReadingStatsStore:
+    """Get the per-user reading statistics store.
+
+    Returns:
+        ReadingStatsStore: Store backed by Supabase.
+    """
+    return SupabaseReadingStatsStore(get_service_client())
+
+
+ReadingStatsStoreDep = Annotated[ReadingStatsStore, Depends(get_stats_store)]
+
+
+def get_history_store() -> ReadingHistoryStore:
+    """Get the reading history store.
+
+    Returns:
+        ReadingHistoryStore: Store backed by Supabase.
+    """
+    return SupabaseReadingHistoryStore(get_service_client())
+
+
+ReadingHistoryStoreDep = Annotated[ReadingHistoryStore, Depends(get_history_store)]
+
+
+def get_daily_service(settings: SettingsDep) -> DailyReadingService:
+    """Get the daily reading service.
+
+    Args:
+        settings: Application configuration
+
+    Returns:
+        DailyReadingService: Process-wide service instance.
+    """
+    return DailyReadingService.get_instance(settings)
+
+
+DailyServiceDep = Annotated[DailyReadingService, Depends(get_daily_service)]
+
+
+def get_job_pool(settings: SettingsDep) -> JobWorkerPool:
+    """Get the reading job pool.
+
+    Args:
+        settings: Application configuration
+
+    Returns:
+        JobWorkerPool: Process-wide pool, with its job store.
+    """
+    return JobWorkerPool.get_instance(settings)
+
+
+JobPoolDep = Annotated[JobWorkerPool, Depends(get_job_pool)]
+
+
+def get_webhook_processor(settings: SettingsDep) -> WebhookProcessor:
+    """Get the Stripe webhook processor.
+
+    Args:
+        settings: Application configuration
+
+    Returns:
+        WebhookProcessor: Process-wide processor, with its event store.
+    """
+    return WebhookProcessor.get_instance(settings)
+
+
+WebhookProcessorDep = Annotated[WebhookProcessor, Depends(get_webhook_processor)]
@@ -0,0 +1,96 @@
+"""Size-thresholded response compression.
+
+Compresses complete response bodies (long interpretations, reading
+payloads) with brotli when the optional ``brotli`` package is installed
+and the client accepts it, otherwise with gzip. Streaming responses
+(NDJSON, server-sent events) and bodies that already carry a
+``Content-Encoding`` pass through untouched, so pre-compressed catalog
+payloads aren't compressed twice.
+"""
+
+import gzip
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.responses import parse_accept_encoding
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+
+class CompressionMiddleware:
+    """Compress complete responses above a minimum size."""
+
+    def __init__(
+        self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6
+    ) -> None:
+        """Wrap an ASGI app.
+
+        Args:
+            app: Downstream application
+            minimum_size: Bodies smaller than this are sent as-is
+            gzip_level: gzip compression level
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accepted = parse_accept_encoding(
+            Headers(scope=scope).get("accept-encoding", "")
+        )
+        if brotli is not None and "br" in accepted:
+            coding = "br"
+        elif "gzip" in accepted:
+            coding = "gzip"
+        else:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if "content-encoding" in headers or message["status"] in (204, 304):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            assert start is not None
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                # Streaming or small: send unchanged from here on.
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            if coding == "br":
+                compressed = brotli.compress(body)
+            else:
+                compressed = gzip.compress(body, compresslevel=self.gzip_level)
+
+            headers = MutableHeaders(raw=start["headers"])
+            headers["Content-Encoding"] = coding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,83 @@
+"""Opt-in per-request profiling.
+
+When diagnostics are enabled, a request carrying ``X-Profile: 1`` or
+``?profile=1`` runs under ``cProfile`` and its call tree is written to the
+profile directory as a ``.prof`` file (open it with ``snakeviz`` or
+``python -m pstats``). The response names the file in ``X-Profile-File``.
+
+``cProfile`` profiles the whole thread, so other requests interleaving
+with the profiled one on the event loop show up too, and only one
+request is profiled at a time.
+"""
+
+import asyncio
+import cProfile
+import re
+import time
+from pathlib import Path
+
+import structlog
+from starlette.datastructures import Headers, QueryParams
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = structlog.get_logger(__name__)
+
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9]+")
+
+
+def _wants_profile(scope: Scope) -> bool:
+    if Headers(scope=scope).get("x-profile") == "1":
+        return True
+    return QueryParams(scope.get("query_string", b"")).get("profile") == "1"
+
+
+class ProfilerMiddleware:
+    """Profile requests that ask for it."""
+
+    def __init__(self, app: ASGIApp, output_dir: Path) -> None:
+        """Wrap an ASGI app.
+
+        Args:
+            app: Downstream application
+            output_dir: Directory the ``.prof`` files are written to
+        """
+        self.app = app
+        self.output_dir = output_dir
+        self._active = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._active or not _wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        slug = _UNSAFE_CHARS.sub("_", scope["path"]).strip("_") or "root"
+        path = self.output_dir / f"{time.strftime('%Y%m%dT%H%M%S')}-{slug}.prof"
+
+        async def send_with_header(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-profile-file", path.name.encode()),
+                ]
+            await send(message)
+
+        profile = cProfile.Profile()
+        self._active = True
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            await self.app(scope, receive, send_with_header)
+        finally:
+            profile.disable()
+            self._active = False
+            await asyncio.to_thread(self._write, profile, path)
+            logger.info(
+                "request_profiled",
+                path=scope["path"],
+                file=str(path),
+                duration_ms=round((time.perf_counter() - started) * 1000, 1),
+            )
+
+    def _write(self, profile: cProfile.Profile, path: Path) -> None:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        profile.dump_stats(path)
@@ -0,0 +1,365 @@
+"""In-process token-bucket rate limiting.
+
+Every request is charged against a bucket for the client IP and, when it
+carries a valid Supabase bearer token, a bucket for the user id. Tokens
+are checked with ``TokenVerifier`` before their user's bucket is charged,
+so a forged token can't drain another user's bucket. Endpoints are
+grouped into classes with their own limits, so expensive reading creation
+is throttled far harder than cheap catalog reads.
+
+A request that stands for many units of work, such as a batch, charges
+the rest to the same buckets through ``request.state.rate_limit``.
+
+Buckets live in sharded LRU maps. Each lookup is O(1), and each request
+evicts at most a few idle buckets from the head of its shard, so memory
+stays bounded without a sweeper task.
+"""
+
+import math
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import structlog
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.responses import ORJSONResponse
+from app.core.auth import AuthenticationError
+
+if TYPE_CHECKING:
+    from app.config import Settings
+    from app.core.auth import TokenVerifier
+
+logger = structlog.get_logger(__name__)
+
+# Stop evicting after this many idle buckets per request.
+_MAX_EVICTIONS_PER_CALL = 4
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimit:
+    """A named limit: ``capacity`` requests, refilled over ``period``."""
+
+    name: str
+    capacity: int
+    period_seconds: float = 60.0
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.capacity / self.period_seconds
+
+
+@dataclass(frozen=True, slots=True)
+class RateDecision:
+    """Outcome of charging one request against a bucket."""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float
+    reset_after: float
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated_at")
+
+    def __init__(self, tokens: float, updated_at: float) -> None:
+        self.tokens = tokens
+        self.updated_at = updated_at
+
+
+class TokenBucketLimiter:
+    """Sharded token buckets keyed by arbitrary strings."""
+
+    def __init__(
+        self,
+        shards: int = 16,
+        idle_seconds: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            shards: Number of independent LRU maps
+            idle_seconds: Buckets untouched for this long are evicted
+            clock: Monotonic time source
+        """
+        self.idle_seconds = idle_seconds
+        self.clock = clock
+        self._shards: list[OrderedDict[str, _Bucket]] = [
+            OrderedDict() for _ in range(shards)
+        ]
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def _shard(self, key: str) -> OrderedDict[str, _Bucket]:
+        return self._shards[zlib.crc32(key.encode()) % len(self._shards)]
+
+    def hit(self, key: str, limit: RateLimit, cost: float = 1.0) -> RateDecision:
+        """Charge a request to a bucket.
+
+        Args:
+            key: Bucket key, e.g. ``"reading:ip:1.2.3.4"``
+            limit: Limit that applies to the bucket
+            cost: Tokens the request takes; nothing is taken if it is denied
+
+        Returns:
+            RateDecision: Whether the request may proceed
+        """
+        now = self.clock()
+        shard = self._shard(key)
+
+        evicted = 0
+        while shard and evicted < _MAX_EVICTIONS_PER_CALL:
+            oldest_key, oldest = next(iter(shard.items()))
+            if now - oldest.updated_at < self.idle_seconds:
+                break
+            del shard[oldest_key]
+            evicted += 1
+
+        bucket = shard.get(key)
+        if bucket is None:
+            bucket = _Bucket(float(limit.capacity), now)
+            shard[key] = bucket
+        else:
+            elapsed = now - bucket.updated_at
+            bucket.tokens = min(
+                float(limit.capacity),
+                bucket.tokens + elapsed * limit.refill_per_second,
+            )
+            bucket.updated_at = now
+            shard.move_to_end(key)
+
+        allowed = bucket.tokens >= cost
+        if allowed:
+            bucket.tokens -= cost
+        missing = limit.capacity - bucket.tokens
+        return RateDecision(
+            allowed=allowed,
+            limit=limit.capacity,
+            remaining=int(bucket.tokens),
+            retry_after=0.0
+            if allowed
+            else (cost - bucket.tokens) / limit.refill_per_second,
+            reset_after=missing / limit.refill_per_second,
+        )
+
+
+def _tightest(decisions: list[RateDecision]) -> RateDecision:
+    return min(decisions, key=lambda d: (d.allowed, d.remaining))
+
+
+@dataclass(frozen=True, slots=True)
+class RateCharge:
+    """The buckets a request was charged to, for charging further work."""
+
+    limiter: TokenBucketLimiter
+    limit: RateLimit
+    keys: tuple[str, ...]
+
+    def hit(self, cost: float) -> RateDecision:
+        """Charge extra units of work to every bucket.
+
+        Args:
+            cost: Tokens to take
+
+        Returns:
+            RateDecision: The tightest bucket's decision
+        """
+        return _tightest([self.limiter.hit(key, self.limit, cost) for key in self.keys])
+
+
+def _rate_headers(decision: RateDecision) -> dict[str, str]:
+    return {
+        "X-RateLimit-Limit": str(decision.limit),
+        "X-RateLimit-Remaining": str(decision.remaining),
+        "X-RateLimit-Reset": str(math.ceil(time.time() + decision.reset_after)),
+    }
+
+
+def too_many_requests(decision: RateDecision) -> ORJSONResponse:
+    """429 response for a denied decision.
+
+    Args:
+        decision: Decision that denied the request
+
+    Returns:
+        ORJSONResponse: ``RATE_LIMITED`` error with Retry-After
+    """
+    retry_after = max(1, math.ceil(decision.retry_after))
+    return ORJSONResponse(
+        status_code=429,
+        content={
+            "error": "RATE_LIMITED",
+            "message": "Too many requests. Please slow down.",
+            "retry_after": retry_after,
+        },
+        headers={
+            **_rate_headers(decision),
+            "Retry-After": str(retry_after),
+        },
+    )
+
+
+def bearer_token(header: str | None) -> str | None:
+    """Extract the token from an Authorization header.
+
+    Args:
+        header: Authorization header value
+
+    Returns:
+        str | None: The bearer token, or None if there is none
+    """
+    if not header or not header.lower().startswith("bearer "):
+        return None
+    token = header[7:].strip()
+    return token or None
+
+
+class RateLimitMiddleware:
+    """Reject requests over their endpoint class limit with 429."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        classify: Callable[[str, str], RateLimit | None],
+        limiter: TokenBucketLimiter | None = None,
+        trust_forwarded: bool = False,
+        verifier: Callable[[], "TokenVerifier"] | None = None,
+    ) -> None:
+        """Wrap an ASGI app.
+
+        Args:
+            app: Downstream application
+            classify: Maps (method, path) to a limit, or None to skip
+            limiter: Bucket store, created if not given
+            trust_forwarded: Take the client IP from X-Forwarded-For
+            verifier: Returns the token verifier; without one, only IP
+                buckets are used
+        """
+        self.app = app
+        self.classify = classify
+        self.limiter = limiter or TokenBucketLimiter()
+        self.trust_forwarded = trust_forwarded
+        self.verifier = verifier
+
+    def _client_ip(self, scope: Scope, headers: Headers) -> str:
+        if self.trust_forwarded:
+            forwarded = headers.get("x-forwarded-for")
+            if forwarded:
+                return forwarded.split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    async def _user_id(self, headers: Headers) -> str | None:
+        token = bearer_token(headers.get("authorization"))
+        if token is None or self.verifier is None:
+            return None
+        verifier = self.verifier()
+        user = verifier.cached(token)
+        if user is None:
+            try:
+                user = await verifier.verify(token)
+            except AuthenticationError:
+                # Unverified tokens only get the IP bucket
+                return None
+        return user.id
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.classify(scope["method"], scope["path"])
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        ip_key = f"{limit.name}:ip:{self._client_ip(scope, headers)}"
+        keys = [ip_key]
+        decisions = [self.limiter.hit(ip_key, limit)]
+        user_id = None
+        # Tokens are only verified for clients still within their IP limit
+        if decisions[0].allowed:
+            user_id = await self._user_id(headers)
+            if user_id is not None:
+                keys.append(f"{limit.name}:user:{user_id}")
+                decisions.append(self.limiter.hit(keys[-1], limit))
+
+        tightest = _tightest(decisions)
+        if not tightest.allowed:
+            logger.warning(
+                "rate_limited",
+                limit=limit.name,
+                path=scope["path"],
+                user_id=user_id,
+                retry_after=max(1, math.ceil(tightest.retry_after)),
+            )
+            await too_many_requests(tightest)(scope, receive, send)
+            return
+
+        scope["state"] = {
+            **scope.get("state", {}),
+            "rate_limit": RateCharge(self.limiter, limit, tuple(keys)),
+        }
+        rate_headers = _rate_headers(tightest)
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response_headers = MutableHeaders(scope=message)
+                for name, value in rate_headers.items():
+                    response_headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+_EXEMPT_PATHS = frozenset(
+    {
+        "/health",
+        "/api/test/health",
+        "/docs",
+        "/openapi.json",
+        # Stripe retries throttled deliveries; signatures gate this instead
+        "/api/webhook/stripe",
+    }
+)
+_READING_PATHS = frozenset({"/api/reading", "/api/test/reading", "/api/test/llm"})
+_CATALOG_PATHS = frozenset({"/api/test/spreads"})
+
+
+def endpoint_classifier(settings: "Settings") -> Callable[[str, str], RateLimit | None]:
+    """Build the (method, path) -> limit policy from settings.
+
+    Args:
+        settings: Application configuration
+
+    Returns:
+        Callable: Classifier for ``RateLimitMiddleware``
+    """
+    reading = RateLimit("reading", settings.rate_limit_reading_per_minute)
+    chat = RateLimit("chat", settings.rate_limit_chat_per_minute)
+    catalog = RateLimit("catalog", settings.rate_limit_catalog_per_minute)
+    default = RateLimit("default", settings.rate_limit_default_per_minute)
+
+    def classify(method: str, path: str) -> RateLimit | None:
+        if method == "OPTIONS" or path in _EXEMPT_PATHS:
+            return None
+        if method == "POST":
+            if path in _READING_PATHS or path.startswith("/api/test/reading/"):
+                return reading
+            if path.startswith("/api/reading/") and path.endswith("/chat"):
+                return chat
+        if method == "GET" and (
+            path.startswith("/api/cards") or path in _CATALOG_PATHS
+        ):
+            return catalog
+        return default
+
+    return classify
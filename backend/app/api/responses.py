@@ -0,0 +1,191 @@
+"""Response classes and pre-serialized static payloads.
+
+``ORJSONResponse`` is the app's default response class. ``StaticPayload``
+holds catalog data (spreads, card metadata, image manifest) that only
+changes on deploy: it is serialized and compressed once, each encoding is
+tagged with its own content-hash ETag, and answered with ``304 Not Modified`` when the client
+already has it.
+"""
+
+import gzip
+import hashlib
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+# Catalog data only changes on deploy; the ETag covers freshness after that.
+CATALOG_CACHE_CONTROL = "public, max-age=86400, stale-while-revalidate=604800"
+
+
+def _dumps(content: Any) -> bytes:
+    # Read-only mappings, such as the spread summaries, serialize as dicts
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response serialized with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return _dumps(content)
+
+
+def accepted_encodings(request: Request) -> set[str]:
+    """Parse the codings a client accepts.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        set: Lowercase coding names with a non-zero quality
+    """
+    return parse_accept_encoding(request.headers.get("accept-encoding", ""))
+
+
+def parse_accept_encoding(header: str) -> set[str]:
+    """Parse an Accept-Encoding header value.
+
+    Args:
+        header: Raw header value
+
+    Returns:
+        set: Lowercase coding names with a non-zero quality
+    """
+    codings = set()
+    for part in header.split(","):
+        coding, *params = (piece.strip() for piece in part.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding and quality > 0:
+            codings.add(coding.lower())
+    return codings
+
+
+@dataclass(frozen=True, slots=True)
+class StaticPayload:
+    """A JSON body serialized, hashed and compressed once."""
+
+    body: bytes
+    etag: str
+    gzip_body: bytes
+    brotli_body: bytes | None
+    cache_control: str = CATALOG_CACHE_CONTROL
+
+    @classmethod
+    def from_content(
+        cls, content: Any, cache_control: str = CATALOG_CACHE_CONTROL
+    ) -> "StaticPayload":
+        """Serialize content and precompute its ETag and encodings.
+
+        Args:
+            content: JSON-serializable content
+            cache_control: Cache-Control header to send
+
+        Returns:
+            StaticPayload: Ready-to-send payload
+        """
+        body = _dumps(content)
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        return cls(
+            body=body,
+            etag=etag,
+            gzip_body=gzip.compress(body, compresslevel=9, mtime=0),
+            brotli_body=brotli.compress(body) if brotli is not None else None,
+            cache_control=cache_control,
+        )
+
+    def etag_for(self, encoding: str | None) -> str:
+        """Strong ETag of one encoding of the payload.
+
+        Each encoding is a different byte sequence, so each gets its own
+        tag: the identity body carries the content hash, and compressed
+        bodies add the coding, e.g. ``"<hash>-br"``.
+
+        Args:
+            encoding: ``"br"``, ``"gzip"`` or None for the identity body
+
+        Returns:
+            str: Quoted entity tag
+        """
+        if encoding is None:
+            return self.etag
+        return f'{self.etag[:-1]}-{encoding}"'
+
+    def select(self, request: Request) -> tuple[bytes, str | None]:
+        """Pick the best encoding the client accepts.
+
+        Args:
+            request: Incoming request
+
+        Returns:
+            tuple[bytes, str | None]: Body and its content coding, or None
+            for the identity body
+        """
+        encodings = accepted_encodings(request)
+        if self.brotli_body is not None and "br" in encodings:
+            return self.brotli_body, "br"
+        if "gzip" in encodings:
+            return self.gzip_body, "gzip"
+        return self.body, None
+
+    def matches(self, request: Request, etag: str) -> bool:
+        """Whether the client's If-None-Match covers a representation.
+
+        Args:
+            request: Incoming request
+            etag: ETag of the representation that would be sent
+
+        Returns:
+            bool: True if a 304 should be sent
+        """
+        header = request.headers.get("if-none-match")
+        if header is None:
+            return False
+        for tag in header.split(","):
+            tag = tag.strip()
+            if tag == "*" or tag.removeprefix("W/") == etag:
+                return True
+        return False
+
+    def to_response(self, request: Request) -> Response:
+        """Build the response for one request.
+
+        Args:
+            request: Incoming request
+
+        Returns:
+            Response: 304 if the client is current, else the payload in the
+            best encoding the client accepts
+        """
+        body, encoding = self.select(request)
+        etag = self.etag_for(encoding)
+        headers = {
+            "ETag": etag,
+            "Cache-Control": self.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if self.matches(request, etag):
+            return Response(status_code=304, headers=headers)
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,98 @@
+"""Card catalog endpoints.
+
+Read-only access to the tarot deck for the card browser and follow-up UI.
+"""
+
+from functools import lru_cache
+from typing import Any
+
+from fastapi import APIRouter, Query, Request, Response
+
+from app.api.deps import DeckDep
+from app.api.responses import StaticPayload
+from app.core.tarot.deck import TarotDeck
+
+router = APIRouter(prefix="/api/cards", tags=["cards"])
+
+# Card images are served by the frontend from public/cards/.
+CARD_IMAGE_BASE_PATH = "/cards/"
+
+
+@lru_cache(maxsize=1)
+def _card_catalog(deck: TarotDeck) -> StaticPayload:
+    """Serialize the full card metadata listing once per deck."""
+    cards = [dict(card) for card in deck.all_cards]
+    return StaticPayload.from_content({"total_cards": len(cards), "cards": cards})
+
+
+@lru_cache(maxsize=1)
+def _image_manifest(deck: TarotDeck) -> StaticPayload:
+    """Serialize the card id to image file manifest once per deck."""
+    return StaticPayload.from_content(
+        {
+            "base_path": CARD_IMAGE_BASE_PATH,
+            "images": {card["id"]: card["image"] for card in deck.all_cards},
+        }
+    )
+
+
+@router.get("")
+async def list_cards(request: Request, deck: DeckDep) -> Response:
+    """List every card with its metadata and meanings.
+
+    Args:
+        request: Incoming request
+        deck: Shared tarot deck
+
+    Returns:
+        Response: Pre-serialized card catalog (ETag, 304 aware)
+    """
+    return _card_catalog(deck).to_response(request)
+
+
+@router.get("/images")
+async def card_images(request: Request, deck: DeckDep) -> Response:
+    """Map card ids to their image files.
+
+    Args:
+        request: Incoming request
+        deck: Shared tarot deck
+
+    Returns:
+        Response: Pre-serialized image manifest (ETag, 304 aware)
+    """
+    return _image_manifest(deck).to_response(request)
+
+
+@router.get("/search")
+async def search_cards(
+    deck: DeckDep,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(10, ge=1, le=78),
+) -> dict[str, Any]:
+    """Find cards by theme across keywords, archetypes and meanings.
+
+    Args:
+        deck: Shared tarot deck
+        q: Search text, e.g. "new beginnings"
+        limit: Maximum number of results
+
+    Returns:
+        dict: Ranked matching cards
+    """
+    hits = deck.search_index.search(q, limit=limit)
+
+    return {
+        "query": q,
+        "total": len(hits),
+        "results": [
+            {
+                "id": hit.card["id"],
+                "name": hit.card["name"],
+                "image": hit.card.get("image"),
+                "score": hit.score,
+                "matched_fields": list(hit.matched_fields),
+            }
+            for hit in hits
+        ],
+    }
@@ -0,0 +1,169 @@
+"""Diagnostics endpoints.
+
+Only mounted when ``DIAGNOSTICS_ENABLED`` is set. Reports event-loop lag,
+runs ``tracemalloc`` snapshot diffs, audits card draws and rebuilds
+reading statistics on demand.
+"""
+
+import asyncio
+import time
+from typing import Any
+
+import structlog
+from fastapi import APIRouter, HTTPException, Query, status
+
+from app.api.deps import DeckDep, ReadingStatsStoreDep, SettingsDep
+from app.core.diagnostics import LoopLagMonitor, MemoryTracker
+from app.core.tarot import audit
+from app.core.tarot.spreads import SpreadLibrary
+
+logger = structlog.get_logger(__name__)
+
+router = APIRouter(prefix="/api/diagnostics", tags=["diagnostics"])
+
+# One draw audit at a time; each keeps a CPU busy for seconds
+_audit_lock = asyncio.Lock()
+
+
+@router.get("/loop")
+async def loop_lag(settings: SettingsDep) -> dict[str, Any]:
+    """Report event-loop lag and the stack of the last stall.
+
+    Args:
+        settings: Application configuration
+
+    Returns:
+        dict: Ticks, stalls, worst lag and the last blocked stack
+    """
+    return LoopLagMonitor.get_instance(settings).snapshot()
+
+
+@router.post("/memory", status_code=status.HTTP_202_ACCEPTED)
+async def start_memory_tracing(
+    frames: int = Query(default=10, ge=1, le=50),
+) -> dict[str, Any]:
+    """Start tracing allocations and take a baseline snapshot.
+
+    Args:
+        frames: Stack frames recorded per allocation
+
+    Returns:
+        dict: Tracing status
+    """
+    await asyncio.to_thread(MemoryTracker.get_instance().start, frames)
+    return {"tracing": True}
+
+
+@router.get("/memory")
+async def memory_diff(limit: int = Query(default=20, ge=1, le=200)) -> dict[str, Any]:
+    """Diff current allocations against the baseline.
+
+    Args:
+        limit: Number of source lines returned
+
+    Returns:
+        dict: Largest allocation changes by source line
+
+    Raises:
+        HTTPException: 409 if tracing has not been started
+    """
+    try:
+        top = await asyncio.to_thread(MemoryTracker.get_instance().diff, limit)
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e)) from e
+    return {"top": top}
+
+
+@router.delete("/memory", status_code=status.HTTP_204_NO_CONTENT)
+async def stop_memory_tracing() -> None:
+    """Stop tracing allocations."""
+    MemoryTracker.get_instance().stop()
+
+
+@router.get("/draws")
+async def audit_draws(
+    deck: DeckDep,
+    trials: int = Query(default=200_000, ge=1_000, le=1_000_000),
+    deck_trials: int = Query(default=20_000, ge=1_000, le=50_000),
+    alpha: float = Query(default=0.001, gt=0, lt=1),
+    spread_id: str | None = None,
+) -> dict[str, Any]:
+    """Audit card draws for fairness.
+
+    Runs uniformity, positional-bias and reversal tests on simulated
+    readings and on readings drawn from the deck, for every spread or just
+    ``spread_id``. The work runs in a worker thread.
+
+    Args:
+        deck: Shared tarot deck
+        trials: Readings simulated per spread
+        deck_trials: Readings drawn from the deck per spread
+        alpha: Significance level
+        spread_id: Audit only this spread
+
+    Returns:
+        dict: Audit report
+
+    Raises:
+        HTTPException: 404 for an unknown spread, 409 if an audit is
+            already running, 503 without NumPy
+    """
+    if not audit.available():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Draw audit needs numpy; install the 'audit' extra",
+        )
+    spreads = list(SpreadLibrary.get_all_spreads().values())
+    if spread_id is not None:
+        spreads = [spread for spread in spreads if spread.spread_id == spread_id]
+        if not spreads:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Unknown spread {spread_id!r}",
+            )
+    if _audit_lock.locked():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="An audit is already running"
+        )
+    async with _audit_lock:
+        report = await asyncio.to_thread(
+            audit.run_audit,
+            spreads,
+            deck=deck,
+            trials=trials,
+            deck_trials=deck_trials,
+            alpha=alpha,
+        )
+    logger.info(
+        "draw_audit_completed",
+        spreads=len(spreads),
+        trials=trials,
+        passed=report.passed,
+        seconds=round(report.seconds, 3),
+    )
+    return report.to_dict()
+
+
+@router.post("/reading-stats/backfill")
+async def backfill_reading_stats(
+    store: ReadingStatsStoreDep, user_id: str | None = None
+) -> dict[str, Any]:
+    """Rebuild per-user reading statistics from stored readings.
+
+    Runs with the service key, so it is only reachable where diagnostics
+    are enabled.
+
+    Args:
+        store: Reading statistics store
+        user_id: Rebuild one user, or everyone when omitted
+
+    Returns:
+        dict: Number of users rebuilt
+    """
+    started = time.perf_counter()
+    users = await store.backfill(user_id)
+    logger.info("reading_stats_backfilled", users=users, user_id=user_id)
+    return {
+        "users": users,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
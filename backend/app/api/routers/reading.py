@@ -0,0 +1,201 @@
+"""Reading endpoints.
+
+Creates tarot readings for authenticated users and serves the daily draw.
+"""
+
+from datetime import datetime, timezone
+from typing import Any
+
+import structlog
+from fastapi import APIRouter, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import (
+    ConversationServiceDep,
+    CurrentUserDep,
+    DailyServiceDep,
+    DeckDep,
+    EntitlementCacheDep,
+    ReadingHistoryStoreDep,
+    ReadingOrchestratorDep,
+    ReadingStatsStoreDep,
+    SettingsDep,
+)
+from app.core.llm.router import routing_tier
+from app.core.services.daily import DAILY_QUESTION
+from app.core.services.export import MEDIA_TYPES, ExportFormat, export_lines
+from app.core.services.history import ExportCursor, SearchCursor
+from app.core.services.reading import serialize_cards
+from app.core.tarot.spreads import SpreadLibrary
+from app.schemas.reading import ChatRequest, ReadingRequest
+
+logger = structlog.get_logger(__name__)
+
+router = APIRouter(prefix="/api", tags=["readings"])
+
+
+@router.post("/reading", status_code=status.HTTP_201_CREATED)
+async def create_reading(
+    body: ReadingRequest,
+    user: CurrentUserDep,
+    orchestrator: ReadingOrchestratorDep,
+    entitlements: EntitlementCacheDep,
+) -> dict[str, Any]:
+    """Create a new tarot reading.
+
+    Credits are reserved while the cards are drawn and interpreted. The
+    reading is stored after the response is sent.
+
+    Args:
+        body: Question and spread type
+        user: Authenticated caller
+        orchestrator: Reading pipeline
+        entitlements: Cached tiers, to route the LLM calls
+
+    Returns:
+        dict: The reading with its cards and interpretation
+    """
+    entitlement = await entitlements.get(user.id)
+    with routing_tier(entitlement.tier):
+        reading = await orchestrator.create(user.id, body.question, body.spread_type)
+    return reading.to_response()
+
+
+@router.post("/reading/{reading_id}/chat")
+async def chat(
+    reading_id: str,
+    body: ChatRequest,
+    user: CurrentUserDep,
+    service: ConversationServiceDep,
+    entitlements: EntitlementCacheDep,
+) -> dict[str, Any]:
+    """Continue the conversation about a reading.
+
+    Args:
+        reading_id: Reading being discussed
+        body: The seeker's message
+        user: Authenticated caller
+        service: Chat service
+        entitlements: Cached tiers, to route the LLM call
+
+    Returns:
+        dict: The assistant's reply
+    """
+    entitlement = await entitlements.get(user.id)
+    with routing_tier(entitlement.tier):
+        reply = await service.reply(user.id, reading_id, body.message)
+    return reply.to_response()
+
+
+@router.get("/readings/search")
+async def search_readings(
+    user: CurrentUserDep,
+    store: ReadingHistoryStoreDep,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(default=20, ge=1, le=50),
+    cursor: str | None = Query(default=None, max_length=500),
+) -> dict[str, Any]:
+    """Search the caller's readings by question and interpretation.
+
+    Supports web-search syntax: quoted phrases, ``or`` and ``-word``.
+
+    Args:
+        user: Authenticated caller
+        store: Reading history store
+        q: Search query
+        limit: Page size
+        cursor: ``next_cursor`` from the previous page
+
+    Returns:
+        dict: Best matches first with highlighted snippets, and the cursor
+        for the next page (null on the last page)
+    """
+    after = SearchCursor.decode(cursor) if cursor else None
+    page = await store.search(user.id, q, limit, after)
+    return page.to_dict()
+
+
+@router.get("/readings/export")
+async def export_readings(
+    user: CurrentUserDep,
+    store: ReadingHistoryStoreDep,
+    settings: SettingsDep,
+    export_format: ExportFormat = Query(default="ndjson", alias="format"),
+    after: str | None = Query(default=None, max_length=500),
+) -> StreamingResponse:
+    """Download every reading and chat message the caller has.
+
+    The body is streamed as it is read, a chunk of readings at a time. To
+    resume an interrupted download, pass the ``cursor`` of the last
+    complete reading as ``after``.
+
+    Args:
+        user: Authenticated caller
+        store: Reading history store
+        settings: Application configuration
+        export_format: ``ndjson`` (one reading per line) or ``csv``
+        after: Resume after this reading
+
+    Returns:
+        StreamingResponse: The export as an attachment
+    """
+    cursor = ExportCursor.decode(after) if after else None
+    lines = export_lines(
+        store, user.id, export_format, cursor, settings.export_chunk_size
+    )
+    return StreamingResponse(
+        lines,
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="alembic-readings.{export_format}"'
+            ),
+            "Cache-Control": "no-store",
+        },
+    )
+
+
+@router.get("/reading/stats")
+async def reading_stats(
+    user: CurrentUserDep, store: ReadingStatsStoreDep, deck: DeckDep
+) -> dict[str, Any]:
+    """Summarize the caller's reading history.
+
+    Totals are maintained as readings are written, so this is one lookup
+    however many readings the user has.
+
+    Args:
+        user: Authenticated caller
+        store: Reading statistics store
+        deck: Shared tarot deck, to name the cards
+
+    Returns:
+        dict: Most-drawn cards, reversal ratio, suit balance and spreads
+    """
+    stats = await store.get(user.id)
+    return stats.summary(deck)
+
+
+@router.get("/reading/daily")
+async def daily_reading(service: DailyServiceDep) -> dict[str, Any]:
+    """Draw a daily guidance card.
+
+    Interpretations for all 156 card/orientation pairs are pre-generated,
+    so this is normally a cache lookup.
+
+    Args:
+        service: Daily reading service
+
+    Returns:
+        dict: The card and its interpretation
+    """
+    card, entry = await service.draw()
+    (drawn,) = serialize_cards(SpreadLibrary.one_card(), [card])
+    generated_at = datetime.fromtimestamp(entry.generated_at, tz=timezone.utc)
+    return {
+        "question": DAILY_QUESTION,
+        "spread_type": "single",
+        "cards": [drawn],
+        "interpretation": entry.interpretation,
+        "generated_at": generated_at.isoformat().replace("+00:00", "Z"),
+    }
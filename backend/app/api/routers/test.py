@@ -4,10 +4,37 @@ These endpoints are disabled in production and help verify
 that core systems (LLM, deck, etc.) are working.
 """
 
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from functools import lru_cache
 from typing import Any
 
+import orjson
 import structlog
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import DeckDep, JobPoolDep, SettingsDep
+from app.api.middleware.rate_limit import RateCharge, too_many_requests
+from app.api.responses import StaticPayload
+from app.core import logs
+from app.core.llm.cache import InterpretationCache
+from app.core.llm.client import LLMFactory
+from app.core.llm.profiles import SLOTracker
+from app.core.llm.prompts import PromptTemplates
+from app.core.llm.router import RoutingStats
+from app.core.services.batch import BatchJob, ReadingBatch
+from app.core.services.generation import stream_fan_out
+from app.core.services.jobs import Job
+from app.core.services.reading import resolve_spread, serialize_cards
+from app.core.tarot.spreads import SpreadLibrary, SpreadRegistry
+from app.schemas.reading import (
+    BatchReadingRequest,
+    FollowUpRequest,
+    ReadingJobRequest,
+    SpreadType,
+)
 
 logger = structlog.get_logger(__name__)
 
@@ -55,30 +82,32 @@ async def test_deck() -> dict[str, Any]:
         ) from e
 
 
+@lru_cache(maxsize=1)
+def _spread_catalog(registry: SpreadRegistry) -> StaticPayload:
+    """Serialize the spread listing once per registry."""
+    return StaticPayload.from_content(
+        {
+            "status": "success",
+            "total_spreads": len(registry),
+            "spreads": list(registry.summaries),
+        }
+    )
+
+
 @router.get("/spreads")
-async def test_spreads() -> dict[str, Any]:
+async def test_spreads(request: Request) -> Response:
     """List all available spreads.
 
-    Returns:
-        dict: Available spreads with details
-    """
-    from app.core.tarot.spreads import SpreadLibrary
+    Served from a pre-serialized payload with an ETag, so repeat requests
+    from a client that already has it get ``304 Not Modified``.
 
-    spreads = SpreadLibrary.get_all_spreads()
+    Args:
+        request: Incoming request
 
-    return {
-        "status": "success",
-        "total_spreads": len(spreads),
-        "spreads": [
-            {
-                "id": spread.spread_id,
-                "name": spread.name,
-                "card_count": spread.card_count,
-                "description": spread.description,
-            }
-            for spread in spreads.values()
-        ],
-    }
+    Returns:
+        Response: Available spreads with details
+    """
+    return _spread_catalog(SpreadLibrary.registry()).to_response(request)
 
 
 @router.post("/llm")
@@ -125,6 +154,39 @@ async def test_llm(prompt: str = "What is the meaning of life?") -> dict[str, An
         ) from e
 
 
+@router.get("/llm/slo")
+async def test_llm_slo() -> dict[str, Any]:
+    """Report model latency against each generation profile's target.
+
+    Returns:
+        dict: Per-profile request, breach and latency figures, worst first
+    """
+    return {"profiles": SLOTracker.get_instance().snapshot()}
+
+
+@router.get("/llm/routing")
+async def test_llm_routing(limit: int = 100) -> dict[str, Any]:
+    """Report per-model latency and recent routing decisions.
+
+    Args:
+        limit: Number of decisions returned, newest first
+
+    Returns:
+        dict: Model averages and decisions
+    """
+    return RoutingStats.get_instance().snapshot(limit)
+
+
+@router.get("/logging")
+async def test_logging() -> dict[str, Any]:
+    """Report logging pipeline throughput, drops and render cost.
+
+    Returns:
+        dict: Queue, sampling and rendering figures for this process
+    """
+    return logs.stats()
+
+
 @router.get("/supabase")
 async def test_supabase() -> dict[str, Any]:
     """Test Supabase connection.
@@ -186,6 +248,7 @@ async def test_reading(
     """
     try:
         from app.config import get_settings
+        from app.core.llm.cache import InterpretationCache
         from app.core.llm.client import LLMFactory
         from app.core.llm.prompts import PromptTemplates
         from app.core.tarot.deck import TarotDeck
@@ -201,36 +264,26 @@ async def test_reading(
         spread = SpreadLibrary.three_card()
 
         # Prepare LLM prompt
-        past_card = cards[0]
-        present_card = cards[1]
-        future_card = cards[2]
-
-        prompt = PromptTemplates.get_three_card_prompt(
-            question=question,
-            past_card=past_card,
-            present_card=present_card,
-            future_card=future_card,
-            past_reversed=past_card.get("is_reversed", False),
-            present_reversed=present_card.get("is_reversed", False),
-            future_reversed=future_card.get("is_reversed", False),
-        )
+        prompt = PromptTemplates.get_spread_prompt(question, spread, cards)
 
         # Get LLM interpretation
         client = LLMFactory.create(
             use_local=settings.use_local_llm,
             ollama_base_url=settings.ollama_base_url,
             grok_api_key=settings.xai_api_key,
+            cache=InterpretationCache.get_instance(settings),
         )
 
         interpretation = await client.generate(
             system_prompt=PromptTemplates.SYSTEM_PROMPT,
             user_prompt=prompt,
+            profile=spread.profile,
         )
 
         logger.info(
             "reading_test_success",
             question=question,
-            cards=[c["name"] for c in cards],
+            cards=[c.name for c in cards],
         )
 
         return {
@@ -244,12 +297,12 @@ async def test_reading(
             },
             "cards": [
                 {
-                    "position": i,
-                    "name": card["name"],
-                    "archetype": card.get("archetype", ""),
-                    "reversed": card.get("is_reversed", False),
+                    "position": card.position,
+                    "name": card.name,
+                    "archetype": card.card_ref.get("archetype", ""),
+                    "reversed": card.reversed,
                 }
-                for i, card in enumerate(cards)
+                for card in cards
             ],
             "interpretation": interpretation,
         }
@@ -260,3 +313,270 @@ async def test_reading(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Reading error: {str(e)}",
         ) from e
+
+
+@router.post("/reading/batch")
+async def test_reading_batch(
+    request: Request, body: BatchReadingRequest, settings: SettingsDep, deck: DeckDep
+) -> Response:
+    """Generate many readings in one request.
+
+    Cards for every item are drawn up front, then generation fans out
+    across all configured providers with ``concurrency`` calls in flight
+    per provider. Results stream back as NDJSON, one line per item in
+    completion order; a failed item is an error line and the batch goes on.
+
+    Each item counts as one request against the reading rate limit.
+
+    Args:
+        request: Incoming request
+        body: Batch items and per-provider concurrency
+        settings: Application configuration
+        deck: Shared tarot deck
+
+    Returns:
+        Response: ``application/x-ndjson`` result lines, or 429 if the
+        batch is over the rate limit
+    """
+    # The middleware charged the request itself; charge the other items
+    charge: RateCharge | None = getattr(request.state, "rate_limit", None)
+    if charge is not None and len(body.items) > 1:
+        decision = charge.hit(len(body.items) - 1)
+        if not decision.allowed:
+            logger.warning("batch_rate_limited", items=len(body.items))
+            return too_many_requests(decision)
+
+    try:
+        providers = LLMFactory.create_providers(
+            use_local=settings.use_local_llm,
+            ollama_base_url=settings.ollama_base_url,
+            grok_api_key=settings.xai_api_key,
+            cache=InterpretationCache.get_instance(settings),
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e)
+        ) from e
+
+    batch = ReadingBatch(deck, providers, concurrency=body.concurrency)
+    jobs = [
+        BatchJob(
+            question=item.question,
+            spread_type=item.spread_type,
+            job_id=item.id,
+            strategy=item.strategy,
+        )
+        for item in body.items
+    ]
+
+    async def lines() -> AsyncIterator[bytes]:
+        try:
+            async for result in batch.run(jobs):
+                yield orjson.dumps(result.to_dict()) + b"\n"
+        finally:
+            # The clients are per batch; close their connection pools
+            for provider in providers.values():
+                close = getattr(provider, "close", None)
+                if close is not None:
+                    await close()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.post("/reading/stream")
+async def test_reading_stream(
+    settings: SettingsDep,
+    deck: DeckDep,
+    question: str = "What do I need to know right now?",
+    spread_type: SpreadType = "celtic_cross",
+) -> StreamingResponse:
+    """Stream a fan-out reading position by position.
+
+    Every position is interpreted concurrently; lines are sent in position
+    order as soon as they are ready, followed by the synthesis.
+
+    Args:
+        settings: Application configuration
+        deck: Shared tarot deck
+        question: The querent's question
+        spread_type: Spread to read
+
+    Returns:
+        StreamingResponse: NDJSON ``cards``, ``position`` and ``synthesis``
+        lines
+    """
+    spread = resolve_spread(spread_type)
+    cards = deck.draw_with_reversals(spread.card_count)
+    client = LLMFactory.get_instance(
+        use_local=settings.use_local_llm,
+        ollama_base_url=settings.ollama_base_url,
+        grok_api_key=settings.xai_api_key,
+        cache=InterpretationCache.get_instance(settings),
+        routing_rules=settings.llm_routing_rules,
+    )
+
+    async def lines() -> AsyncIterator[bytes]:
+        yield (
+            orjson.dumps({"type": "cards", "cards": serialize_cards(spread, cards)})
+            + b"\n"
+        )
+        async for part in stream_fan_out(client, question, spread, cards):
+            yield orjson.dumps(part.to_dict()) + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.post("/reading/follow-up")
+async def test_reading_follow_up(
+    request: FollowUpRequest, settings: SettingsDep
+) -> dict[str, Any]:
+    """Answer a follow-up question about an earlier reading.
+
+    With Ollama, turns after the first in a session reuse the model's
+    context, so only the new question is evaluated.
+
+    Args:
+        request: The earlier reading and the new question
+        settings: Application configuration
+
+    Returns:
+        dict: The response and how long it took
+    """
+    client = LLMFactory.get_instance(
+        use_local=settings.use_local_llm,
+        ollama_base_url=settings.ollama_base_url,
+        grok_api_key=settings.xai_api_key,
+        cache=InterpretationCache.get_instance(settings),
+        routing_rules=settings.llm_routing_rules,
+    )
+    started = time.perf_counter()
+    response = await client.follow_up(
+        request.session_id,
+        PromptTemplates.SYSTEM_PROMPT,
+        PromptTemplates.get_follow_up_prompt(
+            request.original_question,
+            request.previous_cards,
+            request.previous_interpretation,
+            request.question,
+        ),
+        PromptTemplates.get_follow_up_turn(request.question),
+    )
+    return {
+        "session_id": request.session_id,
+        "response": response,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+async def _get_job(pool: JobPoolDep, job_id: str) -> Job:
+    job = await asyncio.to_thread(pool.store.get, job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Job not found"
+        )
+    return job
+
+
+@router.post("/reading/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def submit_reading_job(
+    body: ReadingJobRequest, pool: JobPoolDep, response: Response
+) -> dict[str, Any]:
+    """Queue a reading instead of holding the connection open.
+
+    Args:
+        body: Question, spread type and priority (higher runs first)
+        pool: Reading job pool
+        response: Outgoing response, for the Location header
+
+    Returns:
+        dict: The queued job
+    """
+    job = await pool.submit(
+        {"question": body.question, "spread_type": body.spread_type},
+        priority=body.priority,
+    )
+    response.headers["Location"] = f"/api/test/reading/jobs/{job.id}"
+    return job.to_dict()
+
+
+@router.get("/reading/jobs/{job_id}")
+async def get_reading_job(job_id: str, pool: JobPoolDep) -> dict[str, Any]:
+    """Poll a reading job.
+
+    Args:
+        job_id: Job id
+        pool: Reading job pool
+
+    Returns:
+        dict: Job status, timings and, once finished, result or error
+    """
+    return (await _get_job(pool, job_id)).to_dict()
+
+
+@router.delete("/reading/jobs/{job_id}")
+async def cancel_reading_job(job_id: str, pool: JobPoolDep) -> dict[str, Any]:
+    """Cancel a queued or running reading job.
+
+    A running job stops at its worker's next heartbeat.
+
+    Args:
+        job_id: Job id
+        pool: Reading job pool
+
+    Returns:
+        dict: The job after cancellation
+
+    Raises:
+        HTTPException: 409 if the job already finished
+    """
+    await _get_job(pool, job_id)
+    if not await asyncio.to_thread(pool.store.cancel, job_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Job already finished"
+        )
+    return (await _get_job(pool, job_id)).to_dict()
+
+
+# Server-sent event stream tuning
+_SSE_POLL_SECONDS = 0.5
+_SSE_KEEPALIVE_SECONDS = 15.0
+
+
+@router.get("/reading/jobs/{job_id}/events")
+async def stream_reading_job(job_id: str, pool: JobPoolDep) -> StreamingResponse:
+    """Follow a reading job over server-sent events.
+
+    Sends a ``job`` event whenever the status changes and closes the
+    stream once the job has finished.
+
+    Args:
+        job_id: Job id
+        pool: Reading job pool
+
+    Returns:
+        StreamingResponse: ``text/event-stream`` of job snapshots
+    """
+    job = await _get_job(pool, job_id)
+
+    async def events() -> AsyncIterator[bytes]:
+        current: Job | None = job
+        last_status = None
+        last_sent = time.monotonic()
+        while current is not None:
+            if current.status != last_status:
+                last_status = current.status
+                last_sent = time.monotonic()
+                yield b"event: job\ndata: " + orjson.dumps(current.to_dict()) + b"\n\n"
+                if current.status.is_terminal:
+                    return
+            elif time.monotonic() - last_sent > _SSE_KEEPALIVE_SECONDS:
+                last_sent = time.monotonic()
+                yield b": keepalive\n\n"
+            await asyncio.sleep(_SSE_POLL_SECONDS)
+            current = await asyncio.to_thread(pool.store.get, job_id)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
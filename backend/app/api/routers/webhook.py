@@ -0,0 +1,46 @@
+"""Webhook endpoints.
+
+Receives Stripe billing events. Deliveries are verified and recorded,
+then acknowledged straight away; the billing updates they cause are
+applied in the background.
+"""
+
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, Request, status
+
+from app.api.deps import SettingsDep, WebhookProcessorDep
+from app.core.services.webhooks import verify_event
+
+router = APIRouter(prefix="/api/webhook", tags=["webhook"])
+
+
+@router.post("/stripe")
+async def stripe_webhook(
+    request: Request, settings: SettingsDep, processor: WebhookProcessorDep
+) -> dict[str, Any]:
+    """Accept a Stripe event.
+
+    Args:
+        request: Incoming request, for the raw body and signature
+        settings: Application configuration
+        processor: Stripe webhook processor
+
+    Returns:
+        dict: Acknowledgement, flagging redelivered events
+
+    Raises:
+        HTTPException: 503 if no webhook secret is configured
+    """
+    if not settings.stripe_webhook_secret:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Stripe webhooks are not configured",
+        )
+    event = verify_event(
+        await request.body(),
+        request.headers.get("stripe-signature"),
+        settings.stripe_webhook_secret,
+    )
+    is_new = await processor.ingest(event)
+    return {"received": True, "duplicate": not is_new}
@@ -4,6 +4,8 @@ Configuration is loaded from environment variables with sensible defaults.
 Sensitive values (API keys) have no defaults and must be provided.
 """
 
+from typing import Any
+
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -25,11 +27,40 @@ class Settings(BaseSettings):
     supabase_url: str
     supabase_key: str
     supabase_service_key: str
+    # Legacy shared JWT secret; tokens signed with the project's
+    # asymmetric keys are verified against its JWKS without it
+    supabase_jwt_secret: str | None = None
+
+    # Access token verification
+    auth_jwks_refresh_seconds: float = Field(default=600.0, gt=0)
+    auth_token_cache_size: int = Field(default=10_000, ge=1)
+    auth_leeway_seconds: float = Field(default=30.0, ge=0)
 
     # LLM
     xai_api_key: str | None = None
     use_local_llm: bool = False
     ollama_base_url: str = "http://localhost:11434"
+    # Model routing rules (JSON list); empty sends everything to one client
+    llm_routing_rules: list[dict[str, Any]] = []
+
+    # Interpretation cache - the shared tier is enabled by setting a path
+    llm_cache_path: str | None = None
+    llm_cache_max_bytes: int = 64 * 1024 * 1024
+    llm_cache_ttl_seconds: int = 7 * 24 * 3600
+    llm_cache_local_entries: int = 512
+
+    # Daily one-card readings, pre-generated off-peak
+    daily_pregen_enabled: bool = False
+    daily_pregen_hour_utc: int = Field(default=4, ge=0, le=23)
+    daily_pregen_concurrency: int = Field(default=2, ge=1)
+    daily_refresh_hours: float = 24.0
+
+    # Reading jobs - durable local queue and in-process workers
+    job_queue_path: str = "data/jobs.sqlite3"
+    job_workers: int = Field(default=2, ge=0)
+    job_timeout_seconds: float = 300.0
+    job_retention_hours: float = 24.0
+    job_purge_interval_seconds: float = 3600.0
 
     # Stripe
     stripe_secret_key: str | None = None
@@ -37,12 +68,50 @@ class Settings(BaseSettings):
     stripe_price_seeker: str | None = None
     stripe_price_initiate: str | None = None
     stripe_price_credits: str | None = None
+    # Webhook events applied per database call, and how long to wait
+    # for more after the first
+    stripe_webhook_batch_size: int = Field(default=50, ge=1)
+    stripe_webhook_batch_window_seconds: float = Field(default=0.5, ge=0)
 
     # CORS - stored as string in env, parsed to list
     cors_origins: list[str] = Field(default=["http://localhost:3000"])
 
+    # Rate limits (requests per minute, per user and per IP)
+    rate_limit_enabled: bool = True
+    rate_limit_reading_per_minute: int = 10
+    rate_limit_chat_per_minute: int = 20
+    rate_limit_catalog_per_minute: int = 120
+    rate_limit_default_per_minute: int = 60
+    rate_limit_trust_forwarded: bool = False
+
+    # Readings fetched per query when streaming a history export
+    export_chunk_size: int = Field(default=200, ge=1, le=1000)
+
+    # Users' tier and credit balance kept in memory
+    entitlement_cache_size: int = Field(default=10_000, ge=1)
+    entitlement_ttl_seconds: float = Field(default=60.0, gt=0)
+
+    # Active chat conversations kept in memory, dropped after this idle time
+    conversation_cache_size: int = Field(default=1024, ge=1)
+    conversation_idle_seconds: float = Field(default=1800.0, gt=0)
+    # Most recent messages included in a chat prompt
+    conversation_history_messages: int = Field(default=20, ge=0)
+
+    # Responses smaller than this are not compressed
+    compression_min_bytes: int = 1024
+
+    # Diagnostics: per-request profiling, loop lag, tracemalloc endpoints
+    diagnostics_enabled: bool = False
+    diagnostics_profile_dir: str = "data/profiles"
+    diagnostics_lag_threshold_ms: float = Field(default=100.0, gt=0)
+
     # Logging
     log_level: str = "INFO"
+    log_json: bool = True
+    log_queue_size: int = Field(default=10_000, ge=1)
+    # Hot events: share of occurrences kept, and most kept per second
+    log_sample_rates: dict[str, float] = {"cards_drawn": 0.1}
+    log_max_per_second: dict[str, float] = {"cards_drawn": 10.0}
 
     @field_validator("cors_origins", mode="before")
     @classmethod
@@ -0,0 +1,286 @@
+"""Authentication of Supabase access tokens.
+
+``TokenVerifier`` checks tokens locally, so authenticating a request
+needs no network call. Tokens signed with the project's asymmetric keys
+are checked against its JWKS. The key set is fetched at startup,
+refreshed in the background to pick up rotations, and re-fetched early
+when a token names a key id it hasn't seen. Tokens signed with the legacy
+shared secret (HS256) are checked against ``SUPABASE_JWT_SECRET``.
+
+Claims of verified tokens are kept in a small LRU until the token
+expires, so a repeat request costs one dict lookup. With no local key
+available at all, verification falls back to the Supabase auth API.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+import jwt
+import structlog
+
+from app.config import Settings
+from app.core.database import get_service_client
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class AuthenticatedUser:
+    """The user behind a verified access token."""
+
+    id: str
+    email: str | None = None
+
+
+class AuthenticationError(Exception):
+    """Raised when a token can't be verified."""
+
+
+async def verify_with_supabase(token: str) -> AuthenticatedUser:
+    """Verify an access token with the Supabase auth API.
+
+    Args:
+        token: Supabase JWT from the Authorization header
+
+    Returns:
+        AuthenticatedUser: The token's user
+
+    Raises:
+        AuthenticationError: If Supabase rejects the token
+    """
+    client = get_service_client()
+    try:
+        response = await asyncio.to_thread(client.auth.get_user, token)
+    except Exception as e:
+        logger.info("token_rejected", error=str(e))
+        raise AuthenticationError(str(e)) from e
+
+    user = getattr(response, "user", None)
+    if user is None:
+        msg = "Token has no user"
+        raise AuthenticationError(msg)
+    return AuthenticatedUser(id=str(user.id), email=getattr(user, "email", None))
+
+
+# Algorithms accepted from the JWKS; ``none`` and HMAC never are
+_ASYMMETRIC_ALGORITHMS = frozenset({"RS256", "ES256", "EdDSA"})
+
+# Shortest gap between key set fetches triggered by unknown key ids, so a
+# stream of forged tokens can't hammer the JWKS endpoint
+_MIN_REFRESH_INTERVAL = 30.0
+
+
+class TokenVerifier:
+    """Verifies Supabase access tokens without calling Supabase."""
+
+    _instance: TokenVerifier | None = None
+
+    def __init__(
+        self,
+        issuer: str,
+        jwks_url: str | None = None,
+        jwt_secret: str | None = None,
+        audience: str = "authenticated",
+        leeway: float = 30.0,
+        refresh_seconds: float = 600.0,
+        cache_size: int = 10_000,
+    ) -> None:
+        """Initialize the verifier.
+
+        Args:
+            issuer: Expected ``iss`` claim, ``<SUPABASE_URL>/auth/v1``
+            jwks_url: Project's JWKS endpoint, for asymmetric keys
+            jwt_secret: Legacy shared secret, for HS256 tokens
+            audience: Expected ``aud`` claim
+            leeway: Clock skew allowed when checking ``exp``, in seconds
+            refresh_seconds: Interval between background key set fetches
+            cache_size: Most verified tokens kept
+        """
+        self.issuer = issuer
+        self.jwks_url = jwks_url
+        self.jwt_secret = jwt_secret
+        self.audience = audience
+        self.leeway = leeway
+        self.refresh_seconds = refresh_seconds
+        self.cache_size = cache_size
+        self._keys: dict[str, jwt.PyJWK] = {}
+        self._verified: OrderedDict[str, tuple[AuthenticatedUser, float]] = (
+            OrderedDict()
+        )
+        self._refresh_lock = asyncio.Lock()
+        self._last_refresh = float("-inf")
+        self._task: asyncio.Task[None] | None = None
+
+    def load_keys(self, jwks: Mapping[str, Any]) -> int:
+        """Replace the signing keys with a JWKS document's.
+
+        Args:
+            jwks: ``{"keys": [...]}`` as served by the JWKS endpoint
+
+        Returns:
+            int: Number of usable keys
+        """
+        keys = {}
+        for data in jwks.get("keys") or []:
+            try:
+                key = jwt.PyJWK.from_dict(dict(data))
+            except jwt.PyJWTError as e:
+                logger.warning("jwks_key_skipped", kid=data.get("kid"), error=str(e))
+                continue
+            if key.key_id and key.algorithm_name in _ASYMMETRIC_ALGORITHMS:
+                keys[key.key_id] = key
+        self._keys = keys
+        return len(keys)
+
+    async def refresh_keys(self, force: bool = False) -> None:
+        """Fetch the key set, at most once per ``_MIN_REFRESH_INTERVAL``.
+
+        Args:
+            force: Fetch even if the last fetch was recent
+        """
+        if self.jwks_url is None:
+            return
+        async with self._refresh_lock:
+            if (
+                not force
+                and time.monotonic() - self._last_refresh < _MIN_REFRESH_INTERVAL
+            ):
+                return
+            self._last_refresh = time.monotonic()
+            try:
+                async with httpx.AsyncClient(timeout=5.0) as client:
+                    response = await client.get(self.jwks_url)
+                    response.raise_for_status()
+                    count = self.load_keys(response.json())
+            except (httpx.HTTPError, ValueError) as e:
+                # Keep verifying with the keys already held
+                logger.warning("jwks_refresh_failed", error=str(e))
+                return
+            logger.info("jwks_refreshed", keys=count)
+
+    def start(self) -> None:
+        """Start refreshing the key set in the background."""
+        if self._task is None and self.jwks_url is not None:
+            self._task = asyncio.create_task(self._rotate(), name="jwks_refresh")
+
+    async def stop(self) -> None:
+        """Stop the background refresh."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _rotate(self) -> None:
+        while True:
+            await self.refresh_keys(force=True)
+            await asyncio.sleep(self.refresh_seconds)
+
+    def cached(self, token: str) -> AuthenticatedUser | None:
+        """User of an already-verified token that hasn't expired.
+
+        Args:
+            token: Bearer token
+
+        Returns:
+            AuthenticatedUser | None: The user, or None if not cached
+        """
+        entry = self._verified.get(token)
+        if entry is None:
+            return None
+        user, expires_at = entry
+        if expires_at <= time.time():
+            del self._verified[token]
+            return None
+        self._verified.move_to_end(token)
+        return user
+
+    async def verify(self, token: str) -> AuthenticatedUser:
+        """Verify a token and return its user.
+
+        Args:
+            token: Supabase JWT from the Authorization header
+
+        Returns:
+            AuthenticatedUser: The token's user
+
+        Raises:
+            AuthenticationError: If the token is invalid or expired
+        """
+        user = self.cached(token)
+        if user is not None:
+            return user
+        if not self._keys and not self.jwt_secret:
+            await self.refresh_keys()
+            if not self._keys:
+                return await verify_with_supabase(token)
+
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.PyJWTError as e:
+            raise AuthenticationError(str(e)) from e
+        algorithm = header.get("alg")
+        if algorithm == "HS256" and self.jwt_secret:
+            key: Any = self.jwt_secret
+        elif algorithm in _ASYMMETRIC_ALGORITHMS:
+            kid = header.get("kid")
+            signing_key = self._keys.get(kid or "")
+            if signing_key is None:
+                # Possibly a key rotated in since the last fetch
+                await self.refresh_keys()
+                signing_key = self._keys.get(kid or "")
+            if signing_key is None:
+                msg = f"Unknown signing key: {kid}"
+                raise AuthenticationError(msg)
+            key = signing_key.key
+        else:
+            msg = f"Unsupported token algorithm: {algorithm}"
+            raise AuthenticationError(msg)
+
+        try:
+            claims = jwt.decode(
+                token,
+                key,
+                algorithms=[algorithm],
+                audience=self.audience,
+                issuer=self.issuer,
+                leeway=self.leeway,
+                options={"require": ["exp", "sub"]},
+            )
+        except jwt.PyJWTError as e:
+            logger.info("token_rejected", error=str(e))
+            raise AuthenticationError(str(e)) from e
+
+        user = AuthenticatedUser(id=str(claims["sub"]), email=claims.get("email"))
+        self._verified[token] = (user, float(claims["exp"]))
+        if len(self._verified) > self.cache_size:
+            self._verified.popitem(last=False)
+        return user
+
+    @classmethod
+    def get_instance(cls, settings: Settings) -> TokenVerifier:
+        """Get or create the process-wide verifier.
+
+        Args:
+            settings: Application configuration
+
+        Returns:
+            TokenVerifier: Singleton verifier
+        """
+        if cls._instance is None:
+            auth_url = f"{settings.supabase_url.rstrip('/')}/auth/v1"
+            cls._instance = cls(
+                issuer=auth_url,
+                jwks_url=f"{auth_url}/.well-known/jwks.json",
+                jwt_secret=settings.supabase_jwt_secret,
+                leeway=settings.auth_leeway_seconds,
+                refresh_seconds=settings.auth_jwks_refresh_seconds,
+                cache_size=settings.auth_token_cache_size,
+            )
+        return cls._instance
@@ -0,0 +1,26 @@
+"""Supabase client access.
+
+The backend talks to Supabase with the service key and enforces ownership
+itself, so one client is shared per process.
+"""
+
+from functools import lru_cache
+from typing import Any
+
+from app.config import get_settings
+
+
+@lru_cache(maxsize=1)
+def get_service_client() -> Any:
+    """Get the process-wide Supabase client.
+
+    The client is synchronous; call it from a worker thread
+    (``asyncio.to_thread``) inside request handlers.
+
+    Returns:
+        Client: Supabase client authenticated with the service key
+    """
+    from supabase import create_client
+
+    settings = get_settings()
+    return create_client(settings.supabase_url, settings.supabase_service_key)
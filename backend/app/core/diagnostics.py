@@ -0,0 +1,227 @@
+"""Runtime diagnostics: event-loop lag and memory growth.
+
+Both are opt-in through ``DIAGNOSTICS_ENABLED`` and meant for finding
+problems, not for routine production use.
+
+``LoopLagMonitor`` measures how late the event loop wakes up from a short
+sleep. A watchdog thread checks that the loop keeps ticking; when one
+callback holds the loop past the threshold, for example a synchronous
+Supabase call inside an ``async def``, it logs the loop thread's stack
+while the callback is still running, so the log shows the blocking line.
+
+``MemoryTracker`` wraps ``tracemalloc``: start it, exercise the app, then
+diff against the baseline to see which lines allocated the growth.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+import tracemalloc
+from contextlib import suppress
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+if TYPE_CHECKING:
+    from app.config import Settings
+
+logger = structlog.get_logger(__name__)
+
+# Innermost frames kept when logging a blocked loop's stack.
+_STACK_FRAMES = 30
+
+
+class LoopLagMonitor:
+    """Detects event-loop stalls and records where they happen."""
+
+    _instance: LoopLagMonitor | None = None
+
+    def __init__(self, threshold_seconds: float = 0.1) -> None:
+        """Initialize the monitor.
+
+        Args:
+            threshold_seconds: Stalls longer than this are logged
+        """
+        self.threshold_seconds = threshold_seconds
+        self.interval_seconds = threshold_seconds / 2
+        self.ticks = 0
+        self.stalls = 0
+        self.max_lag_seconds = 0.0
+        self.last_stack: list[str] = []
+        self._last_tick = time.monotonic()
+        self._reported = False
+        self._loop_thread: int | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._stop = threading.Event()
+        self._watchdog: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start measuring on the running loop."""
+        if self._task is not None:
+            return
+        self._loop_thread = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._run(), name="loop_lag_monitor")
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop_lag_watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Stop the measuring task and the watchdog thread."""
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join)
+            self._watchdog = None
+
+    async def _run(self) -> None:
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval_seconds)
+            now = time.monotonic()
+            self._last_tick = now
+            self._reported = False
+            self.ticks += 1
+            lag = max(0.0, now - started - self.interval_seconds)
+            self.max_lag_seconds = max(self.max_lag_seconds, lag)
+            if lag > self.threshold_seconds:
+                self.stalls += 1
+                logger.warning("event_loop_lag", lag_ms=round(lag * 1000, 1))
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            blocked = time.monotonic() - self._last_tick
+            if blocked <= self.threshold_seconds + self.interval_seconds:
+                continue
+            if self._reported or self._loop_thread is None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            self._reported = True
+            self.last_stack = traceback.format_stack(frame)[-_STACK_FRAMES:]
+            logger.warning(
+                "event_loop_blocked",
+                blocked_ms=round(blocked * 1000, 1),
+                stack="".join(self.last_stack),
+            )
+
+    def snapshot(self) -> dict[str, Any]:
+        """Lag figures since the monitor started.
+
+        Returns:
+            dict: Ticks, stalls, worst lag and the last blocked stack
+        """
+        return {
+            "running": self._task is not None,
+            "threshold_ms": self.threshold_seconds * 1000,
+            "ticks": self.ticks,
+            "stalls": self.stalls,
+            "max_lag_ms": round(self.max_lag_seconds * 1000, 1),
+            "last_blocked_stack": self.last_stack,
+        }
+
+    @classmethod
+    def get_instance(cls, settings: Settings) -> LoopLagMonitor:
+        """Get or create the process-wide monitor.
+
+        Args:
+            settings: Application configuration
+
+        Returns:
+            LoopLagMonitor: Singleton monitor instance
+        """
+        if cls._instance is None:
+            cls._instance = cls(settings.diagnostics_lag_threshold_ms / 1000)
+        return cls._instance
+
+
+class MemoryTracker:
+    """Diffs ``tracemalloc`` snapshots against a baseline."""
+
+    _instance: MemoryTracker | None = None
+
+    def __init__(self) -> None:
+        """Initialize an idle tracker."""
+        self._baseline: tracemalloc.Snapshot | None = None
+
+    @property
+    def tracing(self) -> bool:
+        """Whether a baseline has been taken and tracing is on."""
+        return self._baseline is not None and tracemalloc.is_tracing()
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            )
+        )
+
+    def start(self, frames: int = 10) -> None:
+        """Start tracing allocations and take the baseline.
+
+        Tracing slows every allocation, so stop it when done.
+
+        Args:
+            frames: Stack frames recorded per allocation
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self._baseline = self._snapshot()
+
+    def diff(self, limit: int = 20) -> list[dict[str, Any]]:
+        """Largest allocation changes since the baseline.
+
+        Args:
+            limit: Number of source lines returned
+
+        Returns:
+            list: Source line, size change and block count change, largest first
+
+        Raises:
+            RuntimeError: If tracing has not been started
+        """
+        if not self.tracing:
+            msg = "Memory tracing is not running"
+            raise RuntimeError(msg)
+        assert self._baseline is not None
+        stats = self._snapshot().compare_to(self._baseline, "lineno")
+        return [
+            {
+                "location": str(stat.traceback[0]),
+                "size_diff_kb": round(stat.size_diff / 1024, 1),
+                "size_kb": round(stat.size / 1024, 1),
+                "count_diff": stat.count_diff,
+            }
+            for stat in stats[:limit]
+        ]
+
+    def stop(self) -> None:
+        """Stop tracing and drop the baseline."""
+        self._baseline = None
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @classmethod
+    def get_instance(cls) -> MemoryTracker:
+        """Get the process-wide tracker.
+
+        Returns:
+            MemoryTracker: Singleton tracker instance
+        """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
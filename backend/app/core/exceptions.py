@@ -0,0 +1,93 @@
+"""Exception hierarchy for Alembic domain errors.
+
+API routers let these propagate; handlers in ``app.main`` turn them into
+the JSON error format documented in ``docs/architecture/api-design.md``.
+"""
+
+
+class AlembicError(Exception):
+    """Base exception for all Alembic errors."""
+
+    status_code = 400
+
+    def __init__(self, message: str, code: str | None = None):
+        super().__init__(message)
+        self.message = message
+        self.code = code or "ALEMBIC_ERROR"
+
+
+# Domain Errors
+class TarotError(AlembicError):
+    """Tarot-related errors."""
+
+
+class InvalidSpreadError(TarotError):
+    """Raised for an unknown or invalid spread."""
+
+    def __init__(self, spread_id: str):
+        super().__init__(f"Unknown spread: {spread_id}", code="VALIDATION_ERROR")
+        self.spread_id = spread_id
+
+
+class InvalidCursorError(AlembicError):
+    """Raised when a pagination cursor can't be decoded."""
+
+    def __init__(self) -> None:
+        super().__init__("Invalid pagination cursor", code="VALIDATION_ERROR")
+
+
+# LLM Errors
+class LLMError(AlembicError):
+    """LLM-related errors."""
+
+    status_code = 503
+
+    def __init__(self, message: str, code: str = "LLM_ERROR"):
+        super().__init__(message, code=code)
+
+
+# User/Business Errors
+class UserError(AlembicError):
+    """User-related errors."""
+
+
+class InsufficientCreditsError(UserError):
+    """Raised when user has no credits for reading."""
+
+    status_code = 402
+
+    def __init__(self, required: int):
+        super().__init__(
+            f"Insufficient credits: {required} required",
+            code="INSUFFICIENT_CREDITS",
+        )
+        self.required = required
+
+
+class ReadingNotFoundError(UserError):
+    """Raised when a reading doesn't exist."""
+
+    status_code = 404
+
+    def __init__(self, reading_id: str):
+        super().__init__(f"Reading not found: {reading_id}", code="NOT_FOUND")
+        self.reading_id = reading_id
+
+
+class ReadingAccessDeniedError(UserError):
+    """Raised when a reading belongs to another user."""
+
+    status_code = 403
+
+    def __init__(self, reading_id: str):
+        super().__init__(
+            f"Reading belongs to another user: {reading_id}", code="FORBIDDEN"
+        )
+        self.reading_id = reading_id
+
+
+class WebhookSignatureError(AlembicError):
+    """Raised when a webhook delivery fails signature verification."""
+
+    def __init__(self, message: str):
+        super().__init__(message, code="INVALID_SIGNATURE")
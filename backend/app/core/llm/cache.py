@@ -0,0 +1,625 @@
+"""Interpretation cache for LLM completions.
+
+Two tiers sit behind ``LLMClient.generate``:
+
+1. An in-process LRU, private to one worker.
+2. A host-wide SQLite database in WAL mode, shared by every uvicorn worker
+   on the machine. It lives on disk, so it survives worker restarts and
+   deploys.
+
+Values are stored with a one-byte encoding tag and zlib-compressed when
+that makes them smaller. The shared tier is bounded by total encoded size
+and evicts least recently used entries first; triggers keep a running
+total of that size, so checking the bound doesn't scan the table.
+
+The shared database also holds named leases, so periodic work that every
+worker schedules, such as the daily pre-generation, runs in one of them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+from app.core.llm.client import LLMClient
+from app.core.llm.profiles import GenerationProfile
+
+if TYPE_CHECKING:
+    from app.config import Settings
+
+logger = structlog.get_logger(__name__)
+
+_RAW = b"\x00"
+_ZLIB = b"\x01"
+
+# Don't bother compressing values shorter than this.
+_COMPRESS_MIN_BYTES = 256
+
+# Reads refresh ``accessed_at`` at most this often, so hot keys don't turn
+# every cache hit into a write that contends across workers.
+_TOUCH_INTERVAL_SECONDS = 60.0
+
+
+def encode_value(text: str) -> bytes:
+    """Encode a cached completion compactly.
+
+    Args:
+        text: Completion text
+
+    Returns:
+        bytes: Tagged, possibly compressed, payload
+    """
+    raw = text.encode("utf-8")
+    if len(raw) >= _COMPRESS_MIN_BYTES:
+        compressed = zlib.compress(raw, 6)
+        if len(compressed) < len(raw):
+            return _ZLIB + compressed
+    return _RAW + raw
+
+
+def decode_value(payload: bytes) -> str:
+    """Decode a payload produced by ``encode_value``.
+
+    Args:
+        payload: Tagged payload
+
+    Returns:
+        str: Completion text
+
+    Raises:
+        ValueError: If the encoding tag is unknown
+    """
+    tag, body = payload[:1], payload[1:]
+    if tag == _ZLIB:
+        return zlib.decompress(body).decode("utf-8")
+    if tag == _RAW:
+        return body.decode("utf-8")
+    msg = f"Unknown cache value encoding: {tag!r}"
+    raise ValueError(msg)
+
+
+def cache_key(
+    provider: str,
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    variant: str = "",
+) -> str:
+    """Build a cache key for one completion request.
+
+    Args:
+        provider: Provider name (client class)
+        model: Model name
+        system_prompt: System prompt sent to the model
+        user_prompt: User prompt sent to the model
+        variant: Other output-changing parameters, e.g. the token cap
+
+    Returns:
+        str: Hex digest identifying the request
+    """
+    digest = hashlib.sha256()
+    for part in (provider, model, system_prompt, user_prompt):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    if variant:
+        digest.update(variant.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class SharedCacheStore:
+    """Size-bounded key/value store in a local SQLite database.
+
+    All methods are synchronous; ``InterpretationCache`` runs them in a
+    worker thread so the event loop never waits on disk.
+    """
+
+    def __init__(self, path: Path, max_bytes: int) -> None:
+        """Open (or create) the store.
+
+        Args:
+            path: SQLite database file, shared by all workers on the host
+            max_bytes: Upper bound on the total encoded size of values
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, isolation_level=None, check_same_thread=False, timeout=5.0
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS interpretations (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_interpretations_accessed_at "
+            "ON interpretations(accessed_at)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_interpretations_expires_at "
+            "ON interpretations(expires_at)"
+        )
+        self._create_size_counter()
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS leases (
+                name TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+
+    def _create_size_counter(self) -> None:
+        # Every change to ``interpretations`` updates the total in the same
+        # statement, whichever worker makes it
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_size ("
+                "id INTEGER PRIMARY KEY CHECK (id = 1), bytes INTEGER NOT NULL)"
+            )
+            self._conn.execute(
+                "INSERT OR IGNORE INTO cache_size (id, bytes) "
+                "SELECT 1, COALESCE(SUM(size), 0) FROM interpretations"
+            )
+            self._conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS interpretations_size_insert "
+                "AFTER INSERT ON interpretations BEGIN "
+                "UPDATE cache_size SET bytes = bytes + NEW.size WHERE id = 1; END"
+            )
+            self._conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS interpretations_size_update "
+                "AFTER UPDATE OF size ON interpretations BEGIN "
+                "UPDATE cache_size SET bytes = bytes + NEW.size - OLD.size "
+                "WHERE id = 1; END"
+            )
+            self._conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS interpretations_size_delete "
+                "AFTER DELETE ON interpretations BEGIN "
+                "UPDATE cache_size SET bytes = bytes - OLD.size WHERE id = 1; END"
+            )
+        except sqlite3.Error:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def _total_bytes(self) -> int:
+        (total,) = self._conn.execute(
+            "SELECT bytes FROM cache_size WHERE id = 1"
+        ).fetchone()
+        return int(total)
+
+    def get(self, key: str) -> str | None:
+        """Fetch a live entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            str | None: Cached text, or None on miss or expiry
+        """
+        entry = self.get_entry(key)
+        return None if entry is None else entry[0]
+
+    def get_entry(self, key: str) -> tuple[str, float] | None:
+        """Fetch a live entry with its expiry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            tuple[str, float] | None: Cached text and its expiry as a Unix
+            time, or None on miss or expiry
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at, accessed_at FROM interpretations "
+                "WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at, accessed_at = row
+            if expires_at <= now:
+                self._conn.execute("DELETE FROM interpretations WHERE key = ?", (key,))
+                return None
+            if now - accessed_at > _TOUCH_INTERVAL_SECONDS:
+                self._conn.execute(
+                    "UPDATE interpretations SET accessed_at = ? WHERE key = ?",
+                    (now, key),
+                )
+        return decode_value(value), expires_at
+
+    def set(self, key: str, text: str, ttl_seconds: float) -> None:
+        """Store an entry and evict until the store fits its size bound.
+
+        Args:
+            key: Cache key
+            text: Completion text
+            ttl_seconds: Time to live
+        """
+        payload = encode_value(text)
+        now = time.time()
+        with self._lock:
+            # An upsert rather than INSERT OR REPLACE: the implicit delete
+            # of a replace doesn't fire the size triggers
+            self._conn.execute(
+                "INSERT INTO interpretations "
+                "(key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, "
+                "size = excluded.size, expires_at = excluded.expires_at, "
+                "accessed_at = excluded.accessed_at",
+                (key, payload, len(payload), now + ttl_seconds, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        """Once over budget, drop expired entries, then least recently used ones."""
+        if self._total_bytes() <= self.max_bytes:
+            return
+        self._conn.execute("DELETE FROM interpretations WHERE expires_at <= ?", (now,))
+        total = self._total_bytes()
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        freed = 0
+        victims: list[str] = []
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM interpretations ORDER BY accessed_at"
+        ):
+            victims.append(key)
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany(
+            "DELETE FROM interpretations WHERE key = ?", [(k,) for k in victims]
+        )
+        logger.info("interpretation_cache_evicted", entries=len(victims), bytes=freed)
+
+    def acquire(self, name: str, owner: str, ttl_seconds: float) -> bool:
+        """Take or extend a named lease.
+
+        Args:
+            name: Lease name
+            owner: Id of the caller, unique per worker
+            ttl_seconds: Time until the lease lapses if not released
+
+        Returns:
+            bool: True if the caller holds the lease
+        """
+        now = time.time()
+        with self._lock:
+            # One statement, so two workers can't both take a lapsed lease
+            self._conn.execute(
+                "INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET "
+                "owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE leases.expires_at <= ? OR leases.owner = excluded.owner",
+                (name, owner, now + ttl_seconds, now),
+            )
+            row = self._conn.execute(
+                "SELECT owner FROM leases WHERE name = ?", (name,)
+            ).fetchone()
+        return row is not None and row[0] == owner
+
+    def release(self, name: str, owner: str) -> None:
+        """Give up a lease, if the caller still holds it.
+
+        Args:
+            name: Lease name
+            owner: Id the lease was acquired with
+        """
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner)
+            )
+
+    def stats(self) -> dict[str, int]:
+        """Entry count and total encoded size.
+
+        Returns:
+            dict: ``entries`` and ``bytes``
+        """
+        with self._lock:
+            (entries,) = self._conn.execute(
+                "SELECT COUNT(*) FROM interpretations"
+            ).fetchone()
+            total = self._total_bytes()
+        return {"entries": entries, "bytes": total}
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class InterpretationCache:
+    """In-process LRU in front of an optional host-wide shared store."""
+
+    _instance: InterpretationCache | None = None
+
+    def __init__(
+        self,
+        local_max_entries: int = 512,
+        ttl_seconds: float = 7 * 24 * 3600,
+        shared: SharedCacheStore | None = None,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            local_max_entries: Capacity of the in-process tier
+            ttl_seconds: Default time to live for new entries
+            shared: Host-wide tier, or None for in-process caching only
+        """
+        self.local_max_entries = local_max_entries
+        self.ttl_seconds = ttl_seconds
+        self.shared = shared
+        self._local: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        # Identifies this worker as a lease owner
+        self.owner = uuid.uuid4().hex
+        self.hits = {"local": 0, "shared": 0}
+        self.misses = 0
+
+    def _get_local(self, key: str) -> str | None:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._local[key]
+            return None
+        self._local.move_to_end(key)
+        return value
+
+    def _set_local(self, key: str, value: str, expires_at: float) -> None:
+        self._local[key] = (expires_at, value)
+        self._local.move_to_end(key)
+        while len(self._local) > self.local_max_entries:
+            self._local.popitem(last=False)
+
+    async def get(self, key: str, shared_first: bool = False) -> str | None:
+        """Look a key up in the local tier, then the shared tier.
+
+        Args:
+            key: Cache key
+            shared_first: Read the shared tier first, to see entries other
+                workers replaced since this one cached them
+
+        Returns:
+            str | None: Cached completion, or None on miss
+        """
+        if not (shared_first and self.shared is not None):
+            value = self._get_local(key)
+            if value is not None:
+                self.hits["local"] += 1
+                return value
+
+        if self.shared is not None:
+            try:
+                entry = await asyncio.to_thread(self.shared.get_entry, key)
+            except sqlite3.Error as e:
+                logger.warning("interpretation_cache_read_failed", error=str(e))
+                entry = None
+            if entry is not None:
+                self.hits["shared"] += 1
+                # The local copy expires with the shared row, not a fresh TTL
+                value, expires_at = entry
+                self._set_local(key, value, expires_at)
+                return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: str, ttl_seconds: float | None = None) -> None:
+        """Store a completion in both tiers.
+
+        Args:
+            key: Cache key
+            value: Completion text
+            ttl_seconds: Time to live, defaults to the cache's TTL
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._set_local(key, value, time.time() + ttl)
+        if self.shared is not None:
+            try:
+                await asyncio.to_thread(self.shared.set, key, value, ttl)
+            except sqlite3.Error as e:
+                logger.warning("interpretation_cache_write_failed", error=str(e))
+
+    async def acquire_lease(self, name: str, ttl_seconds: float) -> bool:
+        """Take a lease shared by the workers on this host.
+
+        Without a shared tier there is nothing to coordinate with, so the
+        lease is always granted.
+
+        Args:
+            name: Lease name
+            ttl_seconds: Time until the lease lapses if not released
+
+        Returns:
+            bool: True if this worker holds the lease
+        """
+        if self.shared is None:
+            return True
+        try:
+            return await asyncio.to_thread(
+                self.shared.acquire, name, self.owner, ttl_seconds
+            )
+        except sqlite3.Error as e:
+            logger.warning("interpretation_cache_lease_failed", error=str(e))
+            return False
+
+    async def release_lease(self, name: str) -> None:
+        """Give up a lease taken with ``acquire_lease``.
+
+        Args:
+            name: Lease name
+        """
+        if self.shared is None:
+            return
+        try:
+            await asyncio.to_thread(self.shared.release, name, self.owner)
+        except sqlite3.Error as e:
+            logger.warning("interpretation_cache_lease_failed", error=str(e))
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters and tier sizes.
+
+        Returns:
+            dict: Cache statistics for this worker
+        """
+        return {
+            "hits": dict(self.hits),
+            "misses": self.misses,
+            "local_entries": len(self._local),
+            "shared": self.shared.stats() if self.shared is not None else None,
+        }
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> InterpretationCache:
+        """Build a cache from application settings.
+
+        Args:
+            settings: Application configuration
+
+        Returns:
+            InterpretationCache: Configured cache
+        """
+        shared = (
+            SharedCacheStore(
+                Path(settings.llm_cache_path), settings.llm_cache_max_bytes
+            )
+            if settings.llm_cache_path
+            else None
+        )
+        return cls(
+            local_max_entries=settings.llm_cache_local_entries,
+            ttl_seconds=settings.llm_cache_ttl_seconds,
+            shared=shared,
+        )
+
+    @classmethod
+    def get_instance(cls, settings: Settings) -> InterpretationCache:
+        """Get or create the process-wide cache.
+
+        Args:
+            settings: Application configuration
+
+        Returns:
+            InterpretationCache: Singleton cache instance
+        """
+        if cls._instance is None:
+            cls._instance = cls.from_settings(settings)
+        return cls._instance
+
+
+class CachedLLMClient(LLMClient):
+    """LLM client decorator that serves repeated prompts from the cache."""
+
+    def __init__(self, inner: LLMClient, cache: InterpretationCache) -> None:
+        """Wrap a client.
+
+        Args:
+            inner: Client that performs real completions
+            cache: Interpretation cache to read through
+        """
+        self.inner = inner
+        self.cache = cache
+
+    @property
+    def model(self) -> str:
+        """Model name of the wrapped client."""
+        return str(getattr(self.inner, "model", ""))
+
+    @property
+    def provider(self) -> str:  # type: ignore[override]
+        """Provider name of the wrapped client."""
+        return self.inner.provider
+
+    async def generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        profile: GenerationProfile | None = None,
+    ) -> str:
+        """Return a cached completion, generating it on a miss.
+
+        Args:
+            system_prompt: System context
+            user_prompt: User message
+            profile: Generation budget; part of the cache key
+
+        Returns:
+            str: Model response
+        """
+        model = self.model
+        variant = ""
+        if profile is not None:
+            model = profile.model_for(self.provider) or model
+            variant = profile.cache_variant
+        key = cache_key(
+            type(self.inner).__name__, model, system_prompt, user_prompt, variant
+        )
+        cached = await self.cache.get(key)
+        if cached is not None:
+            logger.debug("interpretation_cache_hit", key=key[:12])
+            return cached
+
+        response = await self.inner.generate(system_prompt, user_prompt, profile)
+        await self.cache.set(key, response)
+        return response
+
+    async def follow_up(
+        self,
+        session_id: str,
+        system_prompt: str,
+        prompt: str,
+        turn_prompt: str,
+        profile: GenerationProfile | None = None,
+    ) -> str:
+        """Pass a follow-up turn through uncached.
+
+        Conversation turns depend on the earlier turns, so they are never
+        served from the cache.
+
+        Args:
+            session_id: Conversation id
+            system_prompt: System context
+            prompt: Full follow-up prompt including the earlier reading
+            turn_prompt: Just the new turn
+            profile: Generation budget
+
+        Returns:
+            str: Model response
+        """
+        return await self.inner.follow_up(
+            session_id, system_prompt, prompt, turn_prompt, profile
+        )
+
+    async def close(self) -> None:
+        """Close the wrapped client."""
+        close = getattr(self.inner, "close", None)
+        if close is not None:
+            await close()
@@ -3,24 +3,42 @@
 Supports both local (Ollama) and cloud (Grok) providers.
 """
 
+import time
 from abc import ABC, abstractmethod
+from collections.abc import Mapping, Sequence
+from typing import TYPE_CHECKING, Any
 
 import httpx
 import structlog
 
+from app.core.llm.profiles import DEFAULT_PROFILE, GenerationProfile, SLOTracker
+from app.core.llm.sessions import ContextSessionCache
+
+if TYPE_CHECKING:
+    from app.core.llm.cache import InterpretationCache
+
 logger = structlog.get_logger(__name__)
 
 
 class LLMClient(ABC):
     """Abstract base class for LLM providers."""
 
+    provider = "unknown"
+
     @abstractmethod
-    async def generate(self, system_prompt: str, user_prompt: str) -> str:
+    async def generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        profile: GenerationProfile | None = None,
+    ) -> str:
         """Generate a completion from the LLM.
 
         Args:
             system_prompt: System context for the model
             user_prompt: User's message/question
+            profile: Token, latency and model budget; defaults to
+                ``DEFAULT_PROFILE``
 
         Returns:
             str: Model's response
@@ -30,6 +48,45 @@ class LLMClient(ABC):
         """
         pass
 
+    async def follow_up(
+        self,
+        session_id: str,
+        system_prompt: str,
+        prompt: str,
+        turn_prompt: str,
+        profile: GenerationProfile | None = None,
+    ) -> str:
+        """Answer one follow-up turn of a reading conversation.
+
+        Providers that keep conversation state send only ``turn_prompt``
+        once the session is established. This default has no such state
+        and always sends the full prompt.
+
+        Args:
+            session_id: Conversation id, e.g. the reading id
+            system_prompt: System context for the model
+            prompt: Full follow-up prompt including the earlier reading
+            turn_prompt: Just the new turn, for providers holding the session
+            profile: Generation budget
+
+        Returns:
+            str: Model's response
+        """
+        del session_id, turn_prompt
+        return await self.generate(system_prompt, prompt, profile)
+
+
+def _observe(
+    profile: GenerationProfile, started: float, error: Exception | None = None
+) -> None:
+    """Record a model call against its profile's latency objective."""
+    SLOTracker.get_instance().observe(
+        profile,
+        time.perf_counter() - started,
+        ok=error is None,
+        timed_out=isinstance(error, httpx.TimeoutException),
+    )
+
 
 class OllamaClient(LLMClient):
     """Client for local Ollama models.
@@ -37,49 +94,138 @@ class OllamaClient(LLMClient):
     Uses the Ollama API running locally (default: http://localhost:11434).
     """
 
+    provider = "ollama"
+
     def __init__(
-        self, base_url: str = "http://localhost:11434", model: str = "neural-chat"
+        self,
+        base_url: str = "http://localhost:11434",
+        model: str = "neural-chat",
+        sessions: ContextSessionCache | None = None,
     ):
         """Initialize Ollama client.
 
         Args:
             base_url: Base URL of Ollama API
             model: Model name to use (must be pulled in Ollama)
+            sessions: Context cache for follow-up turns
         """
         self.base_url = base_url
         self.model = model
         self.client = httpx.AsyncClient(timeout=120.0)
-
-    async def generate(self, system_prompt: str, user_prompt: str) -> str:
+        self.sessions = sessions or ContextSessionCache()
+
+    async def generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        profile: GenerationProfile | None = None,
+    ) -> str:
         """Generate response using Ollama.
 
+        The profile maps onto Ollama's ``options``: ``num_predict`` caps the
+        output tokens and ``stop`` ends generation early.
+
         Args:
             system_prompt: System context
             user_prompt: User message
+            profile: Generation budget
+
+        Returns:
+            str: Model response
+        """
+        profile = profile or DEFAULT_PROFILE
+        model = profile.model_for(self.provider) or self.model
+        result = await self._complete(model, system_prompt, user_prompt, profile)
+        return str(result.get("response", "")).strip()
+
+    async def follow_up(
+        self,
+        session_id: str,
+        system_prompt: str,
+        prompt: str,
+        turn_prompt: str,
+        profile: GenerationProfile | None = None,
+    ) -> str:
+        """Answer a follow-up turn, reusing the conversation's context.
+
+        The first turn sends the full prompt and keeps the ``context``
+        Ollama returns. Later turns send only ``turn_prompt`` with that
+        context, so the model skips re-evaluating the earlier exchange.
+        The system prompt is part of the context and isn't sent again.
+
+        Args:
+            session_id: Conversation id, e.g. the reading id
+            system_prompt: System context
+            prompt: Full follow-up prompt including the earlier reading
+            turn_prompt: Just the new turn
+            profile: Generation budget
 
         Returns:
             str: Model response
         """
+        profile = profile or DEFAULT_PROFILE
+        model = profile.model_for(self.provider) or self.model
+        context = self.sessions.get(session_id, model)
+        try:
+            if context is None:
+                result = await self._complete(model, system_prompt, prompt, profile)
+            else:
+                result = await self._complete(
+                    model, None, turn_prompt, profile, context
+                )
+        except Exception:
+            self.sessions.discard(session_id)
+            raise
+        self.sessions.put(session_id, model, result.get("context") or [])
+        logger.debug(
+            "ollama_follow_up",
+            session_reused=context is not None,
+            prompt_tokens=result.get("prompt_eval_count"),
+        )
+        return str(result.get("response", "")).strip()
+
+    async def _complete(
+        self,
+        model: str,
+        system_prompt: str | None,
+        prompt: str,
+        profile: GenerationProfile,
+        context: tuple[int, ...] | None = None,
+    ) -> dict[str, Any]:
+        options: dict[str, object] = {
+            "temperature": profile.temperature,
+            "num_predict": profile.max_tokens,
+        }
+        if profile.stop:
+            options["stop"] = list(profile.stop)
+        payload: dict[str, object] = {
+            "model": model,
+            "prompt": prompt,
+            "stream": False,
+            "options": options,
+        }
+        if system_prompt is not None:
+            payload["system"] = system_prompt
+        if context is not None:
+            payload["context"] = list(context)
+
+        started = time.perf_counter()
         try:
             response = await self.client.post(
                 f"{self.base_url}/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": user_prompt,
-                    "system": system_prompt,
-                    "stream": False,
-                    "temperature": 0.7,
-                },
+                json=payload,
+                timeout=profile.timeout_seconds,
             )
             response.raise_for_status()
-
-            result = response.json()
-            response_text = result.get("response", "")
-            return str(response_text).strip()
-
+            result: dict[str, Any] = response.json()
         except Exception as e:
-            logger.error("ollama_error", error=str(e), model=self.model)
+            _observe(profile, started, e)
+            logger.error(
+                "ollama_error", error=str(e), model=model, profile=profile.name
+            )
             raise
+        _observe(profile, started)
+        return result
 
     async def check_health(self) -> bool:
         """Check if Ollama is running and model is available.
@@ -108,6 +254,8 @@ class GrokClient(LLMClient):
     Production LLM provider. Requires XAI_API_KEY environment variable.
     """
 
+    provider = "grok"
+
     def __init__(self, api_key: str):
         """Initialize Grok client.
 
@@ -119,39 +267,53 @@ class GrokClient(LLMClient):
         self.model = "grok-beta"
         self.client = httpx.AsyncClient(timeout=60.0)
 
-    async def generate(self, system_prompt: str, user_prompt: str) -> str:
+    async def generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        profile: GenerationProfile | None = None,
+    ) -> str:
         """Generate response using Grok API.
 
         Args:
             system_prompt: System context
             user_prompt: User message
+            profile: Generation budget
 
         Returns:
             str: Model response
         """
+        profile = profile or DEFAULT_PROFILE
+        payload: dict[str, object] = {
+            "model": profile.model_for(self.provider) or self.model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            "temperature": profile.temperature,
+            "max_tokens": profile.max_tokens,
+        }
+        if profile.stop:
+            payload["stop"] = list(profile.stop)
+
+        started = time.perf_counter()
         try:
             response = await self.client.post(
                 f"{self.base_url}/chat/completions",
                 headers={"Authorization": f"Bearer {self.api_key}"},
-                json={
-                    "model": self.model,
-                    "messages": [
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt},
-                    ],
-                    "temperature": 0.7,
-                    "max_tokens": 1024,
-                },
+                json=payload,
+                timeout=profile.timeout_seconds,
             )
             response.raise_for_status()
 
             result = response.json()
             content = result["choices"][0]["message"]["content"]
-            return str(content).strip()
-
         except Exception as e:
-            logger.error("grok_error", error=str(e))
+            _observe(profile, started, e)
+            logger.error("grok_error", error=str(e), profile=profile.name)
             raise
+        _observe(profile, started)
+        return str(content).strip()
 
     async def close(self) -> None:
         """Close the HTTP client."""
@@ -169,6 +331,8 @@ class LLMFactory:
         use_local: bool = True,
         ollama_base_url: str = "http://localhost:11434",
         grok_api_key: str | None = None,
+        cache: "InterpretationCache | None" = None,
+        routing_rules: Sequence[Mapping[str, Any]] = (),
     ) -> LLMClient:
         """Create an LLM client.
 
@@ -176,24 +340,85 @@ class LLMFactory:
             use_local: Use local Ollama if True, Grok if False
             ollama_base_url: Base URL for Ollama
             grok_api_key: API key for Grok
+            cache: Interpretation cache to read through, if any
+            routing_rules: Model routing rules; when given, calls are routed
+                over every configured provider instead of just one
 
         Returns:
             LLMClient: Configured client instance
         """
+        client: LLMClient
+        if routing_rules:
+            from app.core.llm.router import ModelRouter, RoutingRule
+
+            # Each provider reads through the cache below the router, so
+            # the key holds the routed provider and model and one tier's
+            # output is never served to another
+            providers = cls.create_providers(
+                use_local, ollama_base_url, grok_api_key, cache=cache
+            )
+            if not use_local:
+                # The preferred provider is the default for unmatched calls
+                providers = dict(reversed(list(providers.items())))
+            return ModelRouter(
+                providers, [RoutingRule.from_dict(rule) for rule in routing_rules]
+            )
         if use_local:
-            return OllamaClient(base_url=ollama_base_url)
+            client = OllamaClient(base_url=ollama_base_url)
         elif grok_api_key:
-            return GrokClient(api_key=grok_api_key)
+            client = GrokClient(api_key=grok_api_key)
         else:
             msg = "Grok requires XAI_API_KEY"
             raise ValueError(msg)
 
+        if cache is not None:
+            from app.core.llm.cache import CachedLLMClient
+
+            client = CachedLLMClient(client, cache)
+        return client
+
+    @classmethod
+    def create_providers(
+        cls,
+        use_local: bool = True,
+        ollama_base_url: str = "http://localhost:11434",
+        grok_api_key: str | None = None,
+        cache: "InterpretationCache | None" = None,
+    ) -> dict[str, LLMClient]:
+        """Create a client for every configured provider.
+
+        Ollama is included when local models are enabled, Grok when an API
+        key is set. Used to spread bulk work over all available capacity.
+
+        Args:
+            use_local: Include local Ollama
+            ollama_base_url: Base URL for Ollama
+            grok_api_key: API key for Grok
+            cache: Interpretation cache to read through, if any
+
+        Returns:
+            dict: Clients keyed by provider name
+        """
+        providers: dict[str, LLMClient] = {}
+        if use_local:
+            providers["ollama"] = cls.create(True, ollama_base_url, cache=cache)
+        if grok_api_key:
+            providers["grok"] = cls.create(
+                False, grok_api_key=grok_api_key, cache=cache
+            )
+        if not providers:
+            msg = "No LLM provider configured"
+            raise ValueError(msg)
+        return providers
+
     @classmethod
     def get_instance(
         cls,
         use_local: bool = True,
         ollama_base_url: str = "http://localhost:11434",
         grok_api_key: str | None = None,
+        cache: "InterpretationCache | None" = None,
+        routing_rules: Sequence[Mapping[str, Any]] = (),
     ) -> LLMClient:
         """Get or create a singleton LLM client.
 
@@ -201,10 +426,14 @@ class LLMFactory:
             use_local: Use local Ollama if True
             ollama_base_url: Base URL for Ollama
             grok_api_key: API key for Grok
+            cache: Interpretation cache to read through, if any
+            routing_rules: Model routing rules, if any
 
         Returns:
             LLMClient: Singleton client instance
         """
         if cls._instance is None:
-            cls._instance = cls.create(use_local, ollama_base_url, grok_api_key)
+            cls._instance = cls.create(
+                use_local, ollama_base_url, grok_api_key, cache, routing_rules
+            )
         return cls._instance
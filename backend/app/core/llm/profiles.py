@@ -0,0 +1,233 @@
+"""Generation profiles and latency objectives.
+
+A profile bounds one kind of generation: how many tokens it may produce,
+how long it may take, which model serves it and where it stops. Each
+spread carries its own profile, so a one-card reading is not budgeted like
+a Celtic Cross. Clients translate the profile into their provider's
+native parameters.
+
+The profile also picks the generation strategy: ``single`` asks for the
+whole interpretation in one completion; ``fan_out`` interprets each
+position concurrently and weaves them together in a short synthesis call.
+
+``SLOTracker`` records model latency per profile against its target, so
+spreads that regularly exceed their budget are easy to spot.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+# Samples kept per profile for percentile estimates.
+_WINDOW = 512
+
+STRATEGIES = frozenset({"single", "fan_out"})
+
+
+@dataclass(frozen=True, slots=True)
+class GenerationProfile:
+    """Token, latency and model budget for one kind of generation."""
+
+    name: str
+    max_tokens: int = 1024
+    temperature: float = 0.7
+    target_seconds: float = 30.0
+    timeout_seconds: float = 60.0
+    stop: tuple[str, ...] = ()
+    models: tuple[tuple[str, str], ...] = ()
+    strategy: str = "single"
+    position_max_tokens: int = 250
+    synthesis_max_tokens: int = 450
+
+    def __post_init__(self) -> None:
+        """Validate the budget.
+
+        Raises:
+            ValueError: If a limit is not positive or the target exceeds
+                the timeout
+        """
+        if (
+            min(self.max_tokens, self.position_max_tokens, self.synthesis_max_tokens)
+            < 1
+        ):
+            msg = f"Profile {self.name!r} token caps must be positive"
+            raise ValueError(msg)
+        if self.strategy not in STRATEGIES:
+            msg = f"Profile {self.name!r} strategy must be one of {sorted(STRATEGIES)}"
+            raise ValueError(msg)
+        if not 0 < self.target_seconds <= self.timeout_seconds:
+            msg = f"Profile {self.name!r} needs 0 < target_seconds <= timeout_seconds"
+            raise ValueError(msg)
+
+    def model_for(self, provider: str) -> str | None:
+        """Model override for a provider.
+
+        Args:
+            provider: Provider name, e.g. ``"ollama"`` or ``"grok"``
+
+        Returns:
+            str | None: Model name, or None to use the client default
+        """
+        for name, model in self.models:
+            if name == provider:
+                return model
+        return None
+
+    def for_part(self, part: str, max_tokens: int) -> GenerationProfile:
+        """Derive the profile for one call of a fan-out generation.
+
+        The part gets its own name, so its latency is tracked separately.
+
+        Args:
+            part: ``"position"`` or ``"synthesis"``
+            max_tokens: Token cap for the call
+
+        Returns:
+            GenerationProfile: Profile for the call
+        """
+        return replace(
+            self, name=f"{self.name}:{part}", max_tokens=max_tokens, strategy="single"
+        )
+
+    @property
+    def cache_variant(self) -> str:
+        """Parameters that change the output, for cache keys."""
+        return f"{self.max_tokens}|{self.temperature}|{'|'.join(self.stop)}"
+
+    @classmethod
+    def from_dict(cls, name: str, data: Mapping[str, Any]) -> GenerationProfile:
+        """Build a profile from a spread file's ``generation`` object.
+
+        Args:
+            name: Profile name, usually the spread id
+            data: Profile fields; ``models`` maps provider to model name
+
+        Returns:
+            GenerationProfile: Validated profile
+
+        Raises:
+            ValueError: If a field has the wrong type or value
+        """
+        converters: dict[str, Any] = {
+            "max_tokens": int,
+            "temperature": float,
+            "target_seconds": float,
+            "timeout_seconds": float,
+            "stop": lambda v: tuple(str(s) for s in v),
+            "models": lambda v: tuple((str(k), str(m)) for k, m in dict(v).items()),
+            "strategy": str,
+            "position_max_tokens": int,
+            "synthesis_max_tokens": int,
+        }
+        unknown = set(data) - set(converters)
+        if unknown:
+            msg = f"Unknown generation profile fields: {sorted(unknown)}"
+            raise ValueError(msg)
+        try:
+            return cls(
+                name=name,
+                **{key: converters[key](value) for key, value in data.items()},
+            )
+        except (TypeError, ValueError) as e:
+            msg = f"Invalid generation profile: {e}"
+            raise ValueError(msg) from e
+
+
+DEFAULT_PROFILE = GenerationProfile(name="default")
+
+
+@dataclass
+class _ProfileStats:
+    target_seconds: float
+    requests: int = 0
+    breaches: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    durations: deque[float] = field(default_factory=lambda: deque(maxlen=_WINDOW))
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    index = max(0, math.ceil(q * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+class SLOTracker:
+    """Counts, per profile, how often generation misses its target."""
+
+    _instance: SLOTracker | None = None
+
+    def __init__(self) -> None:
+        """Initialize an empty tracker."""
+        self._lock = threading.Lock()
+        self._stats: dict[str, _ProfileStats] = {}
+
+    def observe(
+        self,
+        profile: GenerationProfile,
+        seconds: float,
+        ok: bool = True,
+        timed_out: bool = False,
+    ) -> None:
+        """Record one generation.
+
+        Args:
+            profile: Profile the generation ran under
+            seconds: Wall-clock model latency
+            ok: Whether it produced a response
+            timed_out: Whether it hit the profile timeout
+        """
+        with self._lock:
+            stats = self._stats.get(profile.name)
+            if stats is None:
+                stats = self._stats[profile.name] = _ProfileStats(
+                    profile.target_seconds
+                )
+            stats.requests += 1
+            stats.durations.append(seconds)
+            if seconds > profile.target_seconds or not ok:
+                stats.breaches += 1
+            if not ok:
+                stats.errors += 1
+            if timed_out:
+                stats.timeouts += 1
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """Per-profile SLO report, worst breach rate first.
+
+        Returns:
+            list: One entry per profile with counts and latency percentiles
+        """
+        with self._lock:
+            report = []
+            for name, stats in self._stats.items():
+                durations = sorted(stats.durations)
+                report.append(
+                    {
+                        "profile": name,
+                        "target_seconds": stats.target_seconds,
+                        "requests": stats.requests,
+                        "breaches": stats.breaches,
+                        "breach_rate": round(stats.breaches / stats.requests, 4),
+                        "errors": stats.errors,
+                        "timeouts": stats.timeouts,
+                        "p50_seconds": round(_percentile(durations, 0.5), 3),
+                        "p95_seconds": round(_percentile(durations, 0.95), 3),
+                    }
+                )
+        return sorted(report, key=lambda r: r["breach_rate"], reverse=True)
+
+    @classmethod
+    def get_instance(cls) -> SLOTracker:
+        """Get the process-wide tracker.
+
+        Returns:
+            SLOTracker: Singleton tracker instance
+        """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
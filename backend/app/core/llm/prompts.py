@@ -3,8 +3,12 @@
 Hermetic principles and Jungian psychology guide the interpretation voice.
 """
 
+from collections.abc import Mapping, Sequence
 from typing import Any
 
+from app.core.tarot.deck import DrawnCard
+from app.core.tarot.spreads import Spread, SpreadPosition
+
 
 class PromptTemplates:
     """Collection of system and user prompts for tarot readings."""
@@ -46,12 +50,66 @@ Please provide a cohesive interpretation that:
 
 Speak directly to the querent. Use "you" language. Be wise but warm."""
 
+    SPREAD_TEMPLATE = """A seeker has drawn the {spread_name} spread for reflection on their situation.
+
+**Question**: {question}
+
+**The Reading**:
+{card_lines}
+
+Please provide a cohesive interpretation that:
+1. Honors each card's individual meaning and position
+2. Shows how the cards speak to each other
+3. Illuminates the querent's situation with both clarity and depth
+4. Ends with 2-3 reflection questions for the querent to sit with
+
+Speak directly to the querent. Use "you" language. Be wise but warm."""
+
+    DAILY_TEMPLATE = """A seeker has drawn a single card for guidance on the day ahead.
+
+**Question**: {question}
+
+**The Card**: {card}{reversal}
+
+Please provide a short interpretation that:
+1. Names the card's core energy for today
+2. Relates it to the querent's inner life, not outer events
+3. Ends with one reflection question to carry through the day
+
+Speak directly to the querent. Use "you" language. Keep it to two or three paragraphs."""
+
+    POSITION_TEMPLATE = """A seeker has drawn the {spread_name} spread. Interpret one position of it.
+
+**Question**: {question}
+
+**Position**: {position_name} ({position_meaning})
+**Card**: {card}{reversal}
+
+Write one short paragraph on what this card means in this position for the querent's question. Do not interpret other positions and do not add reflection questions; they will be woven together afterwards.
+
+Speak directly to the querent. Use "you" language."""
+
+    SYNTHESIS_TEMPLATE = """A seeker has drawn the {spread_name} spread. Each position has been interpreted on its own:
+
+**Question**: {question}
+
+{position_readings}
+
+Weave these into a brief closing synthesis that:
+1. Names the thread running through the cards
+2. Notes the most important tension or resonance between positions
+3. Ends with 2-3 reflection questions for the querent to sit with
+
+Do not repeat the position interpretations. Speak directly to the querent. Be wise but warm."""
+
+    REVERSAL_NOTE = "This card is reversed, suggesting blocked or shadow energy."
+
     FOLLOW_UP_TEMPLATE = """The seeker is continuing their reading with a follow-up question.
 
 **Original Question**: {original_question}
 **Previous Cards**: {previous_cards}
 **Previous Interpretation**: {previous_interpretation}
-
+{conversation}
 **Follow-up Question**: {follow_up_question}
 
 Provide a response that:
@@ -62,8 +120,12 @@ Provide a response that:
 
 Keep the voice consistent with the Hermetic and Jungian principles. Remember: you are illuminating their own wisdom."""
 
+    FOLLOW_UP_TURN_TEMPLATE = """**Follow-up Question**: {follow_up_question}
+
+Answer in the same voice, building on the reading and our conversation so far rather than repeating it."""
+
     @staticmethod
-    def format_card_info(card: dict[str, Any], is_reversed: bool = False) -> str:
+    def format_card_info(card: Mapping[str, Any], is_reversed: bool = False) -> str:
         """Format a card for inclusion in a prompt.
 
         Args:
@@ -77,12 +139,24 @@ Keep the voice consistent with the Hermetic and Jungian principles. Remember: yo
         reversal_tag = " (Reversed)" if is_reversed else ""
         return f"{name}{reversal_tag}"
 
+    @staticmethod
+    def format_drawn(card: DrawnCard) -> str:
+        """Format a drawn card, with its orientation, for a prompt.
+
+        Args:
+            card: Drawn card
+
+        Returns:
+            str: Formatted card information
+        """
+        return PromptTemplates.format_card_info(card.card_ref, card.reversed)
+
     @staticmethod
     def get_three_card_prompt(
         question: str,
-        past_card: dict[str, Any],
-        present_card: dict[str, Any],
-        future_card: dict[str, Any],
+        past_card: Mapping[str, Any],
+        present_card: Mapping[str, Any],
+        future_card: Mapping[str, Any],
         past_reversed: bool = False,
         present_reversed: bool = False,
         future_reversed: bool = False,
@@ -118,3 +192,178 @@ Keep the voice consistent with the Hermetic and Jungian principles. Remember: yo
             if future_reversed
             else "",
         )
+
+    @staticmethod
+    def get_daily_prompt(
+        question: str, card: Mapping[str, Any], is_reversed: bool = False
+    ) -> str:
+        """Generate a daily one-card prompt.
+
+        The prompt depends only on the question, card and orientation, so
+        every daily draw maps onto one of 156 cacheable prompts.
+
+        Args:
+            question: The daily question
+            card: Card data
+            is_reversed: Whether the card is reversed
+
+        Returns:
+            str: Formatted prompt for LLM
+        """
+        return PromptTemplates.DAILY_TEMPLATE.format(
+            question=question,
+            card=PromptTemplates.format_card_info(card, is_reversed),
+            reversal=f" {PromptTemplates.REVERSAL_NOTE}" if is_reversed else "",
+        )
+
+    @staticmethod
+    def get_follow_up_prompt(
+        original_question: str,
+        previous_cards: Sequence[str],
+        previous_interpretation: str,
+        follow_up_question: str,
+        history: Sequence[tuple[str, str]] = (),
+    ) -> str:
+        """Generate a self-contained follow-up prompt.
+
+        Args:
+            original_question: The reading's question
+            previous_cards: Formatted cards of the reading
+            previous_interpretation: The reading's interpretation
+            follow_up_question: The new question
+            history: Earlier ``(role, content)`` turns, oldest first
+
+        Returns:
+            str: Formatted prompt for LLM
+        """
+        conversation = ""
+        if history:
+            speakers = {"user": "Seeker", "assistant": "Reader"}
+            turns = "\n".join(
+                f"{speakers.get(role, role)}: {content}" for role, content in history
+            )
+            conversation = f"\n**Conversation So Far**:\n{turns}\n"
+        return PromptTemplates.FOLLOW_UP_TEMPLATE.format(
+            original_question=original_question,
+            previous_cards=", ".join(previous_cards),
+            previous_interpretation=previous_interpretation,
+            conversation=conversation,
+            follow_up_question=follow_up_question,
+        )
+
+    @staticmethod
+    def get_follow_up_turn(follow_up_question: str) -> str:
+        """Generate the short prompt for a turn in an ongoing conversation.
+
+        Only valid when the model already holds the earlier exchange.
+
+        Args:
+            follow_up_question: The new question
+
+        Returns:
+            str: Formatted prompt for LLM
+        """
+        return PromptTemplates.FOLLOW_UP_TURN_TEMPLATE.format(
+            follow_up_question=follow_up_question
+        )
+
+    @staticmethod
+    def get_position_prompt(
+        question: str,
+        spread: Spread,
+        position: SpreadPosition,
+        card: DrawnCard,
+    ) -> str:
+        """Generate the prompt for one position of a fan-out reading.
+
+        Args:
+            question: The querent's question
+            spread: Spread being read
+            position: Position to interpret
+            card: Card drawn for the position
+
+        Returns:
+            str: Formatted prompt for LLM
+        """
+        return PromptTemplates.POSITION_TEMPLATE.format(
+            spread_name=spread.name,
+            question=question,
+            position_name=position.name,
+            position_meaning=position.meaning,
+            card=PromptTemplates.format_drawn(card),
+            reversal=f" {PromptTemplates.REVERSAL_NOTE}" if card.reversed else "",
+        )
+
+    @staticmethod
+    def get_synthesis_prompt(
+        question: str,
+        spread: Spread,
+        cards: Sequence[DrawnCard],
+        readings: Sequence[str],
+    ) -> str:
+        """Generate the synthesis prompt of a fan-out reading.
+
+        Args:
+            question: The querent's question
+            spread: Spread being read
+            cards: Drawn cards in position order
+            readings: Position interpretations in position order
+
+        Returns:
+            str: Formatted prompt for LLM
+        """
+        sections = [
+            f"**{position.name}** — {PromptTemplates.format_drawn(card)}:\n{reading}"
+            for position, card, reading in zip(
+                spread.positions, cards, readings, strict=True
+            )
+        ]
+        return PromptTemplates.SYNTHESIS_TEMPLATE.format(
+            spread_name=spread.name,
+            question=question,
+            position_readings="\n\n".join(sections),
+        )
+
+    @staticmethod
+    def get_spread_prompt(
+        question: str,
+        spread: Spread,
+        cards: Sequence[DrawnCard],
+    ) -> str:
+        """Generate a prompt for any spread.
+
+        The three-card spread keeps its dedicated template; other spreads
+        list each position with its meaning.
+
+        Args:
+            question: The querent's question
+            spread: Spread the cards were drawn for
+            cards: Drawn cards in position order
+
+        Returns:
+            str: Formatted prompt for LLM
+        """
+        if spread.spread_id == "three_card":
+            past, present, future = cards
+            return PromptTemplates.get_three_card_prompt(
+                question=question,
+                past_card=past.card_ref,
+                present_card=present.card_ref,
+                future_card=future.card_ref,
+                past_reversed=past.reversed,
+                present_reversed=present.reversed,
+                future_reversed=future.reversed,
+            )
+
+        lines = []
+        for position, card in zip(spread.positions, cards, strict=True):
+            note = f" {PromptTemplates.REVERSAL_NOTE}" if card.reversed else ""
+            lines.append(
+                f"- **{position.name}** ({position.meaning}): "
+                f"{PromptTemplates.format_drawn(card)}{note}"
+            )
+        return PromptTemplates.SPREAD_TEMPLATE.format(
+            spread_name=spread.name,
+            question=question,
+            card_lines="\n".join(lines),
+        )
@@ -0,0 +1,445 @@
+"""Cost- and latency-aware model routing.
+
+``ModelRouter`` sits behind ``LLMFactory`` and picks the provider and
+model for every call. Rules are matched in order against the request:
+
+- the generation profile, i.e. the spread (``celtic_cross``) or one of
+  its fan-out parts (``celtic_cross:position``);
+- the caller's tier, bound with ``routing_tier`` for the request;
+- the prompt length in characters.
+
+A matching rule lists its targets cheapest first. The first target whose
+recent latency fits the profile's target and that isn't failing is used;
+when none fits, the fastest one is. Latency and failures are tracked per
+model as moving averages shared by the whole process, and each decision
+is kept in ``RoutingStats`` and logged so the rules can be tuned.
+
+Rules come from ``LLM_ROUTING_RULES``, a JSON list such as::
+
+    [{"name": "quick", "profiles": ["one_card"],
+      "targets": ["ollama:llama3.2:3b"]},
+     {"name": "deep", "profiles": ["celtic_cross"], "tiers": ["initiate"],
+      "targets": ["grok:grok-2", "ollama:llama3.1:8b"]}]
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+import structlog
+
+from app.core.llm.client import LLMClient
+from app.core.llm.profiles import DEFAULT_PROFILE, GenerationProfile
+
+logger = structlog.get_logger(__name__)
+
+_tier: ContextVar[str] = ContextVar("routing_tier", default="free")
+
+# Weight of the newest sample in the latency and failure averages.
+_ALPHA = 0.2
+
+# Targets failing more often than this are skipped while others are healthy.
+_MAX_ERROR_RATE = 0.5
+
+# Decisions kept for inspection.
+_DECISION_LOG = 1000
+
+
+@contextmanager
+def routing_tier(tier: str) -> Iterator[None]:
+    """Route calls made inside the block for a user tier.
+
+    Args:
+        tier: ``"free"``, ``"seeker"`` or ``"initiate"``
+
+    Yields:
+        None
+    """
+    token = _tier.set(tier)
+    try:
+        yield
+    finally:
+        _tier.reset(token)
+
+
+def current_tier() -> str:
+    """Tier bound by the innermost ``routing_tier`` block, or ``"free"``."""
+    return _tier.get()
+
+
+@dataclass(frozen=True, slots=True)
+class ModelTarget:
+    """A provider and one of its models."""
+
+    provider: str
+    model: str
+
+    @classmethod
+    def parse(cls, text: str) -> ModelTarget:
+        """Parse ``"provider:model"``; the model may contain colons.
+
+        Raises:
+            ValueError: If either part is missing
+        """
+        provider, _, model = text.partition(":")
+        if not provider or not model:
+            msg = f"Routing target must be 'provider:model', got {text!r}"
+            raise ValueError(msg)
+        return cls(provider, model)
+
+    def __str__(self) -> str:
+        return f"{self.provider}:{self.model}"
+
+
+@dataclass(frozen=True, slots=True)
+class RoutingRule:
+    """Targets for the requests a rule matches."""
+
+    name: str
+    targets: tuple[ModelTarget, ...]
+    profiles: frozenset[str] = frozenset()
+    tiers: frozenset[str] = frozenset()
+    min_prompt_chars: int = 0
+    max_prompt_chars: int | None = None
+
+    def matches(self, profile: str, tier: str, prompt_chars: int) -> bool:
+        """Whether a request falls under this rule.
+
+        Empty ``profiles`` or ``tiers`` match anything. A profile matches
+        by full name or by the spread it belongs to.
+        """
+        if self.profiles and not (
+            profile in self.profiles or profile.split(":", 1)[0] in self.profiles
+        ):
+            return False
+        if self.tiers and tier not in self.tiers:
+            return False
+        if prompt_chars < self.min_prompt_chars:
+            return False
+        return self.max_prompt_chars is None or prompt_chars <= self.max_prompt_chars
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> RoutingRule:
+        """Build a rule from its configuration object.
+
+        Raises:
+            ValueError: If the rule has no targets or an unknown field
+        """
+        known = {
+            "name",
+            "targets",
+            "profiles",
+            "tiers",
+            "min_prompt_chars",
+            "max_prompt_chars",
+        }
+        unknown = set(data) - known
+        if unknown:
+            msg = f"Unknown routing rule fields: {sorted(unknown)}"
+            raise ValueError(msg)
+        targets = tuple(ModelTarget.parse(str(t)) for t in data.get("targets", ()))
+        if not targets:
+            msg = "Routing rule needs at least one target"
+            raise ValueError(msg)
+        max_chars = data.get("max_prompt_chars")
+        return cls(
+            name=str(data.get("name", targets[0])),
+            targets=targets,
+            profiles=frozenset(data.get("profiles", ())),
+            tiers=frozenset(data.get("tiers", ())),
+            min_prompt_chars=int(data.get("min_prompt_chars", 0)),
+            max_prompt_chars=int(max_chars) if max_chars is not None else None,
+        )
+
+
+@dataclass(slots=True)
+class RouteDecision:
+    """Which model served a request, and why."""
+
+    profile: str
+    tier: str
+    prompt_chars: int
+    rule: str | None
+    target: ModelTarget | None
+    reason: str
+    estimated_seconds: float | None = None
+    duration_seconds: float | None = None
+    ok: bool | None = None
+    at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "at": self.at,
+            "profile": self.profile,
+            "tier": self.tier,
+            "prompt_chars": self.prompt_chars,
+            "rule": self.rule,
+            "target": str(self.target) if self.target else None,
+            "reason": self.reason,
+            "estimated_seconds": self.estimated_seconds,
+            "duration_seconds": self.duration_seconds,
+            "ok": self.ok,
+        }
+
+
+class RoutingStats:
+    """Per-model latency and failure averages, plus recent decisions."""
+
+    _instance: RoutingStats | None = None
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self._lock = threading.Lock()
+        self._latency: dict[ModelTarget, float] = {}
+        self._errors: dict[ModelTarget, float] = {}
+        self._calls: dict[ModelTarget, int] = {}
+        self.decisions: deque[RouteDecision] = deque(maxlen=_DECISION_LOG)
+
+    def observe(self, target: ModelTarget, seconds: float, ok: bool) -> None:
+        """Fold one call into the target's averages."""
+        with self._lock:
+            self._calls[target] = self._calls.get(target, 0) + 1
+            error = 0.0 if ok else 1.0
+            self._errors[target] = _ALPHA * error + (1 - _ALPHA) * self._errors.get(
+                target, error
+            )
+            if ok:
+                previous = self._latency.get(target, seconds)
+                self._latency[target] = _ALPHA * seconds + (1 - _ALPHA) * previous
+
+    def latency(self, target: ModelTarget) -> float | None:
+        """Average latency of successful calls, or None before the first."""
+        return self._latency.get(target)
+
+    def error_rate(self, target: ModelTarget) -> float:
+        """Average share of failed calls."""
+        return self._errors.get(target, 0.0)
+
+    def record(self, decision: RouteDecision) -> None:
+        """Keep a decision for inspection."""
+        self.decisions.append(decision)
+
+    def snapshot(self, limit: int = 100) -> dict[str, Any]:
+        """Model averages and the most recent decisions.
+
+        Args:
+            limit: Number of decisions returned, newest first
+
+        Returns:
+            dict: ``models`` and ``decisions``
+        """
+        with self._lock:
+            models = [
+                {
+                    "target": str(target),
+                    "calls": calls,
+                    "latency_seconds": round(self._latency[target], 3)
+                    if target in self._latency
+                    else None,
+                    "error_rate": round(self._errors.get(target, 0.0), 3),
+                }
+                for target, calls in self._calls.items()
+            ]
+        recent = list(self.decisions)[-limit:]
+        return {
+            "models": models,
+            "decisions": [d.to_dict() for d in reversed(recent)],
+        }
+
+    @classmethod
+    def get_instance(cls) -> RoutingStats:
+        """Get the process-wide statistics.
+
+        Returns:
+            RoutingStats: Singleton instance
+        """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+
+class ModelRouter(LLMClient):
+    """LLM client that routes every call to a provider and model."""
+
+    provider = "router"
+
+    def __init__(
+        self,
+        providers: Mapping[str, LLMClient],
+        rules: Sequence[RoutingRule],
+        stats: RoutingStats | None = None,
+    ) -> None:
+        """Initialize the router.
+
+        Args:
+            providers: Clients keyed by provider name; the first is the
+                default when no rule matches
+            rules: Routing rules, first match wins
+            stats: Shared statistics, defaults to the process-wide instance
+
+        Raises:
+            ValueError: If no providers are given
+        """
+        if not providers:
+            msg = "Model router needs at least one provider"
+            raise ValueError(msg)
+        self.providers = dict(providers)
+        self.rules = list(rules)
+        self.stats = stats or RoutingStats.get_instance()
+        self.default_provider = next(iter(self.providers))
+
+    @property
+    def model(self) -> str:
+        """Default model, used when no rule matches."""
+        return str(getattr(self.providers[self.default_provider], "model", ""))
+
+    def route(
+        self, profile: GenerationProfile, prompt_chars: int, tier: str | None = None
+    ) -> RouteDecision:
+        """Choose the target for a request.
+
+        Args:
+            profile: Generation profile of the call
+            prompt_chars: Length of the system and user prompts
+            tier: Caller's tier, defaults to the bound ``routing_tier``
+
+        Returns:
+            RouteDecision: The chosen target, or None for the default client
+        """
+        tier = tier or current_tier()
+        for rule in self.rules:
+            if not rule.matches(profile.name, tier, prompt_chars):
+                continue
+            targets = [t for t in rule.targets if t.provider in self.providers]
+            if not targets:
+                continue
+            return self._choose(rule, targets, profile, tier, prompt_chars)
+        return RouteDecision(profile.name, tier, prompt_chars, None, None, "default")
+
+    def _choose(
+        self,
+        rule: RoutingRule,
+        targets: list[ModelTarget],
+        profile: GenerationProfile,
+        tier: str,
+        prompt_chars: int,
+    ) -> RouteDecision:
+        healthy = [
+            t for t in targets if self.stats.error_rate(t) <= _MAX_ERROR_RATE
+        ] or targets
+        for target in healthy:
+            estimate = self.stats.latency(target)
+            if estimate is None or estimate <= profile.target_seconds:
+                reason = "unmeasured" if estimate is None else "within_target"
+                return RouteDecision(
+                    profile.name,
+                    tier,
+                    prompt_chars,
+                    rule.name,
+                    target,
+                    reason,
+                    estimate,
+                )
+        fastest = min(healthy, key=lambda t: self.stats.latency(t) or 0.0)
+        return RouteDecision(
+            profile.name,
+            tier,
+            prompt_chars,
+            rule.name,
+            fastest,
+            "fastest",
+            self.stats.latency(fastest),
+        )
+
+    def _resolve(
+        self, decision: RouteDecision, profile: GenerationProfile
+    ) -> tuple[LLMClient, GenerationProfile]:
+        if decision.target is None:
+            return self.providers[self.default_provider], profile
+        target = decision.target
+        return self.providers[target.provider], replace(
+            profile, models=((target.provider, target.model),)
+        )
+
+    async def _call(self, decision: RouteDecision, call: Awaitable[str]) -> str:
+        started = time.perf_counter()
+        try:
+            response = await call
+        except Exception:
+            self._finish(decision, started, ok=False)
+            raise
+        self._finish(decision, started, ok=True)
+        return response
+
+    def _finish(self, decision: RouteDecision, started: float, ok: bool) -> None:
+        decision.duration_seconds = round(time.perf_counter() - started, 3)
+        decision.ok = ok
+        if decision.target is not None:
+            self.stats.observe(decision.target, decision.duration_seconds, ok)
+        self.stats.record(decision)
+        logger.info("model_routed", **decision.to_dict())
+
+    async def generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        profile: GenerationProfile | None = None,
+    ) -> str:
+        """Generate with the routed provider and model.
+
+        Args:
+            system_prompt: System context
+            user_prompt: User message
+            profile: Generation budget
+
+        Returns:
+            str: Model response
+        """
+        profile = profile or DEFAULT_PROFILE
+        decision = self.route(profile, len(system_prompt) + len(user_prompt))
+        client, routed = self._resolve(decision, profile)
+        return await self._call(
+            decision, client.generate(system_prompt, user_prompt, routed)
+        )
+
+    async def follow_up(
+        self,
+        session_id: str,
+        system_prompt: str,
+        prompt: str,
+        turn_prompt: str,
+        profile: GenerationProfile | None = None,
+    ) -> str:
+        """Answer a follow-up turn with the routed provider and model.
+
+        Args:
+            session_id: Conversation id
+            system_prompt: System context
+            prompt: Full follow-up prompt including the earlier reading
+            turn_prompt: Just the new turn
+            profile: Generation budget
+
+        Returns:
+            str: Model response
+        """
+        profile = profile or DEFAULT_PROFILE
+        decision = self.route(profile, len(system_prompt) + len(prompt))
+        client, routed = self._resolve(decision, profile)
+        return await self._call(
+            decision,
+            client.follow_up(session_id, system_prompt, prompt, turn_prompt, routed),
+        )
+
+    async def close(self) -> None:
+        """Close every provider client."""
+        for client in self.providers.values():
+            close = getattr(client, "close", None)
+            if close is not None:
+                await close()
@@ -0,0 +1,121 @@
+"""Provider-side conversation state for follow-up turns.
+
+Ollama's ``/api/generate`` returns a ``context`` array: the token ids of
+the whole exchange so far. Sending it back with the next prompt lets the
+runner match the prefix it already evaluated, so a follow-up only costs
+the new question's tokens instead of re-reading the system prompt and
+the earlier interpretation.
+
+Context arrays are a few thousand integers each, so the cache is bounded
+both by number of sessions and by total tokens, evicting least recently
+used sessions first. Sessions also expire, and a context is only reused
+with the model that produced it.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class _Session:
+    model: str
+    context: tuple[int, ...]
+    expires_at: float
+
+
+class ContextSessionCache:
+    """LRU cache of provider context arrays keyed by conversation."""
+
+    def __init__(
+        self,
+        max_sessions: int = 256,
+        max_tokens: int = 1_000_000,
+        ttl_seconds: float = 3600.0,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_sessions: Most conversations kept
+            max_tokens: Most context tokens kept across all conversations
+            ttl_seconds: Idle time after which a conversation is dropped
+        """
+        self.max_sessions = max_sessions
+        self.max_tokens = max_tokens
+        self.ttl_seconds = ttl_seconds
+        self._sessions: OrderedDict[str, _Session] = OrderedDict()
+        self._tokens = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, session_id: str, model: str) -> tuple[int, ...] | None:
+        """Look up a conversation's context.
+
+        Args:
+            session_id: Conversation id
+            model: Model the next turn will run on
+
+        Returns:
+            tuple | None: Context token ids, or None if absent, expired or
+            produced by another model
+        """
+        session = self._sessions.get(session_id)
+        if session is None or session.model != model:
+            self.misses += 1
+            return None
+        if session.expires_at <= time.monotonic():
+            self.discard(session_id)
+            self.misses += 1
+            return None
+        self._sessions.move_to_end(session_id)
+        self.hits += 1
+        return session.context
+
+    def put(self, session_id: str, model: str, context: list[int]) -> None:
+        """Store a conversation's latest context.
+
+        Args:
+            session_id: Conversation id
+            model: Model that produced the context
+            context: Context token ids returned by the provider
+        """
+        self.discard(session_id)
+        if not context or len(context) > self.max_tokens:
+            return
+        self._sessions[session_id] = _Session(
+            model, tuple(context), time.monotonic() + self.ttl_seconds
+        )
+        self._tokens += len(context)
+        while len(self._sessions) > self.max_sessions or self._tokens > self.max_tokens:
+            _, evicted = self._sessions.popitem(last=False)
+            self._tokens -= len(evicted.context)
+            self.evictions += 1
+
+    def discard(self, session_id: str) -> None:
+        """Forget a conversation.
+
+        Args:
+            session_id: Conversation id
+        """
+        session = self._sessions.pop(session_id, None)
+        if session is not None:
+            self._tokens -= len(session.context)
+
+    def stats(self) -> dict[str, Any]:
+        """Size and hit figures.
+
+        Returns:
+            dict: Sessions, tokens held, hits, misses and evictions
+        """
+        return {
+            "sessions": len(self._sessions),
+            "tokens": self._tokens,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
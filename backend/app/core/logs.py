@@ -0,0 +1,325 @@
+"""Structured logging pipeline.
+
+Configured once by ``configure_logging`` in the app lifespan, so importing
+the app (e.g. in tests) leaves logging alone. The request path only does
+the cheap part of logging:
+
+1. Loggers are cached bound loggers that filter by level before running
+   any processor, so disabled levels cost one method call.
+2. Hot events are sampled and rate limited before anything is rendered.
+   ``allow`` lets a call site skip building an expensive event entirely.
+3. The event dict is timestamped and put on a bounded queue. When the
+   queue is full the record is dropped and counted, never waited on.
+
+A background listener thread renders the records, as JSON in production,
+and writes them to stdout. Rendering time is measured there, and long
+values are truncated so one huge field can't stall the writer.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import threading
+import time
+from collections.abc import Callable, Mapping
+from datetime import datetime, timezone
+from typing import Any, TextIO
+
+import orjson
+import structlog
+from structlog.types import EventDict, Processor, WrappedLogger
+
+# Longer string values are cut before rendering.
+MAX_VALUE_CHARS = 2000
+
+# Chatty third-party loggers held at WARNING, e.g. one line per HTTP call.
+_QUIET_LOGGERS = ("httpx", "httpcore", "hpack")
+
+# Levels that are never sampled away.
+_UNSAMPLED_METHODS = frozenset({"warning", "error", "critical", "exception"})
+
+
+class EventSampler:
+    """Per-event sampling and rate limits for hot log events."""
+
+    def __init__(
+        self,
+        sample_rates: Mapping[str, float] | None = None,
+        max_per_second: Mapping[str, float] | None = None,
+        rng: Callable[[], float] = random.random,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the sampler.
+
+        Args:
+            sample_rates: Event name to the share of occurrences kept
+            max_per_second: Event name to the most occurrences kept per second
+            rng: Uniform [0, 1) source
+            clock: Monotonic time source
+        """
+        self.sample_rates = dict(sample_rates or {})
+        self.max_per_second = dict(max_per_second or {})
+        self._rng = rng
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self.dropped: dict[str, int] = {}
+
+    def allow(self, event: str) -> bool:
+        """Decide whether to keep one occurrence of an event.
+
+        Args:
+            event: Event name
+
+        Returns:
+            bool: False if the occurrence should not be logged
+        """
+        rate = self.sample_rates.get(event)
+        limit = self.max_per_second.get(event)
+        if rate is None and limit is None:
+            return True
+
+        keep = rate is None or self._rng() < rate
+        if keep and limit is not None:
+            with self._lock:
+                now = self._clock()
+                tokens, updated = self._buckets.get(event, (limit, now))
+                tokens = min(limit, tokens + (now - updated) * limit)
+                keep = tokens >= 1.0
+                self._buckets[event] = (tokens - 1.0 if keep else tokens, now)
+        if not keep:
+            self.dropped[event] = self.dropped.get(event, 0) + 1
+        return keep
+
+    def __call__(
+        self, _logger: WrappedLogger, method_name: str, event_dict: EventDict
+    ) -> EventDict:
+        """Processor that drops sampled-out events.
+
+        Events logged with ``sampled=True`` were already gated with
+        ``allow`` at the call site and pass through; the marker is removed
+        so it isn't rendered.
+        """
+        sampled = event_dict.pop("sampled", False)
+        if sampled or method_name in _UNSAMPLED_METHODS:
+            return event_dict
+        if not self.allow(str(event_dict.get("event", ""))):
+            raise structlog.DropEvent
+        return event_dict
+
+
+class LogStats:
+    """Counters for the logging pipeline."""
+
+    def __init__(self) -> None:
+        self.enqueued = 0
+        self.queue_full = 0
+        self.enqueue_ns = 0
+        self.rendered = 0
+        self.render_ns = 0
+        self.render_ns_max = 0
+
+    def snapshot(self, sampler: EventSampler) -> dict[str, Any]:
+        """Current figures, with times in microseconds."""
+        return {
+            "enqueued": self.enqueued,
+            "dropped_queue_full": self.queue_full,
+            "dropped_sampled": dict(sampler.dropped),
+            "enqueue_us_avg": round(self.enqueue_ns / max(self.enqueued, 1) / 1000, 2),
+            "rendered": self.rendered,
+            "render_us_avg": round(self.render_ns / max(self.rendered, 1) / 1000, 2),
+            "render_us_max": round(self.render_ns_max / 1000, 2),
+        }
+
+
+_sampler = EventSampler()
+_stats = LogStats()
+_listener: logging.handlers.QueueListener | None = None
+
+
+def allow(event: str) -> bool:
+    """Gate an expensive hot event at its call site.
+
+    Log the event with ``sampled=True`` when this returns True, so the
+    pipeline doesn't sample it a second time.
+
+    Args:
+        event: Event name
+
+    Returns:
+        bool: True if this occurrence should be logged
+    """
+    return _sampler.allow(event)
+
+
+def stats() -> dict[str, Any]:
+    """Logging pipeline counters for this process.
+
+    Returns:
+        dict: Queue, drop and render figures
+    """
+    return _stats.snapshot(_sampler)
+
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that never formats or blocks on the caller's thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Rendering happens on the listener thread.
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        started = time.perf_counter_ns()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _stats.queue_full += 1
+            return
+        _stats.enqueued += 1
+        _stats.enqueue_ns += time.perf_counter_ns() - started
+
+
+class _StdoutHandler(logging.StreamHandler):  # type: ignore[type-arg]
+    """Stream handler that writes to whatever ``sys.stdout`` currently is."""
+
+    @property
+    def stream(self) -> TextIO:
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, _value: TextIO) -> None:
+        pass
+
+
+def _stamp(
+    _logger: WrappedLogger, _method_name: str, event_dict: EventDict
+) -> EventDict:
+    """Record the event time cheaply; it is formatted off the request path."""
+    event_dict.setdefault("_ts", time.time())
+    return event_dict
+
+
+def _format_timestamp(
+    _logger: WrappedLogger, _method_name: str, event_dict: EventDict
+) -> EventDict:
+    ts = event_dict.pop("_ts", None)
+    moment = datetime.fromtimestamp(ts if ts is not None else time.time(), timezone.utc)
+    event_dict["timestamp"] = moment.isoformat().replace("+00:00", "Z")
+    return event_dict
+
+
+def _truncate(
+    _logger: WrappedLogger, _method_name: str, event_dict: EventDict
+) -> EventDict:
+    for key, value in event_dict.items():
+        if isinstance(value, str) and len(value) > MAX_VALUE_CHARS:
+            event_dict[key] = f"{value[:MAX_VALUE_CHARS]}…[{len(value)} chars]"
+    return event_dict
+
+
+def _dumps(obj: Any, default: Callable[[Any], Any] | None = None, **_: Any) -> str:
+    return orjson.dumps(obj, default=default).decode()
+
+
+class _TimedRenderer:
+    """Wraps the final renderer to measure rendering cost."""
+
+    def __init__(self, renderer: Processor) -> None:
+        self.renderer = renderer
+
+    def __call__(
+        self, logger: WrappedLogger, method_name: str, event_dict: EventDict
+    ) -> Any:
+        started = time.perf_counter_ns()
+        rendered = self.renderer(logger, method_name, event_dict)
+        elapsed = time.perf_counter_ns() - started
+        _stats.rendered += 1
+        _stats.render_ns += elapsed
+        _stats.render_ns_max = max(_stats.render_ns_max, elapsed)
+        return rendered
+
+
+def configure_logging(
+    level: str = "INFO",
+    json_logs: bool = True,
+    sample_rates: Mapping[str, float] | None = None,
+    max_per_second: Mapping[str, float] | None = None,
+    queue_size: int = 10_000,
+) -> None:
+    """Configure structlog and the stdlib root logger.
+
+    Safe to call again, e.g. per test app; the previous listener thread is
+    stopped first.
+
+    Args:
+        level: Minimum level name, e.g. ``"INFO"``
+        json_logs: Render JSON lines; otherwise human-readable console output
+        sample_rates: Event name to the share of occurrences kept
+        max_per_second: Event name to the most occurrences kept per second
+        queue_size: Records buffered before new ones are dropped
+    """
+    global _listener, _sampler
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+    level_no = logging.getLevelName(level.upper())
+    if not isinstance(level_no, int):
+        level_no = logging.INFO
+    _sampler = EventSampler(sample_rates, max_per_second)
+
+    structlog.configure(
+        processors=[
+            structlog.contextvars.merge_contextvars,
+            structlog.processors.add_log_level,
+            _sampler,
+            _stamp,
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+        ],
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.make_filtering_bound_logger(level_no),
+        cache_logger_on_first_use=True,
+    )
+
+    renderer: Processor = (
+        structlog.processors.JSONRenderer(serializer=_dumps)
+        if json_logs
+        else structlog.dev.ConsoleRenderer()
+    )
+    formatter = structlog.stdlib.ProcessorFormatter(
+        foreign_pre_chain=[structlog.stdlib.add_log_level, _stamp],
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            _format_timestamp,
+            structlog.processors.format_exc_info,
+            _truncate,
+            _TimedRenderer(renderer),
+        ],
+    )
+    output = _StdoutHandler()
+    output.setFormatter(formatter)
+
+    records: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=queue_size)
+    root = logging.getLogger()
+    root.handlers = [_NonBlockingQueueHandler(records)]
+    root.setLevel(level_no)
+    for name in _QUIET_LOGGERS:
+        logging.getLogger(name).setLevel(max(level_no, logging.WARNING))
+
+    _listener = logging.handlers.QueueListener(records, output)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
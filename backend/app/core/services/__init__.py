@@ -0,0 +1 @@
+"""Business logic orchestration across tarot, LLM and persistence."""
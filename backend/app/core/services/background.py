@@ -0,0 +1,64 @@
+"""Fire-and-forget tasks that must not be lost.
+
+Work taken off the request path (database writes, refunds) is spawned
+here so a strong reference is kept until it finishes, failures are
+logged, and shutdown can wait for anything still in flight.
+"""
+
+import asyncio
+from collections.abc import Coroutine
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+_tasks: set[asyncio.Task[Any]] = set()
+
+
+def _finished(task: asyncio.Task[Any]) -> None:
+    _tasks.discard(task)
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error is not None:
+        logger.error(
+            "background_task_failed",
+            task=task.get_name(),
+            error=str(error),
+            exc_info=error,
+        )
+
+
+def spawn(coro: Coroutine[Any, Any, Any], name: str) -> asyncio.Task[Any]:
+    """Run a coroutine in the background.
+
+    Args:
+        coro: Coroutine to run
+        name: Task name, used in logs
+
+    Returns:
+        asyncio.Task: The scheduled task
+    """
+    task = asyncio.create_task(coro, name=name)
+    _tasks.add(task)
+    task.add_done_callback(_finished)
+    return task
+
+
+def pending() -> int:
+    """Number of background tasks still running."""
+    return len(_tasks)
+
+
+async def drain(timeout: float = 10.0) -> None:
+    """Wait for in-flight background tasks, e.g. at shutdown.
+
+    Args:
+        timeout: Seconds to wait before giving up
+    """
+    if not _tasks:
+        return
+    _done, still_running = await asyncio.wait(list(_tasks), timeout=timeout)
+    if still_running:
+        logger.warning("background_tasks_abandoned", count=len(still_running))
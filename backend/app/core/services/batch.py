@@ -0,0 +1,215 @@
+"""Batch reading generation for internal tooling.
+
+Prompt evaluation and QA sweeps need hundreds of readings. A batch draws
+every job's cards up front in one pass, then fans generation out over all
+configured providers. Each provider runs a fixed number of workers pulling
+from one shared queue, so faster providers naturally take more jobs.
+Results are yielded in completion order, and a failed job becomes an
+error result instead of aborting the batch.
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+
+from app.core.exceptions import AlembicError
+from app.core.llm.client import LLMClient
+from app.core.services.generation import generate_interpretation
+from app.core.services.reading import resolve_spread, serialize_cards
+from app.core.tarot.deck import DrawnCard, TarotDeck
+from app.core.tarot.spreads import Spread
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class BatchJob:
+    """A question to read with a spread."""
+
+    question: str
+    spread_type: str = "three_card"
+    job_id: str | None = None
+    strategy: str | None = None
+
+
+@dataclass(slots=True)
+class BatchResult:
+    """Outcome of one job."""
+
+    index: int
+    job_id: str | None
+    ok: bool
+    spread_type: str
+    cards: list[dict[str, Any]] = field(default_factory=list)
+    interpretation: str | None = None
+    provider: str | None = None
+    error: str | None = None
+    generation: dict[str, Any] | None = None
+    duration_ms: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """One NDJSON line of the batch response."""
+        return {
+            "index": self.index,
+            "id": self.job_id,
+            "status": "ok" if self.ok else "error",
+            "spread_type": self.spread_type,
+            "cards": self.cards,
+            "interpretation": self.interpretation,
+            "provider": self.provider,
+            "error": self.error,
+            "generation": self.generation,
+            "duration_ms": round(self.duration_ms, 1),
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class _Prepared:
+    index: int
+    job: BatchJob
+    spread: Spread
+    drawn: list[DrawnCard]
+    cards: list[dict[str, Any]]
+
+
+class ReadingBatch:
+    """Generates many readings with bounded concurrency per provider."""
+
+    def __init__(
+        self,
+        deck: TarotDeck,
+        providers: Mapping[str, LLMClient],
+        concurrency: int = 4,
+    ) -> None:
+        """Initialize the batch runner.
+
+        Args:
+            deck: Shared tarot deck
+            providers: Clients keyed by provider name
+            concurrency: Generations in flight per provider
+        """
+        if not providers:
+            msg = "A batch needs at least one provider"
+            raise ValueError(msg)
+        self.deck = deck
+        self.providers = dict(providers)
+        self.concurrency = concurrency
+
+    def _prepare(
+        self, jobs: Sequence[BatchJob]
+    ) -> tuple[list[_Prepared], list[BatchResult]]:
+        """Resolve spreads and draw every job's cards before generating."""
+        prepared: list[_Prepared] = []
+        rejected: list[BatchResult] = []
+        for index, job in enumerate(jobs):
+            try:
+                spread = resolve_spread(job.spread_type)
+            except AlembicError as e:
+                rejected.append(
+                    BatchResult(
+                        index, job.job_id, False, job.spread_type, error=e.message
+                    )
+                )
+                continue
+            cards = self.deck.draw_with_reversals(spread.card_count)
+            prepared.append(
+                _Prepared(
+                    index=index,
+                    job=job,
+                    spread=spread,
+                    drawn=cards,
+                    cards=serialize_cards(spread, cards),
+                )
+            )
+        return prepared, rejected
+
+    async def _worker(
+        self,
+        provider: str,
+        client: LLMClient,
+        queue: asyncio.Queue[_Prepared],
+        results: asyncio.Queue[BatchResult],
+    ) -> None:
+        while True:
+            try:
+                item = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            started = time.perf_counter()
+            result = BatchResult(
+                item.index,
+                item.job.job_id,
+                False,
+                item.job.spread_type,
+                cards=item.cards,
+                provider=provider,
+            )
+            try:
+                generated = await generate_interpretation(
+                    client,
+                    item.job.question,
+                    item.spread,
+                    item.drawn,
+                    strategy=item.job.strategy,
+                )
+                result.interpretation = generated.text
+                result.generation = generated.stats()
+                result.ok = True
+            except Exception as e:
+                logger.warning(
+                    "batch_item_failed",
+                    index=item.index,
+                    provider=provider,
+                    error=str(e),
+                )
+                result.error = str(e) or type(e).__name__
+            result.duration_ms = (time.perf_counter() - started) * 1000
+            await results.put(result)
+
+    async def run(self, jobs: Sequence[BatchJob]) -> AsyncIterator[BatchResult]:
+        """Generate readings for every job.
+
+        Closing the iterator early cancels the remaining work.
+
+        Args:
+            jobs: Jobs to run
+
+        Yields:
+            BatchResult: One per job, in completion order
+        """
+        started = time.perf_counter()
+        prepared, rejected = self._prepare(jobs)
+        for result in rejected:
+            yield result
+
+        queue: asyncio.Queue[_Prepared] = asyncio.Queue()
+        for item in prepared:
+            queue.put_nowait(item)
+        results: asyncio.Queue[BatchResult] = asyncio.Queue()
+        workers = [
+            asyncio.create_task(self._worker(name, client, queue, results))
+            for name, client in self.providers.items()
+            for _ in range(min(self.concurrency, len(prepared)))
+        ]
+
+        failed = len(rejected)
+        try:
+            for _ in prepared:
+                result = await results.get()
+                failed += not result.ok
+                yield result
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            logger.info(
+                "batch_complete",
+                jobs=len(jobs),
+                failed=failed,
+                providers=list(self.providers),
+                duration_s=round(time.perf_counter() - started, 2),
+            )
@@ -0,0 +1,407 @@
+"""Follow-up conversations about a stored reading.
+
+Every chat turn needs the reading, its cards and the recent messages to
+build the prompt. Active conversations are kept in memory so a turn is
+served without touching the database: the cache holds the reading and
+its last few messages, is updated write-through as each exchange is
+stored, and drops conversations that sit idle or fall off the LRU end.
+
+A miss loads the reading by primary key and the newest messages through
+the ``(reading_id, created_at)`` index (migration 006).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+import structlog
+
+from app.config import Settings
+from app.core.exceptions import (
+    LLMError,
+    ReadingAccessDeniedError,
+    ReadingNotFoundError,
+)
+from app.core.llm.client import LLMClient
+from app.core.llm.prompts import PromptTemplates
+
+logger = structlog.get_logger(__name__)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+@dataclass(frozen=True, slots=True)
+class ChatMessage:
+    """One stored chat message."""
+
+    role: str
+    content: str
+    created_at: str
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> ChatMessage:
+        """Build a message from a ``reading_messages`` row.
+
+        Args:
+            row: Table row
+
+        Returns:
+            ChatMessage: The message
+        """
+        return cls(str(row["role"]), str(row["content"]), str(row["created_at"]))
+
+    def to_response(self) -> dict[str, Any]:
+        """Body for ``POST /api/reading/{id}/chat``."""
+        return {
+            "role": self.role,
+            "content": self.content,
+            "created_at": self.created_at.replace("+00:00", "Z"),
+        }
+
+
+@dataclass(slots=True)
+class Conversation:
+    """A reading and the tail of its chat."""
+
+    reading_id: str
+    user_id: str
+    question: str
+    cards: list[dict[str, Any]]
+    interpretation: str
+    messages: deque[ChatMessage]
+    # Serializes turns, so each one sees the previous reply
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    @classmethod
+    def from_rows(
+        cls,
+        reading: Mapping[str, Any],
+        messages: Sequence[Mapping[str, Any]],
+        max_messages: int,
+    ) -> Conversation:
+        """Build a conversation from stored rows.
+
+        Args:
+            reading: ``readings`` row
+            messages: ``reading_messages`` rows, oldest first
+            max_messages: Most recent messages to keep
+
+        Returns:
+            Conversation: The conversation
+        """
+        return cls(
+            reading_id=str(reading["id"]),
+            user_id=str(reading["user_id"]),
+            question=reading["question"],
+            cards=list(reading.get("cards") or []),
+            interpretation=reading["interpretation"],
+            messages=deque(
+                (ChatMessage.from_row(row) for row in messages), maxlen=max_messages
+            ),
+        )
+
+    def card_labels(self) -> list[str]:
+        """Cards formatted for a prompt, with orientation and position."""
+        labels = []
+        for card in self.cards:
+            label = PromptTemplates.format_card_info(card, bool(card.get("reversed")))
+            if card.get("position"):
+                label += f" in {card['position']}"
+            labels.append(label)
+        return labels
+
+    def history(self) -> list[tuple[str, str]]:
+        """Cached messages as ``(role, content)`` pairs, oldest first."""
+        return [(message.role, message.content) for message in self.messages]
+
+
+class ConversationCache:
+    """In-memory LRU of active conversations with idle expiry."""
+
+    _instance: ConversationCache | None = None
+
+    def __init__(
+        self,
+        max_conversations: int = 1024,
+        idle_seconds: float = 1800.0,
+        max_messages: int = 20,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_conversations: Most conversations kept
+            idle_seconds: Time since last use after which one is dropped
+            max_messages: Most recent messages kept per conversation
+        """
+        self.max_conversations = max_conversations
+        self.idle_seconds = idle_seconds
+        self.max_messages = max_messages
+        self._entries: OrderedDict[str, tuple[Conversation, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, reading_id: str) -> Conversation | None:
+        """Look up an active conversation.
+
+        Args:
+            reading_id: Reading the conversation is about
+
+        Returns:
+            Conversation | None: The conversation, or None if absent or idle
+            for too long
+        """
+        entry = self._entries.get(reading_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        conversation, last_used = entry
+        now = time.monotonic()
+        if now - last_used > self.idle_seconds:
+            del self._entries[reading_id]
+            self.evictions += 1
+            self.misses += 1
+            return None
+        self._entries[reading_id] = (conversation, now)
+        self._entries.move_to_end(reading_id)
+        self.hits += 1
+        return conversation
+
+    def put(self, conversation: Conversation) -> None:
+        """Start caching a conversation.
+
+        Args:
+            conversation: Conversation loaded from the store
+        """
+        self._entries[conversation.reading_id] = (conversation, time.monotonic())
+        self._entries.move_to_end(conversation.reading_id)
+        while len(self._entries) > self.max_conversations:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def append(self, reading_id: str, *messages: ChatMessage) -> None:
+        """Add stored messages to a cached conversation.
+
+        Messages beyond ``max_messages`` push the oldest out. Does nothing
+        if the conversation isn't cached; the next load will include them.
+
+        Args:
+            reading_id: Reading the conversation is about
+            messages: Messages already written to the store
+        """
+        entry = self._entries.get(reading_id)
+        if entry is not None:
+            entry[0].messages.extend(messages)
+
+    def discard(self, reading_id: str) -> None:
+        """Forget a conversation.
+
+        Args:
+            reading_id: Reading the conversation is about
+        """
+        self._entries.pop(reading_id, None)
+
+    def stats(self) -> dict[str, Any]:
+        """Size and hit figures.
+
+        Returns:
+            dict: Conversations held, hits, misses and evictions
+        """
+        return {
+            "conversations": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    @classmethod
+    def get_instance(cls, settings: Settings) -> ConversationCache:
+        """Get or create the process-wide cache.
+
+        Args:
+            settings: Application configuration
+
+        Returns:
+            ConversationCache: Singleton cache instance
+        """
+        if cls._instance is None:
+            cls._instance = cls(
+                max_conversations=settings.conversation_cache_size,
+                idle_seconds=settings.conversation_idle_seconds,
+                max_messages=settings.conversation_history_messages,
+            )
+        return cls._instance
+
+
+class ConversationStore(ABC):
+    """Persistence for readings' chat messages."""
+
+    @abstractmethod
+    async def load(self, reading_id: str, max_messages: int) -> Conversation | None:
+        """Load a reading and its newest messages.
+
+        Args:
+            reading_id: Reading id
+            max_messages: Most recent messages to load
+
+        Returns:
+            Conversation | None: The conversation, or None if the reading
+            doesn't exist
+        """
+
+    @abstractmethod
+    async def append(self, reading_id: str, messages: Sequence[ChatMessage]) -> None:
+        """Store messages for a reading.
+
+        Args:
+            reading_id: Reading id
+            messages: Messages in order
+        """
+
+
+class SupabaseConversationStore(ConversationStore):
+    """Conversation store backed by ``readings`` and ``reading_messages``."""
+
+    def __init__(self, client: Any) -> None:
+        """Initialize the store.
+
+        Args:
+            client: Supabase client with the service key
+        """
+        self.client = client
+
+    async def load(self, reading_id: str, max_messages: int) -> Conversation | None:
+        reading, messages = await asyncio.gather(
+            asyncio.to_thread(
+                self.client.table("readings")
+                .select("id, user_id, question, cards, interpretation")
+                .eq("id", reading_id)
+                .limit(1)
+                .execute
+            ),
+            asyncio.to_thread(
+                self.client.table("reading_messages")
+                .select("role, content, created_at")
+                .eq("reading_id", reading_id)
+                .order("created_at", desc=True)
+                .limit(max_messages)
+                .execute
+            ),
+        )
+        if not reading.data:
+            return None
+        newest_first = messages.data or []
+        return Conversation.from_rows(reading.data[0], newest_first[::-1], max_messages)
+
+    async def append(self, reading_id: str, messages: Sequence[ChatMessage]) -> None:
+        rows = [
+            {
+                "reading_id": reading_id,
+                "role": message.role,
+                "content": message.content,
+                "created_at": message.created_at,
+            }
+            for message in messages
+        ]
+        await asyncio.to_thread(
+            self.client.table("reading_messages").insert(rows).execute
+        )
+
+
+class ConversationService:
+    """Answers chat messages about a reading."""
+
+    def __init__(
+        self, cache: ConversationCache, store: ConversationStore, llm: LLMClient
+    ) -> None:
+        """Initialize the service.
+
+        Args:
+            cache: Active conversation cache
+            store: Message persistence
+            llm: Client used for replies
+        """
+        self.cache = cache
+        self.store = store
+        self.llm = llm
+
+    async def get(self, user_id: str, reading_id: str) -> Conversation:
+        """Fetch a conversation, from the cache when it is active.
+
+        Args:
+            user_id: Authenticated user id
+            reading_id: Reading id
+
+        Returns:
+            Conversation: The reading and its recent messages
+
+        Raises:
+            ReadingNotFoundError: If the reading doesn't exist
+            ReadingAccessDeniedError: If it belongs to another user
+        """
+        conversation = self.cache.get(reading_id)
+        if conversation is None:
+            conversation = await self.store.load(reading_id, self.cache.max_messages)
+            if conversation is None:
+                raise ReadingNotFoundError(reading_id)
+            self.cache.put(conversation)
+        if conversation.user_id != user_id:
+            raise ReadingAccessDeniedError(reading_id)
+        return conversation
+
+    async def reply(self, user_id: str, reading_id: str, message: str) -> ChatMessage:
+        """Answer a message and store the exchange.
+
+        Args:
+            user_id: Authenticated user id
+            reading_id: Reading the message is about
+            message: The seeker's message
+
+        Returns:
+            ChatMessage: The stored reply
+
+        Raises:
+            ReadingNotFoundError: If the reading doesn't exist
+            ReadingAccessDeniedError: If it belongs to another user
+            LLMError: If generation fails (nothing is stored)
+        """
+        conversation = await self.get(user_id, reading_id)
+        async with conversation.lock:
+            # Timestamps are set here: a default of NOW() would give both
+            # rows of the exchange the same one
+            question = ChatMessage("user", message, _now())
+            prompt = PromptTemplates.get_follow_up_prompt(
+                conversation.question,
+                conversation.card_labels(),
+                conversation.interpretation,
+                message,
+                conversation.history(),
+            )
+            try:
+                content = await self.llm.follow_up(
+                    reading_id,
+                    PromptTemplates.SYSTEM_PROMPT,
+                    prompt,
+                    PromptTemplates.get_follow_up_turn(message),
+                )
+            except Exception as e:
+                logger.error("chat_generation_failed", reading_id=reading_id)
+                msg = "Unable to generate response"
+                raise LLMError(msg) from e
+
+            answer = ChatMessage("assistant", content, _now())
+            await self.store.append(reading_id, [question, answer])
+            self.cache.append(reading_id, question, answer)
+        return answer
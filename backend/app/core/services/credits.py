@@ -0,0 +1,79 @@
+"""Credit reservation and refunds.
+
+Credits are reserved through the ``deduct_credits`` SQL function, which
+locks the user row, checks the balance and records the usage
+transaction atomically. ``refund_credits`` is its compensating action.
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class CreditLedger(ABC):
+    """Abstract credit store."""
+
+    @abstractmethod
+    async def reserve(self, user_id: str, amount: int, description: str) -> bool:
+        """Deduct credits if the balance allows it.
+
+        Args:
+            user_id: User to charge
+            amount: Credits to deduct
+            description: Transaction description
+
+        Returns:
+            bool: True if the credits were deducted
+        """
+
+    @abstractmethod
+    async def refund(self, user_id: str, amount: int, description: str) -> None:
+        """Return previously deducted credits.
+
+        Args:
+            user_id: User to credit
+            amount: Credits to return
+            description: Transaction description
+        """
+
+
+class SupabaseCreditLedger(CreditLedger):
+    """Credit ledger backed by the Supabase SQL functions."""
+
+    def __init__(self, client: Any) -> None:
+        """Initialize the ledger.
+
+        Args:
+            client: Supabase client with the service key
+        """
+        self.client = client
+
+    async def reserve(self, user_id: str, amount: int, description: str) -> bool:
+        response = await asyncio.to_thread(
+            self.client.rpc(
+                "deduct_credits",
+                {
+                    "p_user_id": user_id,
+                    "p_amount": amount,
+                    "p_description": description,
+                },
+            ).execute
+        )
+        return bool(response.data)
+
+    async def refund(self, user_id: str, amount: int, description: str) -> None:
+        await asyncio.to_thread(
+            self.client.rpc(
+                "refund_credits",
+                {
+                    "p_user_id": user_id,
+                    "p_amount": amount,
+                    "p_description": description,
+                },
+            ).execute
+        )
+        logger.info("credits_refunded", user_id=user_id, amount=amount)
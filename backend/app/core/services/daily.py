@@ -0,0 +1,369 @@
+"""Pre-generated daily one-card readings.
+
+The daily draw uses a fixed question, so it has only 78 cards × 2
+orientations = 156 possible prompts. Every interpretation is generated
+ahead of time, off-peak and at low concurrency, and stored in the
+interpretation cache. A daily draw is then a cache lookup.
+
+Each entry records the model that produced it and when. Entries from
+another model, or older than the refresh interval, are still served but
+regenerated in the background.
+
+Every uvicorn worker schedules the refresh, but only the one holding the
+``daily:refresh`` lease in the shared cache runs it, and entries another
+worker refreshed recently are found fresh and skipped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+from app.core.llm.cache import InterpretationCache
+from app.core.llm.client import LLMClient, LLMFactory
+from app.core.llm.prompts import PromptTemplates
+from app.core.services import background
+from app.core.tarot.deck import DrawnCard, TarotDeck
+from app.core.tarot.spreads import ONE_CARD
+
+if TYPE_CHECKING:
+    from app.config import Settings
+
+logger = structlog.get_logger(__name__)
+
+DAILY_QUESTION = "What do I most need to understand today?"
+
+# Bump when DAILY_TEMPLATE or DAILY_QUESTION change, so old entries are
+# no longer found and get regenerated.
+PROMPT_VERSION = 1
+
+REFRESH_LEASE = "daily:refresh"
+
+
+def daily_key(card_id: str, is_reversed: bool) -> str:
+    """Cache key for one card and orientation.
+
+    Args:
+        card_id: Card id, e.g. ``"major_00"``
+        is_reversed: Card orientation
+
+    Returns:
+        str: Interpretation cache key
+    """
+    return f"daily:v{PROMPT_VERSION}:{card_id}:{'r' if is_reversed else 'u'}"
+
+
+def seconds_until(hour_utc: int, now: datetime | None = None) -> float:
+    """Seconds until the next occurrence of an hour of the day.
+
+    Args:
+        hour_utc: Hour of the day, 0-23, in UTC
+        now: Current time, defaults to now
+
+    Returns:
+        float: Seconds to wait, always positive
+    """
+    now = now or datetime.now(timezone.utc)
+    target = now.replace(hour=hour_utc, minute=0, second=0, microsecond=0)
+    if target <= now:
+        target += timedelta(days=1)
+    return (target - now).total_seconds()
+
+
+@dataclass(frozen=True, slots=True)
+class DailyInterpretation:
+    """A stored daily interpretation with its provenance."""
+
+    card_id: str
+    is_reversed: bool
+    interpretation: str
+    model: str
+    generated_at: float
+
+    def to_json(self) -> str:
+        """Serialize for the interpretation cache."""
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, text: str) -> DailyInterpretation | None:
+        """Parse a cached entry.
+
+        Args:
+            text: Cached value
+
+        Returns:
+            DailyInterpretation | None: The entry, or None if malformed
+        """
+        try:
+            return cls(**json.loads(text))
+        except (TypeError, ValueError):
+            return None
+
+
+class DailyReadingService:
+    """Serves daily draws from pre-generated interpretations."""
+
+    _instance: DailyReadingService | None = None
+
+    def __init__(
+        self,
+        deck: TarotDeck,
+        llm: LLMClient,
+        cache: InterpretationCache,
+        refresh_seconds: float = 24 * 3600,
+        concurrency: int = 2,
+        lease_seconds: float = 3600.0,
+    ) -> None:
+        """Initialize the service.
+
+        Args:
+            deck: Shared tarot deck
+            llm: Uncached client used for generation
+            cache: Interpretation cache holding the entries
+            refresh_seconds: Entries older than this are regenerated
+            concurrency: Maximum generations in flight at once
+            lease_seconds: How long a refresh keeps other workers out if
+                its worker dies before releasing the lease
+        """
+        self.deck = deck
+        self.llm = llm
+        self.cache = cache
+        self.refresh_seconds = refresh_seconds
+        self.lease_seconds = lease_seconds
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._inflight: dict[str, asyncio.Task[DailyInterpretation]] = {}
+
+    @property
+    def model_version(self) -> str:
+        """Provider and model that new entries are generated with."""
+        model = ONE_CARD.profile.model_for(self.llm.provider) or getattr(
+            self.llm, "model", ""
+        )
+        return f"{type(self.llm).__name__}:{model}"
+
+    def combinations(self) -> list[tuple[Mapping[str, Any], bool]]:
+        """Every (card, is_reversed) pair a daily draw can produce."""
+        return [
+            (card, is_reversed)
+            for card in self.deck.all_cards
+            for is_reversed in (False, True)
+        ]
+
+    def is_fresh(self, entry: DailyInterpretation, now: float | None = None) -> bool:
+        """Whether an entry is current for this model and interval.
+
+        Args:
+            entry: Stored interpretation
+            now: Current epoch time, defaults to now
+
+        Returns:
+            bool: False if the entry should be regenerated
+        """
+        now = time.time() if now is None else now
+        return (
+            entry.model == self.model_version
+            and now - entry.generated_at < self.refresh_seconds
+        )
+
+    async def lookup(
+        self, card_id: str, is_reversed: bool, shared_first: bool = False
+    ) -> DailyInterpretation | None:
+        """Read a stored interpretation.
+
+        Args:
+            card_id: Card id
+            is_reversed: Card orientation
+            shared_first: Prefer the host-wide copy, which may be newer
+
+        Returns:
+            DailyInterpretation | None: The entry, fresh or not
+        """
+        cached = await self.cache.get(
+            daily_key(card_id, is_reversed), shared_first=shared_first
+        )
+        return DailyInterpretation.from_json(cached) if cached is not None else None
+
+    async def _generate(
+        self, card: Mapping[str, Any], is_reversed: bool
+    ) -> DailyInterpretation:
+        async with self._semaphore:
+            started = time.perf_counter()
+            text = await self.llm.generate(
+                PromptTemplates.SYSTEM_PROMPT,
+                PromptTemplates.get_daily_prompt(DAILY_QUESTION, card, is_reversed),
+                ONE_CARD.profile,
+            )
+        entry = DailyInterpretation(
+            card_id=card["id"],
+            is_reversed=is_reversed,
+            interpretation=text,
+            model=self.model_version,
+            generated_at=time.time(),
+        )
+        # Outlive the refresh interval so stale entries can still be served
+        # while they are regenerated.
+        ttl = max(self.cache.ttl_seconds, 2 * self.refresh_seconds)
+        await self.cache.set(
+            daily_key(entry.card_id, is_reversed), entry.to_json(), ttl
+        )
+        logger.debug(
+            "daily_interpretation_generated",
+            card_id=entry.card_id,
+            reversed=is_reversed,
+            duration_ms=round((time.perf_counter() - started) * 1000, 1),
+        )
+        return entry
+
+    def regenerate(
+        self, card: Mapping[str, Any], is_reversed: bool
+    ) -> asyncio.Task[DailyInterpretation]:
+        """Start generating an entry, joining any generation already running.
+
+        Args:
+            card: Card data
+            is_reversed: Card orientation
+
+        Returns:
+            asyncio.Task: Task resolving to the new entry
+        """
+        key = daily_key(card["id"], is_reversed)
+        task = self._inflight.get(key)
+        if task is None:
+            task = background.spawn(
+                self._generate(card, is_reversed), name="daily_generate"
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return task
+
+    async def interpretation(
+        self, card: Mapping[str, Any], is_reversed: bool
+    ) -> DailyInterpretation:
+        """Get the interpretation for a card, generating it only on a miss.
+
+        Stale entries are returned as they are and refreshed in the
+        background.
+
+        Args:
+            card: Card data
+            is_reversed: Card orientation
+
+        Returns:
+            DailyInterpretation: The stored or newly generated entry
+        """
+        entry = await self.lookup(card["id"], is_reversed)
+        if entry is None:
+            logger.info("daily_interpretation_miss", card_id=card["id"])
+            return await asyncio.shield(self.regenerate(card, is_reversed))
+        if not self.is_fresh(entry):
+            self.regenerate(card, is_reversed)
+        return entry
+
+    async def draw(self) -> tuple[DrawnCard, DailyInterpretation]:
+        """Draw today's card and its interpretation.
+
+        Returns:
+            tuple: The drawn card and its entry
+        """
+        (card,) = self.deck.draw_with_reversals(1)
+        return card, await self.interpretation(card.card_ref, card.reversed)
+
+    async def refresh(self, include_stale: bool = True) -> int:
+        """Generate every missing (and optionally stale) combination.
+
+        Does nothing while another worker holds the refresh lease.
+
+        Args:
+            include_stale: Also regenerate entries that exist but are stale
+
+        Returns:
+            int: Number of entries generated
+        """
+        if not await self.cache.acquire_lease(REFRESH_LEASE, self.lease_seconds):
+            logger.info("daily_refresh_skipped", reason="lease_held")
+            return 0
+        try:
+            return await self._refresh(include_stale)
+        finally:
+            await self.cache.release_lease(REFRESH_LEASE)
+
+    async def _refresh(self, include_stale: bool) -> int:
+        started = time.perf_counter()
+        now = time.time()
+
+        async def needs_generation(card: Mapping[str, Any], is_reversed: bool) -> bool:
+            entry = await self.lookup(card["id"], is_reversed, shared_first=True)
+            if entry is None:
+                return True
+            return include_stale and not self.is_fresh(entry, now)
+
+        combinations = self.combinations()
+        flags = await asyncio.gather(*(needs_generation(*c) for c in combinations))
+        pending = [c for c, needed in zip(combinations, flags, strict=True) if needed]
+
+        results = await asyncio.gather(
+            *(self.regenerate(*c) for c in pending), return_exceptions=True
+        )
+        failed = sum(isinstance(r, BaseException) for r in results)
+        logger.info(
+            "daily_refresh_complete",
+            checked=len(combinations),
+            generated=len(pending) - failed,
+            failed=failed,
+            duration_s=round(time.perf_counter() - started, 1),
+        )
+        return len(pending) - failed
+
+    async def run(self, hour_utc: int) -> None:
+        """Keep the daily entries generated, until cancelled.
+
+        Missing entries are filled straight away; the full refresh of stale
+        entries runs once a day at the off-peak hour. A failed refresh is
+        logged and retried at the next one.
+
+        Args:
+            hour_utc: Off-peak hour of the day, in UTC
+        """
+        include_stale = False
+        while True:
+            try:
+                await self.refresh(include_stale=include_stale)
+            except Exception as e:
+                logger.error("daily_refresh_failed", error=str(e))
+            include_stale = True
+            await asyncio.sleep(seconds_until(hour_utc))
+
+    @classmethod
+    def get_instance(cls, settings: Settings) -> DailyReadingService:
+        """Get or create the process-wide service.
+
+        Generation uses its own uncached client, so a refresh always reaches
+        the model instead of reading back the entry it is replacing.
+
+        Args:
+            settings: Application configuration
+
+        Returns:
+            DailyReadingService: Singleton service instance
+        """
+        if cls._instance is None:
+            cls._instance = cls(
+                deck=TarotDeck.get_instance(),
+                llm=LLMFactory.create(
+                    use_local=settings.use_local_llm,
+                    ollama_base_url=settings.ollama_base_url,
+                    grok_api_key=settings.xai_api_key,
+                    routing_rules=settings.llm_routing_rules,
+                ),
+                cache=InterpretationCache.get_instance(settings),
+                refresh_seconds=settings.daily_refresh_hours * 3600,
+                concurrency=settings.daily_pregen_concurrency,
+            )
+        return cls._instance
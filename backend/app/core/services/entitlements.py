@@ -0,0 +1,278 @@
+"""Per-user entitlements: subscription tier and credit balance.
+
+Tier-dependent decisions (model routing, scheduling) need the caller's
+tier before any LLM call. ``EntitlementCache`` keeps it, with the credit
+balance, in a bounded in-process LRU so those decisions cost a dict
+lookup instead of a database round trip.
+
+Entries are dropped as soon as this process changes what they hold:
+``EntitlementLedger`` invalidates a user after ``deduct_credits`` or
+``refund_credits``, and the Stripe webhook processor after it applies a
+subscription change or credit purchase. Subscription events may only name
+the Stripe customer, so the cache also indexes users by customer id.
+Changes made by other processes are picked up when the TTL runs out.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from app.config import Settings
+from app.core.database import get_service_client
+from app.core.services.credits import CreditLedger
+
+
+@dataclass(frozen=True, slots=True)
+class Entitlement:
+    """What a user may do right now."""
+
+    tier: str = "free"
+    credits: int = 0
+    stripe_customer_id: str | None = None
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> Entitlement:
+        """Build an entitlement from a ``users`` row.
+
+        Args:
+            row: Row with ``tier``, ``credits`` and the embedded
+                ``subscriptions`` rows
+
+        Returns:
+            Entitlement: The user's entitlement
+        """
+        subscriptions = row.get("subscriptions") or []
+        if isinstance(subscriptions, Mapping):
+            subscriptions = [subscriptions]
+        customer = next((s.get("stripe_customer_id") for s in subscriptions if s), None)
+        return cls(
+            tier=row.get("tier") or "free",
+            credits=int(row.get("credits") or 0),
+            stripe_customer_id=customer,
+        )
+
+
+class EntitlementStore(ABC):
+    """Source of users' tier and credit balance."""
+
+    @abstractmethod
+    async def fetch(self, user_id: str) -> Entitlement:
+        """Read a user's entitlement.
+
+        Args:
+            user_id: User id
+
+        Returns:
+            Entitlement: Tier and balance, free with no credits if the
+            user has no profile yet
+        """
+
+
+class SupabaseEntitlementStore(EntitlementStore):
+    """Entitlement store backed by the ``users`` table."""
+
+    def __init__(self, client: Any) -> None:
+        """Initialize the store.
+
+        Args:
+            client: Supabase client with the service key
+        """
+        self.client = client
+
+    async def fetch(self, user_id: str) -> Entitlement:
+        response = await asyncio.to_thread(
+            self.client.table("users")
+            .select("tier, credits, subscriptions(stripe_customer_id)")
+            .eq("id", user_id)
+            .limit(1)
+            .execute
+        )
+        rows = response.data or []
+        return Entitlement.from_row(rows[0]) if rows else Entitlement()
+
+
+class EntitlementCache:
+    """Bounded, expiring cache of entitlements in front of a store."""
+
+    _instance: EntitlementCache | None = None
+
+    def __init__(
+        self,
+        store: EntitlementStore,
+        max_users: int = 10_000,
+        ttl_seconds: float = 60.0,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            store: Store read on a miss
+            max_users: Most users kept
+            ttl_seconds: Age after which an entry is re-read
+        """
+        self.store = store
+        self.max_users = max_users
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[Entitlement, float]] = OrderedDict()
+        self._by_customer: dict[str, str] = {}
+        self._loading: dict[str, asyncio.Task[Entitlement]] = {}
+        # Users invalidated while a read was in flight; what that read
+        # fetched may predate the change, so it isn't stored
+        self._stale: set[str] = set()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def peek(self, user_id: str) -> Entitlement | None:
+        """Cached entitlement without touching the store.
+
+        Args:
+            user_id: User id
+
+        Returns:
+            Entitlement | None: The entry, or None if absent or expired
+        """
+        entry = self._entries.get(user_id)
+        if entry is None or entry[1] <= time.monotonic():
+            return None
+        self._entries.move_to_end(user_id)
+        return entry[0]
+
+    async def get(self, user_id: str) -> Entitlement:
+        """A user's entitlement, read from the store on a miss.
+
+        Concurrent misses for the same user share one read. The read runs
+        in its own task, so a caller that is cancelled stops waiting for it
+        without cancelling it for the others.
+
+        Args:
+            user_id: User id
+
+        Returns:
+            Entitlement: Tier and balance
+        """
+        cached = self.peek(user_id)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        loading = self._loading.get(user_id)
+        if loading is None:
+            loading = asyncio.create_task(
+                self._load(user_id), name=f"entitlement_read_{user_id}"
+            )
+            # Mark a failure retrieved even if every caller stopped waiting
+            loading.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._loading[user_id] = loading
+        return await asyncio.shield(loading)
+
+    async def _load(self, user_id: str) -> Entitlement:
+        try:
+            entitlement = await self.store.fetch(user_id)
+        finally:
+            self._loading.pop(user_id, None)
+            stale = user_id in self._stale
+            self._stale.discard(user_id)
+        if not stale:
+            self._put(user_id, entitlement)
+        return entitlement
+
+    def _put(self, user_id: str, entitlement: Entitlement) -> None:
+        self._drop(user_id)
+        self._entries[user_id] = (entitlement, time.monotonic() + self.ttl_seconds)
+        if entitlement.stripe_customer_id:
+            self._by_customer[entitlement.stripe_customer_id] = user_id
+        while len(self._entries) > self.max_users:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+
+    def _drop(self, user_id: str) -> None:
+        entry = self._entries.pop(user_id, None)
+        if entry is not None and entry[0].stripe_customer_id:
+            self._by_customer.pop(entry[0].stripe_customer_id, None)
+
+    def invalidate(self, user_id: str) -> None:
+        """Forget a user's entitlement after it changed.
+
+        Args:
+            user_id: User id
+        """
+        if user_id in self._loading:
+            self._stale.add(user_id)
+        self._drop(user_id)
+
+    def invalidate_many(
+        self, user_ids: Iterable[str] = (), customer_ids: Iterable[str] = ()
+    ) -> None:
+        """Forget entitlements by user or by Stripe customer.
+
+        Args:
+            user_ids: User ids
+            customer_ids: Stripe customer ids
+        """
+        for customer_id in customer_ids:
+            user_id = self._by_customer.get(customer_id)
+            if user_id is not None:
+                self.invalidate(user_id)
+        for user_id in user_ids:
+            self.invalidate(user_id)
+
+    def stats(self) -> dict[str, Any]:
+        """Size and hit figures.
+
+        Returns:
+            dict: Users held, hits and misses
+        """
+        return {"users": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    @classmethod
+    def get_instance(cls, settings: Settings) -> EntitlementCache:
+        """Get or create the process-wide cache.
+
+        Args:
+            settings: Application configuration
+
+        Returns:
+            EntitlementCache: Singleton cache instance
+        """
+        if cls._instance is None:
+            cls._instance = cls(
+                SupabaseEntitlementStore(get_service_client()),
+                max_users=settings.entitlement_cache_size,
+                ttl_seconds=settings.entitlement_ttl_seconds,
+            )
+        return cls._instance
+
+
+class EntitlementLedger(CreditLedger):
+    """Credit ledger decorator that invalidates cached balances."""
+
+    def __init__(self, inner: CreditLedger, cache: EntitlementCache) -> None:
+        """Wrap a ledger.
+
+        Args:
+            inner: Ledger that performs the writes
+            cache: Entitlement cache to invalidate
+        """
+        self.inner = inner
+        self.cache = cache
+
+    async def reserve(self, user_id: str, amount: int, description: str) -> bool:
+        try:
+            return await self.inner.reserve(user_id, amount, description)
+        finally:
+            # Even on error: whether the deduction committed is unknown
+            self.cache.invalidate(user_id)
+
+    async def refund(self, user_id: str, amount: int, description: str) -> None:
+        try:
+            await self.inner.refund(user_id, amount, description)
+        finally:
+            self.cache.invalidate(user_id)
@@ -0,0 +1,186 @@
+"""Streaming export of a user's full reading history.
+
+Readings are pulled from the history store in fixed-size keyset chunks
+and encoded one reading at a time, so memory stays flat however long the
+history is: at most one chunk is held while the response is written.
+
+Every reading in the output carries a ``cursor``. An interrupted download
+is resumed by dropping the incomplete tail, taking the ``cursor`` of the
+last complete reading and requesting the export again with ``after`` set
+to it; the new response starts with the next reading. Cursors are keys,
+not byte offsets, so resuming stays correct if readings are added in
+between.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+from collections.abc import AsyncIterator, Mapping
+from typing import Any, Literal
+
+import orjson
+
+from app.core.services.history import ExportCursor, ReadingHistoryStore
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+CSV_COLUMNS = (
+    "record_type",
+    "reading_id",
+    "created_at",
+    "spread_type",
+    "question",
+    "interpretation",
+    "cards",
+    "message_id",
+    "role",
+    "content",
+    "cursor",
+)
+
+
+def cursor_for(reading: Mapping[str, Any]) -> ExportCursor:
+    """Cursor that resumes an export after this reading.
+
+    Args:
+        reading: Exported reading row
+
+    Returns:
+        ExportCursor: Key of the reading
+    """
+    return ExportCursor(str(reading["created_at"]), str(reading["id"]))
+
+
+async def iter_readings(
+    store: ReadingHistoryStore,
+    user_id: str,
+    after: ExportCursor | None = None,
+    chunk_size: int = 200,
+) -> AsyncIterator[dict[str, Any]]:
+    """Yield all of a user's readings, oldest first, a chunk at a time.
+
+    Args:
+        store: Reading history store
+        user_id: Owner of the readings
+        after: Resume after this reading
+        chunk_size: Readings fetched per query
+
+    Yields:
+        dict: Reading rows with their ``messages``
+    """
+    while True:
+        rows = await store.export_chunk(user_id, chunk_size, after)
+        for row in rows:
+            yield row
+        if len(rows) < chunk_size:
+            return
+        after = cursor_for(rows[-1])
+
+
+async def ndjson_lines(
+    readings: AsyncIterator[dict[str, Any]],
+) -> AsyncIterator[bytes]:
+    """Encode readings as NDJSON, one reading and its messages per line.
+
+    Args:
+        readings: Reading rows
+
+    Yields:
+        bytes: One line per reading
+    """
+    async for reading in readings:
+        record = {**reading, "cursor": cursor_for(reading).encode()}
+        yield orjson.dumps(record) + b"\n"
+
+
+async def csv_lines(
+    readings: AsyncIterator[dict[str, Any]], header: bool = True
+) -> AsyncIterator[bytes]:
+    """Encode readings as CSV.
+
+    Each reading is a ``reading`` row followed by one ``message`` row per
+    message. The ``cursor`` column is set on the last row of each reading,
+    so a resume point is only reached once the reading is complete.
+
+    Args:
+        readings: Reading rows
+        header: Whether to start with the column names; off when resuming,
+            so the output can be appended to the partial file
+
+    Yields:
+        bytes: The rows for one reading at a time
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(CSV_COLUMNS)
+    async for reading in readings:
+        rows: list[list[Any]] = [
+            [
+                "reading",
+                reading["id"],
+                reading["created_at"],
+                reading["spread_type"],
+                reading["question"],
+                reading["interpretation"],
+                orjson.dumps(reading["cards"]).decode(),
+                "",
+                "",
+                "",
+                "",
+            ]
+        ]
+        rows.extend(
+            [
+                "message",
+                reading["id"],
+                message["created_at"],
+                "",
+                "",
+                "",
+                "",
+                message["id"],
+                message["role"],
+                message["content"],
+                "",
+            ]
+            for message in reading.get("messages") or []
+        )
+        rows[-1][-1] = cursor_for(reading).encode()
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def export_lines(
+    store: ReadingHistoryStore,
+    user_id: str,
+    export_format: ExportFormat,
+    after: ExportCursor | None = None,
+    chunk_size: int = 200,
+) -> AsyncIterator[bytes]:
+    """Stream a user's history in the given format.
+
+    Args:
+        store: Reading history store
+        user_id: Owner of the readings
+        export_format: ``"ndjson"`` or ``"csv"``
+        after: Resume after this reading
+        chunk_size: Readings fetched per query
+
+    Returns:
+        AsyncIterator[bytes]: Encoded output
+    """
+    readings = iter_readings(store, user_id, after, chunk_size)
+    if export_format == "csv":
+        return csv_lines(readings, header=after is None)
+    return ndjson_lines(readings)
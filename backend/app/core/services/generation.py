@@ -0,0 +1,195 @@
+"""Interpretation strategies.
+
+``single`` asks for the whole interpretation in one completion, so its
+latency grows with the length of the reading. ``fan_out`` interprets
+every position concurrently and then runs one short synthesis call, so a
+10-card spread takes roughly one position call plus the synthesis. The
+spread's generation profile picks the strategy; callers may override it
+to compare the two.
+
+Both strategies report how many calls they made and how much text went
+in and out, as a proxy for token cost.
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+
+from app.core.llm.client import LLMClient
+from app.core.llm.prompts import PromptTemplates
+from app.core.tarot.deck import DrawnCard
+from app.core.tarot.spreads import Spread
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class GenerationResult:
+    """An interpretation and what it cost to produce."""
+
+    text: str
+    strategy: str
+    calls: int
+    prompt_chars: int
+    output_chars: int
+    duration_ms: float
+
+    def stats(self) -> dict[str, Any]:
+        """Cost and latency figures for comparisons."""
+        return {
+            "strategy": self.strategy,
+            "calls": self.calls,
+            "prompt_chars": self.prompt_chars,
+            "output_chars": self.output_chars,
+            "duration_ms": round(self.duration_ms, 1),
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class InterpretationPart:
+    """One streamed piece of a fan-out interpretation."""
+
+    kind: str
+    text: str
+    position: int | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"type": self.kind, "position": self.position, "text": self.text}
+
+
+def _section_heading(spread: Spread, card: DrawnCard) -> str:
+    name = PromptTemplates.format_drawn(card)
+    return f"**{spread.positions[card.position].name} — {name}**"
+
+
+async def stream_fan_out(
+    llm: LLMClient,
+    question: str,
+    spread: Spread,
+    cards: Sequence[DrawnCard],
+) -> AsyncIterator[InterpretationPart]:
+    """Interpret positions concurrently, yielding them in position order.
+
+    Every position call starts at once; each is yielded as soon as it and
+    all positions before it are done. The synthesis follows the last one.
+    The first failed call fails the whole stream, and closing the iterator
+    cancels any calls still running and waits for them to stop.
+
+    Args:
+        llm: Client for the completions
+        question: The querent's question
+        spread: Spread being read
+        cards: Drawn cards in position order
+
+    Yields:
+        InterpretationPart: ``position`` parts, then one ``synthesis`` part
+    """
+    profile = spread.profile
+    position_profile = profile.for_part("position", profile.position_max_tokens)
+    tasks = [
+        asyncio.create_task(
+            llm.generate(
+                PromptTemplates.SYSTEM_PROMPT,
+                PromptTemplates.get_position_prompt(question, spread, position, card),
+                position_profile,
+            )
+        )
+        for position, card in zip(spread.positions, cards, strict=True)
+    ]
+    try:
+        readings: list[str] = []
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                error = task.exception()
+                if error is not None:
+                    raise error
+            while len(readings) < len(tasks) and tasks[len(readings)].done():
+                reading = tasks[len(readings)].result()
+                yield InterpretationPart("position", reading, len(readings))
+                readings.append(reading)
+
+        synthesis = await llm.generate(
+            PromptTemplates.SYSTEM_PROMPT,
+            PromptTemplates.get_synthesis_prompt(question, spread, cards, readings),
+            profile.for_part("synthesis", profile.synthesis_max_tokens),
+        )
+        yield InterpretationPart("synthesis", synthesis)
+    finally:
+        for task in tasks:
+            task.cancel()
+        # Wait out the cancellations and retrieve every outcome, including
+        # siblings that failed alongside the one raised
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def generate_interpretation(
+    llm: LLMClient,
+    question: str,
+    spread: Spread,
+    cards: Sequence[DrawnCard],
+    strategy: str | None = None,
+) -> GenerationResult:
+    """Interpret a reading with the spread's (or the given) strategy.
+
+    Args:
+        llm: Client for the completions
+        question: The querent's question
+        spread: Spread being read
+        cards: Drawn cards in position order
+        strategy: ``"single"`` or ``"fan_out"``; defaults to the profile's
+
+    Returns:
+        GenerationResult: Assembled interpretation with cost figures
+    """
+    strategy = strategy or spread.profile.strategy
+    started = time.perf_counter()
+
+    if strategy == "single" or spread.card_count == 1:
+        prompt = PromptTemplates.get_spread_prompt(question, spread, cards)
+        text = await llm.generate(PromptTemplates.SYSTEM_PROMPT, prompt, spread.profile)
+        return GenerationResult(
+            text=text,
+            strategy="single",
+            calls=1,
+            prompt_chars=len(PromptTemplates.SYSTEM_PROMPT) + len(prompt),
+            output_chars=len(text),
+            duration_ms=(time.perf_counter() - started) * 1000,
+        )
+
+    readings: list[str] = []
+    sections: list[str] = []
+    async for part in stream_fan_out(llm, question, spread, cards):
+        if part.position is None:
+            sections.append(part.text)
+            continue
+        readings.append(part.text)
+        heading = _section_heading(spread, cards[part.position])
+        sections.append(f"{heading}\n{part.text}")
+
+    output_chars = sum(len(r) for r in readings) + len(sections[-1])
+    prompt_chars = len(PromptTemplates.SYSTEM_PROMPT) * (len(cards) + 1)
+    prompt_chars += sum(
+        len(PromptTemplates.get_position_prompt(question, spread, position, card))
+        for position, card in zip(spread.positions, cards, strict=True)
+    )
+    prompt_chars += len(
+        PromptTemplates.get_synthesis_prompt(question, spread, cards, readings)
+    )
+    result = GenerationResult(
+        text="\n\n".join(sections),
+        strategy="fan_out",
+        calls=len(cards) + 1,
+        prompt_chars=prompt_chars,
+        output_chars=output_chars,
+        duration_ms=(time.perf_counter() - started) * 1000,
+    )
+    logger.debug("fan_out_complete", spread=spread.spread_id, **result.stats())
+    return result
@@ -0,0 +1,220 @@
+"""A user's stored reading history.
+
+Search runs in the database (migration 004): a generated ``tsvector``
+over question and interpretation, a GIN index led by ``user_id`` and the
+``search_readings`` function, which ranks matches and highlights
+snippets for one page at a time.
+
+Pages are keyset-paginated on ``(rank, created_at, id)``. The cursor
+handed to clients is that key for the last row, encoded opaquely, so
+deep pages cost the same as the first and rows can't be skipped or
+repeated the way they can with offsets.
+
+Exports (migration 005) walk every reading oldest first in fixed-size
+chunks keyed on ``(created_at, id)``, each reading carrying its messages.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+from abc import ABC, abstractmethod
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.exceptions import InvalidCursorError
+
+
+def _encode_key(*parts: Any) -> str:
+    raw = json.dumps(parts).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_key(token: str) -> list[Any]:
+    raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    parts = json.loads(raw)
+    if not isinstance(parts, list):
+        raise ValueError("cursor is not a key")
+    return parts
+
+
+@dataclass(frozen=True, slots=True)
+class SearchCursor:
+    """Position after the last row of a search page."""
+
+    rank: float
+    created_at: str
+    id: str
+
+    def encode(self) -> str:
+        """Opaque, URL-safe form for clients."""
+        return _encode_key(self.rank, self.created_at, self.id)
+
+    @classmethod
+    def decode(cls, token: str) -> SearchCursor:
+        """Parse a cursor from a client.
+
+        Raises:
+            InvalidCursorError: If the token is malformed
+        """
+        try:
+            rank, created_at, id_ = _decode_key(token)
+            return cls(float(rank), str(created_at), str(id_))
+        except (ValueError, TypeError) as e:
+            raise InvalidCursorError from e
+
+
+@dataclass(frozen=True, slots=True)
+class ExportCursor:
+    """Position after the last reading written to an export."""
+
+    created_at: str
+    id: str
+
+    def encode(self) -> str:
+        """Opaque, URL-safe form for clients."""
+        return _encode_key(self.created_at, self.id)
+
+    @classmethod
+    def decode(cls, token: str) -> ExportCursor:
+        """Parse a cursor from a client.
+
+        Raises:
+            InvalidCursorError: If the token is malformed
+        """
+        try:
+            created_at, id_ = _decode_key(token)
+            return cls(str(created_at), str(id_))
+        except (ValueError, TypeError) as e:
+            raise InvalidCursorError from e
+
+
+@dataclass(frozen=True, slots=True)
+class SearchPage:
+    """One page of ranked search results."""
+
+    results: list[dict[str, Any]]
+    next_cursor: str | None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"results": self.results, "next_cursor": self.next_cursor}
+
+
+def build_page(rows: Sequence[Mapping[str, Any]], limit: int) -> SearchPage:
+    """Turn up to ``limit + 1`` rows into a page and its next cursor.
+
+    Args:
+        rows: Rows from ``search_readings``, one more than a page if more exist
+        limit: Page size
+
+    Returns:
+        SearchPage: Results and the cursor for the next page, if any
+    """
+    page = list(rows[:limit])
+    next_cursor = None
+    if len(rows) > limit and page:
+        last = page[-1]
+        next_cursor = SearchCursor(
+            float(last["rank"]), str(last["created_at"]), str(last["id"])
+        ).encode()
+    results = [
+        {
+            "id": row["id"],
+            "question": row["question"],
+            "spread_type": row["spread_type"],
+            "created_at": row["created_at"],
+            "rank": row["rank"],
+            "question_snippet": row.get("question_snippet") or row["question"],
+            "snippet": row.get("snippet") or "",
+        }
+        for row in page
+    ]
+    return SearchPage(results, next_cursor)
+
+
+class ReadingHistoryStore(ABC):
+    """Read access to a user's stored readings."""
+
+    @abstractmethod
+    async def search(
+        self,
+        user_id: str,
+        query: str,
+        limit: int = 20,
+        after: SearchCursor | None = None,
+    ) -> SearchPage:
+        """Full-text search over a user's readings.
+
+        Args:
+            user_id: Owner of the readings
+            query: Web-search style query, e.g. ``career "new job" -money``
+            limit: Page size
+            after: Cursor from the previous page
+
+        Returns:
+            SearchPage: Best matches first, with highlighted snippets
+        """
+
+    @abstractmethod
+    async def export_chunk(
+        self, user_id: str, limit: int, after: ExportCursor | None = None
+    ) -> list[dict[str, Any]]:
+        """Fetch the next chunk of a user's readings, oldest first.
+
+        Args:
+            user_id: Owner of the readings
+            limit: Most readings to return
+            after: Last reading of the previous chunk
+
+        Returns:
+            list: Reading rows, each with a ``messages`` list in order
+        """
+
+
+class SupabaseReadingHistoryStore(ReadingHistoryStore):
+    """History store backed by the Supabase ``readings`` table."""
+
+    def __init__(self, client: Any) -> None:
+        """Initialize the store.
+
+        Args:
+            client: Supabase client with the service key
+        """
+        self.client = client
+
+    async def search(
+        self,
+        user_id: str,
+        query: str,
+        limit: int = 20,
+        after: SearchCursor | None = None,
+    ) -> SearchPage:
+        params: dict[str, Any] = {
+            "p_user_id": user_id,
+            "p_query": query,
+            # One extra row tells whether there is a next page
+            "p_limit": limit + 1,
+        }
+        if after is not None:
+            params |= {
+                "p_after_rank": after.rank,
+                "p_after_created_at": after.created_at,
+                "p_after_id": after.id,
+            }
+        response = await asyncio.to_thread(
+            self.client.rpc("search_readings", params).execute
+        )
+        return build_page(response.data or [], limit)
+
+    async def export_chunk(
+        self, user_id: str, limit: int, after: ExportCursor | None = None
+    ) -> list[dict[str, Any]]:
+        params: dict[str, Any] = {"p_user_id": user_id, "p_limit": limit}
+        if after is not None:
+            params |= {"p_after_created_at": after.created_at, "p_after_id": after.id}
+        response = await asyncio.to_thread(
+            self.client.rpc("export_readings", params).execute
+        )
+        return list(response.data or [])
@@ -0,0 +1,609 @@
+"""Durable reading jobs.
+
+Long spreads can take longer than a proxy will hold a request open. In job
+mode a reading is submitted, the client gets ``202 Accepted`` with a job
+id, and an in-process worker pool generates it. Clients poll for the
+result or follow it over server-sent events.
+
+Jobs live in a local SQLite database, so they survive restarts and can be
+shared by every worker process on the host. A claimed job holds a lease
+that its worker keeps extending. If the process dies, the lease runs out
+and another worker picks the job up again, up to ``max_attempts`` times.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Callable, Coroutine
+from contextlib import suppress
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+from app.core.llm.cache import InterpretationCache
+from app.core.llm.client import LLMClient, LLMFactory
+from app.core.services.generation import generate_interpretation
+from app.core.services.reading import resolve_spread, serialize_cards
+from app.core.tarot.deck import TarotDeck
+
+if TYPE_CHECKING:
+    from app.config import Settings
+
+logger = structlog.get_logger(__name__)
+
+
+class JobStatus(str, Enum):
+    """Lifecycle of a job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    @property
+    def is_terminal(self) -> bool:
+        return self not in (JobStatus.QUEUED, JobStatus.RUNNING)
+
+
+@dataclass(frozen=True, slots=True)
+class Job:
+    """A snapshot of one job row."""
+
+    id: str
+    status: JobStatus
+    priority: int
+    payload: dict[str, Any]
+    result: dict[str, Any] | None
+    error: str | None
+    attempts: int
+    created_at: float
+    started_at: float | None
+    finished_at: float | None
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> Job:
+        return cls(
+            id=row["id"],
+            status=JobStatus(row["status"]),
+            priority=row["priority"],
+            payload=json.loads(row["payload"]),
+            result=json.loads(row["result"]) if row["result"] else None,
+            error=row["error"],
+            attempts=row["attempts"],
+            created_at=row["created_at"],
+            started_at=row["started_at"],
+            finished_at=row["finished_at"],
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Public representation, with timings in milliseconds."""
+        queued_ms = (
+            (self.started_at - self.created_at) * 1000
+            if self.started_at is not None
+            else None
+        )
+        run_ms = (
+            (self.finished_at - self.started_at) * 1000
+            if self.finished_at is not None and self.started_at is not None
+            else None
+        )
+        return {
+            "id": self.id,
+            "status": self.status.value,
+            "priority": self.priority,
+            "attempts": self.attempts,
+            "result": self.result,
+            "error": self.error,
+            "timing": {
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "queued_ms": round(queued_ms, 1) if queued_ms is not None else None,
+                "run_ms": round(run_ms, 1) if run_ms is not None else None,
+            },
+        }
+
+
+class JobStore:
+    """Job queue in a local SQLite database.
+
+    All methods are synchronous; callers on the event loop run them with
+    ``asyncio.to_thread``.
+    """
+
+    _instance: JobStore | None = None
+
+    def __init__(self, path: Path | str, max_attempts: int = 3) -> None:
+        """Open (or create) the queue.
+
+        Args:
+            path: SQLite database file, or ``":memory:"``
+            max_attempts: Claims allowed before an abandoned job fails
+        """
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, isolation_level=None, check_same_thread=False, timeout=5.0
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                priority INTEGER NOT NULL,
+                payload TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                lease_expires_at REAL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_claim "
+            "ON jobs(status, priority DESC, created_at)"
+        )
+
+    def submit(self, payload: dict[str, Any], priority: int = 0) -> Job:
+        """Enqueue a job.
+
+        Args:
+            payload: Job input, stored as JSON
+            priority: Higher runs first
+
+        Returns:
+            Job: The queued job
+        """
+        job_id = str(uuid.uuid4())
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, priority, payload, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (job_id, JobStatus.QUEUED, priority, json.dumps(payload), time.time()),
+            )
+        job = self.get(job_id)
+        assert job is not None
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        """Fetch a job.
+
+        Args:
+            job_id: Job id
+
+        Returns:
+            Job | None: The job, or None if unknown
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return Job.from_row(row) if row is not None else None
+
+    def claim(self, lease_seconds: float) -> Job | None:
+        """Take the highest-priority runnable job.
+
+        Queued jobs and running jobs whose lease has expired are runnable.
+        Expired jobs that have used up their attempts are failed instead.
+
+        Args:
+            lease_seconds: How long the claim holds without a heartbeat
+
+        Returns:
+            Job | None: The claimed job, or None if the queue is empty
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? "
+                "WHERE status = ? AND lease_expires_at < ? AND attempts >= ?",
+                (
+                    JobStatus.FAILED,
+                    "Abandoned by its worker",
+                    now,
+                    JobStatus.RUNNING,
+                    now,
+                    self.max_attempts,
+                ),
+            )
+            row = self._conn.execute(
+                """
+                UPDATE jobs
+                SET status = ?, attempts = attempts + 1, started_at = ?,
+                    lease_expires_at = ?
+                WHERE id = (
+                    SELECT id FROM jobs
+                    WHERE status = ? OR (status = ? AND lease_expires_at < ?)
+                    ORDER BY priority DESC, created_at
+                    LIMIT 1
+                )
+                RETURNING *
+                """,
+                (
+                    JobStatus.RUNNING,
+                    now,
+                    now + lease_seconds,
+                    JobStatus.QUEUED,
+                    JobStatus.RUNNING,
+                    now,
+                ),
+            ).fetchone()
+        return Job.from_row(row) if row is not None else None
+
+    def heartbeat(self, job_id: str, lease_seconds: float) -> bool:
+        """Extend a running job's lease.
+
+        Args:
+            job_id: Job id
+            lease_seconds: New lease length from now
+
+        Returns:
+            bool: False if the job is no longer running, e.g. cancelled
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET lease_expires_at = ? WHERE id = ? AND status = ?",
+                (time.time() + lease_seconds, job_id, JobStatus.RUNNING),
+            )
+        return cursor.rowcount == 1
+
+    def _finish(
+        self,
+        job_id: str,
+        status: str,
+        result: dict[str, Any] | None = None,
+        error: str | None = None,
+    ) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, "
+                "lease_expires_at = NULL WHERE id = ? AND status = ?",
+                (
+                    status,
+                    json.dumps(result) if result is not None else None,
+                    error,
+                    time.time(),
+                    job_id,
+                    JobStatus.RUNNING,
+                ),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: str, result: dict[str, Any]) -> bool:
+        """Record a running job's result.
+
+        Args:
+            job_id: Job id
+            result: Job output, stored as JSON
+
+        Returns:
+            bool: False if the job was cancelled meanwhile
+        """
+        return self._finish(job_id, JobStatus.SUCCEEDED, result=result)
+
+    def fail(self, job_id: str, error: str) -> bool:
+        """Record a running job's failure.
+
+        Args:
+            job_id: Job id
+            error: Error message
+
+        Returns:
+            bool: False if the job was cancelled meanwhile
+        """
+        return self._finish(job_id, JobStatus.FAILED, error=error)
+
+    def release(self, job_id: str) -> None:
+        """Return a running job to the queue, e.g. at shutdown.
+
+        Args:
+            job_id: Job id
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, attempts = MAX(attempts - 1, 0), "
+                "started_at = NULL, lease_expires_at = NULL "
+                "WHERE id = ? AND status = ?",
+                (JobStatus.QUEUED, job_id, JobStatus.RUNNING),
+            )
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job.
+
+        Args:
+            job_id: Job id
+
+        Returns:
+            bool: True if the job was cancelled, False if already finished
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, lease_expires_at = NULL "
+                "WHERE id = ? AND status IN (?, ?)",
+                (
+                    JobStatus.CANCELLED,
+                    time.time(),
+                    job_id,
+                    JobStatus.QUEUED,
+                    JobStatus.RUNNING,
+                ),
+            )
+        return cursor.rowcount == 1
+
+    def purge(self, older_than_seconds: float) -> int:
+        """Delete finished jobs past their retention.
+
+        Args:
+            older_than_seconds: Retention for finished jobs
+
+        Returns:
+            int: Number of jobs deleted
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?",
+                (time.time() - older_than_seconds,),
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+JobHandler = Callable[[Job], Coroutine[Any, Any, dict[str, Any]]]
+
+
+async def _cancel(task: asyncio.Task[Any]) -> None:
+    """Cancel a handler task and wait until it has stopped."""
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+class JobWorkerPool:
+    """Runs queued jobs on the event loop with a fixed number of workers."""
+
+    _instance: JobWorkerPool | None = None
+
+    def __init__(
+        self,
+        store: JobStore,
+        handler: JobHandler,
+        workers: int = 2,
+        poll_interval: float = 1.0,
+        lease_seconds: float = 30.0,
+        job_timeout: float = 300.0,
+        retention_seconds: float = 86_400.0,
+        purge_interval: float = 3_600.0,
+    ) -> None:
+        """Initialize the pool.
+
+        Args:
+            store: Job queue
+            handler: Coroutine that turns a job into its result
+            workers: Jobs run concurrently by this process
+            poll_interval: Seconds between queue polls and lease heartbeats
+            lease_seconds: Lease length; must exceed ``poll_interval``
+            job_timeout: Seconds before a running job is failed
+            retention_seconds: How long finished jobs are kept
+            purge_interval: Seconds between purges of expired jobs
+        """
+        self.store = store
+        self.handler = handler
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.job_timeout = job_timeout
+        self.retention_seconds = retention_seconds
+        self.purge_interval = purge_interval
+        self._next_purge = 0.0
+        self._tasks: list[asyncio.Task[None]] = []
+        self._wakeup = asyncio.Event()
+
+    def start(self) -> None:
+        """Start the workers."""
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"job_worker_{n}")
+            for n in range(self.workers)
+        ]
+        logger.info("job_workers_started", workers=self.workers)
+
+    async def stop(self) -> None:
+        """Stop the workers, returning their running jobs to the queue."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        """Wake idle workers, e.g. after a submit."""
+        self._wakeup.set()
+
+    async def submit(self, payload: dict[str, Any], priority: int = 0) -> Job:
+        """Enqueue a job and wake a worker.
+
+        Args:
+            payload: Job input
+            priority: Higher runs first
+
+        Returns:
+            Job: The queued job
+        """
+        job = await asyncio.to_thread(self.store.submit, payload, priority)
+        self.notify()
+        return job
+
+    async def _purge(self) -> None:
+        # Shared by the workers: whichever gets here first purges, and the
+        # deadline moves before the await so the others skip this round
+        now = time.monotonic()
+        if now < self._next_purge:
+            return
+        self._next_purge = now + self.purge_interval
+        try:
+            purged = await asyncio.to_thread(self.store.purge, self.retention_seconds)
+        except sqlite3.Error as e:
+            logger.warning("job_purge_failed", error=str(e))
+            return
+        if purged:
+            logger.info("jobs_purged", purged=purged)
+
+    async def _work(self) -> None:
+        while True:
+            await self._purge()
+            try:
+                job = await asyncio.to_thread(self.store.claim, self.lease_seconds)
+            except sqlite3.Error as e:
+                logger.warning("job_claim_failed", error=str(e))
+                job = None
+            if job is None:
+                self._wakeup.clear()
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                continue
+            await self._run(job)
+
+    async def _run(self, job: Job) -> None:
+        log = logger.bind(job_id=job.id, attempt=job.attempts)
+        started = time.monotonic()
+        task = asyncio.create_task(self.handler(job))
+        try:
+            while True:
+                done, _ = await asyncio.wait({task}, timeout=self.poll_interval)
+                if done:
+                    break
+                try:
+                    running = await asyncio.to_thread(
+                        self.store.heartbeat, job.id, self.lease_seconds
+                    )
+                except sqlite3.Error as e:
+                    # Keep going; if the store stays unavailable the lease
+                    # lapses and the job is claimed again
+                    log.warning("job_heartbeat_failed", error=str(e))
+                    running = True
+                if not running:
+                    await _cancel(task)
+                    log.info("job_cancelled")
+                    return
+                if time.monotonic() - started > self.job_timeout:
+                    await _cancel(task)
+                    await self._store(self.store.fail, job.id, "Timed out")
+                    log.warning("job_timed_out", timeout=self.job_timeout)
+                    return
+        except asyncio.CancelledError:
+            await _cancel(task)
+            await self._store(self.store.release, job.id)
+            raise
+
+        if task.cancelled():
+            await self._store(self.store.fail, job.id, "Cancelled")
+            log.error("job_failed", error="cancelled")
+            return
+        error = task.exception()
+        if error is None:
+            await self._store(self.store.complete, job.id, task.result())
+            log.info(
+                "job_succeeded",
+                run_ms=round((time.monotonic() - started) * 1000, 1),
+            )
+        else:
+            await self._store(self.store.fail, job.id, str(error))
+            log.error("job_failed", error=str(error))
+
+    @staticmethod
+    async def _store(call: Callable[..., Any], job_id: str, *args: Any) -> None:
+        # A failed write leaves the job's lease to lapse, so it is claimed
+        # and run again rather than killing this worker
+        try:
+            await asyncio.to_thread(call, job_id, *args)
+        except sqlite3.Error as e:
+            logger.warning(
+                "job_store_failed",
+                job_id=job_id,
+                operation=call.__name__,
+                error=str(e),
+            )
+
+    @classmethod
+    def get_instance(cls, settings: Settings) -> JobWorkerPool:
+        """Get or create the process-wide pool for reading jobs.
+
+        Args:
+            settings: Application configuration
+
+        Returns:
+            JobWorkerPool: Singleton pool instance
+        """
+        if cls._instance is None:
+            store = JobStore(settings.job_queue_path)
+            llm = LLMFactory.get_instance(
+                use_local=settings.use_local_llm,
+                ollama_base_url=settings.ollama_base_url,
+                grok_api_key=settings.xai_api_key,
+                cache=InterpretationCache.get_instance(settings),
+                routing_rules=settings.llm_routing_rules,
+            )
+            cls._instance = cls(
+                store,
+                ReadingJobHandler(TarotDeck.get_instance(), llm),
+                workers=settings.job_workers,
+                job_timeout=settings.job_timeout_seconds,
+                retention_seconds=settings.job_retention_hours * 3600,
+                purge_interval=settings.job_purge_interval_seconds,
+            )
+        return cls._instance
+
+
+class ReadingJobHandler:
+    """Draws and interprets a reading for a job payload."""
+
+    def __init__(self, deck: TarotDeck, llm: LLMClient) -> None:
+        """Initialize the handler.
+
+        Args:
+            deck: Shared tarot deck
+            llm: Client used for the interpretation
+        """
+        self.deck = deck
+        self.llm = llm
+
+    async def __call__(self, job: Job) -> dict[str, Any]:
+        """Run a reading job.
+
+        Args:
+            job: Job with ``question`` and ``spread_type`` in its payload
+
+        Returns:
+            dict: Spread, cards and interpretation
+        """
+        question = job.payload["question"]
+        spread = resolve_spread(job.payload["spread_type"])
+        cards = self.deck.draw_with_reversals(spread.card_count)
+        generated = await generate_interpretation(self.llm, question, spread, cards)
+        return {
+            "question": question,
+            "spread_type": job.payload["spread_type"],
+            "cards": serialize_cards(spread, cards),
+            "interpretation": generated.text,
+            "generation": generated.stats(),
+        }
@@ -0,0 +1,263 @@
+"""Reading creation pipeline.
+
+Creating a reading needs a credit reservation (a database round trip) and
+an interpretation (an LLM call). Neither depends on the other, so the
+orchestrator starts both at once:
+
+1. The credit reservation starts in the background.
+2. Cards are drawn and the LLM call starts immediately.
+3. If the reservation is refused, the LLM call is cancelled.
+4. If generation fails after credits were taken, they are refunded.
+5. The reading row is written in the background after responding.
+
+End-to-end latency is therefore close to the model latency alone.
+"""
+
+import asyncio
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+import structlog
+
+from app.core.exceptions import (
+    InsufficientCreditsError,
+    InvalidSpreadError,
+    LLMError,
+)
+from app.core.llm.client import LLMClient
+from app.core.services import background
+from app.core.services.credits import CreditLedger
+from app.core.services.generation import generate_interpretation
+from app.core.tarot.deck import DrawnCard, TarotDeck
+from app.core.tarot.spreads import Spread, SpreadLibrary
+
+logger = structlog.get_logger(__name__)
+
+# API and database spread names that differ from SpreadLibrary ids.
+SPREAD_ALIASES: Mapping[str, str] = {"single": "one_card"}
+DB_SPREAD_TYPES: Mapping[str, str] = {"one_card": "single"}
+
+
+def resolve_spread(spread_type: str) -> Spread:
+    """Look up a spread by API name or id.
+
+    Args:
+        spread_type: e.g. ``"single"`` or ``"three_card"``
+
+    Returns:
+        Spread: The matching spread
+
+    Raises:
+        InvalidSpreadError: If no spread matches
+    """
+    spread = SpreadLibrary.get_spread(SPREAD_ALIASES.get(spread_type, spread_type))
+    if spread is None:
+        raise InvalidSpreadError(spread_type)
+    return spread
+
+
+def serialize_cards(spread: Spread, cards: Sequence[DrawnCard]) -> list[dict[str, Any]]:
+    """Serialize drawn cards for API responses and the ``readings.cards`` column.
+
+    Args:
+        spread: Spread the cards were drawn for
+        cards: Drawn cards in position order
+
+    Returns:
+        list: One entry per card with its position name
+    """
+    return [
+        {
+            "id": card.id,
+            "name": card.name,
+            "position": spread.positions[card.position].name,
+            "reversed": card.reversed,
+            "image_url": f"/cards/{card.card_ref.get('image', '')}",
+        }
+        for card in cards
+    ]
+
+
+@dataclass(frozen=True, slots=True)
+class Reading:
+    """A completed reading."""
+
+    id: str
+    user_id: str
+    question: str
+    spread: Spread
+    cards: list[dict[str, Any]]
+    interpretation: str
+    created_at: datetime
+
+    def to_row(self) -> dict[str, Any]:
+        """Row for the ``readings`` table."""
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "question": self.question,
+            "spread_type": DB_SPREAD_TYPES.get(
+                self.spread.spread_id, self.spread.spread_id
+            ),
+            "cards": self.cards,
+            "interpretation": self.interpretation,
+            "created_at": self.created_at.isoformat(),
+        }
+
+    def to_response(self) -> dict[str, Any]:
+        """Body for ``POST /api/reading``."""
+        return {
+            "id": self.id,
+            "question": self.question,
+            "spread_type": DB_SPREAD_TYPES.get(
+                self.spread.spread_id, self.spread.spread_id
+            ),
+            "cards": self.cards,
+            "interpretation": self.interpretation,
+            "created_at": self.created_at.isoformat().replace("+00:00", "Z"),
+        }
+
+
+class ReadingStore(ABC):
+    """Persistence for completed readings."""
+
+    @abstractmethod
+    async def save(self, reading: Reading) -> None:
+        """Persist a reading.
+
+        Args:
+            reading: Completed reading
+        """
+
+
+class SupabaseReadingStore(ReadingStore):
+    """Reading store backed by the Supabase ``readings`` table."""
+
+    def __init__(self, client: Any) -> None:
+        """Initialize the store.
+
+        Args:
+            client: Supabase client with the service key
+        """
+        self.client = client
+
+    async def save(self, reading: Reading) -> None:
+        await asyncio.to_thread(
+            self.client.table("readings").insert(reading.to_row()).execute
+        )
+
+
+class ReadingOrchestrator:
+    """Runs credit reservation concurrently with drawing and generation."""
+
+    def __init__(
+        self,
+        deck: TarotDeck,
+        llm: LLMClient,
+        ledger: CreditLedger,
+        store: ReadingStore,
+    ) -> None:
+        """Initialize the orchestrator.
+
+        Args:
+            deck: Shared tarot deck
+            llm: Client used for the interpretation
+            ledger: Credit store
+            store: Reading persistence
+        """
+        self.deck = deck
+        self.llm = llm
+        self.ledger = ledger
+        self.store = store
+
+    async def create(self, user_id: str, question: str, spread_type: str) -> Reading:
+        """Create a reading for a user.
+
+        Args:
+            user_id: Authenticated user id
+            question: The querent's question
+            spread_type: API spread name
+
+        Returns:
+            Reading: The completed reading; its row is written in the
+            background
+
+        Raises:
+            InvalidSpreadError: If the spread is unknown
+            InsufficientCreditsError: If the user can't pay for the spread
+            LLMError: If generation fails (credits are refunded)
+        """
+        spread = resolve_spread(spread_type)
+        log = logger.bind(user_id=user_id, spread=spread.spread_id)
+        description = f"Reading: {spread.name}"
+        started = time.perf_counter()
+
+        # Free spreads take no credits, so there is nothing to reserve or
+        # refund (``refund_credits`` rejects a zero amount)
+        paid = spread.credit_cost > 0
+        reservation = (
+            asyncio.create_task(
+                self.ledger.reserve(user_id, spread.credit_cost, description)
+            )
+            if paid
+            else None
+        )
+        cards = self.deck.draw_with_reversals(spread.card_count)
+        generation = asyncio.create_task(
+            generate_interpretation(self.llm, question, spread, cards)
+        )
+
+        try:
+            reserved = await reservation if reservation is not None else True
+        except BaseException:
+            # Whether the deduction committed is unknown, so don't refund.
+            generation.cancel()
+            raise
+        reserved_ms = (time.perf_counter() - started) * 1000
+
+        if not reserved:
+            generation.cancel()
+            log.warning("insufficient_credits", required=spread.credit_cost)
+            raise InsufficientCreditsError(required=spread.credit_cost)
+
+        try:
+            result = await generation
+        except BaseException as e:
+            log.error("reading_generation_failed", error=str(e))
+            if paid:
+                background.spawn(
+                    self.ledger.refund(
+                        user_id, spread.credit_cost, f"Refund: {description}"
+                    ),
+                    name="refund_credits",
+                )
+            if isinstance(e, Exception):
+                msg = "Unable to generate interpretation"
+                raise LLMError(msg) from e
+            raise
+
+        reading = Reading(
+            id=str(uuid.uuid4()),
+            user_id=user_id,
+            question=question,
+            spread=spread,
+            cards=serialize_cards(spread, cards),
+            interpretation=result.text,
+            created_at=datetime.now(timezone.utc),
+        )
+        background.spawn(self.store.save(reading), name="save_reading")
+
+        log.info(
+            "reading_created",
+            reading_id=reading.id,
+            reservation_ms=round(reserved_ms, 1),
+            strategy=result.strategy,
+            llm_calls=result.calls,
+            total_ms=round((time.perf_counter() - started) * 1000, 1),
+        )
+        return reading
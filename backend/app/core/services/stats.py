@@ -0,0 +1,190 @@
+"""Per-user reading statistics for the "your journey" view.
+
+Aggregates live in the ``user_reading_stats`` table (migration 003) and
+are updated by a trigger as each reading is inserted or deleted, so
+reading them is a single primary-key lookup however long a user's
+history is. ``ReadingStats.apply`` is the same fold in Python, used for
+tests and as the reference for the SQL. ``backfill_user_reading_stats``
+rebuilds the table from existing readings.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.core.tarot.deck import TarotDeck
+
+SUITS = ("major", "wands", "cups", "swords", "pentacles")
+
+
+def card_suit(card_id: str) -> str:
+    """Suit of a card id, ``"major"`` for the major arcana.
+
+    Args:
+        card_id: Card id, e.g. ``"minor_cups_01"``
+
+    Returns:
+        str: Suit name
+    """
+    if card_id.startswith("minor_"):
+        return card_id.split("_", 2)[1]
+    return "major"
+
+
+def _counts(value: Mapping[str, Any] | None) -> dict[str, int]:
+    return {str(k): int(v) for k, v in (value or {}).items()}
+
+
+@dataclass(frozen=True, slots=True)
+class ReadingStats:
+    """Running totals over all of a user's readings."""
+
+    total_readings: int = 0
+    total_cards: int = 0
+    reversed_cards: int = 0
+    card_counts: Mapping[str, int] = field(default_factory=dict)
+    suit_counts: Mapping[str, int] = field(default_factory=dict)
+    spread_counts: Mapping[str, int] = field(default_factory=dict)
+    first_reading_at: str | None = None
+    last_reading_at: str | None = None
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> ReadingStats:
+        """Build stats from a ``user_reading_stats`` row.
+
+        Args:
+            row: Table row
+
+        Returns:
+            ReadingStats: The user's totals
+        """
+        return cls(
+            total_readings=int(row.get("total_readings") or 0),
+            total_cards=int(row.get("total_cards") or 0),
+            reversed_cards=int(row.get("reversed_cards") or 0),
+            card_counts=_counts(row.get("card_counts")),
+            suit_counts=_counts(row.get("suit_counts")),
+            spread_counts=_counts(row.get("spread_counts")),
+            first_reading_at=row.get("first_reading_at"),
+            last_reading_at=row.get("last_reading_at"),
+        )
+
+    def apply(
+        self, spread_type: str, cards: Sequence[Mapping[str, Any]], created_at: str
+    ) -> ReadingStats:
+        """Fold one reading in, as the ``readings`` trigger does.
+
+        Args:
+            spread_type: Stored spread type, e.g. ``"single"``
+            cards: Stored cards, with ``id`` and ``reversed``
+            created_at: ISO timestamp of the reading
+
+        Returns:
+            ReadingStats: Updated totals
+        """
+        ids = [str(card["id"]) for card in cards]
+        return ReadingStats(
+            total_readings=self.total_readings + 1,
+            total_cards=self.total_cards + len(ids),
+            reversed_cards=self.reversed_cards
+            + sum(bool(card.get("reversed")) for card in cards),
+            card_counts=dict(Counter(self.card_counts) + Counter(ids)),
+            suit_counts=dict(
+                Counter(self.suit_counts) + Counter(card_suit(i) for i in ids)
+            ),
+            spread_counts=dict(Counter(self.spread_counts) + Counter([spread_type])),
+            first_reading_at=min(filter(None, (self.first_reading_at, created_at))),
+            last_reading_at=max(filter(None, (self.last_reading_at, created_at))),
+        )
+
+    def summary(self, deck: TarotDeck, top: int = 5) -> dict[str, Any]:
+        """Journey view of the totals.
+
+        Args:
+            deck: Deck used to name the cards
+            top: Number of most-drawn cards
+
+        Returns:
+            dict: Most-drawn cards, reversal ratio, suit balance and spreads
+        """
+        most_drawn = sorted(self.card_counts.items(), key=lambda kv: (-kv[1], kv[0]))
+        named = []
+        for card_id, count in most_drawn[:top]:
+            card = deck.get_card_by_id(card_id)
+            name = card["name"] if card is not None else card_id
+            named.append({"id": card_id, "name": name, "count": count})
+        cards = max(self.total_cards, 1)
+        return {
+            "total_readings": self.total_readings,
+            "total_cards": self.total_cards,
+            "most_drawn": named,
+            "reversal_ratio": round(self.reversed_cards / cards, 4),
+            "suit_balance": {
+                suit: round(self.suit_counts.get(suit, 0) / cards, 4) for suit in SUITS
+            },
+            "spreads": dict(self.spread_counts),
+            "first_reading_at": self.first_reading_at,
+            "last_reading_at": self.last_reading_at,
+        }
+
+
+class ReadingStatsStore(ABC):
+    """Source of per-user reading statistics."""
+
+    @abstractmethod
+    async def get(self, user_id: str) -> ReadingStats:
+        """Fetch a user's totals.
+
+        Args:
+            user_id: User id
+
+        Returns:
+            ReadingStats: Totals, empty if the user has no readings
+        """
+
+    @abstractmethod
+    async def backfill(self, user_id: str | None = None) -> int:
+        """Rebuild totals from the stored readings.
+
+        Args:
+            user_id: Rebuild one user, or everyone when None
+
+        Returns:
+            int: Number of users rebuilt
+        """
+
+
+class SupabaseReadingStatsStore(ReadingStatsStore):
+    """Stats store backed by the ``user_reading_stats`` table."""
+
+    def __init__(self, client: Any) -> None:
+        """Initialize the store.
+
+        Args:
+            client: Supabase client with the service key
+        """
+        self.client = client
+
+    async def get(self, user_id: str) -> ReadingStats:
+        response = await asyncio.to_thread(
+            self.client.table("user_reading_stats")
+            .select("*")
+            .eq("user_id", user_id)
+            .limit(1)
+            .execute
+        )
+        rows = response.data or []
+        return ReadingStats.from_row(rows[0]) if rows else ReadingStats()
+
+    async def backfill(self, user_id: str | None = None) -> int:
+        response = await asyncio.to_thread(
+            self.client.rpc(
+                "backfill_user_reading_stats", {"p_user_id": user_id}
+            ).execute
+        )
+        return int(response.data or 0)
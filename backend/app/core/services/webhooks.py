@@ -0,0 +1,522 @@
+"""Stripe webhook ingestion.
+
+Stripe retries any delivery that isn't acknowledged quickly, so the
+endpoint does as little as possible: verify the signature, record the
+event id in the ``stripe_events`` table (migration 007) and hand the
+event to ``WebhookProcessor``. A redelivered event is dropped by a
+primary-key conflict, or before that by the processor's set of recently
+seen ids.
+
+The processor runs in the background. It collects events for a short
+window, translates each into subscription changes and credit grants, and
+applies the whole batch with one ``apply_stripe_updates`` call, which also
+marks the events processed. Every update carries its event id, and the
+function applies only events it moves out of ``pending`` itself, so an
+event retried after a lost response, or held by two workers at once, is
+applied once. Events still pending after a crash are picked up again at
+startup, each worker claiming a disjoint set.
+
+Checkout sessions must carry ``user_id`` in their metadata, and for
+subscriptions in ``subscription_data.metadata`` too, so every event can be
+tied to a user.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+import orjson
+import stripe
+import structlog
+
+from app.config import Settings
+from app.core.database import get_service_client
+from app.core.exceptions import WebhookSignatureError
+from app.core.services.entitlements import EntitlementCache
+
+logger = structlog.get_logger(__name__)
+
+# Stripe subscription status -> subscriptions.status
+SUBSCRIPTION_STATUSES = {
+    "active": "active",
+    "trialing": "active",
+    "past_due": "past_due",
+    "unpaid": "past_due",
+    "canceled": "canceled",
+    "incomplete_expired": "canceled",
+    "incomplete": "inactive",
+    "paused": "inactive",
+}
+
+
+def verify_event(
+    payload: bytes, signature: str | None, secret: str, tolerance: int = 300
+) -> dict[str, Any]:
+    """Check a delivery's signature and parse the event.
+
+    Args:
+        payload: Raw request body
+        signature: ``Stripe-Signature`` header
+        secret: Endpoint signing secret
+        tolerance: Oldest accepted signature timestamp, in seconds
+
+    Returns:
+        dict: The event
+
+    Raises:
+        WebhookSignatureError: If the signature or payload is invalid
+    """
+    if not signature:
+        raise WebhookSignatureError("Missing Stripe-Signature header")
+    try:
+        stripe.WebhookSignature.verify_header(
+            payload.decode("utf-8"), signature, secret, tolerance
+        )
+        event = orjson.loads(payload)
+    # types-stripe predates the top-level export
+    except (stripe.SignatureVerificationError, UnicodeDecodeError) as e:  # type: ignore[attr-defined]
+        raise WebhookSignatureError("Invalid Stripe signature") from e
+    except orjson.JSONDecodeError as e:
+        raise WebhookSignatureError("Invalid webhook payload") from e
+    if not isinstance(event, dict) or "id" not in event or "type" not in event:
+        raise WebhookSignatureError("Invalid webhook payload")
+    return event
+
+
+def _timestamp(epoch: Any) -> str | None:
+    if not epoch:
+        return None
+    return datetime.fromtimestamp(int(epoch), tz=timezone.utc).isoformat()
+
+
+@dataclass(slots=True)
+class BillingBatch:
+    """Updates from a batch of events, applied in one transaction."""
+
+    subscriptions: list[dict[str, Any]] = field(default_factory=list)
+    credits: list[dict[str, Any]] = field(default_factory=list)
+    processed: list[str] = field(default_factory=list)
+    failed: list[dict[str, str]] = field(default_factory=list)
+
+    def add(self, event: Mapping[str, Any], plans: Mapping[str, str]) -> None:
+        """Translate an event into updates.
+
+        Unhandled event types are marked processed with no updates.
+
+        Args:
+            event: Stripe event
+            plans: Price id -> plan name
+        """
+        obj = event.get("data", {}).get("object", {})
+        event_at = _timestamp(event.get("created"))
+        event_id = event["id"]
+        kind = event["type"]
+        if kind == "checkout.session.completed":
+            user_id = (obj.get("metadata") or {}).get("user_id")
+            if obj.get("mode") == "payment":
+                credits = int((obj.get("metadata") or {}).get("credits") or 0)
+                if user_id and credits > 0:
+                    self.credits.append(
+                        {
+                            "event_id": event_id,
+                            "user_id": user_id,
+                            "amount": credits,
+                            "description": f"Purchase: {credits} credits",
+                        }
+                    )
+            elif obj.get("mode") == "subscription":
+                # Links the customer to the user; the subscription events
+                # carry the plan and status
+                self.subscriptions.append(
+                    {
+                        "event_id": event_id,
+                        "user_id": user_id,
+                        "stripe_customer_id": obj.get("customer"),
+                        "stripe_subscription_id": obj.get("subscription"),
+                        "status": None,
+                        "plan": None,
+                        "current_period_end": None,
+                        "event_at": event_at,
+                    }
+                )
+        elif kind.startswith("customer.subscription."):
+            items = (obj.get("items") or {}).get("data") or [{}]
+            price_id = (items[0].get("price") or {}).get("id")
+            status = SUBSCRIPTION_STATUSES.get(obj.get("status", ""), "inactive")
+            if kind == "customer.subscription.deleted":
+                status = "canceled"
+            self.subscriptions.append(
+                {
+                    "event_id": event_id,
+                    "user_id": (obj.get("metadata") or {}).get("user_id"),
+                    "stripe_customer_id": obj.get("customer"),
+                    "stripe_subscription_id": obj.get("id"),
+                    "status": status,
+                    "plan": plans.get(price_id or ""),
+                    "current_period_end": _timestamp(
+                        obj.get("current_period_end")
+                        or items[0].get("current_period_end")
+                    ),
+                    "event_at": event_at,
+                }
+            )
+        elif kind == "invoice.payment_failed":
+            self.subscriptions.append(
+                {
+                    "event_id": event_id,
+                    "user_id": None,
+                    "stripe_customer_id": obj.get("customer"),
+                    "stripe_subscription_id": obj.get("subscription"),
+                    "status": "past_due",
+                    "plan": None,
+                    "current_period_end": None,
+                    "event_at": event_at,
+                }
+            )
+        self.processed.append(event_id)
+
+    def extend(self, other: BillingBatch) -> None:
+        """Append another batch's updates to this one.
+
+        Args:
+            other: Batch to take the updates from
+        """
+        self.subscriptions.extend(other.subscriptions)
+        self.credits.extend(other.credits)
+        self.processed.extend(other.processed)
+        self.failed.extend(other.failed)
+
+    def affected(self) -> tuple[set[str], set[str]]:
+        """Users whose tier or balance the batch changes.
+
+        Returns:
+            tuple: User ids, and Stripe customer ids for subscription
+            changes that don't name the user
+        """
+        user_ids = {
+            u["user_id"] for u in self.subscriptions + self.credits if u["user_id"]
+        }
+        customer_ids = {
+            s["stripe_customer_id"]
+            for s in self.subscriptions
+            if s["stripe_customer_id"]
+        }
+        return user_ids, customer_ids
+
+    def to_params(self) -> dict[str, Any]:
+        """Arguments for ``apply_stripe_updates``."""
+        return {
+            "p_subscriptions": self.subscriptions,
+            "p_credits": self.credits,
+            "p_processed": self.processed,
+            "p_failed": self.failed,
+        }
+
+
+class WebhookEventStore(ABC):
+    """Idempotency store and billing writes for Stripe events."""
+
+    @abstractmethod
+    async def record(self, event: Mapping[str, Any]) -> bool:
+        """Record an event unless it was seen before.
+
+        Args:
+            event: Stripe event
+
+        Returns:
+            bool: True if the event is new
+        """
+
+    @abstractmethod
+    async def pending(self, limit: int = 500) -> list[dict[str, Any]]:
+        """Claim recorded events not yet processed, oldest first.
+
+        Claimed events are leased to the caller for a while, so processes
+        recovering at the same time don't take the same events.
+
+        Args:
+            limit: Most events to return
+
+        Returns:
+            list: Event payloads
+        """
+
+    @abstractmethod
+    async def apply(self, batch: BillingBatch) -> list[str]:
+        """Apply a batch's updates and mark its events done.
+
+        Only events still pending are applied; updates from events already
+        processed are skipped.
+
+        Args:
+            batch: Updates and event ids
+
+        Returns:
+            list: Ids of the events this call applied
+        """
+
+
+class SupabaseWebhookEventStore(WebhookEventStore):
+    """Event store backed by the ``stripe_events`` table."""
+
+    def __init__(self, client: Any) -> None:
+        """Initialize the store.
+
+        Args:
+            client: Supabase client with the service key
+        """
+        self.client = client
+
+    async def record(self, event: Mapping[str, Any]) -> bool:
+        response = await asyncio.to_thread(
+            self.client.rpc(
+                "record_stripe_event",
+                {"p_id": event["id"], "p_type": event["type"], "p_payload": event},
+            ).execute
+        )
+        return bool(response.data)
+
+    async def pending(self, limit: int = 500) -> list[dict[str, Any]]:
+        response = await asyncio.to_thread(
+            self.client.rpc("claim_stripe_events", {"p_limit": limit}).execute
+        )
+        events = list(response.data or [])
+        return sorted(events, key=lambda event: event.get("created") or 0)
+
+    async def apply(self, batch: BillingBatch) -> list[str]:
+        response = await asyncio.to_thread(
+            self.client.rpc("apply_stripe_updates", batch.to_params()).execute
+        )
+        return list(response.data or [])
+
+
+class WebhookProcessor:
+    """Background worker applying Stripe events in batches."""
+
+    _instance: WebhookProcessor | None = None
+
+    def __init__(
+        self,
+        store: WebhookEventStore,
+        plans: Mapping[str, str],
+        batch_size: int = 50,
+        batch_window: float = 0.5,
+        recent_ids: int = 10_000,
+        entitlements: EntitlementCache | None = None,
+    ) -> None:
+        """Initialize the processor.
+
+        Args:
+            store: Event store
+            plans: Price id -> plan name
+            batch_size: Most events applied per database call
+            batch_window: Seconds to wait for more events after the first
+            recent_ids: Event ids remembered to drop redeliveries without
+                a database call
+            entitlements: Cache to invalidate for users a batch changes
+        """
+        self.store = store
+        self.plans = dict(plans)
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.recent_ids = recent_ids
+        self.entitlements = entitlements
+        self._queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        self._recent: OrderedDict[str, None] = OrderedDict()
+        self._task: asyncio.Task[None] | None = None
+        self.processed = 0
+        self.failed = 0
+        self.duplicates = 0
+
+    async def ingest(self, event: dict[str, Any]) -> bool:
+        """Record a verified event and queue it for processing.
+
+        Args:
+            event: Stripe event
+
+        Returns:
+            bool: False if the event was a duplicate delivery
+        """
+        event_id = event["id"]
+        is_new = event_id not in self._recent and await self.store.record(event)
+        self._remember(event_id)
+        if not is_new:
+            self.duplicates += 1
+            logger.info("stripe_event_duplicate", event_id=event_id)
+            return False
+        self._queue.put_nowait(event)
+        return True
+
+    def _remember(self, event_id: str) -> None:
+        self._recent[event_id] = None
+        self._recent.move_to_end(event_id)
+        if len(self._recent) > self.recent_ids:
+            self._recent.popitem(last=False)
+
+    def start(self) -> None:
+        """Start the worker."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._work(), name="stripe_webhooks")
+
+    async def stop(self) -> None:
+        """Stop the worker. Queued events stay pending in the store."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def recover(self) -> int:
+        """Queue events left pending, e.g. by a restart.
+
+        Returns:
+            int: Number of events queued
+        """
+        events = await self.store.pending()
+        for event in events:
+            self._remember(event["id"])
+            self._queue.put_nowait(event)
+        return len(events)
+
+    async def _next_batch(self) -> list[dict[str, Any]]:
+        events = [await self._queue.get()]
+        deadline = time.monotonic() + self.batch_window
+        while len(events) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                events.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return events
+
+    async def _work(self) -> None:
+        while True:
+            events = await self._next_batch()
+            try:
+                await self.process(events)
+            except Exception as e:
+                # The events stay pending in the store and are retried by
+                # ``recover`` on the next start
+                logger.error(
+                    "stripe_batch_process_failed", events=len(events), error=str(e)
+                )
+
+    async def process(self, events: Sequence[dict[str, Any]]) -> None:
+        """Apply events in one batch, isolating failures.
+
+        If the batch fails, events are retried one at a time so a single
+        bad event is marked failed without holding back the rest.
+
+        Args:
+            events: Stripe events
+        """
+        started = time.perf_counter()
+        batch, events = await self._batch(events)
+        if not events:
+            return
+        try:
+            applied = await self.store.apply(batch)
+        except Exception as e:
+            if len(events) == 1:
+                await self._fail(events[0], e)
+                return
+            logger.warning("stripe_batch_failed", events=len(events), error=str(e))
+            for event in events:
+                await self.process([event])
+            return
+        self.processed += len(applied)
+        skipped = len(events) - len(applied)
+        if skipped:
+            # Already applied, by an earlier attempt or another worker
+            self.duplicates += skipped
+            logger.info("stripe_events_already_applied", events=skipped)
+        if self.entitlements is not None:
+            user_ids, customer_ids = batch.affected()
+            self.entitlements.invalidate_many(user_ids, customer_ids)
+        logger.info(
+            "stripe_events_processed",
+            events=len(applied),
+            duration_ms=round((time.perf_counter() - started) * 1000, 1),
+        )
+
+    async def _batch(
+        self, events: Sequence[dict[str, Any]]
+    ) -> tuple[BillingBatch, list[dict[str, Any]]]:
+        # Events are translated one at a time, so a malformed one, e.g.
+        # non-numeric credits, is failed on its own
+        batch = BillingBatch()
+        accepted = []
+        for event in events:
+            part = BillingBatch()
+            try:
+                part.add(event, self.plans)
+            except Exception as e:
+                await self._fail(event, e)
+                continue
+            batch.extend(part)
+            accepted.append(event)
+        return batch, accepted
+
+    async def _fail(self, event: Mapping[str, Any], error: Exception) -> None:
+        self.failed += 1
+        logger.error(
+            "stripe_event_failed",
+            event_id=event["id"],
+            type=event.get("type"),
+            error=str(error),
+        )
+        with contextlib.suppress(Exception):
+            await self.store.apply(
+                BillingBatch(failed=[{"id": event["id"], "error": str(error)}])
+            )
+
+    def stats(self) -> dict[str, Any]:
+        """Queue and outcome counts.
+
+        Returns:
+            dict: Queued, processed, failed and duplicate events
+        """
+        return {
+            "queued": self._queue.qsize(),
+            "processed": self.processed,
+            "failed": self.failed,
+            "duplicates": self.duplicates,
+        }
+
+    @classmethod
+    def get_instance(cls, settings: Settings) -> WebhookProcessor:
+        """Get or create the process-wide processor.
+
+        Args:
+            settings: Application configuration
+
+        Returns:
+            WebhookProcessor: Singleton processor
+        """
+        if cls._instance is None:
+            plans = {
+                price: plan
+                for price, plan in (
+                    (settings.stripe_price_seeker, "seeker"),
+                    (settings.stripe_price_initiate, "initiate"),
+                )
+                if price
+            }
+            cls._instance = cls(
+                SupabaseWebhookEventStore(get_service_client()),
+                plans,
+                batch_size=settings.stripe_webhook_batch_size,
+                batch_window=settings.stripe_webhook_batch_window_seconds,
+                entitlements=EntitlementCache.get_instance(settings),
+            )
+        return cls._instance
@@ -5,24 +5,140 @@ drawing random cards, and managing spread positions.
 """
 
 import json
-import random
 import secrets
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
 import structlog
 
+from app.core import logs
+from app.core.tarot.search import CardSearchIndex
+from app.core.tarot.snapshot import (
+    DEFAULT_CARDS_FILE,
+    DEFAULT_SNAPSHOT_FILE,
+    load_snapshot,
+)
+
 logger = structlog.get_logger(__name__)
 
+Card = Mapping[str, Any]
+
+
+@dataclass(frozen=True, slots=True)
+class DrawnCard:
+    """A card as drawn for a reading.
+
+    Holds a reference to the deck's shared card data rather than a copy,
+    so draws allocate one small object per card and never write to data
+    other requests are reading.
+    """
+
+    card_ref: Card
+    position: int
+    reversed: bool = False
+
+    @property
+    def id(self) -> str:
+        """Card id, e.g. ``"major_00"``."""
+        return str(self.card_ref["id"])
+
+    @property
+    def name(self) -> str:
+        """Card name."""
+        return str(self.card_ref.get("name", "Unknown"))
+
+
+def build_card_list(deck_data: dict[str, Any]) -> list[dict[str, Any]]:
+    """Build a flat list of all cards from parsed deck data.
+
+    Args:
+        deck_data: Parsed contents of ``cards.json``
+
+    Returns:
+        list: All 78 cards with their metadata.
+    """
+    cards: list[dict[str, Any]] = []
+
+    # Add major arcana
+    major = deck_data.get("major_arcana", [])
+    cards.extend(major)
+
+    # Add minor arcana - handle nested structure by suit
+    minor_arcana = deck_data.get("minor_arcana", {})
+    if isinstance(minor_arcana, dict):
+        for suit_name, suit_data in minor_arcana.items():
+            if isinstance(suit_data, dict) and "cards" in suit_data:
+                # Add suit metadata to a copy of each card, leaving the
+                # parsed deck data as it was
+                cards.extend(
+                    {
+                        **card,
+                        "suit": suit_name,
+                        "element": suit_data.get("element", ""),
+                        "domain": suit_data.get("domain", ""),
+                    }
+                    for card in suit_data["cards"]
+                )
+    elif isinstance(minor_arcana, list):
+        # Flat list format (fallback)
+        cards.extend(minor_arcana)
+
+    return cards
+
 
 class TarotDeck:
-    """Represents the complete 78-card Tarot deck with cryptographic drawing."""
+    """Represents the complete 78-card Tarot deck with cryptographic drawing.
+
+    Cards are read from the memory-mapped binary snapshot when one has been
+    compiled and matches ``cards.json``; otherwise the JSON is parsed.
+    """
+
+    _instance: "TarotDeck | None" = None
+
+    def __init__(
+        self,
+        cards_file: Path = DEFAULT_CARDS_FILE,
+        snapshot_file: Path | None = DEFAULT_SNAPSHOT_FILE,
+    ) -> None:
+        """Initialize the deck from the snapshot or the JSON data file.
+
+        Args:
+            cards_file: Deck JSON data file
+            snapshot_file: Compiled snapshot, or None to always parse JSON
+        """
+        self.cards_file = cards_file
+        snapshot = (
+            load_snapshot(snapshot_file, cards_file)
+            if snapshot_file is not None
+            else None
+        )
+        self.from_snapshot = snapshot is not None
+        self.all_cards: list[Card]
+        if snapshot is not None:
+            self.deck_data = snapshot.extras()
+            self.all_cards = list(snapshot.cards)
+        else:
+            self.deck_data = self._load_cards()
+            self.all_cards = list(self._build_card_list())
+
+    @classmethod
+    def get_instance(cls) -> "TarotDeck":
+        """Get or create the process-wide deck.
 
-    def __init__(self) -> None:
-        """Initialize the deck by loading cards from JSON data file."""
-        self.cards_file = Path(__file__).parent / "data" / "cards.json"
-        self.deck_data = self._load_cards()
-        self.all_cards = self._build_card_list()
+        Returns:
+            TarotDeck: Singleton deck instance
+        """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @cached_property
+    def search_index(self) -> CardSearchIndex:
+        """Inverted index over this deck's card text, built on first use."""
+        return CardSearchIndex(self.all_cards)
 
     def _load_cards(self) -> dict[str, Any]:
         """Load card data from JSON file.
@@ -46,30 +162,9 @@ class TarotDeck:
         Returns:
             list: All 78 cards with their metadata.
         """
-        cards: list[dict[str, Any]] = []
-
-        # Add major arcana
-        major = self.deck_data.get("major_arcana", [])
-        cards.extend(major)
-
-        # Add minor arcana - handle nested structure by suit
-        minor_arcana = self.deck_data.get("minor_arcana", {})
-        if isinstance(minor_arcana, dict):
-            for suit_name, suit_data in minor_arcana.items():
-                if isinstance(suit_data, dict) and "cards" in suit_data:
-                    # Add suit metadata to each card
-                    for card in suit_data["cards"]:
-                        card["suit"] = suit_name
-                        card["element"] = suit_data.get("element", "")
-                        card["domain"] = suit_data.get("domain", "")
-                        cards.append(card)
-        elif isinstance(minor_arcana, list):
-            # Flat list format (fallback)
-            cards.extend(minor_arcana)
-
-        return cards
-
-    def draw(self, count: int = 1) -> list[dict[str, Any]]:
+        return build_card_list(self.deck_data)
+
+    def draw(self, count: int = 1) -> list[Card]:
         """Draw random cards using cryptographic randomness.
 
         Uses secrets.choice for cryptographically secure random selection,
@@ -92,33 +187,36 @@ class TarotDeck:
         available = self.all_cards.copy()
 
         for _ in range(count):
-            card = secrets.choice(available)
-            drawn.append(card)
-            available.remove(card)
-
-        logger.info("cards_drawn", count=count, cards=[c["name"] for c in drawn])
+            drawn.append(available.pop(secrets.randbelow(len(available))))
+
+        if logs.allow("cards_drawn"):
+            logger.info(
+                "cards_drawn",
+                count=count,
+                cards=[c["name"] for c in drawn],
+                sampled=True,
+            )
         return drawn
 
-    def draw_with_reversals(self, count: int = 1) -> list[dict[str, Any]]:
+    def draw_with_reversals(self, count: int = 1) -> list[DrawnCard]:
         """Draw cards and randomly assign reversals.
 
         Each card has a 50% chance of being reversed (meaning interpreted
-        in shadow/negative aspect).
+        in shadow/negative aspect), decided with the same cryptographic
+        randomness as the draw itself.
 
         Args:
             count: Number of cards to draw
 
         Returns:
-            list: Cards with 'reversed' boolean flag added
+            list: Drawn cards in position order, referencing the deck's data
         """
-        cards = self.draw(count)
-
-        for card in cards:
-            card["is_reversed"] = random.choice([True, False])
-
-        return cards
+        return [
+            DrawnCard(card, position, secrets.randbits(1) == 1)
+            for position, card in enumerate(self.draw(count))
+        ]
 
-    def get_card_by_id(self, card_id: str) -> dict[str, Any] | None:
+    def get_card_by_id(self, card_id: str) -> Card | None:
         """Retrieve a specific card by ID.
 
         Args:
@@ -132,27 +230,18 @@ class TarotDeck:
                 return card
         return None
 
-    def get_major_arcana(self) -> list[dict[str, Any]]:
+    def get_major_arcana(self) -> list[Card]:
         """Get all major arcana cards.
 
         Returns:
             list: All 22 major arcana cards
         """
-        result: list[dict[str, Any]] = self.deck_data.get("major_arcana", [])
-        return result
+        return [card for card in self.all_cards if "suit" not in card]
 
-    def get_minor_arcana(self) -> list[dict[str, Any]]:
+    def get_minor_arcana(self) -> list[Card]:
         """Get all minor arcana cards.
 
         Returns:
             list: All 56 minor arcana cards
         """
-        cards: list[dict[str, Any]] = []
-        minor_arcana = self.deck_data.get("minor_arcana", {})
-        if isinstance(minor_arcana, dict):
-            for suit_name, suit_data in minor_arcana.items():
-                if isinstance(suit_data, dict) and "cards" in suit_data:
-                    for card in suit_data["cards"]:
-                        card["suit"] = suit_name
-                        cards.append(card)
-        return cards
+        return [card for card in self.all_cards if "suit" in card]
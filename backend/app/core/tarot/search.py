@@ -0,0 +1,200 @@
+"""Inverted-index search over tarot card text.
+
+The index is built once per deck from the card name, ``keywords``,
+``archetype``, ``hermetic_principle``, ``upright`` and ``reversed`` fields.
+Each posting already carries its final score contribution (field weight ×
+term frequency × IDF), so a query is a handful of dict lookups and adds.
+The last query term also matches as a prefix, for search-as-you-type.
+"""
+
+import math
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any
+
+# Matches in short, curated fields count for more than matches in prose.
+FIELD_WEIGHTS: Mapping[str, float] = {
+    "name": 4.0,
+    "keywords": 3.0,
+    "archetype": 2.5,
+    "hermetic_principle": 2.5,
+    "upright": 1.0,
+    "reversed": 1.0,
+}
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset(
+    [
+        "a",
+        "an",
+        "and",
+        "are",
+        "as",
+        "at",
+        "be",
+        "but",
+        "by",
+        "for",
+        "from",
+        "has",
+        "have",
+        "in",
+        "into",
+        "is",
+        "it",
+        "its",
+        "of",
+        "on",
+        "or",
+        "so",
+        "that",
+        "the",
+        "their",
+        "this",
+        "to",
+        "was",
+        "were",
+        "will",
+        "with",
+        "you",
+        "your",
+    ]
+)
+
+
+def _stem(token: str) -> str:
+    """Fold simple English plurals so 'beginnings' matches 'beginning'."""
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> list[str]:
+    """Normalize text into index terms.
+
+    Lowercases, strips accents, splits on non-alphanumerics, drops
+    stopwords and folds plurals.
+
+    Args:
+        text: Raw text
+
+    Returns:
+        list: Normalized terms, in order
+    """
+    folded = unicodedata.normalize("NFKD", text.lower())
+    ascii_text = folded.encode("ascii", "ignore").decode("ascii")
+    return [
+        _stem(token)
+        for token in _TOKEN_PATTERN.findall(ascii_text)
+        if token not in _STOPWORDS
+    ]
+
+
+@dataclass(frozen=True, slots=True)
+class SearchHit:
+    """One ranked search result."""
+
+    card: Mapping[str, Any]
+    score: float
+    matched_fields: tuple[str, ...]
+
+
+class CardSearchIndex:
+    """Precomputed inverted index over a deck's cards."""
+
+    __slots__ = ("_cards", "_postings", "_vocabulary")
+
+    def __init__(self, cards: Sequence[Mapping[str, Any]]) -> None:
+        """Build the index.
+
+        Args:
+            cards: Cards to index, in deck order
+        """
+        self._cards = tuple(cards)
+
+        # term -> card index -> field -> term frequency
+        frequencies: dict[str, dict[int, dict[str, int]]] = defaultdict(
+            lambda: defaultdict(lambda: defaultdict(int))
+        )
+        for index, card in enumerate(self._cards):
+            for field in FIELD_WEIGHTS:
+                value = card.get(field)
+                if not value:
+                    continue
+                text = " ".join(value) if isinstance(value, list) else str(value)
+                for term in tokenize(text):
+                    frequencies[term][index][field] += 1
+
+        total = len(self._cards)
+        postings: dict[str, tuple[tuple[int, float, tuple[str, ...]], ...]] = {}
+        for term, by_card in frequencies.items():
+            idf = math.log(1 + total / len(by_card))
+            postings[term] = tuple(
+                (
+                    index,
+                    idf
+                    * sum(
+                        FIELD_WEIGHTS[field] * (1 + math.log(count))
+                        for field, count in fields.items()
+                    ),
+                    tuple(fields),
+                )
+                for index, fields in by_card.items()
+            )
+        self._postings = postings
+        self._vocabulary = sorted(postings)
+
+    def __len__(self) -> int:
+        return len(self._vocabulary)
+
+    def _expand_prefix(self, prefix: str) -> list[str]:
+        start = bisect_left(self._vocabulary, prefix)
+        terms = []
+        for term in islice(self._vocabulary, start, None):
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+        return terms
+
+    def search(self, query: str, limit: int = 10) -> list[SearchHit]:
+        """Rank cards against a free-text query.
+
+        Args:
+            query: Search text, e.g. "new beginnings" or "shadow"
+            limit: Maximum number of hits
+
+        Returns:
+            list: Hits ordered by descending score, then deck order
+        """
+        terms = tokenize(query)
+        if not terms or limit < 1:
+            return []
+
+        scores: dict[int, float] = defaultdict(float)
+        fields: dict[int, set[str]] = defaultdict(set)
+        for position, term in enumerate(terms):
+            expanded = [term] if term in self._postings else []
+            if not expanded and position == len(terms) - 1:
+                expanded = self._expand_prefix(term)
+            for matched in expanded:
+                for index, score, matched_fields in self._postings[matched]:
+                    scores[index] += score
+                    fields[index].update(matched_fields)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [
+            SearchHit(
+                card=self._cards[index],
+                score=round(score, 4),
+                matched_fields=tuple(f for f in FIELD_WEIGHTS if f in fields[index]),
+            )
+            for index, score in ranked[:limit]
+        ]
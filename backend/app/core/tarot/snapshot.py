@@ -0,0 +1,353 @@
+"""Compact memory-mapped binary snapshot of the tarot deck.
+
+The snapshot is compiled from ``cards.json`` at build time and loaded with
+``mmap`` at runtime. Every worker process on a host maps the same file, so
+the card text lives in shared page cache instead of in 78 parsed dicts per
+worker, and loading the deck is a single map call.
+
+File layout (all integers little-endian):
+
+    header   magic, version, counts, section offsets and checksums
+    records  one fixed-width record per card; string fields are indexes
+             into the string table, ``number`` is a signed integer
+    strings  (offset, length) index followed by an interned UTF-8 blob
+
+The header stores the SHA-256 of the ``cards.json`` it was compiled from
+and a CRC32 of everything after the header. If either check fails the
+snapshot is ignored and ``TarotDeck`` falls back to parsing the JSON.
+
+Build with::
+
+    python -m app.core.tarot.snapshot
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import struct
+import zlib
+from collections.abc import Iterator, Mapping
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+MAGIC = b"ALMBDECK"
+VERSION = 1
+
+DATA_DIR = Path(__file__).parent / "data"
+DEFAULT_CARDS_FILE = DATA_DIR / "cards.json"
+DEFAULT_SNAPSHOT_FILE = DATA_DIR / "cards.snapshot"
+
+# String-valued card fields, in record order. ``keywords`` is a list in the
+# JSON and is stored as a single string joined by KEYWORD_SEPARATOR.
+STRING_FIELDS: tuple[str, ...] = (
+    "id",
+    "name",
+    "numeral",
+    "image",
+    "keywords",
+    "archetype",
+    "hermetic_principle",
+    "court",
+    "upright",
+    "reversed",
+    "suit",
+    "element",
+    "domain",
+)
+KEYWORD_SEPARATOR = "\x1f"
+
+_ABSENT = 0xFFFFFFFF
+_NO_NUMBER = -(2**31)
+
+# magic, version, record size, card count, string count, source sha256,
+# records offset, string index offset, string blob offset, extras string
+# index, body crc32
+_HEADER = struct.Struct("<8sHHII32sIIIII")
+_RECORD = struct.Struct("<i" + "I" * len(STRING_FIELDS))
+_STRING_ENTRY = struct.Struct("<II")
+
+_FIELD_SLOTS = {name: slot for slot, name in enumerate(STRING_FIELDS, start=1)}
+
+
+class _StringTable:
+    """Interning string table used while compiling a snapshot."""
+
+    def __init__(self) -> None:
+        self.index: dict[str, int] = {}
+        self.entries: list[bytes] = []
+
+    def add(self, value: str) -> int:
+        existing = self.index.get(value)
+        if existing is not None:
+            return existing
+        slot = len(self.entries)
+        self.index[value] = slot
+        self.entries.append(value.encode("utf-8"))
+        return slot
+
+
+def compile_snapshot(
+    cards_file: Path = DEFAULT_CARDS_FILE,
+    output_file: Path = DEFAULT_SNAPSHOT_FILE,
+) -> int:
+    """Compile ``cards.json`` into a binary snapshot.
+
+    Args:
+        cards_file: Source deck JSON
+        output_file: Destination snapshot path
+
+    Returns:
+        int: Size of the written snapshot in bytes
+    """
+    from app.core.tarot.deck import build_card_list
+
+    source = cards_file.read_bytes()
+    deck_data = json.loads(source)
+    cards = build_card_list(deck_data)
+
+    strings = _StringTable()
+    records = bytearray()
+    for card in cards:
+        fields: list[int] = []
+        for name in STRING_FIELDS:
+            value = card.get(name)
+            if value is None:
+                fields.append(_ABSENT)
+            elif name == "keywords":
+                fields.append(strings.add(KEYWORD_SEPARATOR.join(value)))
+            else:
+                fields.append(strings.add(str(value)))
+        number = card.get("number")
+        records += _RECORD.pack(_NO_NUMBER if number is None else number, *fields)
+
+    extras = {
+        key: value
+        for key, value in deck_data.items()
+        if key not in ("major_arcana", "minor_arcana")
+    }
+    extras_slot = strings.add(json.dumps(extras, separators=(",", ":")))
+
+    string_index = bytearray()
+    blob = bytearray()
+    for encoded in strings.entries:
+        string_index += _STRING_ENTRY.pack(len(blob), len(encoded))
+        blob += encoded
+
+    records_offset = _HEADER.size
+    index_offset = records_offset + len(records)
+    blob_offset = index_offset + len(string_index)
+    body = bytes(records + string_index + blob)
+
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        _RECORD.size,
+        len(cards),
+        len(strings.entries),
+        hashlib.sha256(source).digest(),
+        records_offset,
+        index_offset,
+        blob_offset,
+        extras_slot,
+        zlib.crc32(body),
+    )
+
+    tmp_file = output_file.with_suffix(output_file.suffix + ".tmp")
+    tmp_file.write_bytes(header + body)
+    tmp_file.replace(output_file)
+
+    logger.info(
+        "deck_snapshot_compiled",
+        path=str(output_file),
+        cards=len(cards),
+        strings=len(strings.entries),
+        size=len(header) + len(body),
+    )
+    return len(header) + len(body)
+
+
+class DeckSnapshot:
+    """Read-only view over a memory-mapped deck snapshot."""
+
+    __slots__ = (
+        "_buffer",
+        "_count",
+        "_records_offset",
+        "_index_offset",
+        "_blob_offset",
+        "_extras_slot",
+        "_cards",
+    )
+
+    def __init__(self, buffer: mmap.mmap) -> None:
+        """Wrap an already validated snapshot mapping.
+
+        Args:
+            buffer: Memory map of a snapshot that passed validation
+        """
+        header = _HEADER.unpack_from(buffer, 0)
+        self._buffer = buffer
+        self._count: int = header[3]
+        self._records_offset: int = header[6]
+        self._index_offset: int = header[7]
+        self._blob_offset: int = header[8]
+        self._extras_slot: int = header[9]
+        self._cards = tuple(SnapshotCard(self, i) for i in range(self._count))
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def cards(self) -> tuple[SnapshotCard, ...]:
+        """All cards in deck order."""
+        return self._cards
+
+    def extras(self) -> dict[str, Any]:
+        """Non-card deck data (meta, number and court meanings).
+
+        Returns:
+            dict: Decoded extras section
+        """
+        return json.loads(self.string(self._extras_slot))  # type: ignore[no-any-return]
+
+    def string(self, slot: int) -> str:
+        """Decode one entry of the string table.
+
+        Args:
+            slot: String table index
+
+        Returns:
+            str: Decoded string
+        """
+        offset, length = _STRING_ENTRY.unpack_from(
+            self._buffer, self._index_offset + slot * _STRING_ENTRY.size
+        )
+        start = self._blob_offset + offset
+        return self._buffer[start : start + length].decode("utf-8")
+
+    def record(self, index: int) -> tuple[int, ...]:
+        """Unpack the fixed-width record of one card.
+
+        Args:
+            index: Card position in deck order
+
+        Returns:
+            tuple: ``(number, *string_slots)``
+        """
+        return _RECORD.unpack_from(
+            self._buffer, self._records_offset + index * _RECORD.size
+        )
+
+
+class SnapshotCard(Mapping[str, Any]):
+    """A card backed by a snapshot record.
+
+    Behaves like the card dict from ``cards.json``. Fields are decoded from
+    the shared mapping on access, so holding a card costs two references.
+    """
+
+    __slots__ = ("_snapshot", "_index")
+
+    def __init__(self, snapshot: DeckSnapshot, index: int) -> None:
+        self._snapshot = snapshot
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        record = self._snapshot.record(self._index)
+        if key == "number":
+            if record[0] == _NO_NUMBER:
+                raise KeyError(key)
+            return record[0]
+        slot_position = _FIELD_SLOTS.get(key)
+        if slot_position is None or record[slot_position] == _ABSENT:
+            raise KeyError(key)
+        value = self._snapshot.string(record[slot_position])
+        if key == "keywords":
+            return value.split(KEYWORD_SEPARATOR) if value else []
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        record = self._snapshot.record(self._index)
+        for name, slot in zip(STRING_FIELDS, record[1:], strict=True):
+            if slot != _ABSENT:
+                yield name
+            if name == "id" and record[0] != _NO_NUMBER:
+                yield "number"
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"SnapshotCard({self['id']!r})"
+
+
+def _validate(buffer: mmap.mmap, cards_file: Path) -> str | None:
+    """Check a mapped snapshot against its header and source JSON.
+
+    Returns:
+        str | None: Reason the snapshot is unusable, or None if valid
+    """
+    if len(buffer) < _HEADER.size:
+        return "truncated"
+    (magic, version, record_size, _, _, source_digest, _, _, _, _, body_crc) = (
+        _HEADER.unpack_from(buffer, 0)
+    )
+    if magic != MAGIC or version != VERSION or record_size != _RECORD.size:
+        return "incompatible_format"
+    if zlib.crc32(buffer[_HEADER.size :]) != body_crc:
+        return "body_checksum_mismatch"
+    if hashlib.sha256(cards_file.read_bytes()).digest() != source_digest:
+        return "stale_source"
+    return None
+
+
+@lru_cache(maxsize=4)
+def load_snapshot(
+    snapshot_file: Path = DEFAULT_SNAPSHOT_FILE,
+    cards_file: Path = DEFAULT_CARDS_FILE,
+) -> DeckSnapshot | None:
+    """Map a snapshot file, once per process.
+
+    Args:
+        snapshot_file: Compiled snapshot path
+        cards_file: Source JSON the snapshot must have been built from
+
+    Returns:
+        DeckSnapshot | None: Snapshot view, or None if it is missing,
+        corrupt, or out of date with ``cards_file``
+    """
+    if not snapshot_file.exists():
+        return None
+
+    try:
+        with open(snapshot_file, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError) as e:
+        # An empty file, e.g. from an interrupted build, can't be mapped
+        logger.warning(
+            "deck_snapshot_rejected",
+            path=str(snapshot_file),
+            reason="unreadable",
+            error=str(e),
+        )
+        return None
+
+    reason = _validate(buffer, cards_file)
+    if reason is not None:
+        buffer.close()
+        logger.warning("deck_snapshot_rejected", path=str(snapshot_file), reason=reason)
+        return None
+
+    return DeckSnapshot(buffer)
+
+
+if __name__ == "__main__":
+    size = compile_snapshot()
+    print(f"Wrote {DEFAULT_SNAPSHOT_FILE} ({size} bytes)")
@@ -2,16 +2,33 @@
 
 Spreads define the structure and meaning of card positions for readings.
 This module provides common spreads and a framework for creating custom ones.
+
+Spreads are immutable and built once: the built-in spreads are module
+constants, and additional spreads are loaded from JSON files in
+``data/spreads/`` and validated when the registry is first used. Lookups
+go through an id map, and each spread carries its serialized form.
 """
 
-from dataclasses import dataclass
+import json
+import re
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
 
 import structlog
 
+from app.core.llm.profiles import DEFAULT_PROFILE, GenerationProfile
+
 logger = structlog.get_logger(__name__)
 
+SPREADS_DIR = Path(__file__).parent / "data" / "spreads"
+
+_SPREAD_ID_PATTERN = re.compile(r"^[a-z][a-z0-9_]*$")
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class SpreadPosition:
     """Represents a position in a tarot spread."""
 
@@ -21,7 +38,7 @@ class SpreadPosition:
     guidance: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Spread:
     """Represents a complete tarot spread structure."""
 
@@ -29,13 +46,395 @@ class Spread:
     spread_id: str
     description: str
     card_count: int
-    positions: list[SpreadPosition]
+    positions: tuple[SpreadPosition, ...]
     instructions: str
+    credit_cost: int = 1
+    profile: GenerationProfile = DEFAULT_PROFILE
+    summary: Mapping[str, Any] = field(init=False, repr=False, compare=False)
+    detail: Mapping[str, Any] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Validate the layout and precompute serializations.
+
+        Raises:
+            ValueError: If positions don't match the card count
+        """
+        if self.card_count != len(self.positions):
+            msg = (
+                f"Spread {self.spread_id!r} declares {self.card_count} cards "
+                f"but has {len(self.positions)} positions"
+            )
+            raise ValueError(msg)
+        if self.credit_cost < 0:
+            msg = f"Spread {self.spread_id!r} credit_cost must not be negative"
+            raise ValueError(msg)
+        if [p.position for p in self.positions] != list(range(self.card_count)):
+            msg = f"Spread {self.spread_id!r} positions must be numbered from 0"
+            raise ValueError(msg)
+
+        # Shared by every request, so read-only
+        summary = {
+            "id": self.spread_id,
+            "name": self.name,
+            "card_count": self.card_count,
+            "description": self.description,
+            "credit_cost": self.credit_cost,
+        }
+        object.__setattr__(self, "summary", MappingProxyType(summary))
+        object.__setattr__(
+            self,
+            "detail",
+            MappingProxyType(
+                {
+                    **summary,
+                    "instructions": self.instructions,
+                    "positions": tuple(
+                        MappingProxyType(
+                            {
+                                "position": p.position,
+                                "name": p.name,
+                                "meaning": p.meaning,
+                                "guidance": p.guidance,
+                            }
+                        )
+                        for p in self.positions
+                    ),
+                }
+            ),
+        )
+
+
+class SpreadRegistry:
+    """Immutable id-indexed collection of spreads."""
+
+    __slots__ = ("_spreads", "_summaries")
+
+    def __init__(self, spreads: Iterable[Spread]) -> None:
+        """Index spreads by id.
+
+        Args:
+            spreads: Spreads in display order
+
+        Raises:
+            ValueError: If two spreads share an id
+        """
+        by_id: dict[str, Spread] = {}
+        for spread in spreads:
+            if spread.spread_id in by_id:
+                msg = f"Duplicate spread id {spread.spread_id!r}"
+                raise ValueError(msg)
+            by_id[spread.spread_id] = spread
+        self._spreads: Mapping[str, Spread] = MappingProxyType(by_id)
+        self._summaries = tuple(spread.summary for spread in by_id.values())
+
+    def __len__(self) -> int:
+        return len(self._spreads)
+
+    def get(self, spread_id: str) -> Spread | None:
+        """Look up a spread by id.
+
+        Args:
+            spread_id: The spread identifier
+
+        Returns:
+            Spread if found, None otherwise
+        """
+        return self._spreads.get(spread_id)
+
+    @property
+    def spreads(self) -> Mapping[str, Spread]:
+        """Read-only view of all spreads keyed by id."""
+        return self._spreads
+
+    @property
+    def summaries(self) -> tuple[Mapping[str, Any], ...]:
+        """Precomputed summaries of all spreads, in display order."""
+        return self._summaries
+
+
+def _require_text(data: Mapping[str, Any], key: str, source: str) -> str:
+    value = data.get(key)
+    if not isinstance(value, str) or not value.strip():
+        msg = f"{source}: {key!r} must be a non-empty string"
+        raise ValueError(msg)
+    return value
+
+
+def parse_spread(data: Mapping[str, Any], source: str = "<spread>") -> Spread:
+    """Build a spread from a data file definition.
+
+    The position index is taken from list order; ``card_count`` is optional
+    and, when given, must match the number of positions.
+
+    Args:
+        data: Decoded spread definition
+        source: Where the definition came from, for error messages
+
+    Returns:
+        Spread: Validated spread
+
+    Raises:
+        ValueError: If the definition is invalid
+    """
+    spread_id = _require_text(data, "spread_id", source)
+    if not _SPREAD_ID_PATTERN.match(spread_id):
+        msg = f"{source}: spread_id {spread_id!r} must be snake_case"
+        raise ValueError(msg)
+
+    raw_positions = data.get("positions")
+    if not isinstance(raw_positions, list) or not raw_positions:
+        msg = f"{source}: 'positions' must be a non-empty list"
+        raise ValueError(msg)
+
+    positions = []
+    for index, raw in enumerate(raw_positions):
+        if not isinstance(raw, Mapping):
+            msg = f"{source}: position {index} must be an object"
+            raise ValueError(msg)
+        where = f"{source} position {index}"
+        positions.append(
+            SpreadPosition(
+                position=index,
+                name=_require_text(raw, "name", where),
+                meaning=_require_text(raw, "meaning", where),
+                guidance=_require_text(raw, "guidance", where),
+            )
+        )
+
+    card_count = data.get("card_count", len(positions))
+    credit_cost = data.get("credit_cost", 1)
+    for key, value in (("card_count", card_count), ("credit_cost", credit_cost)):
+        if not isinstance(value, int) or isinstance(value, bool):
+            msg = f"{source}: {key!r} must be an integer"
+            raise ValueError(msg)
+
+    generation = data.get("generation", {})
+    if not isinstance(generation, Mapping):
+        msg = f"{source}: 'generation' must be an object"
+        raise ValueError(msg)
+
+    try:
+        return Spread(
+            name=_require_text(data, "name", source),
+            spread_id=spread_id,
+            description=_require_text(data, "description", source),
+            card_count=card_count,
+            positions=tuple(positions),
+            instructions=_require_text(data, "instructions", source),
+            credit_cost=credit_cost,
+            profile=GenerationProfile.from_dict(spread_id, generation),
+        )
+    except ValueError as e:
+        msg = f"{source}: {e}"
+        raise ValueError(msg) from e
+
+
+def load_spread_files(directory: Path) -> list[Spread]:
+    """Load and validate every ``*.json`` spread definition in a directory.
+
+    Args:
+        directory: Directory of spread definition files
+
+    Returns:
+        list: Spreads sorted by file name
+
+    Raises:
+        ValueError: If any file is malformed or invalid
+    """
+    if not directory.is_dir():
+        return []
+
+    spreads = []
+    for path in sorted(directory.glob("*.json")):
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError as e:
+            msg = f"{path}: invalid JSON: {e}"
+            raise ValueError(msg) from e
+        if not isinstance(data, dict):
+            msg = f"{path}: spread definition must be an object"
+            raise ValueError(msg)
+        spreads.append(parse_spread(data, source=str(path)))
+    return spreads
+
+
+# Built-in spreads, constructed once at import.
+THREE_CARD = Spread(
+    name="Three Card",
+    spread_id="three_card",
+    description="Past, Present, Future - The foundational spread for any situation",
+    card_count=3,
+    positions=(
+        SpreadPosition(
+            position=0,
+            name="Past",
+            meaning="The influences and experiences that brought you here",
+            guidance="What foundation or cycle are you completing?",
+        ),
+        SpreadPosition(
+            position=1,
+            name="Present",
+            meaning="The current energies and circumstances",
+            guidance="What is the true nature of your situation right now?",
+        ),
+        SpreadPosition(
+            position=2,
+            name="Future",
+            meaning="The potential outcome and energies ahead",
+            guidance="What is trying to emerge? What is the next chapter?",
+        ),
+    ),
+    instructions="Shuffle and draw three cards. Lay them left to right.",
+    profile=GenerationProfile(
+        name="three_card", max_tokens=900, target_seconds=15, timeout_seconds=60
+    ),
+)
+
+
+CELTIC_CROSS = Spread(
+    name="Celtic Cross",
+    spread_id="celtic_cross",
+    description="A comprehensive 10-card spread exploring all dimensions of a situation",
+    card_count=10,
+    positions=(
+        SpreadPosition(
+            position=0,
+            name="Significator",
+            meaning="The heart of the matter",
+            guidance="What is this really about?",
+        ),
+        SpreadPosition(
+            position=1,
+            name="Challenge",
+            meaning="The obstacle or influence to navigate",
+            guidance="What is the true challenge here?",
+        ),
+        SpreadPosition(
+            position=2,
+            name="Root",
+            meaning="The foundation or origin of the situation",
+            guidance="Where does this come from?",
+        ),
+        SpreadPosition(
+            position=3,
+            name="Recent Past",
+            meaning="Recent influences that shaped the present",
+            guidance="What just happened?",
+        ),
+        SpreadPosition(
+            position=4,
+            name="Possible Outcome",
+            meaning="Where things are naturally heading",
+            guidance="What is the likely path?",
+        ),
+        SpreadPosition(
+            position=5,
+            name="Near Future",
+            meaning="Energies coming into play soon",
+            guidance="What is emerging?",
+        ),
+        SpreadPosition(
+            position=6,
+            name="Your Attitude",
+            meaning="Your role and perspective in this",
+            guidance="How are you approaching this?",
+        ),
+        SpreadPosition(
+            position=7,
+            name="Others' Influence",
+            meaning="How others or external forces affect this",
+            guidance="What are others bringing?",
+        ),
+        SpreadPosition(
+            position=8,
+            name="Hopes/Fears",
+            meaning="Your deeper desires or anxieties",
+            guidance="What do you really want? What scares you?",
+        ),
+        SpreadPosition(
+            position=9,
+            name="Outcome",
+            meaning="The ultimate resolution or lesson",
+            guidance="What is being revealed?",
+        ),
+    ),
+    instructions="Shuffle and draw 10 cards, placing them in the Celtic Cross pattern.",
+    credit_cost=3,
+    profile=GenerationProfile(
+        name="celtic_cross",
+        max_tokens=2000,
+        target_seconds=35,
+        timeout_seconds=120,
+    ),
+)
+
+
+SHADOW_WORK = Spread(
+    name="Shadow Work",
+    spread_id="shadow_work",
+    description="A 4-card spread for integrating shadow aspects and unconscious patterns",
+    card_count=4,
+    positions=(
+        SpreadPosition(
+            position=0,
+            name="What I Deny",
+            meaning="The aspect of myself I reject or don't acknowledge",
+            guidance="What quality do I judge in others that I possess?",
+        ),
+        SpreadPosition(
+            position=1,
+            name="Why I Hide It",
+            meaning="The fear or belief that causes repression",
+            guidance="What am I afraid will happen if I claim this?",
+        ),
+        SpreadPosition(
+            position=2,
+            name="Its Gift",
+            meaning="The positive potential of this shadow aspect",
+            guidance="How could this power serve me if integrated?",
+        ),
+        SpreadPosition(
+            position=3,
+            name="Integration Path",
+            meaning="How to bring this aspect into consciousness",
+            guidance="What action opens me to wholeness?",
+        ),
+    ),
+    instructions="Shuffle and draw 4 cards for deep shadow work. Move slowly with this spread.",
+    credit_cost=2,
+    profile=GenerationProfile(
+        name="shadow_work", max_tokens=1100, target_seconds=20, timeout_seconds=75
+    ),
+)
+
+
+ONE_CARD = Spread(
+    name="One Card",
+    spread_id="one_card",
+    description="A single card for daily guidance or specific focus",
+    card_count=1,
+    positions=(
+        SpreadPosition(
+            position=0,
+            name="Message",
+            meaning="The card's message for you today",
+            guidance="What is this card showing you?",
+        ),
+    ),
+    instructions="Draw one card and sit with its message.",
+    profile=GenerationProfile(
+        name="one_card", max_tokens=400, target_seconds=8, timeout_seconds=30
+    ),
+)
+
+BUILTIN_SPREADS: tuple[Spread, ...] = (ONE_CARD, THREE_CARD, CELTIC_CROSS, SHADOW_WORK)
 
 
 class SpreadLibrary:
     """Collection of tarot spreads available in Alembic."""
 
+    _registry: SpreadRegistry | None = None
+
     @staticmethod
     def three_card() -> Spread:
         """The foundational three-card spread: Past, Present, Future.
@@ -47,33 +446,7 @@ class SpreadLibrary:
         Returns:
             Spread: Three-card spread configuration
         """
-        return Spread(
-            name="Three Card",
-            spread_id="three_card",
-            description="Past, Present, Future - The foundational spread for any situation",
-            card_count=3,
-            positions=[
-                SpreadPosition(
-                    position=0,
-                    name="Past",
-                    meaning="The influences and experiences that brought you here",
-                    guidance="What foundation or cycle are you completing?",
-                ),
-                SpreadPosition(
-                    position=1,
-                    name="Present",
-                    meaning="The current energies and circumstances",
-                    guidance="What is the true nature of your situation right now?",
-                ),
-                SpreadPosition(
-                    position=2,
-                    name="Future",
-                    meaning="The potential outcome and energies ahead",
-                    guidance="What is trying to emerge? What is the next chapter?",
-                ),
-            ],
-            instructions="Shuffle and draw three cards. Lay them left to right.",
-        )
+        return THREE_CARD
 
     @staticmethod
     def celtic_cross() -> Spread:
@@ -85,75 +458,7 @@ class SpreadLibrary:
         Returns:
             Spread: Celtic Cross spread configuration
         """
-        return Spread(
-            name="Celtic Cross",
-            spread_id="celtic_cross",
-            description="A comprehensive 10-card spread exploring all dimensions of a situation",
-            card_count=10,
-            positions=[
-                SpreadPosition(
-                    position=0,
-                    name="Significator",
-                    meaning="The heart of the matter",
-                    guidance="What is this really about?",
-                ),
-                SpreadPosition(
-                    position=1,
-                    name="Challenge",
-                    meaning="The obstacle or influence to navigate",
-                    guidance="What is the true challenge here?",
-                ),
-                SpreadPosition(
-                    position=2,
-                    name="Root",
-                    meaning="The foundation or origin of the situation",
-                    guidance="Where does this come from?",
-                ),
-                SpreadPosition(
-                    position=3,
-                    name="Recent Past",
-                    meaning="Recent influences that shaped the present",
-                    guidance="What just happened?",
-                ),
-                SpreadPosition(
-                    position=4,
-                    name="Possible Outcome",
-                    meaning="Where things are naturally heading",
-                    guidance="What is the likely path?",
-                ),
-                SpreadPosition(
-                    position=5,
-                    name="Near Future",
-                    meaning="Energies coming into play soon",
-                    guidance="What is emerging?",
-                ),
-                SpreadPosition(
-                    position=6,
-                    name="Your Attitude",
-                    meaning="Your role and perspective in this",
-                    guidance="How are you approaching this?",
-                ),
-                SpreadPosition(
-                    position=7,
-                    name="Others' Influence",
-                    meaning="How others or external forces affect this",
-                    guidance="What are others bringing?",
-                ),
-                SpreadPosition(
-                    position=8,
-                    name="Hopes/Fears",
-                    meaning="Your deeper desires or anxieties",
-                    guidance="What do you really want? What scares you?",
-                ),
-                SpreadPosition(
-                    position=9,
-                    name="Outcome",
-                    meaning="The ultimate resolution or lesson",
-                    guidance="What is being revealed?",
-                ),
-            ],
-            instructions="Shuffle and draw 10 cards, placing them in the Celtic Cross pattern.",
-        )
+        return CELTIC_CROSS
 
     @staticmethod
     def shadow_work() -> Spread:
@@ -165,39 +470,7 @@ class SpreadLibrary:
         Returns:
             Spread: Shadow Work spread configuration
         """
-        return Spread(
-            name="Shadow Work",
-            spread_id="shadow_work",
-            description="A 4-card spread for integrating shadow aspects and unconscious patterns",
-            card_count=4,
-            positions=[
-                SpreadPosition(
-                    position=0,
-                    name="What I Deny",
-                    meaning="The aspect of myself I reject or don't acknowledge",
-                    guidance="What quality do I judge in others that I possess?",
-                ),
-                SpreadPosition(
-                    position=1,
-                    name="Why I Hide It",
-                    meaning="The fear or belief that causes repression",
-                    guidance="What am I afraid will happen if I claim this?",
-                ),
-                SpreadPosition(
-                    position=2,
-                    name="Its Gift",
-                    meaning="The positive potential of this shadow aspect",
-                    guidance="How could this power serve me if integrated?",
-                ),
-                SpreadPosition(
-                    position=3,
-                    name="Integration Path",
-                    meaning="How to bring this aspect into consciousness",
-                    guidance="What action opens me to wholeness?",
-                ),
-            ],
-            instructions="Shuffle and draw 4 cards for deep shadow work. Move slowly with this spread.",
-        )
+        return SHADOW_WORK
 
     @staticmethod
     def one_card() -> Spread:
@@ -206,39 +479,55 @@ class SpreadLibrary:
         Returns:
             Spread: Single card spread configuration
         """
-        return Spread(
-            name="One Card",
-            spread_id="one_card",
-            description="A single card for daily guidance or specific focus",
-            card_count=1,
-            positions=[
-                SpreadPosition(
-                    position=0,
-                    name="Message",
-                    meaning="The card's message for you today",
-                    guidance="What is this card showing you?",
-                ),
-            ],
-            instructions="Draw one card and sit with its message.",
+        return ONE_CARD
+
+    @classmethod
+    def load(cls, spreads_dir: Path | None = SPREADS_DIR) -> SpreadRegistry:
+        """Build the registry from built-in and data-file spreads.
+
+        Called at startup so invalid spread files fail fast. Replaces any
+        registry built earlier.
+
+        Args:
+            spreads_dir: Directory of extra spread definitions, or None
+
+        Returns:
+            SpreadRegistry: The new registry
+
+        Raises:
+            ValueError: If a spread file is invalid or reuses an id
+        """
+        extra = load_spread_files(spreads_dir) if spreads_dir is not None else []
+        cls._registry = SpreadRegistry([*BUILTIN_SPREADS, *extra])
+        logger.info(
+            "spreads_loaded",
+            builtin=len(BUILTIN_SPREADS),
+            custom=[spread.spread_id for spread in extra],
         )
+        return cls._registry
 
-    @staticmethod
-    def get_all_spreads() -> dict[str, Spread]:
-        """Get all available spreads as a dictionary.
+    @classmethod
+    def registry(cls) -> SpreadRegistry:
+        """Get the spread registry, building it on first use.
 
         Returns:
-            dict: All spreads keyed by spread_id
+            SpreadRegistry: All available spreads
         """
-        spreads = [
-            SpreadLibrary.one_card(),
-            SpreadLibrary.three_card(),
-            SpreadLibrary.celtic_cross(),
-            SpreadLibrary.shadow_work(),
-        ]
-        return {spread.spread_id: spread for spread in spreads}
+        if cls._registry is None:
+            return cls.load()
+        return cls._registry
 
-    @staticmethod
-    def get_spread(spread_id: str) -> Spread | None:
+    @classmethod
+    def get_all_spreads(cls) -> Mapping[str, Spread]:
+        """Get all available spreads.
+
+        Returns:
+            Mapping: Read-only view of all spreads keyed by spread_id
+        """
+        return cls.registry().spreads
+
+    @classmethod
+    def get_spread(cls, spread_id: str) -> Spread | None:
         """Retrieve a specific spread by ID.
 
         Args:
@@ -247,5 +536,4 @@ class SpreadLibrary:
         Returns:
             Spread if found, None otherwise
         """
-        all_spreads = SpreadLibrary.get_all_spreads()
-        return all_spreads.get(spread_id)
+        return cls.registry().get(spread_id)
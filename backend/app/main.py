@@ -4,16 +4,32 @@ Main entry point for the backend API. Sets up the FastAPI app with
 middleware, routers, and lifespan event handlers.
 """
 
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from pathlib import Path
 from typing import Any
 
 import structlog
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import ValidationError
 
-from app.api.routers import health, test
+from app.api.middleware.compression import CompressionMiddleware
+from app.api.middleware.profiler import ProfilerMiddleware
+from app.api.middleware.rate_limit import RateLimitMiddleware, endpoint_classifier
+from app.api.responses import ORJSONResponse
+from app.api.routers import cards, diagnostics, health, reading, test, webhook
 from app.config import Settings, get_settings
+from app.core.auth import TokenVerifier
+from app.core.diagnostics import LoopLagMonitor
+from app.core.exceptions import AlembicError
+from app.core.logs import configure_logging, shutdown_logging
+from app.core.services import background
+from app.core.services.daily import DailyReadingService
+from app.core.services.jobs import JobWorkerPool
+from app.core.services.webhooks import WebhookProcessor
+from app.core.tarot.deck import TarotDeck
+from app.core.tarot.spreads import SpreadLibrary
 
 logger = structlog.get_logger(__name__)
 
@@ -30,16 +46,95 @@ async def lifespan(_app: FastAPI) -> Any:
     """
     # Startup
     settings = get_settings()
+    configure_logging(
+        level=settings.log_level,
+        json_logs=settings.log_json,
+        sample_rates=settings.log_sample_rates,
+        max_per_second=settings.log_max_per_second,
+        queue_size=settings.log_queue_size,
+    )
     logger.info(
         "startup",
         environment=settings.environment,
         debug=settings.debug,
     )
 
+    # Build the spread registry now so invalid spread files fail startup
+    SpreadLibrary.load()
+
+    # Load the shared deck and build its search index before serving
+    deck = TarotDeck.get_instance()
+    logger.info("deck_ready", cards=len(deck.all_cards), terms=len(deck.search_index))
+
+    # Pre-generate daily one-card interpretations off-peak
+    daily_task = None
+    if settings.daily_pregen_enabled:
+        daily = DailyReadingService.get_instance(settings)
+        daily_task = asyncio.create_task(
+            daily.run(settings.daily_pregen_hour_utc), name="daily_pregen"
+        )
+
+    # Run queued reading jobs, including any left over from a restart.
+    # The workers also purge finished jobs past their retention.
+    jobs = None
+    if settings.job_workers > 0:
+        jobs = JobWorkerPool.get_instance(settings)
+        jobs.start()
+
+    # Fetch the token signing keys now and keep them current
+    verifier = TokenVerifier.get_instance(settings)
+    verifier.start()
+
+    # Apply Stripe events off the request path, including any not yet
+    # processed before a restart
+    webhooks = None
+    if settings.stripe_webhook_secret:
+        webhooks = WebhookProcessor.get_instance(settings)
+        webhooks.start()
+        recovered = await webhooks.recover()
+        logger.info("stripe_webhooks_ready", recovered=recovered)
+
+    # Watch for callbacks that block the event loop
+    monitor = None
+    if settings.diagnostics_enabled:
+        monitor = LoopLagMonitor.get_instance(settings)
+        monitor.start()
+
     yield
 
-    # Shutdown
+    if monitor is not None:
+        await monitor.stop()
+    await verifier.stop()
+    if webhooks is not None:
+        await webhooks.stop()
+    if jobs is not None:
+        await jobs.stop()
+    if daily_task is not None:
+        daily_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await daily_task
+
+    # Shutdown: let off-request writes (readings, refunds) finish
+    await background.drain()
     logger.info("shutdown", environment=settings.environment)
+    shutdown_logging()
+
+
+async def alembic_error_handler(_request: Request, exc: Exception) -> ORJSONResponse:
+    """Render domain errors in the documented error format.
+
+    Args:
+        _request: Incoming request
+        exc: Raised AlembicError
+
+    Returns:
+        ORJSONResponse: ``{"error": code, "message": message}``
+    """
+    assert isinstance(exc, AlembicError)
+    return ORJSONResponse(
+        status_code=exc.status_code,
+        content={"error": exc.code, "message": exc.message},
+    )
 
 
 def create_app() -> FastAPI:
@@ -63,8 +158,29 @@ def create_app() -> FastAPI:
         description="AI-powered Hermetic tarot reading application",
         version="0.1.0",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
+    # Opt-in profiling, innermost so it times only the app itself
+    if settings.diagnostics_enabled:
+        app.add_middleware(
+            ProfilerMiddleware, output_dir=Path(settings.diagnostics_profile_dir)
+        )
+
+    # Compress long bodies such as interpretations
+    app.add_middleware(
+        CompressionMiddleware, minimum_size=settings.compression_min_bytes
+    )
+
+    # Rate limiting, inside CORS so 429s still carry CORS headers
+    if settings.rate_limit_enabled:
+        app.add_middleware(
+            RateLimitMiddleware,
+            classify=endpoint_classifier(settings),
+            trust_forwarded=settings.rate_limit_trust_forwarded,
+            verifier=lambda: TokenVerifier.get_instance(settings),
+        )
+
     # CORS Middleware
     app.add_middleware(
         CORSMiddleware,
@@ -74,9 +190,16 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    app.add_exception_handler(AlembicError, alembic_error_handler)
+
     # Include routers
     app.include_router(health.router)
+    app.include_router(cards.router)
+    app.include_router(reading.router)
     app.include_router(test.router)
+    app.include_router(webhook.router)
+    if settings.diagnostics_enabled:
+        app.include_router(diagnostics.router)
 
     return app
 
@@ -0,0 +1,68 @@
+"""Schemas for reading endpoints."""
+
+from typing import Annotated, Literal
+
+from pydantic import AfterValidator, BaseModel, Field
+
+from app.core.exceptions import InvalidSpreadError
+from app.core.services.reading import resolve_spread
+
+
+def _known_spread(spread_type: str) -> str:
+    """Accept any spread in the registry, including data-file spreads."""
+    try:
+        resolve_spread(spread_type)
+    except InvalidSpreadError as e:
+        raise ValueError(e.message) from e
+    return spread_type
+
+
+SpreadType = Annotated[str, AfterValidator(_known_spread)]
+GenerationStrategy = Literal["single", "fan_out"]
+
+
+class ReadingRequest(BaseModel):
+    """Body of ``POST /api/reading``."""
+
+    question: str = Field(..., min_length=1, max_length=1000)
+    spread_type: SpreadType
+
+
+class BatchReadingItem(BaseModel):
+    """One job in a batch."""
+
+    id: str | None = Field(default=None, max_length=100)
+    question: str = Field(..., min_length=1, max_length=1000)
+    spread_type: SpreadType = "three_card"
+    strategy: GenerationStrategy | None = None
+
+
+class BatchReadingRequest(BaseModel):
+    """Body of ``POST /api/test/reading/batch``."""
+
+    items: list[BatchReadingItem] = Field(..., min_length=1, max_length=500)
+    concurrency: int = Field(default=4, ge=1, le=32)
+
+
+class ReadingJobRequest(BaseModel):
+    """Body of ``POST /api/test/reading/jobs``."""
+
+    question: str = Field(..., min_length=1, max_length=1000)
+    spread_type: SpreadType = "celtic_cross"
+    priority: int = Field(default=0, ge=0, le=9)
+
+
+class FollowUpRequest(BaseModel):
+    """Body of ``POST /api/test/reading/follow-up``."""
+
+    session_id: str = Field(..., min_length=1, max_length=100)
+    original_question: str = Field(..., min_length=1, max_length=1000)
+    previous_cards: list[str] = Field(default_factory=list, max_length=10)
+    previous_interpretation: str = Field(..., min_length=1, max_length=20000)
+    question: str = Field(..., min_length=1, max_length=1000)
+
+
+class ChatRequest(BaseModel):
+    """Body of ``POST /api/reading/{reading_id}/chat``."""
+
+    message: str = Field(..., min_length=1, max_length=1000)
@@ -0,0 +1,133 @@
+"""Tests for local access token verification."""
+
+import time
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_stats_store
+from app.core.auth import AuthenticationError, TokenVerifier
+
+ISSUER = "https://test.supabase.co/auth/v1"
+SECRET = "super-secret-jwt-token-with-at-least-32-characters"
+
+
+def _claims(**overrides) -> dict:
+    now = int(time.time())
+    claims = {
+        "sub": "user-1",
+        "email": "seeker@example.com",
+        "aud": "authenticated",
+        "iss": ISSUER,
+        "iat": now,
+        "exp": now + 3600,
+    }
+    return claims | overrides
+
+
+def _es256_key(kid: str) -> tuple[ec.EllipticCurvePrivateKey, dict]:
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    jwk = jwt.algorithms.ECAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    return private_key, jwk | {"kid": kid, "alg": "ES256", "use": "sig"}
+
+
+async def test_shared_secret_tokens_verify_and_are_cached(monkeypatch) -> None:
+    verifier = TokenVerifier(ISSUER, jwt_secret=SECRET)
+    token = jwt.encode(_claims(), SECRET, algorithm="HS256")
+
+    user = await verifier.verify(token)
+    # A repeat is served from the cache without decoding again
+    monkeypatch.setattr(jwt, "decode", None)
+    again = await verifier.verify(token)
+
+    assert user.id == "user-1"
+    assert user.email == "seeker@example.com"
+    assert again is user
+
+
+@pytest.mark.parametrize(
+    "claims",
+    [
+        _claims(exp=int(time.time()) - 120),
+        _claims(aud="anon"),
+        _claims(iss="https://other.supabase.co/auth/v1"),
+    ],
+)
+async def test_invalid_claims_are_rejected(claims: dict) -> None:
+    verifier = TokenVerifier(ISSUER, jwt_secret=SECRET)
+
+    with pytest.raises(AuthenticationError):
+        await verifier.verify(jwt.encode(claims, SECRET, algorithm="HS256"))
+
+
+async def test_forged_and_unsigned_tokens_are_rejected() -> None:
+    verifier = TokenVerifier(ISSUER, jwt_secret=SECRET)
+    forged = jwt.encode(_claims(), "x" * 32, algorithm="HS256")
+    unsigned = jwt.encode(_claims(), None, algorithm="none")
+
+    for token in (forged, unsigned, "not-a-jwt"):
+        with pytest.raises(AuthenticationError):
+            await verifier.verify(token)
+
+
+async def test_cached_claims_expire_with_the_token() -> None:
+    verifier = TokenVerifier(ISSUER, jwt_secret=SECRET)
+    token = jwt.encode(_claims(exp=int(time.time()) + 1), SECRET, algorithm="HS256")
+    await verifier.verify(token)
+
+    verifier._verified[token] = (verifier._verified[token][0], time.time() - 1)
+
+    assert verifier.cached(token) is None
+
+
+async def test_jwks_keys_verify_and_rotate(monkeypatch) -> None:
+    old_key, old_jwk = _es256_key("key-1")
+    new_key, new_jwk = _es256_key("key-2")
+    verifier = TokenVerifier(ISSUER, jwks_url="https://test.supabase.co/jwks")
+    assert verifier.load_keys({"keys": [old_jwk]}) == 1
+    fetches = []
+
+    async def refresh_keys(force: bool = False) -> None:
+        fetches.append(force)
+        verifier.load_keys({"keys": [old_jwk, new_jwk]})
+
+    monkeypatch.setattr(verifier, "refresh_keys", refresh_keys)
+
+    old = jwt.encode(_claims(), old_key, algorithm="ES256", headers={"kid": "key-1"})
+    new = jwt.encode(
+        _claims(sub="user-2"), new_key, algorithm="ES256", headers={"kid": "key-2"}
+    )
+
+    assert (await verifier.verify(old)).id == "user-1"
+    assert fetches == []
+    # A key rotated in since the last fetch triggers one early refresh
+    assert (await verifier.verify(new)).id == "user-2"
+    assert fetches == [False]
+
+
+async def test_hmac_tokens_are_rejected_without_a_secret() -> None:
+    _key, jwk = _es256_key("key-1")
+    verifier = TokenVerifier(ISSUER, jwks_url="https://test.supabase.co/jwks")
+    verifier.load_keys({"keys": [jwk]})
+
+    with pytest.raises(AuthenticationError):
+        await verifier.verify(jwt.encode(_claims(), SECRET, algorithm="HS256"))
+
+
+def test_endpoint_rejects_invalid_token(client: TestClient, monkeypatch) -> None:
+    monkeypatch.setenv("SUPABASE_URL", "https://test.supabase.co")
+    monkeypatch.setenv("SUPABASE_KEY", "anon")
+    monkeypatch.setenv("SUPABASE_SERVICE_KEY", "service")
+    monkeypatch.setattr(
+        TokenVerifier, "_instance", TokenVerifier(ISSUER, jwt_secret=SECRET)
+    )
+    client.app.dependency_overrides[get_stats_store] = lambda: None
+    forged = jwt.encode(_claims(), "x" * 32, algorithm="HS256")
+
+    response = client.get(
+        "/api/reading/stats", headers={"Authorization": f"Bearer {forged}"}
+    )
+
+    assert response.status_code == 401
@@ -0,0 +1,155 @@
+"""Tests for batch reading generation."""
+
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_settings_dep
+from app.config import Settings
+from app.core.llm.client import LLMClient, LLMFactory
+from app.core.llm.profiles import GenerationProfile
+from app.core.services.batch import BatchJob, ReadingBatch
+from app.core.tarot.deck import TarotDeck
+from app.main import create_app
+
+
+class SleepyClient(LLMClient):
+    """Fake client that answers after a delay, failing on request."""
+
+    model = "fake-model"
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+        self.profiles: list[str] = []
+        self.closed = False
+
+    async def generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        profile: GenerationProfile | None = None,
+    ) -> str:
+        self.profiles.append(profile.name if profile else "")
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if "FAIL" in user_prompt:
+            raise RuntimeError("model refused")
+        return system_prompt[:7]
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+async def _collect(batch: ReadingBatch, jobs: list[BatchJob]) -> list[dict]:
+    return [result.to_dict() async for result in batch.run(jobs)]
+
+
+async def test_batch_isolates_failures_and_rejects_bad_spreads() -> None:
+    """One bad item doesn't stop the others."""
+    batch = ReadingBatch(TarotDeck.get_instance(), {"fake": SleepyClient()})
+    jobs = [
+        BatchJob("Where am I going?", "three_card", "a"),
+        BatchJob("FAIL please", "single", "b"),
+        BatchJob("What is hidden?", "tarot_pyramid", "c"),
+    ]
+
+    results = {r["id"]: r for r in await _collect(batch, jobs)}
+
+    assert results["a"]["status"] == "ok"
+    assert len(results["a"]["cards"]) == 3
+    assert results["a"]["generation"]["strategy"] == "single"
+    assert results["b"]["status"] == "error"
+    assert results["b"]["error"] == "model refused"
+    assert results["c"]["status"] == "error"
+    assert results["c"]["cards"] == []
+
+
+async def test_batch_bounds_concurrency_per_provider() -> None:
+    """Each provider has at most ``concurrency`` calls in flight."""
+    fast, slow = SleepyClient(0.001), SleepyClient(0.01)
+    batch = ReadingBatch(
+        TarotDeck.get_instance(), {"fast": fast, "slow": slow}, concurrency=2
+    )
+
+    results = await _collect(batch, [BatchJob(f"Q{i}") for i in range(20)])
+
+    assert sorted(r["index"] for r in results) == list(range(20))
+    assert fast.peak <= 2
+    assert slow.peak <= 2
+    providers = [r["provider"] for r in results]
+    assert providers.count("fast") > providers.count("slow")
+
+
+async def test_batch_streams_in_completion_order() -> None:
+    """Quick items are yielded before slow ones."""
+    batch = ReadingBatch(
+        TarotDeck.get_instance(),
+        {"slow": SleepyClient(0.05), "fast": SleepyClient(0.0)},
+        concurrency=1,
+    )
+
+    results = await _collect(batch, [BatchJob("first"), BatchJob("second")])
+
+    assert [r["provider"] for r in results] == ["fast", "slow"]
+
+
+def test_batch_endpoint_streams_ndjson(
+    settings: Settings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The endpoint returns one JSON line per item."""
+    provider = SleepyClient()
+    monkeypatch.setattr(
+        LLMFactory,
+        "create_providers",
+        classmethod(lambda _cls, **_: {"fake": provider}),
+    )
+    app = create_app()
+    app.dependency_overrides[get_settings_dep] = lambda: settings
+
+    response = TestClient(app).post(
+        "/api/test/reading/batch",
+        json={
+            "items": [
+                {"question": "One?"},
+                {"question": "Two?", "spread_type": "single"},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["index"] for line in lines) == [0, 1]
+    assert all(line["status"] == "ok" for line in lines)
+    assert provider.closed
+
+
+def test_batch_items_count_against_the_rate_limit(
+    settings: Settings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A batch larger than the reading limit is rejected before generating."""
+    provider = SleepyClient()
+    monkeypatch.setattr(
+        LLMFactory,
+        "create_providers",
+        classmethod(lambda _cls, **_: {"fake": provider}),
+    )
+    app = create_app()
+    app.dependency_overrides[get_settings_dep] = lambda: settings
+
+    response = TestClient(app).post(
+        "/api/test/reading/batch",
+        json={"items": [{"question": f"Q{n}?"} for n in range(50)]},
+    )
+
+    assert response.status_code == 429
+    assert response.json()["error"] == "RATE_LIMITED"
+    assert provider.profiles == []
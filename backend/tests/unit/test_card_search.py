@@ -0,0 +1,54 @@
+"""Tests for card search."""
+
+from fastapi.testclient import TestClient
+
+from app.core.tarot.deck import TarotDeck
+from app.core.tarot.search import CardSearchIndex, tokenize
+
+
+def test_tokenize_normalizes_text() -> None:
+    """Tokens are lowercased, accent-free, plural-folded and stopword-free."""
+    assert tokenize("The Beginnings of Déjà-vu") == ["beginning", "deja", "vu"]
+
+
+def test_keyword_matches_rank_first() -> None:
+    """Cards with the theme as a keyword outrank prose mentions."""
+    hits = TarotDeck.get_instance().search_index.search("transformation")
+
+    assert hits[0].card["name"] == "Death"
+    assert "keywords" in hits[0].matched_fields
+    assert [h.score for h in hits] == sorted((h.score for h in hits), reverse=True)
+
+
+def test_hermetic_principle_is_searchable() -> None:
+    """Principles find the cards that embody them."""
+    hits = TarotDeck.get_instance().search_index.search("correspondence")
+
+    assert "The Magician" in {h.card["name"] for h in hits}
+
+
+def test_last_term_matches_as_prefix() -> None:
+    """Partial final words match, for search-as-you-type."""
+    index = CardSearchIndex(
+        [{"id": "a", "name": "Alpha", "keywords": ["illumination"]}]
+    )
+
+    assert [h.card["id"] for h in index.search("illum")] == ["a"]
+    assert index.search("xyz") == []
+
+
+def test_search_endpoint(client: TestClient) -> None:
+    """The search endpoint returns ranked cards."""
+    response = client.get("/api/cards/search", params={"q": "shadow", "limit": 3})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 3
+    assert data["results"][0]["name"] == "The Devil"
+
+
+def test_search_endpoint_requires_query(client: TestClient) -> None:
+    """An empty query is a validation error."""
+    response = client.get("/api/cards/search", params={"q": ""})
+
+    assert response.status_code == 422
@@ -0,0 +1,105 @@
+"""Tests for pre-serialized catalog responses and compression."""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.middleware.compression import CompressionMiddleware
+from app.api.responses import parse_accept_encoding
+
+
+def test_spreads_carry_etag_and_cache_control(client: TestClient) -> None:
+    """Catalog responses are cacheable and content-addressed."""
+    response = client.get("/api/test/spreads")
+
+    assert response.status_code == 200
+    assert response.headers["etag"].startswith('"')
+    assert "max-age" in response.headers["cache-control"]
+    assert response.json()["total_spreads"] == 4
+
+
+def test_matching_etag_returns_304(client: TestClient) -> None:
+    """A client holding the current ETag gets Not Modified."""
+    etag = client.get("/api/test/spreads").headers["etag"]
+
+    response = client.get("/api/test/spreads", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_catalog_is_served_precompressed(client: TestClient) -> None:
+    """Clients accepting gzip get the precompressed body."""
+    response = client.get("/api/cards", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    data = response.json()
+    assert data["total_cards"] == 78
+    assert data["cards"][0]["name"] == "The Fool"
+
+
+def test_each_encoding_has_its_own_etag(client: TestClient) -> None:
+    """Compressed and identity bodies never share a strong ETag."""
+    identity = client.get("/api/cards", headers={"Accept-Encoding": "identity"})
+    gzipped = client.get("/api/cards", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in identity.headers
+    assert gzipped.headers["etag"] == identity.headers["etag"][:-1] + '-gzip"'
+
+    # A tag for the gzip body doesn't validate the identity body
+    response = client.get(
+        "/api/cards",
+        headers={
+            "Accept-Encoding": "identity",
+            "If-None-Match": gzipped.headers["etag"],
+        },
+    )
+    assert response.status_code == 200
+
+    response = client.get(
+        "/api/cards",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": gzipped.headers["etag"]},
+    )
+    assert response.status_code == 304
+
+
+def test_image_manifest(client: TestClient) -> None:
+    """The manifest maps card ids to image files."""
+    data = client.get("/api/cards/images").json()
+
+    assert data["base_path"] == "/cards/"
+    assert data["images"]["major_00"] == "00-TheFool.png"
+    assert len(data["images"]) == 78
+
+
+def test_accept_encoding_respects_zero_quality() -> None:
+    """Codings with q=0 are refused."""
+    assert parse_accept_encoding("gzip;q=0, br;q=0.5, identity") == {
+        "br",
+        "identity",
+    }
+
+
+def test_compression_middleware_threshold() -> None:
+    """Only bodies above the minimum size are compressed."""
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/long")
+    async def long_body() -> dict[str, str]:
+        return {"interpretation": "The Star rises. " * 50}
+
+    @app.get("/short")
+    async def short_body() -> dict[str, str]:
+        return {"ok": "yes"}
+
+    test_client = TestClient(app)
+    headers = {"Accept-Encoding": "gzip"}
+
+    long_response = test_client.get("/long", headers=headers)
+    short_response = test_client.get("/short", headers=headers)
+
+    assert long_response.headers["content-encoding"] == "gzip"
+    assert long_response.json()["interpretation"].startswith("The Star")
+    assert int(long_response.headers["content-length"]) < 800
+    assert "content-encoding" not in short_response.headers
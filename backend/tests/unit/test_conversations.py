@@ -0,0 +1,152 @@
+"""Tests for the chat conversation cache and service."""
+
+from collections.abc import Sequence
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_conversation_service, get_current_user, get_entitlements
+from app.core.auth import AuthenticatedUser
+from app.core.exceptions import ReadingAccessDeniedError, ReadingNotFoundError
+from app.core.llm.client import LLMClient
+from app.core.services.conversations import (
+    ChatMessage,
+    Conversation,
+    ConversationCache,
+    ConversationService,
+    ConversationStore,
+)
+from app.core.services.entitlements import (
+    Entitlement,
+    EntitlementCache,
+    EntitlementStore,
+)
+
+READING = {
+    "id": "reading-1",
+    "user_id": "user-1",
+    "question": "What should I focus on?",
+    "cards": [
+        {"id": "major_00", "name": "The Fool", "position": "Present", "reversed": True}
+    ],
+    "interpretation": "A leap into the unknown.",
+}
+
+
+class FakeStore(ConversationStore):
+    def __init__(self, messages: int = 0) -> None:
+        self.messages = [
+            {"role": "user", "content": f"m{i}", "created_at": f"2026-01-01T00:00:0{i}"}
+            for i in range(messages)
+        ]
+        self.loads = 0
+
+    async def load(self, reading_id: str, max_messages: int) -> Conversation | None:
+        self.loads += 1
+        if reading_id != READING["id"]:
+            return None
+        newest = self.messages[-max_messages:] if max_messages else []
+        return Conversation.from_rows(READING, newest, max_messages)
+
+    async def append(self, _reading_id: str, messages: Sequence[ChatMessage]) -> None:
+        self.messages.extend(
+            {"role": m.role, "content": m.content, "created_at": m.created_at}
+            for m in messages
+        )
+
+
+class RecordingLLM(LLMClient):
+    def __init__(self) -> None:
+        self.prompts: list[str] = []
+
+    async def generate(self, _system_prompt, user_prompt, _profile=None) -> str:
+        self.prompts.append(user_prompt)
+        return f"answer {len(self.prompts)}"
+
+
+class FreeTier(EntitlementStore):
+    async def fetch(self, _user_id: str) -> Entitlement:
+        return Entitlement()
+
+
+def _service(store: FakeStore, max_messages: int = 4) -> ConversationService:
+    return ConversationService(
+        ConversationCache(max_messages=max_messages), store, RecordingLLM()
+    )
+
+
+async def test_turns_are_served_from_cache_and_written_through() -> None:
+    store = FakeStore(messages=3)
+    service = _service(store, max_messages=4)
+
+    await service.reply("user-1", "reading-1", "first?")
+    reply = await service.reply("user-1", "reading-1", "second?")
+
+    assert store.loads == 1
+    assert reply.content == "answer 2"
+    assert [m["content"] for m in store.messages[-4:]] == [
+        "first?",
+        "answer 1",
+        "second?",
+        "answer 2",
+    ]
+    # Only the last four messages are kept and sent
+    cached = await service.get("user-1", "reading-1")
+    assert [m.content for m in cached.messages] == [
+        "first?",
+        "answer 1",
+        "second?",
+        "answer 2",
+    ]
+    prompt = service.llm.prompts[-1]
+    assert "Seeker: m2\nSeeker: first?\nReader: answer 1" in prompt
+    assert "The Fool (Reversed) in Present" in prompt
+
+
+async def test_unknown_and_foreign_readings_are_rejected() -> None:
+    service = _service(FakeStore())
+
+    with pytest.raises(ReadingNotFoundError):
+        await service.get("user-1", "missing")
+    with pytest.raises(ReadingAccessDeniedError):
+        await service.get("user-2", "reading-1")
+
+
+def test_cache_evicts_least_recent_and_idle(monkeypatch) -> None:
+    now = [0.0]
+    monkeypatch.setattr(
+        "app.core.services.conversations.time.monotonic", lambda: now[0]
+    )
+    cache = ConversationCache(max_conversations=2, idle_seconds=60)
+    for reading_id in ("a", "b"):
+        cache.put(Conversation.from_rows({**READING, "id": reading_id}, [], 4))
+
+    cache.get("a")
+    cache.put(Conversation.from_rows({**READING, "id": "c"}, [], 4))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+
+    now[0] = 61.0
+    assert cache.get("c") is None
+    assert cache.stats()["evictions"] == 2
+
+
+def test_chat_endpoint(client: TestClient) -> None:
+    service = _service(FakeStore())
+    client.app.dependency_overrides[get_conversation_service] = lambda: service
+    client.app.dependency_overrides[get_entitlements] = lambda: EntitlementCache(
+        FreeTier()
+    )
+    client.app.dependency_overrides[get_current_user] = lambda: AuthenticatedUser(
+        "user-1"
+    )
+
+    ok = client.post("/api/reading/reading-1/chat", json={"message": "Why?"})
+    missing = client.post("/api/reading/nope/chat", json={"message": "Why?"})
+
+    assert ok.status_code == 200
+    assert ok.json()["role"] == "assistant"
+    assert ok.json()["content"] == "answer 1"
+    assert ok.json()["created_at"].endswith("Z")
+    assert missing.status_code == 404
+    assert missing.json()["error"] == "NOT_FOUND"
@@ -0,0 +1,167 @@
+"""Tests for pre-generated daily readings."""
+
+import asyncio
+import contextlib
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from app.core.llm.cache import InterpretationCache, SharedCacheStore
+from app.core.llm.client import LLMClient
+from app.core.llm.profiles import GenerationProfile
+from app.core.services import background, daily
+from app.core.services.daily import (
+    REFRESH_LEASE,
+    DailyInterpretation,
+    DailyReadingService,
+    daily_key,
+    seconds_until,
+)
+from app.core.tarot.deck import TarotDeck
+
+
+class CountingClient(LLMClient):
+    """Fake client that counts completions."""
+
+    model = "fake-model"
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+        self.profiles: set[str] = set()
+
+    async def generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        profile: GenerationProfile | None = None,
+    ) -> str:
+        self.calls += 1
+        self.profiles.add(profile.name if profile else "")
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0)
+        self.in_flight -= 1
+        return f"{len(system_prompt)}:{user_prompt[-20:]}"
+
+
+def _service(llm: CountingClient, concurrency: int = 2) -> DailyReadingService:
+    return DailyReadingService(
+        TarotDeck.get_instance(),
+        llm,
+        InterpretationCache(local_max_entries=512),
+        concurrency=concurrency,
+    )
+
+
+async def test_refresh_generates_all_combinations_at_bounded_concurrency() -> None:
+    """All 156 draws are generated once, never more than N at a time."""
+    llm = CountingClient()
+    service = _service(llm, concurrency=3)
+
+    assert await service.refresh() == 156
+    assert await service.refresh() == 0
+    assert llm.calls == 156
+    assert llm.peak <= 3
+    assert llm.profiles == {"one_card"}
+
+
+async def test_daily_draw_is_served_from_cache() -> None:
+    """Once pre-generated, a draw doesn't call the model."""
+    llm = CountingClient()
+    service = _service(llm)
+    await service.refresh()
+
+    card, entry = await service.draw()
+
+    assert llm.calls == 156
+    assert entry.card_id == card.id
+    assert entry.is_reversed == card.reversed
+
+
+async def test_stale_entry_is_served_and_regenerated() -> None:
+    """Entries from another model are returned, then replaced."""
+    llm = CountingClient()
+    service = _service(llm)
+    card = TarotDeck.get_instance().all_cards[0]
+    old = DailyInterpretation(card["id"], False, "old", "OtherClient:x", time.time())
+    await service.cache.set(daily_key(card["id"], False), old.to_json())
+
+    served = await service.interpretation(card, False)
+    await background.drain()
+    refreshed = await service.lookup(card["id"], False)
+
+    assert served.interpretation == "old"
+    assert refreshed is not None
+    assert refreshed.model == service.model_version
+    assert llm.calls == 1
+
+
+async def test_concurrent_misses_share_one_generation() -> None:
+    """Simultaneous requests for a missing entry trigger one model call."""
+    llm = CountingClient()
+    service = _service(llm)
+    card = TarotDeck.get_instance().all_cards[5]
+
+    entries = await asyncio.gather(
+        *(service.interpretation(card, True) for _ in range(5))
+    )
+
+    assert llm.calls == 1
+    assert len({e.interpretation for e in entries}) == 1
+
+
+def test_seconds_until_rolls_over_to_tomorrow() -> None:
+    """An hour already past today is scheduled for tomorrow."""
+    now = datetime(2025, 1, 1, 5, 30, tzinfo=timezone.utc)
+
+    assert seconds_until(6, now) == 1800
+    assert seconds_until(4, now) == 22.5 * 3600
+
+
+async def test_only_the_lease_holder_refreshes(tmp_path: Path) -> None:
+    """Workers sharing a cache don't regenerate the same entries."""
+    path = tmp_path / "cache.sqlite3"
+    llm_a, llm_b = CountingClient(), CountingClient()
+    cache_a = InterpretationCache(shared=SharedCacheStore(path, 10_000_000))
+    cache_b = InterpretationCache(shared=SharedCacheStore(path, 10_000_000))
+    service_a = DailyReadingService(TarotDeck.get_instance(), llm_a, cache_a)
+    service_b = DailyReadingService(TarotDeck.get_instance(), llm_b, cache_b)
+
+    assert await cache_a.acquire_lease(REFRESH_LEASE, 60)
+    assert await service_b.refresh() == 0
+    await cache_a.release_lease(REFRESH_LEASE)
+
+    assert await service_a.refresh() == 156
+    # Entries worker A just refreshed are fresh for worker B
+    assert await service_b.refresh() == 0
+    assert llm_b.calls == 0
+
+
+async def test_run_survives_a_failed_refresh(monkeypatch: pytest.MonkeyPatch) -> None:
+    """An unexpected error is logged and the loop keeps going."""
+    service = _service(CountingClient())
+    attempts = 0
+
+    async def flaky_refresh(**_kwargs: bool) -> int:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("boom")
+        return 0
+
+    monkeypatch.setattr(service, "refresh", flaky_refresh)
+    monkeypatch.setattr(daily, "seconds_until", lambda _hour: 0)
+    task = asyncio.create_task(service.run(3))
+    for _ in range(50):
+        if attempts >= 2:
+            break
+        await asyncio.sleep(0)
+    task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await task
+
+    assert attempts >= 2
@@ -0,0 +1,77 @@
+"""Tests for the opt-in diagnostics."""
+
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.middleware.profiler import ProfilerMiddleware
+from app.core.diagnostics import LoopLagMonitor, MemoryTracker
+
+
+@pytest.fixture
+def profiled(tmp_path: Path) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/work")
+    async def work() -> dict[str, int]:
+        return {"total": sum(range(1000))}
+
+    app.add_middleware(ProfilerMiddleware, output_dir=tmp_path)
+    return TestClient(app)
+
+
+def test_profiles_only_requests_that_ask(profiled: TestClient, tmp_path: Path) -> None:
+    """A profile file is written for X-Profile or ?profile=1 requests."""
+    assert "x-profile-file" not in profiled.get("/work").headers
+    assert list(tmp_path.iterdir()) == []
+
+    by_header = profiled.get("/work", headers={"X-Profile": "1"})
+    by_query = profiled.get("/work?profile=1")
+
+    assert by_header.json() == {"total": 499500}
+    for response in (by_header, by_query):
+        name = response.headers["x-profile-file"]
+        assert name.endswith("-work.prof")
+        assert (tmp_path / name).stat().st_size > 0
+
+
+async def test_loop_monitor_captures_blocking_stack() -> None:
+    """A synchronous sleep on the loop is logged with the offending line."""
+    monitor = LoopLagMonitor(threshold_seconds=0.04)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        time.sleep(0.25)
+        await asyncio.sleep(0.1)
+    finally:
+        await monitor.stop()
+
+    snapshot = monitor.snapshot()
+    assert snapshot["stalls"] >= 1
+    assert snapshot["max_lag_ms"] >= 150
+    assert "time.sleep(0.25)" in "".join(snapshot["last_blocked_stack"])
+    assert not snapshot["running"]
+
+
+def test_memory_tracker_reports_growth() -> None:
+    """Allocations made after the baseline show up in the diff."""
+    tracker = MemoryTracker()
+    with pytest.raises(RuntimeError):
+        tracker.diff()
+
+    tracker.start()
+    try:
+        retained = [bytearray(1024) for _ in range(2000)]
+        top = tracker.diff(limit=5)
+    finally:
+        tracker.stop()
+
+    assert len(retained) == 2000
+    assert any(
+        "test_diagnostics.py" in t["location"] and t["size_diff_kb"] > 1000 for t in top
+    )
+    assert not tracker.tracing
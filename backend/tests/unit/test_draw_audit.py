@@ -0,0 +1,202 @@
+"""Tests for the vectorized draw fairness audit."""
+
+import math
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routers import diagnostics
+from app.core.tarot.audit import (
+    SpreadAudit,
+    chi_square_sf,
+    draw_prefixes,
+    random_bits,
+    run_audit,
+)
+from app.core.tarot.deck import DrawnCard, TarotDeck
+from app.core.tarot.spreads import SpreadLibrary
+
+np = pytest.importorskip("numpy")
+
+
+def test_chi_square_sf_matches_known_values() -> None:
+    """Survival function agrees with tabulated critical values."""
+    assert chi_square_sf(3.841, 1) == pytest.approx(0.05, abs=1e-4)
+    assert chi_square_sf(10.0, 2) == pytest.approx(math.exp(-5), rel=1e-9)
+    assert chi_square_sf(98.484, 77) == pytest.approx(0.05, abs=1e-3)
+    assert chi_square_sf(0.0, 5) == 1.0
+
+
+def test_draw_prefixes_are_distinct_cards() -> None:
+    """Each simulated draw holds distinct, valid card indices."""
+    prefixes = draw_prefixes(78, 10, 5_000)
+
+    assert prefixes.shape == (5_000, 10)
+    assert prefixes.min() >= 0
+    assert prefixes.max() < 78
+    assert all(len(set(row)) == 10 for row in prefixes.tolist())
+
+
+def test_draw_prefixes_rejects_bad_count() -> None:
+    """Drawing more cards than the deck holds is an error."""
+    with pytest.raises(ValueError):
+        draw_prefixes(78, 79, 10)
+
+
+def test_random_bits_are_bits() -> None:
+    """Reversal bits are 0 or 1, as many as asked for."""
+    bits = random_bits(1_001)
+
+    assert bits.shape == (1_001,)
+    assert set(bits.tolist()) <= {0, 1}
+
+
+def test_audit_passes_for_every_spread() -> None:
+    """Simulated draws pass every test for every spread."""
+    spreads = list(SpreadLibrary.get_all_spreads().values())
+
+    report = run_audit(spreads, trials=50_000, alpha=1e-6, batch_size=20_000)
+
+    assert report.passed
+    assert [spread.spread_id for spread in report.spreads] == [
+        spread.spread_id for spread in spreads
+    ]
+    for result, spread in zip(report.spreads, spreads, strict=True):
+        assert len(result.positions) == spread.card_count
+        assert result.reversal_rate == pytest.approx(0.5, abs=0.01)
+
+
+def test_audit_detects_positional_bias() -> None:
+    """A card favouring one position fails the positional test."""
+    trials = 78_000
+    counts = np.full((3, 78), 1_000, dtype=np.int64)
+    # Same totals per card, but card 0 leans towards the first position
+    counts[0, 0] += 300
+    counts[0, 1] -= 300
+    counts[1, 0] -= 300
+    counts[1, 1] += 300
+    reversed_counts = np.full(3, trials // 2, dtype=np.int64)
+
+    result = SpreadAudit.from_counts(
+        "three_card", ["Past", "Present", "Future"], counts, reversed_counts, trials
+    )
+
+    assert result.p_value > 0.001
+    assert result.positional_p_value < 0.001
+    assert not result.passed
+
+
+def test_audit_detects_reversal_bias() -> None:
+    """Too many reversals fail the reversal test."""
+    trials = 78_000
+    counts = np.full((1, 78), 1_000, dtype=np.int64)
+    reversed_counts = np.array([40_000], dtype=np.int64)
+
+    result = SpreadAudit.from_counts(
+        "one_card", ["Card"], counts, reversed_counts, trials
+    )
+
+    assert result.p_value == pytest.approx(1.0)
+    assert result.reversal_p_value < 0.001
+    assert not result.passed
+
+
+@pytest.fixture
+def diagnostics_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(diagnostics.router)
+    return TestClient(app)
+
+
+def test_deck_cross_check_passes() -> None:
+    """Real draws from the deck pass the same tests."""
+    spread = SpreadLibrary.get_spread("three_card")
+    assert spread is not None
+
+    report = run_audit(
+        [spread],
+        deck=TarotDeck.get_instance(),
+        trials=10_000,
+        deck_trials=5_000,
+        alpha=1e-6,
+    )
+
+    assert report.passed
+    (result,) = report.deck_draws
+    assert result.trials == 5_000
+    assert result.reversal_rate == pytest.approx(0.5, abs=0.05)
+
+
+class AlwaysReversedDeck:
+    """A deck whose draws are biased: every card comes up reversed."""
+
+    def __init__(self) -> None:
+        self.deck = TarotDeck.get_instance()
+        self.all_cards = self.deck.all_cards
+
+    def draw_with_reversals(self, count: int) -> list[DrawnCard]:
+        return [
+            DrawnCard(card, position, True)
+            for position, card in enumerate(self.deck.draw(count))
+        ]
+
+
+def test_deck_cross_check_catches_a_biased_deck() -> None:
+    """A bias in the deck fails the audit even though the simulation passes."""
+    spread = SpreadLibrary.get_spread("one_card")
+    assert spread is not None
+
+    report = run_audit(
+        [spread],
+        deck=AlwaysReversedDeck(),
+        trials=10_000,
+        deck_trials=2_000,
+        alpha=1e-6,
+    )
+
+    assert all(result.passed for result in report.spreads)
+    assert not report.passed
+    assert report.deck_draws[0].reversal_rate == 1.0
+
+
+def test_audit_endpoint(diagnostics_client: TestClient) -> None:
+    """The diagnostics endpoint reports on one spread."""
+    response = diagnostics_client.get(
+        "/api/diagnostics/draws",
+        params={
+            "trials": 2_000,
+            "deck_trials": 1_000,
+            "alpha": 1e-9,
+            "spread_id": "three_card",
+        },
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["passed"] is True
+    assert [spread["spread_id"] for spread in body["spreads"]] == ["three_card"]
+    assert [spread["spread_id"] for spread in body["deck_draws"]] == ["three_card"]
+
+
+def test_audit_endpoint_limits_trials(diagnostics_client: TestClient) -> None:
+    """Requests for more trials than the cap are rejected."""
+    response = diagnostics_client.get(
+        "/api/diagnostics/draws", params={"trials": 10_000_000}
+    )
+
+    assert response.status_code == 422
+
+
+def test_audit_endpoint_unknown_spread(diagnostics_client: TestClient) -> None:
+    """An unknown spread id is a 404."""
+    response = diagnostics_client.get(
+        "/api/diagnostics/draws", params={"trials": 1_000, "spread_id": "nope"}
+    )
+
+    assert response.status_code == 404
+
+
+def test_audit_endpoint_is_off_by_default(client: TestClient) -> None:
+    """Without diagnostics enabled the audit isn't mounted."""
+    assert client.get("/api/diagnostics/draws").status_code == 404
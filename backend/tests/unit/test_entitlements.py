@@ -0,0 +1,183 @@
+"""Tests for the entitlement cache and its invalidation."""
+
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_current_user, get_entitlements, get_reading_orchestrator
+from app.core.auth import AuthenticatedUser
+from app.core.llm.router import current_tier
+from app.core.services.credits import CreditLedger
+from app.core.services.entitlements import (
+    Entitlement,
+    EntitlementCache,
+    EntitlementLedger,
+    EntitlementStore,
+)
+from app.core.services.webhooks import BillingBatch, WebhookEventStore, WebhookProcessor
+
+
+class CountingStore(EntitlementStore):
+    def __init__(self) -> None:
+        self.entitlements = {
+            "user-1": Entitlement("seeker", 5, "cus_1"),
+            "user-2": Entitlement("free", 3),
+        }
+        self.fetches = 0
+        self.gate: asyncio.Event | None = None
+
+    async def fetch(self, user_id: str) -> Entitlement:
+        self.fetches += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        return self.entitlements.get(user_id, Entitlement())
+
+
+class Ledger(CreditLedger):
+    async def reserve(self, _user_id: str, _amount: int, _description: str) -> bool:
+        return True
+
+    async def refund(self, _user_id: str, _amount: int, _description: str) -> None:
+        return None
+
+
+class Events(WebhookEventStore):
+    async def record(self, _event) -> bool:
+        return True
+
+    async def pending(self, _limit: int = 500) -> list:
+        return []
+
+    async def apply(self, batch: BillingBatch) -> list[str]:
+        return list(batch.processed)
+
+
+async def test_hits_skip_the_store_until_invalidated() -> None:
+    store = CountingStore()
+    cache = EntitlementCache(store)
+
+    assert (await cache.get("user-1")).tier == "seeker"
+    await cache.get("user-1")
+    assert store.fetches == 1
+
+    cache.invalidate("user-1")
+    await cache.get("user-1")
+    assert store.fetches == 2
+    assert cache.stats() == {"users": 1, "hits": 1, "misses": 2}
+
+
+async def test_expired_entries_are_reread(monkeypatch) -> None:
+    now = [0.0]
+    monkeypatch.setattr("app.core.services.entitlements.time.monotonic", lambda: now[0])
+    store = CountingStore()
+    cache = EntitlementCache(store, ttl_seconds=60)
+
+    await cache.get("user-1")
+    now[0] = 61.0
+    await cache.get("user-1")
+
+    assert store.fetches == 2
+
+
+async def test_concurrent_misses_share_a_read_and_respect_invalidation() -> None:
+    store = CountingStore()
+    store.gate = asyncio.Event()
+    cache = EntitlementCache(store)
+
+    reads = [asyncio.create_task(cache.get("user-1")) for _ in range(5)]
+    await asyncio.sleep(0)
+    # Credits change while the read is in flight
+    cache.invalidate("user-1")
+    store.gate.set()
+    results = await asyncio.gather(*reads)
+
+    assert store.fetches == 1
+    assert {r.tier for r in results} == {"seeker"}
+    assert cache.peek("user-1") is None
+
+
+async def test_cancelled_caller_leaves_the_shared_read_running() -> None:
+    store = CountingStore()
+    store.gate = asyncio.Event()
+    cache = EntitlementCache(store)
+
+    first = asyncio.create_task(cache.get("user-1"))
+    others = [asyncio.create_task(cache.get("user-1")) for _ in range(3)]
+    await asyncio.sleep(0)
+    # The request that started the read goes away
+    first.cancel()
+    await asyncio.sleep(0)
+    store.gate.set()
+    results = await asyncio.gather(*others)
+
+    assert first.cancelled()
+    assert store.fetches == 1
+    assert {r.tier for r in results} == {"seeker"}
+    assert cache.peek("user-1") is not None
+
+
+async def test_credit_changes_invalidate() -> None:
+    cache = EntitlementCache(CountingStore())
+    ledger = EntitlementLedger(Ledger(), cache)
+    await cache.get("user-2")
+
+    await ledger.reserve("user-2", 1, "Reading")
+
+    assert cache.peek("user-2") is None
+
+
+async def test_webhook_batches_invalidate_by_user_and_customer() -> None:
+    cache = EntitlementCache(CountingStore())
+    await cache.get("user-1")
+    await cache.get("user-2")
+    processor = WebhookProcessor(Events(), {}, entitlements=cache)
+    subscription = {
+        "id": "evt_1",
+        "type": "customer.subscription.deleted",
+        "created": 1_790_000_000,
+        "data": {"object": {"id": "sub_1", "customer": "cus_1", "status": "canceled"}},
+    }
+
+    await processor.process([subscription])
+    assert cache.peek("user-1") is None
+    assert cache.peek("user-2") is not None
+
+    purchase = {
+        "id": "evt_2",
+        "type": "checkout.session.completed",
+        "data": {
+            "object": {
+                "mode": "payment",
+                "metadata": {"user_id": "user-2", "credits": "20"},
+            }
+        },
+    }
+    await processor.process([purchase])
+    assert cache.peek("user-2") is None
+
+
+def test_reading_is_routed_for_the_cached_tier(client: TestClient) -> None:
+    class Orchestrator:
+        tier: str | None = None
+
+        async def create(self, *_args):
+            Orchestrator.tier = current_tier()
+            return self
+
+        def to_response(self) -> dict:
+            return {}
+
+    client.app.dependency_overrides[get_entitlements] = lambda: EntitlementCache(
+        CountingStore()
+    )
+    client.app.dependency_overrides[get_reading_orchestrator] = Orchestrator
+    client.app.dependency_overrides[get_current_user] = lambda: AuthenticatedUser(
+        "user-1"
+    )
+
+    response = client.post(
+        "/api/reading", json={"question": "What now?", "spread_type": "single"}
+    )
+
+    assert response.status_code == 201
+    assert Orchestrator.tier == "seeker"
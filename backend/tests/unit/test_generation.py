@@ -0,0 +1,115 @@
+"""Tests for single-call and fan-out interpretation strategies."""
+
+import asyncio
+
+import pytest
+
+from app.core.llm.client import LLMClient
+from app.core.llm.profiles import GenerationProfile
+from app.core.services.generation import generate_interpretation, stream_fan_out
+from app.core.tarot.deck import DrawnCard, TarotDeck
+from app.core.tarot.spreads import SpreadLibrary
+
+
+class ScriptedClient(LLMClient):
+    """Fake client; earlier calls take longer, so they finish last."""
+
+    def __init__(self, fail_on: str | None = None) -> None:
+        self.calls: list[str] = []
+        self.in_flight = 0
+        self.peak = 0
+        self.cancelled = 0
+        self.fail_on = fail_on
+
+    async def generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        profile: GenerationProfile | None = None,
+    ) -> str:
+        name = profile.name if profile else ""
+        self.calls.append(name)
+        delay = 0.002 * (12 - len(self.calls))
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+        if self.fail_on and self.fail_on in user_prompt:
+            raise RuntimeError("model refused")
+        return f"{name}#{len(self.calls)}:{len(system_prompt)}"
+
+
+def _draw(count: int) -> list[DrawnCard]:
+    return TarotDeck.get_instance().draw_with_reversals(count)
+
+
+async def test_fan_out_runs_positions_concurrently_then_synthesizes() -> None:
+    """Ten position calls run at once, followed by one synthesis call."""
+    spread = SpreadLibrary.celtic_cross()
+    llm = ScriptedClient()
+
+    result = await generate_interpretation(
+        llm, "Q?", spread, _draw(10), strategy="fan_out"
+    )
+
+    assert result.strategy == "fan_out"
+    assert result.calls == 11
+    assert llm.peak == 10
+    assert llm.calls[-1] == "celtic_cross:synthesis"
+    assert result.text.startswith("**Significator")
+    assert result.text.index("**Challenge") < result.text.index("**Outcome")
+
+
+async def test_stream_yields_positions_in_order() -> None:
+    """Parts come out in position order even when later ones finish first."""
+    spread = SpreadLibrary.shadow_work()
+
+    parts = [
+        part async for part in stream_fan_out(ScriptedClient(), "Q?", spread, _draw(4))
+    ]
+
+    assert [p.position for p in parts] == [0, 1, 2, 3, None]
+    assert parts[-1].kind == "synthesis"
+
+
+async def test_celtic_cross_defaults_to_a_single_call() -> None:
+    """Fan-out is opt-in; by default the reading is one completion."""
+    llm = ScriptedClient()
+
+    result = await generate_interpretation(
+        llm, "Q?", SpreadLibrary.celtic_cross(), _draw(10)
+    )
+
+    assert result.calls == 1
+    assert llm.calls == ["celtic_cross"]
+    assert result.output_chars == len(result.text)
+
+
+async def test_failed_position_cancels_the_rest() -> None:
+    """One failed position fails the reading and stops the others."""
+    spread = SpreadLibrary.celtic_cross()
+    llm = ScriptedClient(fail_on="Hopes/Fears")
+
+    with pytest.raises(RuntimeError):
+        await generate_interpretation(llm, "Q?", spread, _draw(10), strategy="fan_out")
+    await asyncio.sleep(0)
+
+    assert llm.cancelled == 8
+
+
+async def test_failed_stream_waits_for_its_calls_to_stop() -> None:
+    """By the time the failure surfaces, every other call has finished."""
+    spread = SpreadLibrary.celtic_cross()
+    llm = ScriptedClient(fail_on="Hopes/Fears")
+
+    with pytest.raises(RuntimeError):
+        async for _ in stream_fan_out(llm, "Q?", spread, _draw(10)):
+            pass
+
+    assert llm.in_flight == 0
+    assert llm.cancelled == 8
@@ -0,0 +1,266 @@
+"""Tests for durable reading jobs."""
+
+import asyncio
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_job_pool
+from app.core.services.jobs import Job, JobStatus, JobStore, JobWorkerPool
+from app.main import create_app
+
+
+async def _wait_for(store: JobStore, job_id: str, status: JobStatus) -> Job:
+    for _ in range(200):
+        job = store.get(job_id)
+        assert job is not None
+        if job.status == status:
+            return job
+        await asyncio.sleep(0.01)
+    pytest.fail(f"job never reached {status}")
+
+
+def test_claim_takes_highest_priority_first(tmp_path: Path) -> None:
+    """Priority wins over submission order."""
+    store = JobStore(tmp_path / "jobs.sqlite3")
+    low = store.submit({"n": 1}, priority=0)
+    high = store.submit({"n": 2}, priority=5)
+
+    first = store.claim(lease_seconds=30)
+    second = store.claim(lease_seconds=30)
+
+    assert first is not None and first.id == high.id
+    assert second is not None and second.id == low.id
+    assert store.claim(lease_seconds=30) is None
+
+
+def test_jobs_survive_reopening(tmp_path: Path) -> None:
+    """Queued jobs are still there after a restart."""
+    path = tmp_path / "jobs.sqlite3"
+    job = JobStore(path).submit({"question": "Still here?"})
+
+    reopened = JobStore(path).get(job.id)
+
+    assert reopened is not None
+    assert reopened.status == JobStatus.QUEUED
+    assert reopened.payload == {"question": "Still here?"}
+
+
+def test_expired_lease_is_reclaimed_then_abandoned() -> None:
+    """A dead worker's job is retried, then failed after max attempts."""
+    store = JobStore(":memory:", max_attempts=2)
+    job = store.submit({})
+
+    assert store.claim(lease_seconds=-1) is not None
+    retried = store.claim(lease_seconds=-1)
+    assert retried is not None and retried.attempts == 2
+
+    assert store.claim(lease_seconds=30) is None
+    abandoned = store.get(job.id)
+    assert abandoned is not None and abandoned.status == JobStatus.FAILED
+
+
+async def test_pool_runs_jobs_and_records_timing() -> None:
+    """Workers complete jobs and record when they ran."""
+    store = JobStore(":memory:")
+
+    async def handler(job: Job) -> dict[str, Any]:
+        return {"echo": job.payload["question"]}
+
+    pool = JobWorkerPool(store, handler, workers=2, poll_interval=0.01)
+    pool.start()
+    try:
+        queued = await pool.submit({"question": "Why?"})
+        done = await _wait_for(store, queued.id, JobStatus.SUCCEEDED)
+    finally:
+        await pool.stop()
+
+    assert done.result == {"echo": "Why?"}
+    timing = done.to_dict()["timing"]
+    assert timing["queued_ms"] is not None
+    assert timing["run_ms"] is not None
+
+
+async def test_cancelling_a_running_job_stops_its_handler() -> None:
+    """A cancelled job's handler is interrupted and its result discarded."""
+    store = JobStore(":memory:")
+    started = asyncio.Event()
+    interrupted = asyncio.Event()
+
+    async def handler(_job: Job) -> dict[str, Any]:
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            interrupted.set()
+            raise
+        return {}
+
+    pool = JobWorkerPool(store, handler, workers=1, poll_interval=0.01)
+    pool.start()
+    try:
+        job = await pool.submit({})
+        await asyncio.wait_for(started.wait(), 1)
+        assert store.cancel(job.id)
+        await asyncio.wait_for(interrupted.wait(), 1)
+    finally:
+        await pool.stop()
+
+    cancelled = store.get(job.id)
+    assert cancelled is not None and cancelled.status == JobStatus.CANCELLED
+
+
+async def test_handler_errors_fail_the_job() -> None:
+    """Exceptions are stored as the job error."""
+    store = JobStore(":memory:")
+
+    async def handler(job: Job) -> dict[str, Any]:
+        raise RuntimeError(f"no model for {job.id[:4]}")
+
+    pool = JobWorkerPool(store, handler, workers=1, poll_interval=0.01)
+    pool.start()
+    try:
+        job = await pool.submit({})
+        failed = await _wait_for(store, job.id, JobStatus.FAILED)
+    finally:
+        await pool.stop()
+
+    assert failed.error is not None and failed.error.startswith("no model")
+
+
+async def test_pool_purges_finished_jobs_periodically() -> None:
+    """Workers keep purging finished jobs while they run, not just once."""
+    store = JobStore(":memory:")
+
+    async def handler(_job: Job) -> dict[str, Any]:
+        return {}
+
+    pool = JobWorkerPool(
+        store,
+        handler,
+        workers=2,
+        poll_interval=0.01,
+        retention_seconds=0.0,
+        purge_interval=0.05,
+    )
+    pool.start()
+    try:
+        for _ in range(2):
+            # Only finished jobs are purged, so a missing job ran to the end
+            job = await pool.submit({})
+            for _ in range(100):
+                if store.get(job.id) is None:
+                    break
+                await asyncio.sleep(0.01)
+            assert store.get(job.id) is None
+    finally:
+        await pool.stop()
+
+
+class LockedStore(JobStore):
+    """Job store whose first writes fail with a lock error."""
+
+    def __init__(self) -> None:
+        super().__init__(":memory:")
+        self.locked = {"heartbeat": 2, "complete": 1}
+
+    def _check(self, operation: str) -> None:
+        if self.locked[operation] > 0:
+            self.locked[operation] -= 1
+            raise sqlite3.OperationalError("database is locked")
+
+    def heartbeat(self, job_id: str, lease_seconds: float) -> bool:
+        self._check("heartbeat")
+        return super().heartbeat(job_id, lease_seconds)
+
+    def complete(self, job_id: str, result: dict[str, Any]) -> bool:
+        self._check("complete")
+        return super().complete(job_id, result)
+
+
+async def test_store_errors_dont_kill_workers() -> None:
+    """A locked database is logged and the worker keeps taking jobs."""
+    store = LockedStore()
+
+    async def handler(job: Job) -> dict[str, Any]:
+        await asyncio.sleep(0.03)
+        return {"n": job.payload["n"]}
+
+    pool = JobWorkerPool(store, handler, workers=1, poll_interval=0.01)
+    pool.start()
+    try:
+        first = await pool.submit({"n": 1})
+        await asyncio.sleep(0.1)
+        second = await pool.submit({"n": 2})
+        done = await _wait_for(store, second.id, JobStatus.SUCCEEDED)
+        assert not any(task.done() for task in pool._tasks)
+    finally:
+        await pool.stop()
+
+    assert done.result == {"n": 2}
+    # Its result wasn't saved, so the job waits for its lease to lapse
+    unsaved = store.get(first.id)
+    assert unsaved is not None and unsaved.status == JobStatus.RUNNING
+
+
+async def test_cancelled_job_handler_has_stopped_before_the_worker_moves_on() -> None:
+    """The worker waits for a cancelled handler to finish unwinding."""
+    store = JobStore(":memory:")
+    started = asyncio.Event()
+    unwound: list[bool] = []
+
+    async def handler(_job: Job) -> dict[str, Any]:
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        finally:
+            await asyncio.sleep(0.02)
+            unwound.append(True)
+        return {}
+
+    pool = JobWorkerPool(
+        store, handler, workers=1, poll_interval=0.01, job_timeout=0.05
+    )
+    pool.start()
+    try:
+        job = await pool.submit({})
+        await _wait_for(store, job.id, JobStatus.FAILED)
+        assert unwound == [True]
+    finally:
+        await pool.stop()
+
+
+def test_job_endpoints_submit_poll_and_cancel() -> None:
+    """Submitting returns 202 and the job can be polled and cancelled."""
+
+    async def handler(_job: Job) -> dict[str, Any]:
+        return {}
+
+    pool = JobWorkerPool(JobStore(":memory:"), handler)
+    app = create_app()
+    app.dependency_overrides[get_job_pool] = lambda: pool
+    client = TestClient(app)
+
+    submitted = client.post(
+        "/api/test/reading/jobs", json={"question": "Long one?", "priority": 3}
+    )
+    assert submitted.status_code == 202
+    job_id = submitted.json()["id"]
+    assert submitted.headers["location"].endswith(job_id)
+
+    polled = client.get(f"/api/test/reading/jobs/{job_id}").json()
+    assert polled["status"] == "queued"
+    assert polled["priority"] == 3
+
+    assert client.delete(f"/api/test/reading/jobs/{job_id}").json()["status"] == (
+        "cancelled"
+    )
+    assert client.delete(f"/api/test/reading/jobs/{job_id}").status_code == 409
+    assert client.get("/api/test/reading/jobs/missing").status_code == 404
+
+    events = client.get(f"/api/test/reading/jobs/{job_id}/events")
+    assert events.headers["content-type"].startswith("text/event-stream")
+    assert '"status":"cancelled"' in events.text
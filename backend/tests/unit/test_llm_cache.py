@@ -0,0 +1,142 @@
+"""Tests for the two-tier interpretation cache."""
+
+import time
+from pathlib import Path
+
+from app.core.llm.cache import (
+    CachedLLMClient,
+    InterpretationCache,
+    SharedCacheStore,
+    decode_value,
+    encode_value,
+)
+from app.core.llm.client import LLMClient
+from app.core.llm.profiles import GenerationProfile
+
+
+class CountingClient(LLMClient):
+    """Fake client that counts completions."""
+
+    model = "fake-model"
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.profiles: list[GenerationProfile | None] = []
+
+    async def generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        profile: GenerationProfile | None = None,
+    ) -> str:
+        self.calls += 1
+        self.profiles.append(profile)
+        return f"{system_prompt}|{user_prompt}|{self.calls}"
+
+
+def test_value_encoding_round_trips_and_compresses() -> None:
+    """Long values are compressed and decode back unchanged."""
+    text = "As above, so below. " * 100
+
+    payload = encode_value(text)
+
+    assert len(payload) < len(text)
+    assert decode_value(payload) == text
+    assert decode_value(encode_value("short")) == "short"
+
+
+def test_shared_store_survives_reopen(tmp_path: Path) -> None:
+    """Entries persist across connections, as across worker restarts."""
+    path = tmp_path / "cache.sqlite3"
+    store = SharedCacheStore(path, max_bytes=1_000_000)
+    store.set("key", "The Tower speaks", ttl_seconds=60)
+    store.close()
+
+    reopened = SharedCacheStore(path, max_bytes=1_000_000)
+    assert reopened.get("key") == "The Tower speaks"
+
+
+def test_shared_store_expires_entries(tmp_path: Path) -> None:
+    """Entries past their TTL are misses."""
+    store = SharedCacheStore(tmp_path / "cache.sqlite3", max_bytes=1_000_000)
+    store.set("key", "value", ttl_seconds=-1)
+
+    assert store.get("key") is None
+
+
+def test_shared_store_evicts_least_recently_used(tmp_path: Path) -> None:
+    """The store stays within its byte budget."""
+    store = SharedCacheStore(tmp_path / "cache.sqlite3", max_bytes=100)
+    for i in range(10):
+        store.set(f"key{i}", "x" * 40 + str(i), ttl_seconds=60)
+
+    stats = store.stats()
+    assert stats["bytes"] <= 100
+    assert store.get("key9") is not None
+    assert store.get("key0") is None
+
+
+async def test_cached_client_generates_once(tmp_path: Path) -> None:
+    """Repeated prompts are served from the cache."""
+    cache = InterpretationCache(
+        shared=SharedCacheStore(tmp_path / "cache.sqlite3", max_bytes=1_000_000)
+    )
+    inner = CountingClient()
+    client = CachedLLMClient(inner, cache)
+
+    first = await client.generate("system", "question")
+    second = await client.generate("system", "question")
+
+    assert first == second
+    assert inner.calls == 1
+    assert cache.hits["local"] == 1
+
+
+async def test_shared_tier_is_visible_to_other_workers(tmp_path: Path) -> None:
+    """A second process-local cache hits entries written by the first."""
+    path = tmp_path / "cache.sqlite3"
+    worker_a = CachedLLMClient(
+        CountingClient(),
+        InterpretationCache(shared=SharedCacheStore(path, max_bytes=1_000_000)),
+    )
+    inner_b = CountingClient()
+    cache_b = InterpretationCache(shared=SharedCacheStore(path, max_bytes=1_000_000))
+    worker_b = CachedLLMClient(inner_b, cache_b)
+
+    expected = await worker_a.generate("system", "question")
+
+    assert await worker_b.generate("system", "question") == expected
+    assert inner_b.calls == 0
+    assert cache_b.hits["shared"] == 1
+
+
+def test_shared_store_tracks_its_size(tmp_path: Path) -> None:
+    """The running total follows inserts, overwrites, expiry and eviction."""
+    path = tmp_path / "cache.sqlite3"
+    store = SharedCacheStore(path, max_bytes=100)
+    store.set("a", "x" * 30, ttl_seconds=60)
+    store.set("a", "x" * 10, ttl_seconds=60)
+    store.set("b", "x" * 20, ttl_seconds=-1)
+    assert store.get("b") is None
+    for i in range(10):
+        store.set(f"key{i}", "x" * 40 + str(i), ttl_seconds=60)
+
+    (actual,) = store._conn.execute(
+        "SELECT COALESCE(SUM(size), 0) FROM interpretations"
+    ).fetchone()
+    assert store.stats()["bytes"] == actual <= 100
+    store.close()
+
+    assert SharedCacheStore(path, max_bytes=100).stats()["bytes"] == actual
+
+
+async def test_shared_hit_keeps_the_remaining_ttl(tmp_path: Path) -> None:
+    """A local copy of a shared entry expires when the shared row does."""
+    shared = SharedCacheStore(tmp_path / "cache.sqlite3", max_bytes=1_000_000)
+    shared.set("key", "value", ttl_seconds=60)
+    cache = InterpretationCache(ttl_seconds=7 * 24 * 3600, shared=shared)
+
+    assert await cache.get("key") == "value"
+
+    expires_at, _ = cache._local["key"]
+    assert expires_at <= time.time() + 60
@@ -0,0 +1,97 @@
+"""Tests for follow-up turns reusing provider context."""
+
+import json
+import time
+
+import httpx
+
+from app.core.llm.cache import CachedLLMClient, InterpretationCache
+from app.core.llm.client import LLMClient, OllamaClient
+from app.core.llm.profiles import GenerationProfile
+from app.core.llm.sessions import ContextSessionCache
+
+
+def _ollama(requests: list[dict]) -> OllamaClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent = json.loads(request.content)
+        requests.append(sent)
+        context = [*sent.get("context", []), *range(len(requests) * 10)]
+        return httpx.Response(
+            200, json={"response": f" answer {len(requests)} ", "context": context}
+        )
+
+    client = OllamaClient()
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+async def test_follow_up_sends_only_the_new_turn_once_established() -> None:
+    """The second turn sends the short prompt with the stored context."""
+    requests: list[dict] = []
+    client = _ollama(requests)
+
+    first = await client.follow_up("r1", "sys", "FULL PROMPT", "turn 1")
+    second = await client.follow_up("r1", "sys", "FULL PROMPT 2", "turn 2")
+
+    assert (first, second) == ("answer 1", "answer 2")
+    assert requests[0]["prompt"] == "FULL PROMPT"
+    assert requests[0]["system"] == "sys"
+    assert "context" not in requests[0]
+    assert requests[1]["prompt"] == "turn 2"
+    assert "system" not in requests[1]
+    assert requests[1]["context"] == list(range(10))
+    assert client.sessions.stats()["hits"] == 1
+
+
+async def test_context_is_not_reused_across_models() -> None:
+    """A profile that switches model starts the conversation over."""
+    requests: list[dict] = []
+    client = _ollama(requests)
+    other = GenerationProfile(name="other", models=(("ollama", "llama3"),))
+
+    await client.follow_up("r1", "sys", "FULL", "turn")
+    await client.follow_up("r1", "sys", "FULL", "turn", other)
+
+    assert requests[1]["prompt"] == "FULL"
+    assert requests[1]["model"] == "llama3"
+
+
+async def test_cached_client_passes_follow_ups_through() -> None:
+    """Conversation turns bypass the interpretation cache."""
+    requests: list[dict] = []
+    client = CachedLLMClient(_ollama(requests), InterpretationCache())
+
+    await client.follow_up("r1", "sys", "FULL", "turn")
+    await client.follow_up("r1", "sys", "FULL", "turn")
+
+    assert [r["prompt"] for r in requests] == ["FULL", "turn"]
+
+
+async def test_providers_without_sessions_send_the_full_prompt() -> None:
+    """The default implementation ignores the session."""
+
+    class Echo(LLMClient):
+        async def generate(self, _system_prompt, user_prompt, _profile=None):
+            return user_prompt
+
+    assert await Echo().follow_up("r1", "sys", "FULL", "turn") == "FULL"
+
+
+def test_session_cache_evicts_by_count_tokens_and_age(monkeypatch) -> None:
+    """The least recently used sessions go first; expired ones are misses."""
+    cache = ContextSessionCache(max_sessions=2, max_tokens=10, ttl_seconds=60)
+    cache.put("a", "m", [1, 2, 3])
+    cache.put("b", "m", [4, 5, 6])
+    assert cache.get("a", "m") == (1, 2, 3)
+
+    cache.put("c", "m", [7])
+    assert cache.get("b", "m") is None
+    cache.put("d", "m", list(range(8)))
+    assert cache.get("a", "m") is None
+    assert cache.stats()["tokens"] == 9
+    assert cache.stats()["evictions"] == 2
+
+    now = time.monotonic()
+    monkeypatch.setattr("app.core.llm.sessions.time.monotonic", lambda: now + 61)
+    assert cache.get("d", "m") is None
+    assert len(cache) == 1
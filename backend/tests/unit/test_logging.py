@@ -0,0 +1,102 @@
+"""Tests for the structured logging pipeline."""
+
+import json
+import logging
+import time
+
+import pytest
+import structlog
+
+from app.core import logs
+from app.core.logs import EventSampler, configure_logging, shutdown_logging
+from app.main import create_app
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def json_logging():
+    configure_logging(level="INFO", sample_rates={"hot": 0.0})
+    yield
+    shutdown_logging()
+
+
+def test_sampler_keeps_configured_share():
+    values = iter([0.05, 0.5, 0.09, 0.95])
+    sampler = EventSampler(sample_rates={"hot": 0.1}, rng=lambda: next(values))
+
+    kept = [sampler.allow("hot") for _ in range(4)]
+
+    assert kept == [True, False, True, False]
+    assert sampler.dropped == {"hot": 2}
+    assert sampler.allow("other")
+
+
+def test_sampler_rate_limit_refills_over_time():
+    clock = FakeClock()
+    sampler = EventSampler(max_per_second={"hot": 2}, clock=clock)
+
+    assert [sampler.allow("hot") for _ in range(3)] == [True, True, False]
+    clock.now = 0.5
+    assert sampler.allow("hot")
+    assert not sampler.allow("hot")
+
+
+def test_sampler_never_drops_warnings():
+    sampler = EventSampler(sample_rates={"hot": 0.0})
+
+    with pytest.raises(structlog.DropEvent):
+        sampler(None, "info", {"event": "hot"})
+    assert sampler(None, "warning", {"event": "hot"}) == {"event": "hot"}
+    assert sampler(None, "info", {"event": "hot", "sampled": True}) == {"event": "hot"}
+
+
+@pytest.mark.usefixtures("json_logging")
+def test_events_render_as_json_off_thread(capsys):
+    log = structlog.get_logger("test")
+    log.info("reading_ready", spread="three_card", note="x" * 5000)
+    log.info("hot")
+    log.debug("too_quiet")
+    shutdown_logging()
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [line["event"] for line in lines] == ["reading_ready"]
+    line = lines[0]
+    assert line["level"] == "info"
+    assert line["spread"] == "three_card"
+    assert line["timestamp"].endswith("Z")
+    assert len(line["note"]) < 2100
+    assert logs.stats()["dropped_sampled"] == {"hot": 1}
+
+
+def test_full_queue_drops_instead_of_blocking(capsys):
+    configure_logging(queue_size=1)
+    assert logs._listener is not None
+    logs._listener.stop()
+    logs._listener = None
+    before = logs.stats()["dropped_queue_full"]
+
+    started = time.perf_counter()
+    for i in range(50):
+        logging.getLogger("test").warning("flood %d", i)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 1.0
+    assert logs.stats()["dropped_queue_full"] - before == 49
+    configure_logging()
+    shutdown_logging()
+    capsys.readouterr()
+
+
+def test_creating_the_app_leaves_logging_alone():
+    shutdown_logging()
+
+    create_app()
+
+    assert logs._listener is None
@@ -0,0 +1,159 @@
+"""Tests for cost- and latency-aware model routing."""
+
+import pytest
+
+from app.core.llm.cache import CachedLLMClient, InterpretationCache
+from app.core.llm.client import LLMClient, LLMFactory
+from app.core.llm.profiles import GenerationProfile
+from app.core.llm.router import (
+    ModelRouter,
+    ModelTarget,
+    RoutingRule,
+    RoutingStats,
+    routing_tier,
+)
+from app.core.tarot.spreads import SpreadLibrary
+
+
+class RecordingClient(LLMClient):
+    """Returns which model it was asked to use."""
+
+    def __init__(self, provider: str, fail: bool = False) -> None:
+        self.provider = provider
+        self.model = f"{provider}-default"
+        self.fail = fail
+
+    async def generate(self, _system_prompt, _user_prompt, profile=None):
+        if self.fail:
+            raise RuntimeError("provider down")
+        model = profile.model_for(self.provider) if profile else None
+        return f"{self.provider}:{model or self.model}"
+
+
+RULES = [
+    RoutingRule.from_dict(
+        {"name": "quick", "profiles": ["one_card"], "targets": ["ollama:small"]}
+    ),
+    RoutingRule.from_dict(
+        {
+            "name": "deep",
+            "profiles": ["celtic_cross"],
+            "tiers": ["initiate"],
+            "targets": ["ollama:large", "grok:grok-2"],
+        }
+    ),
+    RoutingRule.from_dict(
+        {"name": "long", "min_prompt_chars": 5000, "targets": ["grok:grok-2"]}
+    ),
+]
+
+
+def _router(**providers: LLMClient) -> ModelRouter:
+    providers = providers or {
+        "ollama": RecordingClient("ollama"),
+        "grok": RecordingClient("grok"),
+    }
+    return ModelRouter(providers, RULES, RoutingStats())
+
+
+async def test_routes_by_spread_tier_and_prompt_length() -> None:
+    """Each request goes to the model its first matching rule names."""
+    router = _router()
+    one_card = SpreadLibrary.one_card().profile
+    celtic = SpreadLibrary.celtic_cross().profile
+
+    assert await router.generate("s", "u", one_card) == "ollama:small"
+    assert await router.generate("s", "u", celtic) == "ollama:ollama-default"
+    with routing_tier("initiate"):
+        assert await router.generate("s", "u", celtic) == "ollama:large"
+        part = celtic.for_part("position", 200)
+        assert await router.generate("s", "u", part) == "ollama:large"
+    assert await router.generate("s", "u" * 6000, celtic) == "grok:grok-2"
+
+    decisions = router.stats.snapshot()["decisions"]
+    assert [d["rule"] for d in decisions] == ["long", "deep", "deep", None, "quick"]
+    assert decisions[-1]["target"] == "ollama:small"
+    assert decisions[0]["ok"] is True
+
+
+def test_slow_targets_are_passed_over() -> None:
+    """The cheaper model is skipped while it runs past the profile target."""
+    router = _router()
+    profile = GenerationProfile(name="celtic_cross", target_seconds=10)
+    large = ModelTarget("ollama", "large")
+
+    for _ in range(3):
+        router.stats.observe(large, 30.0, ok=True)
+    decision = router.route(profile, 100, tier="initiate")
+    assert decision.target == ModelTarget("grok", "grok-2")
+
+    router.stats.observe(ModelTarget("grok", "grok-2"), 45.0, ok=True)
+    decision = router.route(profile, 100, tier="initiate")
+    assert decision.target == large
+    assert decision.reason == "fastest"
+
+
+async def test_failing_targets_are_avoided() -> None:
+    """Failures count against a target until it recovers."""
+    router = _router(ollama=RecordingClient("ollama", fail=True))
+    router.providers["grok"] = RecordingClient("grok")
+    profile = GenerationProfile(name="celtic_cross")
+
+    with routing_tier("initiate"), pytest.raises(RuntimeError):
+        await router.generate("s", "u", profile)
+    with routing_tier("initiate"):
+        assert await router.generate("s", "u", profile) == "grok:grok-2"
+
+
+def test_rules_are_validated() -> None:
+    """Bad rule configuration fails loudly."""
+    with pytest.raises(ValueError, match="at least one target"):
+        RoutingRule.from_dict({"name": "empty"})
+    with pytest.raises(ValueError, match="provider:model"):
+        RoutingRule.from_dict({"targets": ["grok"]})
+    with pytest.raises(ValueError, match="Unknown"):
+        RoutingRule.from_dict({"targets": ["grok:x"], "tier": ["free"]})
+    assert ModelTarget.parse("ollama:llama3.1:8b").model == "llama3.1:8b"
+
+
+def test_factory_builds_router_when_rules_are_set() -> None:
+    """Routing rules make the factory return a router over all providers."""
+    client = LLMFactory.create(
+        use_local=True,
+        grok_api_key="key",
+        routing_rules=[{"targets": ["grok:grok-2"]}],
+    )
+
+    assert isinstance(client, ModelRouter)
+    assert list(client.providers) == ["ollama", "grok"]
+
+
+async def test_cached_router_keeps_tiers_apart() -> None:
+    """Cached output of one tier's model isn't served to another tier."""
+    cache = InterpretationCache()
+    client = LLMFactory.create(
+        use_local=True,
+        grok_api_key="key",
+        cache=cache,
+        routing_rules=[
+            {"tiers": ["free"], "targets": ["ollama:small"]},
+            {"tiers": ["initiate"], "targets": ["grok:grok-2"]},
+        ],
+    )
+    assert isinstance(client, ModelRouter)
+    for name, provider in client.providers.items():
+        assert isinstance(provider, CachedLLMClient)
+        await provider.inner.close()  # type: ignore[attr-defined]
+        provider.inner = RecordingClient(name)
+    profile = SpreadLibrary.three_card().profile
+
+    with routing_tier("free"):
+        free = await client.generate("s", "u", profile)
+    with routing_tier("initiate"):
+        initiate = await client.generate("s", "u", profile)
+    with routing_tier("free"):
+        again = await client.generate("s", "u", profile)
+
+    assert free == again == "ollama:small"
+    assert initiate == "grok:grok-2"
+    assert cache.hits["local"] == 1
@@ -0,0 +1,138 @@
+"""Tests for spread generation profiles and SLO tracking."""
+
+import json
+
+import httpx
+import pytest
+
+from app.core.llm.cache import CachedLLMClient, InterpretationCache
+from app.core.llm.client import GrokClient, OllamaClient
+from app.core.llm.profiles import GenerationProfile, SLOTracker
+from app.core.tarot.spreads import SpreadLibrary, parse_spread
+
+PROFILE = GenerationProfile(
+    name="test",
+    max_tokens=321,
+    temperature=0.5,
+    target_seconds=5,
+    timeout_seconds=10,
+    stop=("\n\n---",),
+    models=(("grok", "grok-2-mini"),),
+)
+
+
+def _recording_transport(
+    requests: list[httpx.Request], body: dict
+) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=body)
+
+    return httpx.MockTransport(handler)
+
+
+async def test_ollama_maps_profile_to_options() -> None:
+    """Token cap and stop sequences become Ollama options."""
+    requests: list[httpx.Request] = []
+    client = OllamaClient()
+    client.client = httpx.AsyncClient(
+        transport=_recording_transport(requests, {"response": " ok "})
+    )
+
+    assert await client.generate("sys", "user", PROFILE) == "ok"
+
+    sent = json.loads(requests[0].content)
+    assert sent["model"] == "neural-chat"
+    assert sent["options"] == {
+        "temperature": 0.5,
+        "num_predict": 321,
+        "stop": ["\n\n---"],
+    }
+    assert requests[0].extensions["timeout"]["read"] == 10
+
+
+async def test_grok_maps_profile_to_request() -> None:
+    """Grok gets max_tokens, stop and the profile's model."""
+    requests: list[httpx.Request] = []
+    client = GrokClient(api_key="test")
+    client.client = httpx.AsyncClient(
+        transport=_recording_transport(
+            requests, {"choices": [{"message": {"content": "ok"}}]}
+        )
+    )
+
+    await client.generate("sys", "user", PROFILE)
+
+    sent = json.loads(requests[0].content)
+    assert sent["model"] == "grok-2-mini"
+    assert sent["max_tokens"] == 321
+    assert sent["stop"] == ["\n\n---"]
+
+
+def test_builtin_spreads_scale_budgets_with_size() -> None:
+    """Larger spreads get more tokens and more time."""
+    one = SpreadLibrary.one_card().profile
+    celtic = SpreadLibrary.celtic_cross().profile
+
+    assert one.max_tokens < celtic.max_tokens
+    assert one.target_seconds < celtic.target_seconds
+
+
+def test_spread_files_can_set_a_profile() -> None:
+    """The ``generation`` object becomes the spread's profile."""
+    spread = parse_spread(
+        {
+            "spread_id": "quick",
+            "name": "Quick",
+            "description": "d",
+            "instructions": "i",
+            "positions": [{"name": "A", "meaning": "m", "guidance": "g"}],
+            "generation": {"max_tokens": 200, "models": {"ollama": "llama3"}},
+        }
+    )
+
+    assert spread.profile.name == "quick"
+    assert spread.profile.max_tokens == 200
+    assert spread.profile.model_for("ollama") == "llama3"
+    assert spread.profile.model_for("grok") is None
+
+
+def test_unknown_profile_fields_are_rejected() -> None:
+    """Typos in a profile fail loudly."""
+    with pytest.raises(ValueError, match="max_token"):
+        GenerationProfile.from_dict("x", {"max_token": 10})
+
+
+def test_slo_tracker_ranks_breaching_profiles_first() -> None:
+    """Profiles over target more often are reported first."""
+    tracker = SLOTracker()
+    fast = GenerationProfile(name="fast", target_seconds=1, timeout_seconds=2)
+    slow = GenerationProfile(name="slow", target_seconds=1, timeout_seconds=2)
+    for _ in range(3):
+        tracker.observe(fast, 0.2)
+    tracker.observe(slow, 0.5)
+    tracker.observe(slow, 1.5)
+    tracker.observe(slow, 2.0, ok=False, timed_out=True)
+
+    report = tracker.snapshot()
+
+    assert [r["profile"] for r in report] == ["slow", "fast"]
+    assert report[0]["breaches"] == 2
+    assert report[0]["timeouts"] == 1
+    assert report[1]["breach_rate"] == 0
+
+
+async def test_profiles_are_part_of_the_cache_key() -> None:
+    """The same prompt under a different token cap is a different entry."""
+    requests: list[httpx.Request] = []
+    inner = OllamaClient()
+    inner.client = httpx.AsyncClient(
+        transport=_recording_transport(requests, {"response": "ok"})
+    )
+    client = CachedLLMClient(inner, InterpretationCache())
+
+    await client.generate("sys", "user", PROFILE)
+    await client.generate("sys", "user", PROFILE)
+    await client.generate("sys", "user", SpreadLibrary.one_card().profile)
+
+    assert len(requests) == 2
@@ -0,0 +1,154 @@
+"""Tests for token-bucket rate limiting."""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.middleware.rate_limit import (
+    RateLimit,
+    RateLimitMiddleware,
+    TokenBucketLimiter,
+    bearer_token,
+)
+from app.core.auth import AuthenticatedUser, AuthenticationError
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeVerifier:
+    """Accepts tokens of the form ``valid-<user id>``."""
+
+    def __init__(self) -> None:
+        self.verified = 0
+
+    def cached(self, _token: str) -> AuthenticatedUser | None:
+        return None
+
+    async def verify(self, token: str) -> AuthenticatedUser:
+        self.verified += 1
+        if not token.startswith("valid-"):
+            raise AuthenticationError("bad signature")
+        return AuthenticatedUser(id=token.removeprefix("valid-"))
+
+
+def _headers(token: str, ip: str = "1.1.1.1") -> dict[str, str]:
+    return {"Authorization": f"Bearer {token}", "X-Forwarded-For": ip}
+
+
+def _app(limit: RateLimit, verifier: FakeVerifier | None = None) -> TestClient:
+    verifier = verifier or FakeVerifier()
+    app = FastAPI()
+    app.add_middleware(
+        RateLimitMiddleware,
+        classify=lambda _m, _p: limit,
+        trust_forwarded=True,
+        verifier=lambda: verifier,
+    )
+
+    @app.post("/api/reading")
+    async def create_reading() -> dict[str, str]:
+        return {"status": "ok"}
+
+    return TestClient(app)
+
+
+def test_bucket_refills_over_time() -> None:
+    """Tokens are spent per request and refill at the configured rate."""
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(clock=clock)
+    limit = RateLimit("reading", capacity=2, period_seconds=60)
+
+    assert limiter.hit("k", limit).allowed
+    assert limiter.hit("k", limit).allowed
+    denied = limiter.hit("k", limit)
+    assert not denied.allowed
+    assert denied.retry_after == 30
+
+    clock.now = 30
+    assert limiter.hit("k", limit).allowed
+
+
+def test_idle_buckets_are_evicted() -> None:
+    """Buckets untouched past the idle window are dropped."""
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(shards=1, idle_seconds=100, clock=clock)
+    limit = RateLimit("default", capacity=5)
+    for i in range(3):
+        limiter.hit(f"ip:{i}", limit)
+
+    clock.now = 200
+    limiter.hit("ip:new", limit)
+
+    assert len(limiter) == 1
+
+
+def test_bearer_token_is_read_from_header() -> None:
+    """The token is taken from a Bearer Authorization header."""
+    assert bearer_token("Bearer abc.def.ghi") == "abc.def.ghi"
+    assert bearer_token("Basic dXNlcg==") is None
+    assert bearer_token(None) is None
+
+
+def test_forged_token_does_not_drain_the_users_bucket() -> None:
+    """Only verified tokens are charged to a user bucket."""
+    client = _app(RateLimit("reading", capacity=1))
+
+    # An attacker's token names the victim but fails verification
+    forged = client.post("/api/reading", headers=_headers("forged-victim"))
+    victim = client.post("/api/reading", headers=_headers("valid-victim", ip="2.2.2.2"))
+
+    assert forged.status_code == 200
+    assert victim.status_code == 200
+
+
+def test_tokens_are_not_verified_once_the_ip_is_limited() -> None:
+    """Requests over the IP limit are rejected before any verification."""
+    verifier = FakeVerifier()
+    client = _app(RateLimit("reading", capacity=1), verifier)
+
+    client.post("/api/reading", headers=_headers("valid-a"))
+    response = client.post("/api/reading", headers=_headers("valid-a"))
+
+    assert response.status_code == 429
+    assert verifier.verified == 1
+
+
+def test_middleware_returns_429_with_retry_after() -> None:
+    """Requests over the limit are rejected with Retry-After."""
+    client = _app(RateLimit("reading", capacity=2))
+
+    first = client.post("/api/reading")
+    client.post("/api/reading")
+    rejected = client.post("/api/reading")
+
+    assert first.status_code == 200
+    assert first.headers["x-ratelimit-limit"] == "2"
+    assert rejected.status_code == 429
+    assert int(rejected.headers["retry-after"]) >= 1
+    assert rejected.json()["error"] == "RATE_LIMITED"
+
+
+def test_users_behind_one_ip_share_the_ip_bucket() -> None:
+    """A new user id doesn't escape the per-IP limit."""
+    client = _app(RateLimit("reading", capacity=1))
+
+    assert client.post("/api/reading", headers=_headers("valid-a")).status_code == 200
+    response = client.post("/api/reading", headers=_headers("valid-b"))
+
+    assert response.status_code == 429
+
+
+def test_health_is_not_rate_limited(client: TestClient) -> None:
+    """Health checks are exempt."""
+    for _ in range(100):
+        response = client.get("/health")
+
+    assert response.status_code == 200
+    assert "x-ratelimit-limit" not in response.headers
@@ -0,0 +1,130 @@
+"""Tests for streaming reading history export."""
+
+import csv
+import io
+import json
+
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_current_user, get_history_store, get_settings_dep
+from app.config import Settings
+from app.core.auth import AuthenticatedUser
+from app.core.services.history import ExportCursor, ReadingHistoryStore, SearchPage
+
+
+def _reading(i: int, messages: int = 0) -> dict:
+    created_at = f"2026-01-01T00:00:{i:02d}+00:00"
+    return {
+        "id": f"r-{i:02d}",
+        "question": f"Question {i}, with a comma",
+        "spread_type": "single",
+        "cards": [{"id": "major_00", "reversed": False}],
+        "interpretation": "Line one\nline two",
+        "created_at": created_at,
+        "messages": [
+            {
+                "id": f"m-{i:02d}-{j}",
+                "role": "user" if j % 2 == 0 else "assistant",
+                "content": f"message {j}",
+                "created_at": created_at,
+            }
+            for j in range(messages)
+        ],
+    }
+
+
+class FakeHistoryStore(ReadingHistoryStore):
+    def __init__(self, readings: list[dict]) -> None:
+        self.readings = readings
+        self.chunks: list[int] = []
+
+    async def search(self, *_args, **_kwargs) -> SearchPage:
+        return SearchPage([], None)
+
+    async def export_chunk(self, _user_id, limit, after=None) -> list[dict]:
+        rows = self.readings
+        if after is not None:
+            rows = [
+                r
+                for r in rows
+                if (r["created_at"], r["id"]) > (after.created_at, after.id)
+            ]
+        chunk = rows[:limit]
+        self.chunks.append(len(chunk))
+        return chunk
+
+
+def _client(
+    client: TestClient, store: FakeHistoryStore, chunk_size: int = 200
+) -> TestClient:
+    settings = Settings(
+        supabase_url="https://test.supabase.co",
+        supabase_key="anon",
+        supabase_service_key="service",
+        export_chunk_size=chunk_size,
+    )
+    client.app.dependency_overrides[get_settings_dep] = lambda: settings
+    client.app.dependency_overrides[get_history_store] = lambda: store
+    client.app.dependency_overrides[get_current_user] = lambda: AuthenticatedUser(
+        "user-1"
+    )
+    return client
+
+
+def test_ndjson_export_reads_in_chunks(client: TestClient) -> None:
+    store = FakeHistoryStore([_reading(i, messages=i % 3) for i in range(5)])
+
+    response = _client(client, store, chunk_size=2).get("/api/readings/export")
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert "attachment" in response.headers["content-disposition"]
+    assert [line["id"] for line in lines] == [f"r-{i:02d}" for i in range(5)]
+    assert [len(line["messages"]) for line in lines] == [0, 1, 2, 0, 1]
+    assert store.chunks == [2, 2, 1]
+
+
+def test_ndjson_export_resumes_after_cursor(client: TestClient) -> None:
+    store = FakeHistoryStore([_reading(i) for i in range(4)])
+    client = _client(client, store)
+    first = client.get("/api/readings/export").text.splitlines()
+
+    # Download cut off inside the third line: resume from the second
+    cursor = json.loads(first[1])["cursor"]
+    rest = client.get("/api/readings/export", params={"after": cursor})
+
+    assert ExportCursor.decode(cursor).id == "r-01"
+    assert first[:2] + rest.text.splitlines() == first
+
+
+def test_csv_export_groups_messages_under_reading(client: TestClient) -> None:
+    store = FakeHistoryStore([_reading(0, messages=2), _reading(1)])
+    client = _client(client, store)
+
+    response = client.get("/api/readings/export", params={"format": "csv"})
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+
+    assert response.headers["content-type"].startswith("text/csv")
+    assert [r["record_type"] for r in rows] == [
+        "reading",
+        "message",
+        "message",
+        "reading",
+    ]
+    assert rows[0]["question"] == "Question 0, with a comma"
+    assert rows[0]["interpretation"] == "Line one\nline two"
+    # The resume cursor only appears once a reading is complete
+    assert [bool(r["cursor"]) for r in rows] == [False, False, True, True]
+
+    resumed = client.get(
+        "/api/readings/export", params={"format": "csv", "after": rows[2]["cursor"]}
+    )
+    assert resumed.text.startswith("reading,r-01,")
+
+
+def test_export_rejects_bad_cursor(client: TestClient) -> None:
+    response = _client(client, FakeHistoryStore([])).get(
+        "/api/readings/export", params={"after": "@@"}
+    )
+
+    assert response.status_code == 400
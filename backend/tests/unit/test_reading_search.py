@@ -0,0 +1,101 @@
+"""Tests for reading history search."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_current_user, get_history_store
+from app.core.auth import AuthenticatedUser
+from app.core.exceptions import InvalidCursorError
+from app.core.services.history import (
+    ReadingHistoryStore,
+    SearchCursor,
+    SearchPage,
+    build_page,
+)
+
+
+def _row(i: int, rank: float) -> dict:
+    return {
+        "id": f"id-{i}",
+        "question": f"question {i}",
+        "spread_type": "single",
+        "created_at": f"2026-01-0{i}T00:00:00+00:00",
+        "rank": rank,
+        "question_snippet": f"<mark>question</mark> {i}",
+        "snippet": "the <mark>tower</mark> falls",
+    }
+
+
+class FakeHistoryStore(ReadingHistoryStore):
+    def __init__(self, rows: list[dict]) -> None:
+        self.rows = rows
+        self.calls: list[tuple] = []
+
+    async def search(self, user_id, query, limit=20, after=None) -> SearchPage:
+        self.calls.append((user_id, query, limit, after))
+        rows = self.rows
+        if after is not None:
+            key = (after.rank, after.created_at, after.id)
+            rows = [r for r in rows if (r["rank"], r["created_at"], r["id"]) < key]
+        return build_page(rows[: limit + 1], limit)
+
+    async def export_chunk(self, *_args, **_kwargs) -> list[dict]:
+        return []
+
+
+def test_cursor_round_trips_and_rejects_garbage() -> None:
+    cursor = SearchCursor(0.0607927, "2026-01-02T00:00:00+00:00", "abc")
+
+    assert SearchCursor.decode(cursor.encode()) == cursor
+    with pytest.raises(InvalidCursorError):
+        SearchCursor.decode("not-a-cursor")
+
+
+def test_page_has_cursor_only_when_more_rows_exist() -> None:
+    rows = [_row(3, 0.5), _row(2, 0.5), _row(1, 0.1)]
+
+    first = build_page(rows, 2)
+    last = build_page(rows[2:], 2)
+
+    assert [r["id"] for r in first.results] == ["id-3", "id-2"]
+    assert SearchCursor.decode(first.next_cursor) == SearchCursor(
+        0.5, "2026-01-02T00:00:00+00:00", "id-2"
+    )
+    assert last.next_cursor is None
+
+
+def test_search_endpoint_pages_with_keyset_cursor(client: TestClient) -> None:
+    """Following next_cursor walks every match exactly once."""
+    store = FakeHistoryStore([_row(3, 0.5), _row(2, 0.5), _row(1, 0.1)])
+    client.app.dependency_overrides[get_history_store] = lambda: store
+    client.app.dependency_overrides[get_current_user] = lambda: AuthenticatedUser(
+        "user-1"
+    )
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        params = {"q": "tower", "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        body = client.get("/api/readings/search", params=params).json()
+        seen.extend(r["id"] for r in body["results"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == ["id-3", "id-2", "id-1"]
+    assert store.calls[0][:3] == ("user-1", "tower", 2)
+    assert "<mark>" in body["results"][0]["snippet"]
+
+
+def test_search_endpoint_rejects_bad_cursor(client: TestClient) -> None:
+    client.app.dependency_overrides[get_history_store] = lambda: FakeHistoryStore([])
+    client.app.dependency_overrides[get_current_user] = lambda: AuthenticatedUser(
+        "user-1"
+    )
+
+    response = client.get("/api/readings/search", params={"q": "x", "cursor": "@@"})
+
+    assert response.status_code == 400
+    assert response.json()["error"] == "VALIDATION_ERROR"
@@ -0,0 +1,193 @@
+"""Tests for the concurrent reading pipeline."""
+
+import asyncio
+import dataclasses
+import json
+import re
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.exceptions import InsufficientCreditsError, LLMError
+from app.core.llm.client import LLMClient
+from app.core.llm.profiles import GenerationProfile
+from app.core.services import background
+from app.core.services.credits import CreditLedger
+from app.core.services.reading import (
+    Reading,
+    ReadingOrchestrator,
+    ReadingStore,
+    resolve_spread,
+)
+from app.core.tarot.deck import TarotDeck
+from app.core.tarot.spreads import SpreadLibrary
+
+MIGRATIONS = Path(__file__).parents[3] / "infrastructure" / "supabase"
+
+
+class FakeLedger(CreditLedger):
+    def __init__(self, allow: bool = True) -> None:
+        self.allow = allow
+        self.reserved: list[tuple[str, int, str]] = []
+        self.refunds: list[tuple[str, int, str]] = []
+
+    async def reserve(self, user_id: str, amount: int, description: str) -> bool:
+        await asyncio.sleep(0.01)
+        self.reserved.append((user_id, amount, description))
+        return self.allow
+
+    async def refund(self, user_id: str, amount: int, description: str) -> None:
+        self.refunds.append((user_id, amount, description))
+
+
+class FakeStore(ReadingStore):
+    def __init__(self) -> None:
+        self.saved: list[Reading] = []
+
+    async def save(self, reading: Reading) -> None:
+        self.saved.append(reading)
+
+
+class FakeLLM(LLMClient):
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.cancelled = False
+        self.prompts: list[tuple[str, str, GenerationProfile | None]] = []
+
+    async def generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        profile: GenerationProfile | None = None,
+    ) -> str:
+        self.prompts.append((system_prompt, user_prompt, profile))
+        try:
+            await asyncio.sleep(0.05)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.fail:
+            raise RuntimeError("model unavailable")
+        return "The cards speak."
+
+    async def health_check(self) -> bool:
+        return True
+
+
+def _orchestrator(
+    ledger: CreditLedger, llm: LLMClient, store: ReadingStore
+) -> ReadingOrchestrator:
+    return ReadingOrchestrator(TarotDeck.get_instance(), llm, ledger, store)
+
+
+async def test_reading_is_created_and_saved_in_background() -> None:
+    """A paid reading returns immediately and is persisted afterwards."""
+    store = FakeStore()
+    llm = FakeLLM()
+    orchestrator = _orchestrator(FakeLedger(), llm, store)
+
+    reading = await orchestrator.create("user-1", "What now?", "three_card")
+    await background.drain()
+
+    assert reading.interpretation == "The cards speak."
+    assert [c["position"] for c in reading.cards] == ["Past", "Present", "Future"]
+    assert store.saved == [reading]
+    assert llm.prompts[0][2] is not None
+    assert llm.prompts[0][2].name == "three_card"
+
+
+async def test_insufficient_credits_cancel_generation() -> None:
+    """A refused reservation stops the in-flight LLM call."""
+    llm = FakeLLM()
+    orchestrator = _orchestrator(FakeLedger(allow=False), llm, FakeStore())
+
+    with pytest.raises(InsufficientCreditsError):
+        await orchestrator.create("user-1", "What now?", "celtic_cross")
+    await asyncio.sleep(0.01)
+
+    assert llm.cancelled
+
+
+async def test_generation_failure_refunds_credits() -> None:
+    """Credits taken for a failed generation are given back."""
+    ledger = FakeLedger()
+    orchestrator = _orchestrator(ledger, FakeLLM(fail=True), FakeStore())
+
+    with pytest.raises(LLMError):
+        await orchestrator.create("user-1", "What now?", "shadow_work")
+    await background.drain()
+
+    assert ledger.refunds == [("user-1", 2, "Refund: Reading: Shadow Work")]
+
+
+async def test_custom_spread_readings_fit_the_readings_table(tmp_path: Path) -> None:
+    """The stored spread type of a data-file spread passes the table's CHECK."""
+    (tmp_path / "crossroads.json").write_text(
+        json.dumps(
+            {
+                "spread_id": "crossroads",
+                "name": "Crossroads",
+                "description": "Two paths",
+                "instructions": "Draw two cards.",
+                "positions": [
+                    {"name": "Path A", "meaning": "One way", "guidance": "Where?"},
+                    {"name": "Path B", "meaning": "Another", "guidance": "Why?"},
+                ],
+            }
+        )
+    )
+    SpreadLibrary.load(tmp_path)
+    store = FakeStore()
+    try:
+        await _orchestrator(FakeLedger(), FakeLLM(), store).create(
+            "user-1", "Which way?", "crossroads"
+        )
+        await background.drain()
+    finally:
+        SpreadLibrary.load()
+
+    migration = (MIGRATIONS / "008_custom_spread_types.sql").read_text()
+    pattern = re.search(r"spread_type ~ '([^']+)'", migration)
+    assert pattern is not None
+    (saved,) = store.saved
+    assert re.fullmatch(pattern.group(1), saved.to_row()["spread_type"])
+
+
+async def test_free_spreads_skip_reserve_and_refund(monkeypatch) -> None:
+    """A spread costing nothing never touches the ledger, even on failure."""
+    free = dataclasses.replace(resolve_spread("three_card"), credit_cost=0)
+    monkeypatch.setattr(
+        "app.core.services.reading.resolve_spread", lambda _spread_type: free
+    )
+    ledger = FakeLedger()
+
+    reading = await _orchestrator(ledger, FakeLLM(), FakeStore()).create(
+        "user-1", "What now?", "three_card"
+    )
+    with pytest.raises(LLMError):
+        await _orchestrator(ledger, FakeLLM(fail=True), FakeStore()).create(
+            "user-1", "What now?", "three_card"
+        )
+    await background.drain()
+
+    assert reading.interpretation == "The cards speak."
+    assert ledger.reserved == []
+    assert ledger.refunds == []
+
+
+def test_single_resolves_to_one_card_spread() -> None:
+    """The API's ``single`` name maps onto the one-card spread."""
+    spread = resolve_spread("single")
+
+    assert spread.spread_id == "one_card"
+    assert spread.credit_cost == 1
+
+
+def test_reading_endpoint_requires_auth(client: TestClient) -> None:
+    """Creating a reading without a token is rejected."""
+    response = client.post(
+        "/api/reading", json={"question": "Hi?", "spread_type": "single"}
+    )
+
+    assert response.status_code == 401
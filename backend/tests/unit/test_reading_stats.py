@@ -0,0 +1,133 @@
+"""Tests for incrementally maintained reading statistics."""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_current_user, get_stats_store
+from app.api.routers import diagnostics
+from app.core.auth import AuthenticatedUser
+from app.core.services.stats import (
+    ReadingStats,
+    ReadingStatsStore,
+    card_suit,
+)
+from app.core.tarot.deck import TarotDeck
+
+
+class FakeStatsStore(ReadingStatsStore):
+    def __init__(self, stats: ReadingStats) -> None:
+        self.stats = stats
+        self.requested: list[str] = []
+
+    async def get(self, user_id: str) -> ReadingStats:
+        self.requested.append(user_id)
+        return self.stats
+
+    async def backfill(self, user_id: str | None = None) -> int:
+        self.requested.append(f"backfill:{user_id}")
+        return 1
+
+
+def _history() -> ReadingStats:
+    stats = ReadingStats()
+    stats = stats.apply(
+        "three_card",
+        [
+            {"id": "major_00", "reversed": False},
+            {"id": "minor_cups_01", "reversed": True},
+            {"id": "minor_cups_02", "reversed": False},
+        ],
+        "2026-01-02T00:00:00+00:00",
+    )
+    return stats.apply(
+        "single", [{"id": "major_00", "reversed": True}], "2026-01-01T00:00:00+00:00"
+    )
+
+
+def test_card_suit() -> None:
+    assert card_suit("major_13") == "major"
+    assert card_suit("minor_pentacles_10") == "pentacles"
+
+
+def test_readings_fold_into_running_totals() -> None:
+    """Each reading updates the counts without revisiting older ones."""
+    stats = _history()
+
+    assert stats.total_readings == 2
+    assert stats.total_cards == 4
+    assert stats.reversed_cards == 2
+    assert stats.card_counts == {"major_00": 2, "minor_cups_01": 1, "minor_cups_02": 1}
+    assert stats.suit_counts == {"major": 2, "cups": 2}
+    assert stats.spread_counts == {"three_card": 1, "single": 1}
+    assert stats.first_reading_at == "2026-01-01T00:00:00+00:00"
+    assert stats.last_reading_at == "2026-01-02T00:00:00+00:00"
+
+
+def test_row_round_trip_and_summary() -> None:
+    """A table row gives the same journey view as the fold."""
+    stats = _history()
+    row = {
+        "total_readings": 2,
+        "total_cards": 4,
+        "reversed_cards": 2,
+        "card_counts": dict(stats.card_counts),
+        "suit_counts": dict(stats.suit_counts),
+        "spread_counts": dict(stats.spread_counts),
+        "first_reading_at": stats.first_reading_at,
+        "last_reading_at": stats.last_reading_at,
+    }
+    summary = ReadingStats.from_row(row).summary(TarotDeck.get_instance(), top=2)
+
+    assert summary == stats.summary(TarotDeck.get_instance(), top=2)
+    assert summary["most_drawn"][0] == {
+        "id": "major_00",
+        "name": "The Fool",
+        "count": 2,
+    }
+    assert len(summary["most_drawn"]) == 2
+    assert summary["reversal_ratio"] == 0.5
+    assert summary["suit_balance"]["cups"] == 0.5
+    assert summary["suit_balance"]["swords"] == 0.0
+
+
+def test_stats_endpoint_reads_one_row(client: TestClient) -> None:
+    """The endpoint summarizes the caller's stored totals."""
+    store = FakeStatsStore(_history())
+    client.app.dependency_overrides[get_stats_store] = lambda: store
+    client.app.dependency_overrides[get_current_user] = lambda: AuthenticatedUser(
+        "user-1"
+    )
+
+    response = client.get("/api/reading/stats")
+
+    assert response.status_code == 200
+    assert response.json()["total_readings"] == 2
+    assert store.requested == ["user-1"]
+
+
+def test_empty_history_has_zero_ratios() -> None:
+    summary = ReadingStats().summary(TarotDeck.get_instance())
+
+    assert summary["total_readings"] == 0
+    assert summary["reversal_ratio"] == 0.0
+    assert summary["most_drawn"] == []
+
+
+def test_backfill_is_a_diagnostics_endpoint(client: TestClient) -> None:
+    """Rebuilding everyone's stats isn't reachable unless diagnostics are on."""
+    store = FakeStatsStore(ReadingStats())
+    client.app.dependency_overrides[get_stats_store] = lambda: store
+
+    assert client.post("/api/test/reading/stats/backfill").status_code == 404
+    assert client.post("/api/diagnostics/reading-stats/backfill").status_code == 404
+
+    app = FastAPI()
+    app.include_router(diagnostics.router)
+    app.dependency_overrides[get_stats_store] = lambda: store
+    response = TestClient(app).post(
+        "/api/diagnostics/reading-stats/backfill", params={"user_id": "user-1"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["users"] == 1
+    assert store.requested == ["backfill:user-1"]
@@ -0,0 +1,124 @@
+"""Tests for the binary deck snapshot."""
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from app.core.tarot.deck import TarotDeck, build_card_list
+from app.core.tarot.snapshot import (
+    DEFAULT_CARDS_FILE,
+    compile_snapshot,
+    load_snapshot,
+)
+
+
+@pytest.fixture
+def cards_file(tmp_path: Path) -> Path:
+    """Copy of cards.json that tests may modify."""
+    path = tmp_path / "cards.json"
+    shutil.copy(DEFAULT_CARDS_FILE, path)
+    return path
+
+
+def test_snapshot_round_trips_every_card(cards_file: Path, tmp_path: Path) -> None:
+    """Every card decoded from the snapshot equals its JSON source."""
+    snapshot_file = tmp_path / "cards.snapshot"
+    compile_snapshot(cards_file, snapshot_file)
+
+    snapshot = load_snapshot(snapshot_file, cards_file)
+    assert snapshot is not None
+
+    expected = build_card_list(json.loads(cards_file.read_text()))
+    assert len(snapshot) == 78
+    assert [dict(card) for card in snapshot.cards] == expected
+
+
+def test_snapshot_is_smaller_than_json(cards_file: Path, tmp_path: Path) -> None:
+    """Interning keeps the snapshot more compact than the JSON source."""
+    snapshot_file = tmp_path / "cards.snapshot"
+    size = compile_snapshot(cards_file, snapshot_file)
+
+    assert size < cards_file.stat().st_size
+
+
+def test_stale_snapshot_is_rejected(cards_file: Path, tmp_path: Path) -> None:
+    """A snapshot built from different JSON is ignored."""
+    snapshot_file = tmp_path / "cards.snapshot"
+    compile_snapshot(cards_file, snapshot_file)
+    cards_file.write_text(cards_file.read_text() + "\n")
+
+    assert load_snapshot(snapshot_file, cards_file) is None
+
+
+def test_corrupt_snapshot_is_rejected(cards_file: Path, tmp_path: Path) -> None:
+    """A snapshot whose body fails its checksum is ignored."""
+    snapshot_file = tmp_path / "cards.snapshot"
+    compile_snapshot(cards_file, snapshot_file)
+    data = bytearray(snapshot_file.read_bytes())
+    data[-1] ^= 0xFF
+    snapshot_file.write_bytes(bytes(data))
+
+    assert load_snapshot(snapshot_file, cards_file) is None
+
+
+def test_empty_snapshot_is_rejected(cards_file: Path, tmp_path: Path) -> None:
+    """A zero-byte snapshot, as left by an interrupted build, is ignored."""
+    snapshot_file = tmp_path / "cards.snapshot"
+    snapshot_file.write_bytes(b"")
+
+    assert load_snapshot(snapshot_file, cards_file) is None
+
+
+def test_deck_reads_from_snapshot(cards_file: Path, tmp_path: Path) -> None:
+    """TarotDeck uses a valid snapshot transparently."""
+    snapshot_file = tmp_path / "cards.snapshot"
+    compile_snapshot(cards_file, snapshot_file)
+
+    deck = TarotDeck(cards_file=cards_file, snapshot_file=snapshot_file)
+
+    assert deck.from_snapshot
+    assert len(deck.all_cards) == 78
+    assert len(deck.get_major_arcana()) == 22
+    assert len(deck.get_minor_arcana()) == 56
+    card = deck.get_card_by_id("major_00")
+    assert card is not None
+    assert card["name"] == "The Fool"
+    assert deck.deck_data["meta"]["total_cards"] == 78
+
+
+def test_deck_falls_back_to_json(cards_file: Path, tmp_path: Path) -> None:
+    """TarotDeck parses the JSON when no snapshot exists."""
+    deck = TarotDeck(cards_file=cards_file, snapshot_file=tmp_path / "missing")
+
+    assert not deck.from_snapshot
+    assert len(deck.all_cards) == 78
+    assert len(deck.draw_with_reversals(10)) == 10
+
+
+def test_draws_reference_shared_cards_without_mutating_them(
+    cards_file: Path, tmp_path: Path
+) -> None:
+    """Drawn cards point at the deck's data and carry their own placement."""
+    deck = TarotDeck(cards_file=cards_file, snapshot_file=tmp_path / "missing")
+    before = [dict(card) for card in deck.all_cards]
+
+    drawn = deck.draw_with_reversals(10)
+
+    assert [card.position for card in drawn] == list(range(10))
+    assert all(any(card.card_ref is c for c in deck.all_cards) for card in drawn)
+    assert [dict(card) for card in deck.all_cards] == before
+    with pytest.raises(AttributeError):
+        drawn[0].reversed = True  # type: ignore[misc]
+
+
+def test_build_card_list_leaves_deck_data_untouched(cards_file: Path) -> None:
+    """Suit metadata is added to copies, not to the parsed JSON."""
+    data = json.loads(cards_file.read_text())
+
+    cards = build_card_list(data)
+
+    wands = data["minor_arcana"]["wands"]["cards"][0]
+    assert "suit" not in wands
+    assert any(card["suit"] == "wands" for card in cards if "suit" in card)
@@ -0,0 +1,129 @@
+"""Tests for the spread registry."""
+
+import dataclasses
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pydantic import ValidationError
+
+from app.core.tarot.spreads import SpreadLibrary, load_spread_files, parse_spread
+from app.schemas.reading import ReadingRequest
+
+
+def _definition(**overrides: Any) -> dict[str, Any]:
+    data: dict[str, Any] = {
+        "spread_id": "crossroads",
+        "name": "Crossroads",
+        "description": "Two paths",
+        "instructions": "Draw two cards.",
+        "positions": [
+            {"name": "Path A", "meaning": "The first way", "guidance": "Where?"},
+            {"name": "Path B", "meaning": "The second way", "guidance": "Why?"},
+        ],
+    }
+    data.update(overrides)
+    return data
+
+
+@pytest.fixture(autouse=True)
+def _reset_registry() -> Any:
+    yield
+    SpreadLibrary.load()
+
+
+def test_lookups_return_the_same_instance() -> None:
+    """Spreads are built once, not per lookup."""
+    assert SpreadLibrary.get_spread("three_card") is SpreadLibrary.three_card()
+    assert SpreadLibrary.get_spread("missing") is None
+
+
+def test_spreads_are_immutable() -> None:
+    """Spreads can't be modified once built."""
+    spread = SpreadLibrary.celtic_cross()
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        spread.name = "Changed"  # type: ignore[misc]
+    assert isinstance(spread.positions, tuple)
+
+
+def test_summaries_are_precomputed() -> None:
+    """The registry exposes serialized summaries in display order."""
+    summaries = SpreadLibrary.registry().summaries
+
+    assert [s["id"] for s in summaries] == [
+        "one_card",
+        "three_card",
+        "celtic_cross",
+        "shadow_work",
+    ]
+    assert SpreadLibrary.one_card().detail["positions"][0]["name"] == "Message"
+
+
+def test_serialized_forms_are_read_only() -> None:
+    """Shared summaries can't be changed by one caller for the others."""
+    spread = SpreadLibrary.one_card()
+
+    with pytest.raises(TypeError):
+        spread.summary["name"] = "Changed"  # type: ignore[index]
+    with pytest.raises(TypeError):
+        spread.detail["positions"][0]["name"] = "Changed"  # type: ignore[index]
+    with pytest.raises(TypeError):
+        SpreadLibrary.registry().summaries[0]["id"] = "changed"  # type: ignore[index]
+
+
+def test_custom_spreads_load_from_data_files(tmp_path: Path) -> None:
+    """JSON spread files are added to the registry."""
+    (tmp_path / "crossroads.json").write_text(json.dumps(_definition()))
+
+    SpreadLibrary.load(tmp_path)
+
+    spread = SpreadLibrary.get_spread("crossroads")
+    assert spread is not None
+    assert spread.card_count == 2
+    assert [p.position for p in spread.positions] == [0, 1]
+
+
+def test_requests_accept_any_registered_spread(tmp_path: Path) -> None:
+    """Spread types are checked against the registry, not a fixed list."""
+    with pytest.raises(ValidationError):
+        ReadingRequest(question="Which way?", spread_type="crossroads")
+
+    (tmp_path / "crossroads.json").write_text(json.dumps(_definition()))
+    SpreadLibrary.load(tmp_path)
+
+    request = ReadingRequest(question="Which way?", spread_type="crossroads")
+    assert request.spread_type == "crossroads"
+    assert ReadingRequest(question="Q?", spread_type="single").spread_type == "single"
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"spread_id": "Not Snake"},
+        {"positions": []},
+        {"card_count": 3},
+        {"name": ""},
+    ],
+)
+def test_invalid_definitions_are_rejected(overrides: dict[str, Any]) -> None:
+    """Invalid spread definitions raise ValueError."""
+    with pytest.raises(ValueError):
+        parse_spread(_definition(**overrides))
+
+
+def test_custom_spread_cannot_reuse_builtin_id(tmp_path: Path) -> None:
+    """A data file can't shadow a built-in spread."""
+    (tmp_path / "dup.json").write_text(json.dumps(_definition(spread_id="one_card")))
+
+    with pytest.raises(ValueError, match="Duplicate"):
+        SpreadLibrary.load(tmp_path)
+
+
+def test_malformed_file_names_the_file(tmp_path: Path) -> None:
+    """JSON errors point at the offending file."""
+    (tmp_path / "broken.json").write_text("{")
+
+    with pytest.raises(ValueError, match="broken.json"):
+        load_spread_files(tmp_path)
@@ -0,0 +1,249 @@
+"""Tests for Stripe webhook ingestion and batched processing."""
+
+import asyncio
+import hashlib
+import hmac
+import time
+from collections.abc import Mapping
+from typing import Any
+
+import orjson
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_settings_dep, get_webhook_processor
+from app.config import Settings
+from app.core.services.webhooks import BillingBatch, WebhookEventStore, WebhookProcessor
+
+SECRET = "whsec_test"
+PLANS = {"price_seeker": "seeker", "price_initiate": "initiate"}
+
+
+class FakeEventStore(WebhookEventStore):
+    def __init__(self, fail_on: str | None = None) -> None:
+        self.events: dict[str, Mapping[str, Any]] = {}
+        self.records = 0
+        self.batches: list[BillingBatch] = []
+        self.applied: set[str] = set()
+        self.fail_on = fail_on
+
+    async def record(self, event: Mapping[str, Any]) -> bool:
+        self.records += 1
+        if event["id"] in self.events:
+            return False
+        self.events[event["id"]] = event
+        return True
+
+    async def pending(self, _limit: int = 500) -> list[dict[str, Any]]:
+        return []
+
+    async def apply(self, batch: BillingBatch) -> list[str]:
+        if self.fail_on in batch.processed:
+            raise RuntimeError("constraint violated")
+        self.batches.append(batch)
+        new = [event_id for event_id in batch.processed if event_id not in self.applied]
+        self.applied.update(new)
+        return new
+
+
+def _event(event_id: str, kind: str, obj: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": event_id,
+        "type": kind,
+        "created": 1_790_000_000,
+        "data": {"object": obj},
+    }
+
+
+def _credits(event_id: str, user_id: str = "user-1") -> dict[str, Any]:
+    return _event(
+        event_id,
+        "checkout.session.completed",
+        {"mode": "payment", "metadata": {"user_id": user_id, "credits": "20"}},
+    )
+
+
+def _signed(payload: bytes, secret: str = SECRET) -> dict[str, str]:
+    timestamp = int(time.time())
+    digest = hmac.new(
+        secret.encode(), f"{timestamp}.".encode() + payload, hashlib.sha256
+    ).hexdigest()
+    return {"Stripe-Signature": f"t={timestamp},v1={digest}"}
+
+
+def _client(client: TestClient, processor: WebhookProcessor) -> TestClient:
+    settings = Settings(
+        supabase_url="https://test.supabase.co",
+        supabase_key="anon",
+        supabase_service_key="service",
+        stripe_webhook_secret=SECRET,
+    )
+    client.app.dependency_overrides[get_settings_dep] = lambda: settings
+    client.app.dependency_overrides[get_webhook_processor] = lambda: processor
+    return client
+
+
+def test_webhook_acks_once_and_drops_redeliveries(client: TestClient) -> None:
+    store = FakeEventStore()
+    processor = WebhookProcessor(store, PLANS)
+    client = _client(client, processor)
+    payload = orjson.dumps(_credits("evt_1"))
+
+    first = client.post(
+        "/api/webhook/stripe", content=payload, headers=_signed(payload)
+    )
+    second = client.post(
+        "/api/webhook/stripe", content=payload, headers=_signed(payload)
+    )
+
+    assert first.json() == {"received": True, "duplicate": False}
+    assert second.json() == {"received": True, "duplicate": True}
+    # The redelivery is caught in memory, without a database call
+    assert store.records == 1
+    assert processor.stats()["queued"] == 1
+
+
+def test_webhook_rejects_bad_signature(client: TestClient) -> None:
+    processor = WebhookProcessor(FakeEventStore(), PLANS)
+    payload = orjson.dumps(_credits("evt_1"))
+
+    response = _client(client, processor).post(
+        "/api/webhook/stripe", content=payload, headers=_signed(payload, "whsec_other")
+    )
+
+    assert response.status_code == 400
+    assert response.json()["error"] == "INVALID_SIGNATURE"
+    assert processor.stats()["queued"] == 0
+
+
+def test_events_translate_into_billing_updates() -> None:
+    batch = BillingBatch()
+    batch.add(_credits("evt_1"), PLANS)
+    batch.add(
+        _event(
+            "evt_2",
+            "customer.subscription.updated",
+            {
+                "id": "sub_1",
+                "customer": "cus_1",
+                "status": "trialing",
+                "metadata": {"user_id": "user-1"},
+                "items": {"data": [{"price": {"id": "price_initiate"}}]},
+                "current_period_end": 1_792_000_000,
+            },
+        ),
+        PLANS,
+    )
+    batch.add(_event("evt_3", "customer.created", {}), PLANS)
+
+    assert batch.credits == [
+        {
+            "event_id": "evt_1",
+            "user_id": "user-1",
+            "amount": 20,
+            "description": "Purchase: 20 credits",
+        }
+    ]
+    (subscription,) = batch.subscriptions
+    assert subscription["status"] == "active"
+    assert subscription["plan"] == "initiate"
+    assert subscription["event_at"].startswith("2026-09-21")
+    assert batch.processed == ["evt_1", "evt_2", "evt_3"]
+
+
+async def test_worker_batches_queued_events() -> None:
+    store = FakeEventStore()
+    processor = WebhookProcessor(store, PLANS, batch_size=10, batch_window=0.05)
+    processor.start()
+    try:
+        for n in range(3):
+            await processor.ingest(_credits(f"evt_{n}"))
+        for _ in range(50):
+            if processor.processed == 3:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await processor.stop()
+
+    assert len(store.batches) == 1
+    assert store.batches[0].processed == ["evt_0", "evt_1", "evt_2"]
+
+
+async def test_failed_batch_is_retried_per_event() -> None:
+    store = FakeEventStore(fail_on="evt_bad")
+    processor = WebhookProcessor(store, PLANS)
+
+    await processor.process([_credits("evt_1"), _credits("evt_bad"), _credits("evt_2")])
+
+    assert [b.processed for b in store.batches] == [["evt_1"], [], ["evt_2"]]
+    assert store.batches[1].failed[0]["id"] == "evt_bad"
+    assert processor.stats()["failed"] == 1
+
+
+async def test_reapplied_events_are_counted_once() -> None:
+    store = FakeEventStore()
+    processor = WebhookProcessor(store, PLANS)
+    events = [_credits("evt_1"), _credits("evt_2")]
+
+    await processor.process(events)
+    # As after a lost response, or a second worker recovering the same rows
+    await processor.process(events)
+
+    assert processor.stats()["processed"] == 2
+    assert processor.stats()["duplicates"] == 2
+
+
+async def test_malformed_event_fails_alone_and_the_worker_keeps_going() -> None:
+    store = FakeEventStore()
+    processor = WebhookProcessor(store, PLANS, batch_size=10, batch_window=0.01)
+    bad_credits = _credits("evt_bad")
+    bad_credits["data"]["object"]["metadata"]["credits"] = "ten"
+    bad_created = {**_credits("evt_late"), "created": "yesterday"}
+    processor.start()
+    try:
+        for event in (_credits("evt_1"), bad_credits, bad_created):
+            await processor.ingest(event)
+        await asyncio.sleep(0.05)
+        await processor.ingest(_credits("evt_2"))
+        for _ in range(50):
+            if processor.processed == 2:
+                break
+            await asyncio.sleep(0.01)
+        assert processor._task is not None and not processor._task.done()
+    finally:
+        await processor.stop()
+
+    assert store.applied == {"evt_1", "evt_2"}
+    assert {f["id"] for b in store.batches for f in b.failed} == {
+        "evt_bad",
+        "evt_late",
+    }
+    assert processor.stats()["failed"] == 2
+
+
+async def test_worker_survives_an_unexpected_error(monkeypatch) -> None:
+    store = FakeEventStore()
+    processor = WebhookProcessor(store, PLANS, batch_window=0.01)
+    calls = 0
+    process = processor.process
+
+    async def flaky(events: list[dict[str, Any]]) -> None:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("store unreachable")
+        await process(events)
+
+    monkeypatch.setattr(processor, "process", flaky)
+    processor.start()
+    try:
+        await processor.ingest(_credits("evt_1"))
+        await asyncio.sleep(0.05)
+        await processor.ingest(_credits("evt_2"))
+        for _ in range(50):
+            if processor.processed == 1:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await processor.stop()
+
+    assert store.applied == {"evt_2"}
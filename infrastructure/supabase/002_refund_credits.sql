@@ -0,0 +1,31 @@
+-- ============================================
+-- ALEMBIC MIGRATION 002: Refund Credits
+-- Compensating action for deduct_credits, used when a reading fails
+-- after its credits were reserved.
+-- Run this in Supabase SQL Editor
+-- ============================================
+
+CREATE OR REPLACE FUNCTION refund_credits(
+    p_user_id UUID,
+    p_amount INTEGER,
+    p_description TEXT
+) RETURNS VOID AS $$
+BEGIN
+    IF p_amount IS NULL OR p_amount <= 0 THEN
+        RAISE EXCEPTION 'Refund amount must be positive, got %', p_amount;
+    END IF;
+
+    UPDATE users
+    SET credits = credits + p_amount
+    WHERE id = p_user_id;
+
+    INSERT INTO credit_transactions (user_id, amount, type, description)
+    VALUES (p_user_id, p_amount, 'refund', p_description);
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Only the backend (service role) may refund; clients could otherwise
+-- mint credits through the REST API
+REVOKE EXECUTE ON FUNCTION refund_credits(UUID, INTEGER, TEXT)
+    FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION refund_credits(UUID, INTEGER, TEXT) TO service_role;
@@ -0,0 +1,237 @@
+-- ============================================
+-- ALEMBIC MIGRATION 003: User Reading Stats
+-- Per-user aggregates for the "your journey" view, kept current by a
+-- trigger on readings so reading them is one primary-key lookup no
+-- matter how many readings a user has.
+-- Run this in Supabase SQL Editor
+-- ============================================
+
+CREATE TABLE user_reading_stats (
+    user_id UUID PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    total_readings INTEGER NOT NULL DEFAULT 0,
+    total_cards INTEGER NOT NULL DEFAULT 0,
+    reversed_cards INTEGER NOT NULL DEFAULT 0,
+    -- card id -> times drawn
+    card_counts JSONB NOT NULL DEFAULT '{}',
+    -- 'major' | 'wands' | 'cups' | 'swords' | 'pentacles' -> cards drawn
+    suit_counts JSONB NOT NULL DEFAULT '{}',
+    -- spread_type -> readings
+    spread_counts JSONB NOT NULL DEFAULT '{}',
+    first_reading_at TIMESTAMPTZ,
+    last_reading_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+ALTER TABLE user_reading_stats ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view own reading stats"
+ON user_reading_stats FOR SELECT
+USING (auth.uid() = user_id);
+
+-- Suit of a card id: minor_cups_01 -> cups, major_00 -> major
+CREATE OR REPLACE FUNCTION card_suit(p_card_id TEXT)
+RETURNS TEXT AS $$
+    SELECT CASE
+        WHEN p_card_id LIKE 'minor\_%' THEN split_part(p_card_id, '_', 2)
+        ELSE 'major'
+    END;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Add p_sign (1 or -1) times each count in p_delta to p_counts
+CREATE OR REPLACE FUNCTION jsonb_add_counts(p_counts JSONB, p_delta JSONB, p_sign INTEGER)
+RETURNS JSONB AS $$
+    SELECT COALESCE(jsonb_object_agg(key, total) FILTER (WHERE total <> 0), '{}')
+    FROM (
+        SELECT key, SUM(value) AS total
+        FROM (
+            SELECT key, value::INTEGER AS value FROM jsonb_each_text(p_counts)
+            UNION ALL
+            SELECT key, value::INTEGER * p_sign FROM jsonb_each_text(p_delta)
+        ) counts
+        GROUP BY key
+    ) totals;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Fold one reading into (p_sign = 1) or out of (p_sign = -1) its user's stats
+CREATE OR REPLACE FUNCTION apply_reading_stats(
+    p_user_id UUID,
+    p_spread_type TEXT,
+    p_cards JSONB,
+    p_created_at TIMESTAMPTZ,
+    p_sign INTEGER
+) RETURNS VOID AS $$
+DECLARE
+    v_cards INTEGER;
+    v_reversed INTEGER;
+    v_card_counts JSONB;
+    v_suit_counts JSONB;
+BEGIN
+    SELECT
+        COUNT(*),
+        COUNT(*) FILTER (WHERE COALESCE((card->>'reversed')::BOOLEAN, FALSE))
+    INTO v_cards, v_reversed
+    FROM jsonb_array_elements(p_cards) AS card;
+
+    SELECT COALESCE(jsonb_object_agg(card_id, n), '{}')
+    INTO v_card_counts
+    FROM (
+        SELECT card->>'id' AS card_id, COUNT(*) AS n
+        FROM jsonb_array_elements(p_cards) AS card
+        GROUP BY 1
+    ) c;
+
+    SELECT COALESCE(jsonb_object_agg(suit, n), '{}')
+    INTO v_suit_counts
+    FROM (
+        SELECT card_suit(card->>'id') AS suit, COUNT(*) AS n
+        FROM jsonb_array_elements(p_cards) AS card
+        GROUP BY 1
+    ) s;
+
+    INSERT INTO user_reading_stats AS s (
+        user_id, total_readings, total_cards, reversed_cards,
+        card_counts, suit_counts, spread_counts,
+        first_reading_at, last_reading_at
+    ) VALUES (
+        p_user_id, p_sign, v_cards * p_sign, v_reversed * p_sign,
+        jsonb_add_counts('{}', v_card_counts, p_sign),
+        jsonb_add_counts('{}', v_suit_counts, p_sign),
+        jsonb_build_object(p_spread_type, p_sign),
+        p_created_at, p_created_at
+    )
+    ON CONFLICT (user_id) DO UPDATE SET
+        total_readings = s.total_readings + p_sign,
+        total_cards = s.total_cards + v_cards * p_sign,
+        reversed_cards = s.reversed_cards + v_reversed * p_sign,
+        card_counts = jsonb_add_counts(s.card_counts, v_card_counts, p_sign),
+        suit_counts = jsonb_add_counts(s.suit_counts, v_suit_counts, p_sign),
+        spread_counts = jsonb_add_counts(
+            s.spread_counts, jsonb_build_object(p_spread_type, 1), p_sign
+        ),
+        first_reading_at = LEAST(s.first_reading_at, EXCLUDED.first_reading_at),
+        last_reading_at = GREATEST(s.last_reading_at, EXCLUDED.last_reading_at),
+        updated_at = NOW();
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Only the trigger below may fold readings in or out
+REVOKE EXECUTE ON FUNCTION apply_reading_stats(UUID, TEXT, JSONB, TIMESTAMPTZ, INTEGER)
+    FROM PUBLIC, anon, authenticated;
+
+CREATE OR REPLACE FUNCTION readings_stats_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM apply_reading_stats(
+            NEW.user_id, NEW.spread_type, NEW.cards, NEW.created_at, 1
+        );
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM apply_reading_stats(
+            OLD.user_id, OLD.spread_type, OLD.cards, OLD.created_at, -1
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE TRIGGER readings_maintain_stats
+    AFTER INSERT OR DELETE ON readings
+    FOR EACH ROW
+    EXECUTE FUNCTION readings_stats_trigger();
+
+-- ============================================
+-- Backfill: rebuild stats from existing readings.
+-- One pass over readings; safe to re-run, e.g. after changing the
+-- aggregation. Pass a user id to rebuild just that user.
+-- ============================================
+
+CREATE OR REPLACE FUNCTION backfill_user_reading_stats(p_user_id UUID DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    v_users INTEGER;
+BEGIN
+    DELETE FROM user_reading_stats
+    WHERE p_user_id IS NULL OR user_id = p_user_id;
+
+    WITH drawn AS (
+        SELECT r.user_id, card
+        FROM readings r, jsonb_array_elements(r.cards) AS card
+        WHERE p_user_id IS NULL OR r.user_id = p_user_id
+    ),
+    per_reading AS (
+        SELECT
+            user_id,
+            COUNT(*) AS total_readings,
+            MIN(created_at) AS first_reading_at,
+            MAX(created_at) AS last_reading_at
+        FROM readings
+        WHERE p_user_id IS NULL OR user_id = p_user_id
+        GROUP BY user_id
+    ),
+    per_card AS (
+        SELECT
+            user_id,
+            COUNT(*) AS total_cards,
+            COUNT(*) FILTER (WHERE COALESCE((card->>'reversed')::BOOLEAN, FALSE))
+                AS reversed_cards
+        FROM drawn
+        GROUP BY user_id
+    ),
+    card_counts AS (
+        SELECT user_id, jsonb_object_agg(card_id, n) AS counts
+        FROM (
+            SELECT user_id, card->>'id' AS card_id, COUNT(*) AS n
+            FROM drawn GROUP BY 1, 2
+        ) c
+        GROUP BY user_id
+    ),
+    suit_counts AS (
+        SELECT user_id, jsonb_object_agg(suit, n) AS counts
+        FROM (
+            SELECT user_id, card_suit(card->>'id') AS suit, COUNT(*) AS n
+            FROM drawn GROUP BY 1, 2
+        ) s
+        GROUP BY user_id
+    ),
+    spread_counts AS (
+        SELECT user_id, jsonb_object_agg(spread_type, n) AS counts
+        FROM (
+            SELECT user_id, spread_type, COUNT(*) AS n
+            FROM readings
+            WHERE p_user_id IS NULL OR user_id = p_user_id
+            GROUP BY 1, 2
+        ) t
+        GROUP BY user_id
+    )
+    INSERT INTO user_reading_stats (
+        user_id, total_readings, total_cards, reversed_cards,
+        card_counts, suit_counts, spread_counts,
+        first_reading_at, last_reading_at
+    )
+    SELECT
+        r.user_id,
+        r.total_readings,
+        COALESCE(c.total_cards, 0),
+        COALESCE(c.reversed_cards, 0),
+        COALESCE(cc.counts, '{}'),
+        COALESCE(sc.counts, '{}'),
+        COALESCE(st.counts, '{}'),
+        r.first_reading_at,
+        r.last_reading_at
+    FROM per_reading r
+    LEFT JOIN per_card c USING (user_id)
+    LEFT JOIN card_counts cc USING (user_id)
+    LEFT JOIN suit_counts sc USING (user_id)
+    LEFT JOIN spread_counts st USING (user_id);
+
+    GET DIAGNOSTICS v_users = ROW_COUNT;
+    RETURN v_users;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- A rebuild deletes and rescans; only the backend (service role) may run it
+REVOKE EXECUTE ON FUNCTION backfill_user_reading_stats(UUID)
+    FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION backfill_user_reading_stats(UUID) TO service_role;
+
+SELECT backfill_user_reading_stats();
@@ -0,0 +1,81 @@
+-- ============================================
+-- ALEMBIC MIGRATION 004: Reading Search
+-- Full-text search over a user's readings by question and
+-- interpretation, from a generated tsvector and a GIN index rather than
+-- ILIKE scans.
+-- Run this in Supabase SQL Editor
+-- ============================================
+
+-- Lets the GIN index lead with user_id, so a search only visits the
+-- caller's entries
+CREATE EXTENSION IF NOT EXISTS btree_gin;
+
+-- Question words weigh more than interpretation words
+ALTER TABLE readings
+ADD COLUMN search_vector TSVECTOR
+GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', COALESCE(question, '')), 'A')
+    || setweight(to_tsvector('english', COALESCE(interpretation, '')), 'B')
+) STORED;
+
+CREATE INDEX idx_readings_search ON readings USING GIN (user_id, search_vector);
+
+-- Ranked, keyset-paginated search. Results are ordered by
+-- (rank, created_at, id) descending; pass the last row's values to get the
+-- next page. Snippets are built only for the returned page.
+CREATE OR REPLACE FUNCTION search_readings(
+    p_user_id UUID,
+    p_query TEXT,
+    p_limit INTEGER DEFAULT 20,
+    p_after_rank REAL DEFAULT NULL,
+    p_after_created_at TIMESTAMPTZ DEFAULT NULL,
+    p_after_id UUID DEFAULT NULL
+) RETURNS TABLE (
+    id UUID,
+    question TEXT,
+    spread_type TEXT,
+    created_at TIMESTAMPTZ,
+    rank REAL,
+    question_snippet TEXT,
+    snippet TEXT
+) AS $$
+    WITH query AS (
+        SELECT websearch_to_tsquery('english', p_query) AS q
+    ),
+    page AS (
+        SELECT
+            r.id,
+            r.question,
+            r.spread_type,
+            r.created_at,
+            r.interpretation,
+            ts_rank_cd(r.search_vector, query.q)::REAL AS rank
+        FROM readings r, query
+        WHERE r.user_id = p_user_id
+          AND r.search_vector @@ query.q
+          AND (
+              p_after_rank IS NULL
+              OR (ts_rank_cd(r.search_vector, query.q)::REAL, r.created_at, r.id)
+                 < (p_after_rank, p_after_created_at, p_after_id)
+          )
+        ORDER BY rank DESC, r.created_at DESC, r.id DESC
+        LIMIT LEAST(GREATEST(p_limit, 1), 100)
+    )
+    SELECT
+        page.id,
+        page.question,
+        page.spread_type,
+        page.created_at,
+        page.rank,
+        ts_headline(
+            'english', page.question, query.q,
+            'StartSel=<mark>, StopSel=</mark>, HighlightAll=true'
+        ),
+        ts_headline(
+            'english', page.interpretation, query.q,
+            'StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, '
+            'MaxFragments=2, FragmentDelimiter=" … "'
+        )
+    FROM page, query
+    ORDER BY page.rank DESC, page.created_at DESC, page.id DESC;
+$$ LANGUAGE sql STABLE;
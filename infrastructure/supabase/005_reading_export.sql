@@ -0,0 +1,58 @@
+-- ============================================
+-- ALEMBIC MIGRATION 005: Reading Export
+-- Chunked export of a user's readings with their messages, for data
+-- export requests. Pages are keyset-paginated so each chunk is an index
+-- range scan however deep into the history it is.
+-- Run this in Supabase SQL Editor
+-- ============================================
+
+CREATE INDEX idx_readings_user_created ON readings(user_id, created_at, id);
+
+-- Up to p_limit readings after (p_after_created_at, p_after_id), oldest
+-- first, each with its messages in order
+CREATE OR REPLACE FUNCTION export_readings(
+    p_user_id UUID,
+    p_limit INTEGER DEFAULT 200,
+    p_after_created_at TIMESTAMPTZ DEFAULT NULL,
+    p_after_id UUID DEFAULT NULL
+) RETURNS TABLE (
+    id UUID,
+    question TEXT,
+    spread_type TEXT,
+    cards JSONB,
+    interpretation TEXT,
+    created_at TIMESTAMPTZ,
+    messages JSONB
+) AS $$
+    SELECT
+        r.id,
+        r.question,
+        r.spread_type,
+        r.cards,
+        r.interpretation,
+        r.created_at,
+        COALESCE(
+            (
+                SELECT jsonb_agg(
+                    jsonb_build_object(
+                        'id', m.id,
+                        'role', m.role,
+                        'content', m.content,
+                        'created_at', m.created_at
+                    )
+                    ORDER BY m.created_at, m.id
+                )
+                FROM reading_messages m
+                WHERE m.reading_id = r.id
+            ),
+            '[]'
+        )
+    FROM readings r
+    WHERE r.user_id = p_user_id
+      AND (
+          p_after_created_at IS NULL
+          OR (r.created_at, r.id) > (p_after_created_at, p_after_id)
+      )
+    ORDER BY r.created_at, r.id
+    LIMIT LEAST(GREATEST(p_limit, 1), 1000);
+$$ LANGUAGE sql STABLE;
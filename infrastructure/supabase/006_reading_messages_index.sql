@@ -0,0 +1,13 @@
+-- ============================================
+-- ALEMBIC MIGRATION 006: Reading Messages Index
+-- Loading a conversation reads a reading's newest messages. With only a
+-- reading_id index that means fetching and sorting all of them; the
+-- composite index returns the newest N in order.
+-- Run this in Supabase SQL Editor
+-- ============================================
+
+CREATE INDEX idx_reading_messages_reading_created
+ON reading_messages(reading_id, created_at);
+
+-- Covered by the composite index's leading column
+DROP INDEX IF EXISTS idx_reading_messages_reading_id;
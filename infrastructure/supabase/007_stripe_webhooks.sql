@@ -0,0 +1,184 @@
+-- ============================================
+-- ALEMBIC MIGRATION 007: Stripe Webhooks
+-- Idempotency store for Stripe events and a batch function that applies
+-- subscription changes and credit purchases in one transaction, each
+-- event at most once.
+-- Run this in Supabase SQL Editor
+-- ============================================
+
+-- One row per Stripe event id. The primary key makes dropping a
+-- redelivered event a single index probe.
+CREATE TABLE stripe_events (
+    id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    payload JSONB NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending'
+        CHECK (status IN ('pending', 'processed', 'failed')),
+    error TEXT,
+    -- Lease taken by the worker recovering the event
+    claimed_until TIMESTAMPTZ,
+    received_at TIMESTAMPTZ DEFAULT NOW(),
+    processed_at TIMESTAMPTZ
+);
+
+-- Events still to process, e.g. after a restart
+CREATE INDEX idx_stripe_events_pending ON stripe_events(received_at)
+WHERE status = 'pending';
+
+-- Service role only
+ALTER TABLE stripe_events ENABLE ROW LEVEL SECURITY;
+
+-- Time of the Stripe event that last changed the subscription, so a late
+-- redelivery of an older event can't overwrite a newer state
+ALTER TABLE subscriptions ADD COLUMN last_event_at TIMESTAMPTZ;
+
+-- Record an event; FALSE if it was already recorded
+CREATE OR REPLACE FUNCTION record_stripe_event(
+    p_id TEXT,
+    p_type TEXT,
+    p_payload JSONB
+) RETURNS BOOLEAN AS $$
+    WITH inserted AS (
+        INSERT INTO stripe_events (id, type, payload)
+        VALUES (p_id, p_type, p_payload)
+        ON CONFLICT (id) DO NOTHING
+        RETURNING 1
+    )
+    SELECT EXISTS (SELECT 1 FROM inserted);
+$$ LANGUAGE sql SECURITY DEFINER SET search_path = public;
+
+-- Claim up to p_limit pending events for p_lease_seconds, so workers
+-- recovering at the same time take disjoint sets
+CREATE OR REPLACE FUNCTION claim_stripe_events(
+    p_limit INTEGER DEFAULT 500,
+    p_lease_seconds INTEGER DEFAULT 300
+) RETURNS SETOF JSONB AS $$
+    UPDATE stripe_events e
+    SET claimed_until = NOW() + make_interval(secs => p_lease_seconds)
+    FROM (
+        SELECT id FROM stripe_events
+        WHERE status = 'pending'
+          AND (claimed_until IS NULL OR claimed_until < NOW())
+        ORDER BY received_at
+        LIMIT p_limit
+        FOR UPDATE SKIP LOCKED
+    ) AS claimed
+    WHERE e.id = claimed.id
+    RETURNING e.payload;
+$$ LANGUAGE sql SECURITY DEFINER SET search_path = public;
+
+-- Apply a batch of billing updates:
+--   p_subscriptions: [{event_id, user_id, stripe_customer_id,
+--                      stripe_subscription_id, status, plan,
+--                      current_period_end, event_at}]
+--   p_credits: [{event_id, user_id, amount, description}]
+--   p_processed: event ids to mark processed
+--   p_failed: [{id, error}] events to mark failed
+-- Returns the ids of the events applied by this call.
+CREATE OR REPLACE FUNCTION apply_stripe_updates(
+    p_subscriptions JSONB DEFAULT '[]',
+    p_credits JSONB DEFAULT '[]',
+    p_processed TEXT[] DEFAULT '{}',
+    p_failed JSONB DEFAULT '[]'
+) RETURNS TEXT[] AS $$
+DECLARE
+    v_applied TEXT[];
+    v_sub JSONB;
+    v_user_id UUID;
+BEGIN
+    -- Only events still pending are applied. A retry after a lost
+    -- response, or a second worker holding the same event, waits on the
+    -- row lock and then finds it processed, so nothing is granted twice
+    WITH claimed AS (
+        UPDATE stripe_events
+        SET status = 'processed', error = NULL, processed_at = NOW()
+        WHERE id = ANY(p_processed) AND status = 'pending'
+        RETURNING id
+    )
+    SELECT COALESCE(array_agg(id), '{}') INTO v_applied FROM claimed;
+
+    FOR v_sub IN
+        SELECT value FROM jsonb_array_elements(p_subscriptions)
+        WHERE value->>'event_id' = ANY(v_applied)
+    LOOP
+        -- Subscription events only carry the customer; map it to the user
+        -- linked at checkout
+        v_user_id := COALESCE(
+            (v_sub->>'user_id')::UUID,
+            (SELECT user_id FROM subscriptions
+             WHERE stripe_customer_id = v_sub->>'stripe_customer_id')
+        );
+        CONTINUE WHEN v_user_id IS NULL;
+
+        INSERT INTO subscriptions AS s (
+            user_id, stripe_customer_id, stripe_subscription_id,
+            status, plan, current_period_end, last_event_at
+        ) VALUES (
+            v_user_id,
+            v_sub->>'stripe_customer_id',
+            v_sub->>'stripe_subscription_id',
+            COALESCE(v_sub->>'status', 'inactive'),
+            v_sub->>'plan',
+            (v_sub->>'current_period_end')::TIMESTAMPTZ,
+            (v_sub->>'event_at')::TIMESTAMPTZ
+        )
+        ON CONFLICT (user_id) DO UPDATE SET
+            stripe_customer_id = EXCLUDED.stripe_customer_id,
+            stripe_subscription_id = COALESCE(
+                EXCLUDED.stripe_subscription_id, s.stripe_subscription_id
+            ),
+            status = COALESCE(v_sub->>'status', s.status),
+            plan = COALESCE(EXCLUDED.plan, s.plan),
+            current_period_end = COALESCE(
+                EXCLUDED.current_period_end, s.current_period_end
+            ),
+            last_event_at = EXCLUDED.last_event_at
+        WHERE s.last_event_at IS NULL
+           OR s.last_event_at <= EXCLUDED.last_event_at;
+
+        UPDATE users u
+        SET tier = CASE
+            WHEN s.status = 'active' AND s.plan IS NOT NULL THEN s.plan
+            ELSE 'free'
+        END
+        FROM subscriptions s
+        WHERE s.user_id = v_user_id AND u.id = v_user_id;
+    END LOOP;
+
+    WITH grants AS (
+        SELECT (g->>'user_id')::UUID AS user_id, SUM((g->>'amount')::INTEGER) AS amount
+        FROM jsonb_array_elements(p_credits) AS g
+        WHERE g->>'event_id' = ANY(v_applied)
+        GROUP BY 1
+    )
+    UPDATE users u
+    SET credits = u.credits + grants.amount
+    FROM grants
+    WHERE u.id = grants.user_id;
+
+    INSERT INTO credit_transactions (user_id, amount, type, description)
+    SELECT (g->>'user_id')::UUID, (g->>'amount')::INTEGER, 'purchase', g->>'description'
+    FROM jsonb_array_elements(p_credits) AS g
+    WHERE g->>'event_id' = ANY(v_applied);
+
+    UPDATE stripe_events e
+    SET status = 'failed', error = f->>'error', processed_at = NOW()
+    FROM jsonb_array_elements(p_failed) AS f
+    WHERE e.id = f->>'id' AND e.status = 'pending';
+
+    RETURN v_applied;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Only the backend (service role) may call these; clients could otherwise
+-- grant themselves a plan or credits through the REST API
+REVOKE EXECUTE ON FUNCTION record_stripe_event(TEXT, TEXT, JSONB)
+    FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION claim_stripe_events(INTEGER, INTEGER)
+    FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION apply_stripe_updates(JSONB, JSONB, TEXT[], JSONB)
+    FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION record_stripe_event(TEXT, TEXT, JSONB) TO service_role;
+GRANT EXECUTE ON FUNCTION claim_stripe_events(INTEGER, INTEGER) TO service_role;
+GRANT EXECUTE ON FUNCTION apply_stripe_updates(JSONB, JSONB, TEXT[], JSONB)
+    TO service_role;
@@ -0,0 +1,14 @@
+-- ============================================
+-- ALEMBIC MIGRATION 008: Custom Spread Types
+-- Spreads can be added as data files, so readings.spread_type is no
+-- longer limited to the four built-in spreads. The constraint now only
+-- checks the spread id format the backend enforces when loading spreads;
+-- without this, readings of custom spreads were paid for and then failed
+-- to insert.
+-- Run this in Supabase SQL Editor
+-- ============================================
+
+ALTER TABLE readings DROP CONSTRAINT IF EXISTS readings_spread_type_check;
+
+ALTER TABLE readings ADD CONSTRAINT readings_spread_type_check
+CHECK (spread_type ~ '^[a-z][a-z0-9_]*$');